@@ -0,0 +1,30 @@
+"""index participation foreign keys for grouped counts
+
+Revision ID: 4b7d2e91c6a3
+Revises: c3e1a7d9b402
+Create Date: 2026-10-19 17:05:12.402117
+
+Index sur segment_guests.guest_id et show_presenters.presenter_id : les
+compteurs de participation des listes invites / presentateurs sont calcules
+par sous-requete COUNT correlee sur ces colonnes.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7d2e91c6a3'
+down_revision: Union[str, None] = 'c3e1a7d9b402'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_segment_guests_guest_id', 'segment_guests', ['guest_id'], unique=False)
+    op.create_index('ix_show_presenters_presenter_id', 'show_presenters', ['presenter_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_show_presenters_presenter_id', table_name='show_presenters')
+    op.drop_index('ix_segment_guests_guest_id', table_name='segment_guests')
@@ -0,0 +1,53 @@
+"""trigram indexes for guest and user directory search
+
+Revision ID: 7c2f5a9e0d14
+Revises: 4b7d2e91c6a3
+Create Date: 2026-10-19 18:20:41.913205
+
+Recherche annuaire (invites, utilisateurs) : index GIN pg_trgm sur une cle
+normalisee (minuscules, sans accents) concatenant nom / email / telephone.
+unaccent() n'etant pas IMMUTABLE, il est enveloppe dans immutable_unaccent()
+pour etre utilisable dans un index d'expression. Les expressions doivent
+rester identiques a celles generees par app/db/crud/crud_directory_search.py.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2f5a9e0d14'
+down_revision: Union[str, None] = '4b7d2e91c6a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+GUESTS_SEARCH_KEY = (
+    "immutable_unaccent(lower("
+    "coalesce(name, '') || ' ' || coalesce(email, '') || ' ' || coalesce(phone, '')"
+    "))"
+)
+USERS_SEARCH_KEY = (
+    "immutable_unaccent(lower("
+    "coalesce(username, '') || ' ' || coalesce(name, '') || ' ' || coalesce(family_name, '')"
+    " || ' ' || coalesce(email, '') || ' ' || coalesce(phone_number, '')"
+    "))"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute(
+        "CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text AS "
+        "$$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$ "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT"
+    )
+    op.execute(f"CREATE INDEX IF NOT EXISTS ix_guests_search_trgm ON guests USING gin ({GUESTS_SEARCH_KEY} gin_trgm_ops)")
+    op.execute(f"CREATE INDEX IF NOT EXISTS ix_users_search_trgm ON users USING gin ({USERS_SEARCH_KEY} gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_users_search_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_guests_search_trgm")
+    op.execute("DROP FUNCTION IF EXISTS immutable_unaccent(text)")
@@ -0,0 +1,44 @@
+"""add job_runs table for the leader-elected job runner
+
+Revision ID: a8d3f6c2e517
+Revises: 7c2f5a9e0d14
+Create Date: 2026-10-19 19:02:37.118420
+
+Historique des executions du planificateur de taches (app/services/job_runner.py) :
+une ligne par execution, lue par /admin/jobs et par le worker qui devient
+leader pour reprendre les echeances sans double execution.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d3f6c2e517'
+down_revision: Union[str, None] = '7c2f5a9e0d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('job_runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_name', sa.String(length=64), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('duration_ms', sa.Integer(), nullable=True),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('worker', sa.String(length=100), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_job_runs_id'), 'job_runs', ['id'], unique=False)
+    op.create_index('ix_job_runs_job_name_started_at', 'job_runs', ['job_name', 'started_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_runs_job_name_started_at', table_name='job_runs')
+    op.drop_index(op.f('ix_job_runs_id'), table_name='job_runs')
+    op.drop_table('job_runs')
@@ -0,0 +1,61 @@
+"""composite and partial indexes for the hottest filters
+
+Revision ID: b6c4e8f2a913
+Revises: d1f7b3a9c620
+Create Date: 2026-10-19 21:02:37.418520
+
+Passe d'indexation des requetes les plus frequentes (synchronisation Social,
+boite de reception, listes inventaire). Verifie par tests/test_query_plans.py
+(plans EXPLAIN sur une base peuplee).
+
+Creation CONCURRENTLY (hors transaction) : pas de verrou d'ecriture sur les
+grosses tables (social_comments, social_post_results) pendant la migration.
+
+Deja couverts, non modifies : social_comments.platform_comment_id (unique),
+shows.broadcast_date (ix_shows_broadcast_date), logistics_fuel_logs
+(ix_fuel_vehicle_date sur vehicle_id, date).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6c4e8f2a913'
+down_revision: Union[str, None] = 'd1f7b3a9c620'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (nom, table, colonnes, predicat de l'index partiel)
+INDEXES = [
+    ('ix_social_post_results_account_platform_post', 'social_post_results', ['account_id', 'platform_post_id'], None),
+    ('ix_social_post_results_post_id', 'social_post_results', ['post_id'], None),
+    ('ix_social_posts_active_created', 'social_posts', ['created_at'], "is_deleted = false"),
+    ('ix_social_comments_root_created', 'social_comments', ['created_at'],
+     "is_deleted = false AND parent_comment_id IS NULL"),
+    ('ix_social_comments_post_id', 'social_comments', ['post_id'], None),
+    ('ix_social_comments_parent_comment_id', 'social_comments', ['parent_comment_id'], None),
+    ('ix_social_comments_account_id', 'social_comments', ['account_id'], None),
+    ('ix_social_conversations_account_id', 'social_conversations', ['account_id'], None),
+    ('ix_social_messages_conversation_created', 'social_messages', ['conversation_id', 'created_at'], None),
+    ('ix_equipment_active_created', 'inventory_equipment', ['is_archived', 'created_at'], "is_deleted = false"),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
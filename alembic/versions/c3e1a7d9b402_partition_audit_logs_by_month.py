@@ -0,0 +1,153 @@
+"""partition audit_logs by month, add audit_log_counters
+
+Revision ID: c3e1a7d9b402
+Revises: bf0da3365124
+Create Date: 2026-10-19 09:12:41.318204
+
+Convertit audit_logs en table partitionnee par plage mensuelle sur `timestamp`
+(partitions audit_logs_pYYYYMM + audit_logs_default), ajoute les index
+composites (user_id, timestamp) / (table_name, timestamp) / (timestamp, id)
+et la table audit_log_counters maintenue par trigger pour les statistiques.
+archived_audit_logs.user_id devient nullable pour accepter les actions systeme
+lors de l'archivage en bloc.
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e1a7d9b402'
+down_revision: Union[str, None] = 'bf0da3365124'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Nombre de partitions mensuelles creees a l'avance
+MONTHS_AHEAD = 3
+
+
+def _add_months(d: date, months: int) -> date:
+    index = d.year * 12 + (d.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # 1. Mettre l'ancienne table de cote (la sequence des IDs est conservee)
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_legacy")
+    op.execute("ALTER INDEX audit_logs_pkey RENAME TO audit_logs_legacy_pkey")
+    op.execute("ALTER TABLE audit_logs_legacy RENAME CONSTRAINT audit_logs_user_id_fkey TO audit_logs_legacy_user_id_fkey")
+
+    # 2. Table parente partitionnee
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            user_id INTEGER REFERENCES users (id),
+            action VARCHAR NOT NULL,
+            table_name VARCHAR NOT NULL,
+            record_id INTEGER NOT NULL,
+            timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            CONSTRAINT audit_logs_pkey PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    op.create_index('ix_audit_logs_user_id_timestamp', 'audit_logs', ['user_id', 'timestamp'], unique=False)
+    op.create_index('ix_audit_logs_table_name_timestamp', 'audit_logs', ['table_name', 'timestamp'], unique=False)
+    op.create_index('ix_audit_logs_timestamp_id', 'audit_logs', ['timestamp', 'id'], unique=False)
+
+    # 3. Partitions mensuelles : du plus ancien log jusqu'a MONTHS_AHEAD mois apres aujourd'hui
+    today = date.today().replace(day=1)
+    oldest = conn.execute(sa.text("SELECT min(timestamp) FROM audit_logs_legacy")).scalar()
+    month = oldest.date().replace(day=1) if oldest else today
+    last = _add_months(today, MONTHS_AHEAD)
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE audit_logs_p{month:%Y%m} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+    # 4. Recopie des donnees puis suppression de l'ancienne table
+    op.execute("""
+        INSERT INTO audit_logs (id, user_id, action, table_name, record_id, timestamp)
+        SELECT id, user_id, action, table_name, record_id, timestamp FROM audit_logs_legacy
+    """)
+    op.execute("DROP TABLE audit_logs_legacy")
+
+    # 5. Compteurs incrementaux pour /audit-logs/stats
+    op.create_table('audit_log_counters',
+    sa.Column('dimension', sa.String(length=16), nullable=False),
+    sa.Column('key', sa.String(), nullable=False),
+    sa.Column('count', sa.BigInteger(), nullable=False, server_default='0'),
+    sa.PrimaryKeyConstraint('dimension', 'key')
+    )
+    op.execute("""
+        INSERT INTO audit_log_counters (dimension, key, count)
+        SELECT 'action', action, count(*) FROM audit_logs GROUP BY action
+        UNION ALL
+        SELECT 'table', table_name, count(*) FROM audit_logs GROUP BY table_name
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION audit_log_counters_bump() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO audit_log_counters (dimension, key, count)
+                VALUES ('action', NEW.action, 1), ('table', NEW.table_name, 1)
+                ON CONFLICT (dimension, key) DO UPDATE SET count = audit_log_counters.count + 1;
+                RETURN NEW;
+            END IF;
+            UPDATE audit_log_counters SET count = count - 1
+            WHERE (dimension = 'action' AND key = OLD.action)
+               OR (dimension = 'table' AND key = OLD.table_name);
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER audit_logs_counters_trg
+        AFTER INSERT OR DELETE ON audit_logs
+        FOR EACH ROW EXECUTE FUNCTION audit_log_counters_bump()
+    """)
+
+    # 6. Archivage des actions systeme (user_id NULL)
+    op.alter_column('archived_audit_logs', 'user_id', existing_type=sa.Integer(), nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM archived_audit_logs WHERE user_id IS NULL")
+    op.alter_column('archived_audit_logs', 'user_id', existing_type=sa.Integer(), nullable=False)
+
+    op.execute("DROP TRIGGER IF EXISTS audit_logs_counters_trg ON audit_logs")
+    op.execute("DROP FUNCTION IF EXISTS audit_log_counters_bump()")
+    op.drop_table('audit_log_counters')
+
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+    op.execute("ALTER INDEX audit_logs_pkey RENAME TO audit_logs_partitioned_pkey")
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            user_id INTEGER,
+            action VARCHAR NOT NULL,
+            table_name VARCHAR NOT NULL,
+            record_id INTEGER NOT NULL,
+            timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            CONSTRAINT audit_logs_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute("""
+        INSERT INTO audit_logs (id, user_id, action, table_name, record_id, timestamp)
+        SELECT id, user_id, action, table_name, record_id, timestamp FROM audit_logs_partitioned
+    """)
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    # Supprime la table partitionnee et toutes ses partitions
+    op.execute("DROP TABLE audit_logs_partitioned CASCADE")
+    op.execute("""
+        ALTER TABLE audit_logs ADD CONSTRAINT audit_logs_user_id_fkey
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    """)
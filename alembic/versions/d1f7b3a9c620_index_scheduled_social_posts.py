@@ -0,0 +1,32 @@
+"""partial index on scheduled social posts for the publish queue
+
+Revision ID: d1f7b3a9c620
+Revises: a8d3f6c2e517
+Create Date: 2026-10-19 20:11:08.530912
+
+La file de publication planifiee (app/services/social_publish_queue.py)
+recharge les prochaines echeances a chaque planification : index partiel
+sur scheduled_at limite aux posts "scheduled" non supprimes.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1f7b3a9c620'
+down_revision: Union[str, None] = 'a8d3f6c2e517'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_social_posts_scheduled_due', 'social_posts', ['scheduled_at'], unique=False,
+        postgresql_where=sa.text("status = 'scheduled' AND is_deleted = false"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_social_posts_scheduled_due', table_name='social_posts')
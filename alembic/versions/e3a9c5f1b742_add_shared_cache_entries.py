@@ -0,0 +1,40 @@
+"""add shared_cache_entries table for the cross-worker cache
+
+Revision ID: e3a9c5f1b742
+Revises: b6c4e8f2a913
+Create Date: 2026-10-19 22:14:51.602417
+
+Cache partage entre workers (app/services/shared_cache.py), utilise par les
+rapports Google Analytics : une ligne par cle, valeur JSON, echeances de
+fraicheur et de peremption, date de derniere lecture pour l'eviction LRU.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9c5f1b742'
+down_revision: Union[str, None] = 'b6c4e8f2a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('shared_cache_entries',
+    sa.Column('namespace', sa.String(length=50), nullable=False),
+    sa.Column('key', sa.String(length=255), nullable=False),
+    sa.Column('value', sa.JSON(), nullable=True),
+    sa.Column('stored_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('stale_until', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('accessed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('namespace', 'key')
+    )
+    op.create_index('ix_shared_cache_entries_namespace_accessed', 'shared_cache_entries', ['namespace', 'accessed_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_shared_cache_entries_namespace_accessed', table_name='shared_cache_entries')
+    op.drop_table('shared_cache_entries')
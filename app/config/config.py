@@ -22,14 +22,46 @@ class Settings(BaseSettings):
     # Grace etendue pour appareils de confiance (7 jours = 10080 min)
     TRUSTED_DEVICE_REFRESH_GRACE_MINUTES:int = 10080
 
+    # Pools de connexions PostgreSQL, par worker : requetes HTTP (DB_*) et taches
+    # d'arriere-plan (DB_JOBS_*) et routes async asyncpg (DB_ASYNC_*). Connexions max =
+    # WORKERS x (DB_POOL_SIZE + DB_MAX_OVERFLOW + DB_JOBS_POOL_SIZE + DB_JOBS_MAX_OVERFLOW
+    # + DB_ASYNC_POOL_SIZE + DB_ASYNC_MAX_OVERFLOW), a garder sous max_connections avec
+    # une marge pour les connexions dediees (verrou du leader, LISTEN, verrous du cache
+    # partage) : par defaut 4 x (10 + 6 + 5) = 84 pour max_connections = 100.
+    # Delais par session en ms (0 = pas de limite).
+    DB_POOL_SIZE:int = 5
+    DB_MAX_OVERFLOW:int = 5
+    DB_STATEMENT_TIMEOUT_MS:int = 30000
+    DB_IDLE_IN_TRANSACTION_TIMEOUT_MS:int = 120000
+    DB_JOBS_POOL_SIZE:int = 2
+    DB_JOBS_MAX_OVERFLOW:int = 4
+    DB_JOBS_STATEMENT_TIMEOUT_MS:int = 1800000
+    DB_JOBS_IDLE_IN_TRANSACTION_TIMEOUT_MS:int = 0
+    DB_ASYNC_POOL_SIZE:int = 3
+    DB_ASYNC_MAX_OVERFLOW:int = 2
+    DB_POOL_TIMEOUT_SECONDS:int = 30
+    DB_POOL_RECYCLE_SECONDS:int = 1800
+    DB_POOL_PRE_PING:bool = True
+    # PgBouncer (mode transaction) devant PostgreSQL : pas de pool local ni de delais
+    # passes a la connexion (a definir sur le role PostgreSQL)
+    DB_PGBOUNCER:bool = False
+    # URL PostgreSQL directe (hors PgBouncer), obligatoire avec DB_PGBOUNCER : verrous
+    # consultatifs (leader, cache partage) et LISTEN vivent sur la session
+    DB_DIRECT_URL:str = ""
+
     # OVH API
     OVH_ENDPOINT:str = "ovh-eu"
     OVH_APPLICATION_KEY:str = ""
     OVH_APPLICATION_SECRET:str = ""
     OVH_CONSUMER_KEY:str = ""
+    # Intervalle de rafraichissement des instantanes de l'inventaire OVH par la tache
+    # ovh_inventory du leader (secondes, 0 = desactive : instantanes calcules a la demande)
+    OVH_PREFETCH_INTERVAL_SECONDS:int = 600
 
     # Scaleway Dedibox API (token prive from console.online.net/en/api/access)
     SCW_SECRET_KEY:str = ""
+    # Intervalle de rafraichissement des instantanes d'inventaire Dedibox (secondes)
+    SCW_INVENTORY_REFRESH_SECONDS:int = 600
 
     # URLs frontend / backend (pour OAuth callback redirect)
     FRONTEND_URL:str = "http://localhost:5173"
@@ -60,6 +92,8 @@ class Settings(BaseSettings):
     WP_RADIOAUDACE_URL:str = "https://www.radioaudace.com"
     WP_RADIOAUDACE_USER:str = ""
     WP_RADIOAUDACE_APP_PASSWORD:str = ""
+    # Statistiques des articles WordPress : instantane rafraichi par le planificateur (secondes)
+    WP_STATS_REFRESH_SECONDS:int = 900
 
     # RadioDJ integration (Now Playing track info)
     RADIODJ_API_KEY:str = ""
@@ -79,6 +113,12 @@ class Settings(BaseSettings):
     # Le service convertit automatiquement le JSON Chrome en format Netscape
     YTDLP_COOKIES_PATH:str = "/app/data/cookies.txt"
 
+    # Extraction sous-titres : taille du pool d'extraction (par worker) et cache disque
+    # Le cache est partage entre workers Gunicorn (cle : video_id + langue + format)
+    SUBTITLE_WORKERS:int = 2
+    SUBTITLE_CACHE_DIR:str = "/app/data/subtitles_cache"
+    SUBTITLE_CACHE_MAX_MB:int = 200
+
     # Firebase Storage (nettoyage fichiers temporaires apres publication)
     # Accepte soit le contenu JSON direct, soit un chemin vers le fichier JSON
     FIREBASE_SERVICE_ACCOUNT:str = ""
@@ -91,6 +131,56 @@ class Settings(BaseSettings):
     # Contenu JSON du Service Account (coller le JSON complet dans la variable)
     # Le Service Account doit avoir l'acces "Lecteur" dans chaque propriete GA4
     GA_SERVICE_ACCOUNT_JSON:str = ""
+    # Cache GA4 partage entre workers (table shared_cache_entries) : fraicheur (s),
+    # duree pendant laquelle une valeur perimee est encore servie et rafraichie en
+    # arriere-plan (s), nombre max d'entrees (les moins recemment lues sont evincees)
+    GA_CACHE_TTL_SECONDS:int = 300
+    GA_REALTIME_CACHE_TTL_SECONDS:int = 30
+    GA_CACHE_STALE_SECONDS:int = 900
+    GA_CACHE_MAX_ENTRIES:int = 500
+
+    # Client HTTP sortant partage (integrations externes)
+    # Requetes simultanees max par hote, nouvelles tentatives pour GET/PUT/DELETE, et
+    # nombre max d'hotes avec un client ouvert (le moins recemment utilise est ferme)
+    HTTP_MAX_PER_HOST:int = 10
+    HTTP_RETRIES:int = 2
+    HTTP_MAX_HOSTS:int = 32
+
+    # Journal des acces HTTP (LoggerMiddleware) : part des requetes reussies journalisees
+    # (0.0 a 1.0 ; erreurs et requetes lentes toujours journalisees), seuil de requete
+    # lente (ms), format "text" ou "json"
+    ACCESS_LOG_SAMPLE_RATE:float = 1.0
+    ACCESS_LOG_SLOW_MS:int = 1000
+    ACCESS_LOG_FORMAT:str = "text"
+
+    # Metriques Prometheus (GET /metrics) : jeton Bearer, obligatoire en production
+    # (vide = requetes directes du reseau interne uniquement : loopback, adresses privees)
+    # Multi-workers : PROMETHEUS_MULTIPROC_DIR (variable d'environnement, voir gunicorn.conf.py)
+    METRICS_TOKEN:str = ""
+
+    # Profilage SQL par requete (developpement / recette uniquement) : en-tetes X-DB-Queries
+    # et Server-Timing, avertissement au-dela du budget ou si une meme requete est repetee
+    SQL_PROFILING:bool = False
+    SQL_QUERY_BUDGET:int = 50
+    SQL_REPEAT_THRESHOLD:int = 5
+
+    # Planificateur de taches periodiques : un seul worker leader (verrou consultatif PostgreSQL)
+    JOB_RUNNER_ENABLED:bool = True
+    JOB_LEADER_CHECK_SECONDS:int = 15
+    JOB_HISTORY_RETENTION_DAYS:int = 30
+
+    # Publication planifiee des posts sociaux : publications simultanees max (worker leader)
+    SOCIAL_PUBLISH_CONCURRENCY:int = 4
+    # Publication d'un post : comptes cibles publies en parallele, tentatives par compte
+    SOCIAL_FANOUT_CONCURRENCY:int = 8
+    SOCIAL_PUBLISH_MAX_ATTEMPTS:int = 3
+    SOCIAL_PUBLISH_RETRY_BASE_SECONDS:float = 2.0
+
+    # Maintenance par lots (nettoyage / purge) : lignes par lot, pause entre lots,
+    # et nombre de lignes supprimees a partir duquel une table passe en VACUUM (ANALYZE)
+    MAINTENANCE_BATCH_SIZE:int = 5000
+    MAINTENANCE_PAUSE_MS:int = 200
+    MAINTENANCE_VACUUM_MIN_ROWS:int = 1000
 
     model_config = SettingsConfigDict(env_file=".env")
    
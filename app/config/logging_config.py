@@ -0,0 +1,48 @@
+"""
+Configuration centralisee des logs de l'application.
+
+Les handlers fichier (api_logs.log, rotation 5 Mo x 3) et console ne sont plus
+appeles par le thread qui journalise : les enregistrements passent par une
+file (QueueHandler) videe par un thread dedie (QueueListener). L'ecriture
+disque et la rotation ne bloquent donc plus la boucle d'evenements.
+
+Usage (une fois, au demarrage) :
+    from app.config.logging_config import setup_logging
+    setup_logging()
+"""
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+LOG_FILE = "api_logs.log"
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(level: int = logging.INFO) -> QueueListener:
+    """Installe le QueueHandler sur le logger racine et demarre le thread d'ecriture (idempotent)."""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = RotatingFileHandler(LOG_FILE, maxBytes=5 * 1024 * 1024, backupCount=3)
+    file_handler.setFormatter(formatter)
+    # Handler console pour que les logs apparaissent dans Docker
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # Message seul : le format complet est applique par les handlers du listener
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    _listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+    logging.basicConfig(level=level, handlers=[queue_handler])
+    _listener.start()
+    # Vide la file avant la fin du processus
+    atexit.register(_listener.stop)
+    return _listener
@@ -1,12 +1,18 @@
+import base64
+import re
 from typing import Optional, List, Tuple
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, desc
-from datetime import datetime, timezone
-from app.models import AuditLog, ArchivedAuditLog, User
+from sqlalchemy import func, desc, text, tuple_
+from datetime import datetime, date, timezone
+from app.models import AuditLog, AuditLogCounter, ArchivedAuditLog, User
 from app.schemas.schema_archived_audit_logs import ArchivedAuditLogCreate
 from sqlalchemy.exc import SQLAlchemyError
 
 
+# Partitions mensuelles de audit_logs : audit_logs_pYYYYMM (+ audit_logs_default)
+_PARTITION_NAME_RE = re.compile(r"^audit_logs_p(\d{4})(\d{2})$")
+
+
 def _serialize_log_with_username(log: AuditLog) -> dict:
     """Sérialise un log d'audit en incluant le username de l'utilisateur."""
     return {
@@ -20,6 +26,27 @@ def _serialize_log_with_username(log: AuditLog) -> dict:
     }
 
 
+def _encode_cursor(log: AuditLog) -> str:
+    """Encode la position (timestamp, id) d'un log en curseur opaque."""
+    raw = f"{log.timestamp.isoformat()}|{log.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Décode un curseur produit par _encode_cursor. Lève ValueError si invalide."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        ts, log_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(log_id)
+    except Exception as e:
+        raise ValueError(f"Curseur de pagination invalide : {cursor}") from e
+
+
+def _add_months(d: date, months: int) -> date:
+    index = d.year * 12 + (d.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
 # CRUD pour les logs d'audit actifs
 def get_all_audit_logs(
     db: Session,
@@ -29,13 +56,21 @@ def get_all_audit_logs(
     action: Optional[str] = None,
     table_name: Optional[str] = None,
     start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None
-) -> Tuple[List[dict], int]:
+    end_date: Optional[datetime] = None,
+    exact: bool = False,
+    cursor: Optional[str] = None
+) -> Tuple[List[dict], Optional[int], Optional[str]]:
     """
     Récupérer les logs d'audit actifs avec pagination, filtres et tri.
+
+    - exact=True : égalité stricte sur action/table_name (utilise les index
+      composites) au lieu de la recherche partielle ILIKE.
+    - cursor : pagination par clé (timestamp, id) ; skip est alors ignoré
+      et le comptage total n'est pas recalculé (total = None).
     
     Returns:
-        Tuple[List[dict], int]: (logs sérialisés avec username, total count)
+        Tuple[List[dict], Optional[int], Optional[str]]:
+            (logs sérialisés avec username, total count, curseur de la page suivante)
     """
     try:
         query = db.query(AuditLog).options(joinedload(AuditLog.user))
@@ -44,21 +79,30 @@ def get_all_audit_logs(
         if user_id is not None:
             query = query.filter(AuditLog.user_id == user_id)
         if action is not None:
-            query = query.filter(AuditLog.action.ilike(f"%{action}%"))
+            query = query.filter(AuditLog.action == action if exact else AuditLog.action.ilike(f"%{action}%"))
         if table_name is not None:
-            query = query.filter(AuditLog.table_name.ilike(f"%{table_name}%"))
+            query = query.filter(AuditLog.table_name == table_name if exact else AuditLog.table_name.ilike(f"%{table_name}%"))
         if start_date is not None:
             query = query.filter(AuditLog.timestamp >= start_date)
         if end_date is not None:
             query = query.filter(AuditLog.timestamp <= end_date)
         
-        # Total avant pagination
-        total = query.count()
-        
-        # Tri par date décroissante + pagination
-        logs = query.order_by(desc(AuditLog.timestamp)).offset(skip).limit(limit).all()
+        total = None
+        if cursor is not None:
+            cursor_ts, cursor_id = _decode_cursor(cursor)
+            query = query.filter(tuple_(AuditLog.timestamp, AuditLog.id) < tuple_(cursor_ts, cursor_id))
+        else:
+            # Total avant pagination (mode offset uniquement)
+            total = query.order_by(None).count()
         
-        return [_serialize_log_with_username(log) for log in logs], total
+        # Tri par date décroissante + pagination (limit + 1 pour détecter la page suivante)
+        query = query.order_by(desc(AuditLog.timestamp), desc(AuditLog.id))
+        if cursor is None:
+            query = query.offset(skip)
+        logs = query.limit(limit + 1).all()
+
+        next_cursor = _encode_cursor(logs[limit - 1]) if len(logs) > limit else None
+        return [_serialize_log_with_username(log) for log in logs[:limit]], total, next_cursor
     except SQLAlchemyError as e:
         raise Exception(f"Erreur lors de la récupération des logs d'audit actifs : {str(e)}")
 
@@ -76,30 +120,21 @@ def get_audit_log(db: Session, id: int) -> Optional[dict]:
 def get_audit_log_stats(db: Session) -> dict:
     """
     Récupérer des statistiques sur les logs d'audit.
-    Comptage par action, par table, et les 10 dernières actions.
+    Comptage par action, par table (lus dans audit_log_counters, maintenus
+    par trigger), et les 10 dernières actions.
     """
     try:
-        total = db.query(func.count(AuditLog.id)).scalar()
-        
-        # Comptage par action
-        action_counts = db.query(
-            AuditLog.action, func.count(AuditLog.id)
-        ).group_by(AuditLog.action).all()
-        actions = {action: count for action, count in action_counts}
-        
-        # Comptage par table
-        table_counts = db.query(
-            AuditLog.table_name, func.count(AuditLog.id)
-        ).group_by(AuditLog.table_name).all()
-        tables = {table: count for table, count in table_counts}
+        counters = db.query(AuditLogCounter).filter(AuditLogCounter.count > 0).all()
+        actions = {c.key: c.count for c in counters if c.dimension == "action"}
+        tables = {c.key: c.count for c in counters if c.dimension == "table"}
         
         # 10 dernières actions
         recent = db.query(AuditLog).options(
             joinedload(AuditLog.user)
-        ).order_by(desc(AuditLog.timestamp)).limit(10).all()
+        ).order_by(desc(AuditLog.timestamp), desc(AuditLog.id)).limit(10).all()
         
         return {
-            "total_logs": total or 0,
+            "total_logs": sum(actions.values()),
             "actions": actions,
             "tables": tables,
             "recent_activity": [_serialize_log_with_username(log) for log in recent]
@@ -183,6 +218,112 @@ def archive_audit_log(db: Session, id: int) -> Optional[ArchivedAuditLog]:
         db.rollback()  # Annule la transaction en cas d'erreur
         raise Exception(f"Erreur lors de l'archivage du log d'audit avec ID {id} : {str(e)}")
 
+def ensure_audit_log_partitions(db: Session, months_ahead: int = 3) -> List[str]:
+    """
+    Crée les partitions mensuelles manquantes de audit_logs, du mois courant
+    jusqu'à `months_ahead` mois plus tard.
+
+    Les lignes déjà tombées dans audit_logs_default pour un mois sont
+    déplacées dans la nouvelle partition (PostgreSQL refuse sinon la création).
+
+    Returns:
+        List[str]: noms des partitions créées
+    """
+    created = []
+    try:
+        month = datetime.now(timezone.utc).date().replace(day=1)
+        for _ in range(months_ahead + 1):
+            upper = _add_months(month, 1)
+            name = f"audit_logs_p{month:%Y%m}"
+            exists = db.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+            if not exists:
+                bounds = {"start": month, "end": upper}
+                moved = db.execute(text(
+                    "DELETE FROM audit_logs_default WHERE timestamp >= :start AND timestamp < :end "
+                    "RETURNING id, user_id, action, table_name, record_id, timestamp"
+                ), bounds).mappings().all()
+                db.execute(text(
+                    f'CREATE TABLE "{name}" PARTITION OF audit_logs '
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+                ))
+                if moved:
+                    db.execute(text(
+                        "INSERT INTO audit_logs (id, user_id, action, table_name, record_id, timestamp) "
+                        "VALUES (:id, :user_id, :action, :table_name, :record_id, :timestamp)"
+                    ), [dict(row) for row in moved])
+                db.commit()
+                created.append(name)
+            month = upper
+        return created
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise Exception(f"Erreur lors de la création des partitions d'audit : {str(e)}")
+
+
+def archive_audit_log_partitions(db: Session, before: datetime) -> dict:
+    """
+    Archive en bloc les partitions mensuelles entièrement antérieures à `before`.
+
+    Pour chaque partition : DETACH PARTITION, décrément des compteurs en une
+    requête groupée, copie INSERT ... SELECT vers archived_audit_logs puis
+    DROP de la partition détachée. Une transaction par partition.
+
+    Returns:
+        dict: {"archived_partitions": [...], "archived_rows": int}
+    """
+    archived_partitions = []
+    archived_rows = 0
+    try:
+        partitions = db.execute(text(
+            """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE p.relname = 'audit_logs'
+            ORDER BY c.relname
+            """
+        )).scalars().all()
+
+        cutoff = before.date() if isinstance(before, datetime) else before
+        for name in partitions:
+            match = _PARTITION_NAME_RE.match(name)
+            if not match:
+                continue
+            month = date(int(match.group(1)), int(match.group(2)), 1)
+            if _add_months(month, 1) > cutoff:
+                continue
+
+            db.execute(text(f'ALTER TABLE audit_logs DETACH PARTITION "{name}"'))
+            # Le DETACH ne déclenche pas le trigger DELETE : décrément en bloc
+            db.execute(text(
+                f"""
+                UPDATE audit_log_counters c SET count = c.count - s.n
+                FROM (
+                    SELECT 'action' AS dimension, action AS key, count(*) AS n FROM "{name}" GROUP BY action
+                    UNION ALL
+                    SELECT 'table', table_name, count(*) FROM "{name}" GROUP BY table_name
+                ) s
+                WHERE c.dimension = s.dimension AND c.key = s.key
+                """
+            ))
+            result = db.execute(text(
+                f"""
+                INSERT INTO archived_audit_logs (user_id, action, table_name, record_id, timestamp)
+                SELECT user_id, action, table_name, record_id, timestamp FROM "{name}"
+                """
+            ))
+            db.execute(text(f'DROP TABLE "{name}"'))
+            db.commit()
+
+            archived_partitions.append(name)
+            archived_rows += result.rowcount or 0
+
+        return {"archived_partitions": archived_partitions, "archived_rows": archived_rows}
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise Exception(f"Erreur lors de l'archivage des partitions d'audit : {str(e)}")
+
 # CRUD pour les logs d'audit archivés
 def get_all_archived_audit_logs(db: Session, skip: int = 0, limit: int = 50) -> Tuple[List[dict], int]:
     """Récupérer les logs d'audit archivés avec pagination"""
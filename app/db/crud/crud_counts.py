@@ -0,0 +1,33 @@
+"""
+Compteurs de participation calcules en SQL.
+
+Sous-requetes COUNT correlees a joindre aux requetes de liste : le compteur est
+calcule par la base (index sur la cle etrangere) pour les seules lignes de la
+page, sans charger les relations `guest.segments` / `presenter.shows`.
+"""
+
+from sqlalchemy import func, select
+
+from app.models import Guest, Presenter, SegmentGuest, ShowPresenter
+
+
+def guest_segment_count():
+    """Nombre de segments auxquels participe l'invite (equivalent de len(guest.segments))."""
+    return (
+        select(func.count(SegmentGuest.id))
+        .where(SegmentGuest.guest_id == Guest.id)
+        .correlate(Guest)
+        .scalar_subquery()
+        .label("segment_count")
+    )
+
+
+def presenter_show_count():
+    """Nombre d'emissions presentees (equivalent de len(presenter.shows))."""
+    return (
+        select(func.count(ShowPresenter.id))
+        .where(ShowPresenter.presenter_id == Presenter.id)
+        .correlate(Presenter)
+        .scalar_subquery()
+        .label("show_count")
+    )
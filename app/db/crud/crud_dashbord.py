@@ -6,6 +6,7 @@ from datetime import date, datetime
 from sqlalchemy.exc import SQLAlchemyError
 from typing import Dict, Any, List
 from app.models import Show, User,Segment
+from app.utils.time_window import day_window
 
 def get_dashboard(db: Session) -> Dict[str, Any]:
 
@@ -25,6 +26,8 @@ def get_dashboard(db: Session) -> Dict[str, Any]:
     try:
         today = date.today()
         current_time = datetime.now()
+        # Journee en intervalle sur broadcast_date (index), pas func.date(...)
+        today_range = day_window(today)
 #         # Vérification de la validité des dates
 
         if not today or not current_time:
@@ -37,7 +40,7 @@ def get_dashboard(db: Session) -> Dict[str, Any]:
             joinedload(Show.presenters),
             joinedload(Show.segments).joinedload(Segment.guests)
         ).filter(
-            func.date(Show.broadcast_date) == today
+            today_range.filter(Show.broadcast_date)
         ).order_by(Show.broadcast_date).all()
 
         # if not programme_du_jour and not db.query(Show).filter(func.date(Show.broadcast_date) == today).first():
@@ -106,7 +109,7 @@ def get_dashboard(db: Session) -> Dict[str, Any]:
         ).scalar() or 0 // 60
 
         response = {
-            "emissions_du_jour": db.query(Show).filter(func.date(Show.broadcast_date) == today).count(),
+            "emissions_du_jour": db.query(Show).filter(today_range.filter(Show.broadcast_date)).count(),
             "en_direct_et_a_venir": db.query(Show).filter(
                 Show.broadcast_date >= current_time,
                 Show.status.in_(['en-cours', 'attente-diffusion'])
@@ -0,0 +1,131 @@
+"""
+Recherche annuaire (invites, utilisateurs) pour l'editeur de conducteur.
+
+- Cle de recherche normalisee (minuscules, sans accents) sur nom / email / telephone,
+  indexee en PostgreSQL par un index GIN pg_trgm (migration 7c2f5a9e0d14)
+- Resultats classes : debut du nom, puis debut d'un mot du nom, puis le reste
+  (similarite trigramme en departage)
+- Limite stricte (MAX_LIMIT) avec pagination offset, et forme "typeahead" legere
+
+Sur un autre dialecte (SQLite des tests), la normalisation se limite a lower().
+"""
+
+import unicodedata
+from typing import Any, Dict, List
+
+from sqlalchemy import case, func, literal_column
+from sqlalchemy.orm import Session
+
+from app.models import Guest, User
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+TYPEAHEAD_LIMIT = 10
+
+
+def normalize_search_term(term: str) -> str:
+    """Minuscules, sans accents ni espaces superflus (meme normalisation que l'index)."""
+    decomposed = unicodedata.normalize("NFKD", term.strip().lower())
+    return " ".join("".join(c for c in decomposed if not unicodedata.combining(c)).split())
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _normalized(db: Session, *columns):
+    """
+    Expression SQL normalisee. En PostgreSQL, identique a l'expression indexee :
+    immutable_unaccent(lower(coalesce(c1, '') || ' ' || coalesce(c2, '') ...)).
+    """
+    # Litteraux inline (pas de parametres lies) pour que l'expression corresponde a l'index
+    expr = None
+    for column in columns:
+        part = func.coalesce(column, literal_column("''"))
+        expr = part if expr is None else expr.op("||")(literal_column("' '")).op("||")(part)
+    expr = func.lower(expr)
+    if db.get_bind().dialect.name == "postgresql":
+        return func.immutable_unaccent(expr)
+    return expr
+
+
+def clamp_limit(limit: int) -> int:
+    return max(1, min(limit or DEFAULT_LIMIT, MAX_LIMIT))
+
+
+def _ranked_search(db: Session, model, key_columns, name_columns, base_filters, term: str, limit: int, offset: int, columns=()):
+    """
+    Requete commune : filtre sur la cle indexee, tri prefixe d'abord, total et page.
+    `columns` : colonnes supplementaires selectionnees (les lignes sont alors des tuples).
+    """
+    normalized = normalize_search_term(term)
+    escaped = _escape_like(normalized)
+    search_key = _normalized(db, *key_columns)
+    name_key = _normalized(db, *name_columns)
+
+    query = db.query(model, *columns).filter(*base_filters, search_key.like(f"%{escaped}%", escape="\\"))
+    total = query.count()
+
+    rank = case(
+        (name_key.like(f"{escaped}%", escape="\\"), 0),
+        (name_key.like(f"% {escaped}%", escape="\\"), 1),
+        else_=2,
+    )
+    order_by = [rank]
+    if db.get_bind().dialect.name == "postgresql":
+        order_by.append(func.similarity(name_key, normalized).desc())
+    order_by += [name_key, model.id]
+
+    items = query.order_by(*order_by).offset(max(offset, 0)).limit(clamp_limit(limit)).all()
+    return items, total
+
+
+def search_guests_directory(db: Session, term: str, limit: int = DEFAULT_LIMIT, offset: int = 0, columns=()):
+    """Invites non supprimes correspondant au terme (nom, email, telephone). Retourne (invites, total)."""
+    return _ranked_search(
+        db,
+        Guest,
+        key_columns=(Guest.name, Guest.email, Guest.phone),
+        name_columns=(Guest.name,),
+        base_filters=(Guest.is_deleted == False,),
+        term=term,
+        limit=limit,
+        offset=offset,
+        columns=columns,
+    )
+
+
+def search_users_directory(db: Session, term: str, limit: int = DEFAULT_LIMIT, offset: int = 0, columns=()):
+    """Utilisateurs non supprimes (username, prenom, nom, email, telephone). Retourne (utilisateurs, total)."""
+    return _ranked_search(
+        db,
+        User,
+        key_columns=(User.username, User.name, User.family_name, User.email, User.phone_number),
+        name_columns=(User.name, User.family_name),
+        base_filters=(User.is_deleted == False,),
+        term=term,
+        limit=limit,
+        offset=offset,
+        columns=columns,
+    )
+
+
+def guest_typeahead(db: Session, term: str, limit: int = TYPEAHEAD_LIMIT) -> List[Dict[str, Any]]:
+    """Suggestions legeres pour l'autocompletion des invites."""
+    guests, _ = search_guests_directory(db, term, limit=min(limit, MAX_LIMIT))
+    return [{"id": g.id, "name": g.name, "email": g.email, "avatar": g.avatar} for g in guests]
+
+
+def user_typeahead(db: Session, term: str, limit: int = TYPEAHEAD_LIMIT) -> List[Dict[str, Any]]:
+    """Suggestions legeres pour l'autocompletion des utilisateurs."""
+    users, _ = search_users_directory(db, term, limit=min(limit, MAX_LIMIT))
+    return [
+        {
+            "id": u.id,
+            "username": u.username,
+            "name": " ".join(p for p in (u.name, u.family_name) if p) or u.username,
+            "email": u.email,
+            "profilePicture": u.profilePicture,
+        }
+        for u in users
+    ]
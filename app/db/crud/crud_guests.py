@@ -5,12 +5,14 @@ from sqlalchemy.exc import SQLAlchemyError
 from app.models.model_guest import Guest
 from app.schemas import GuestCreate, GuestUpdate,GuestResponse
 from typing import List, Optional
-from sqlalchemy import or_
 from typing import Dict, Any
 from app.models.model_guest import Guest  # Modèle SQLAlchemy pour la table guests
 from app.models.model_segment import Segment  # Modèle SQLAlchemy pour la table segments
 from app.models.model_show import Show  # Modèle SQLAlchemy pour la table shows
 from app.schemas.schema_guests import GuestResponseWithAppearances
+from app.models.model_segment_guests import SegmentGuest
+from app.db.crud.crud_counts import guest_segment_count
+from app.db.crud.crud_directory_search import DEFAULT_LIMIT, search_guests_directory
 from app.exceptions.guest_exceptions import GuestNotFoundException, DatabaseQueryException
 
 
@@ -58,9 +60,16 @@ def get_guests(db: Session, skip: int = 0, limit: int = 10):
     """Récupérer tous les invités avec pagination."""
     try:
         # Ordonner par ID décroissant pour mettre les plus récents en tête
-        gest_result = db.query(Guest).order_by(Guest.id.desc()).offset(skip).limit(limit).all()
+        # Compteur de participations calculé en SQL (pas de chargement de guest.segments)
+        gest_result = (
+            db.query(Guest, guest_segment_count())
+            .order_by(Guest.id.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
         serialized_guests = []
-        for guest in gest_result:
+        for guest, segment_count in gest_result:
             guests = {
                     "email": guest.email,
                     "id": guest.id,
@@ -74,7 +83,7 @@ def get_guests(db: Session, skip: int = 0, limit: int = 10):
                     "contact_info": guest.contact_info,
                     # "created_at": "2024-12-19T17:29:22.037544",
                     # "is_deleted": false   
-                    "showSegment_participation": len(guest.segments)
+                    "showSegment_participation": segment_count
         }
             serialized_guests.append(guests)
         return serialized_guests
@@ -118,13 +127,15 @@ def delete_guest(db: Session, guest_id: int) -> bool:
 
 #///////////////////// pour la recherche //////////////////////////
 
-def search_guest(session: Session, query: str) -> Dict[str, Any]:
+def search_guest(session: Session, query: str, skip: int = 0, limit: int = DEFAULT_LIMIT) -> Dict[str, Any]:
     """
     Recherche d'un invité dans la base de données en fonction d'un mot-clé,
     avec gestion des exceptions et codes de réponse.
 
     :param session: Session SQLAlchemy active.
-    :param query: Chaîne de recherche (nom, email, téléphone ou autre).
+    :param query: Chaîne de recherche (nom, email ou téléphone, sans tenir compte des accents).
+    :param skip: Décalage de pagination.
+    :param limit: Nombre maximum de résultats (borné à MAX_LIMIT).
     :return: Dictionnaire contenant les résultats ou un message d'erreur.
     """
     try:
@@ -135,18 +146,10 @@ def search_guest(session: Session, query: str) -> Dict[str, Any]:
                 "message": "Le mot-clé de recherche ne peut pas être vide."
             }
         
-        # Recherche dans la base de données
-        results = session.query(Guest).filter(
-            Guest.is_deleted == False,  # Exclure les invités supprimés
-            or_(
-                Guest.name.ilike(f"%{query}%"),       # Recherche par nom
-                Guest.email.ilike(f"%{query}%"),      # Recherche par email
-                Guest.phone.ilike(f"%{query}%"),      # Recherche par numéro de téléphone
-                Guest.role.ilike(f"%{query}%"),       # Recherche par rôle
-                Guest.contact_info.ilike(f"%{query}%"),  # Recherche par infos de contact
-                Guest.biography.ilike(f"%{query}%")   # Recherche par biographie
-            )
-        ).all()
+        # Recherche classée (index trigramme), compteur de participations dans la même requête
+        results, total = search_guests_directory(
+            session, query, limit=limit, offset=skip, columns=(guest_segment_count(),)
+        )
         
         # Vérifier si des résultats ont été trouvés
         if not results:
@@ -170,15 +173,16 @@ def search_guest(session: Session, query: str) -> Dict[str, Any]:
                 # "created_at": guest.created_at,
                 # "updated_at": guest.updated_at,
                 # "is_deleted": guest.is_deleted,
-                "showSegment_participation": len(guest.segments)
+                "showSegment_participation": segment_count
 
             }
-            for guest in results
+            for guest, segment_count in results
         ]
 
         return {
             "status_code": 200,
             "message": "Recherche effectuée avec succès.",
+            "total": total,
             "data": guests_data
         }
 
@@ -270,6 +274,33 @@ class GuestService:
         except SQLAlchemyError as e:
             raise DatabaseQueryException(f"Erreur lors de la récupération des participations: {str(e)}")
 
+    @staticmethod
+    def get_guests_appearances(db: Session, guest_ids: List[int]) -> Dict[int, List[Show]]:
+        """
+        Récupère en une requête les émissions de plusieurs invités.
+
+        Returns:
+            Dict[int, List[Show]]: émissions (sans doublon) par ID d'invité.
+        """
+        try:
+            appearances: Dict[int, List[Show]] = {guest_id: [] for guest_id in guest_ids}
+            if not guest_ids:
+                return appearances
+            rows = (
+                db.query(SegmentGuest.guest_id, Show)
+                .join(Segment, Segment.id == SegmentGuest.segment_id)
+                .join(Show, Show.id == Segment.show_id)
+                .filter(SegmentGuest.guest_id.in_(guest_ids))
+                .distinct()
+                .order_by(SegmentGuest.guest_id, Show.id)
+                .all()
+            )
+            for guest_id, show in rows:
+                appearances[guest_id].append(show)
+            return appearances
+        except SQLAlchemyError as e:
+            raise DatabaseQueryException(f"Erreur lors de la récupération des participations: {str(e)}")
+
     @staticmethod
     def build_guest_response(guest: Guest, appearances: List[Show]) -> GuestResponseWithAppearances:
         """
@@ -303,13 +334,15 @@ class GuestService:
         )
     
     @staticmethod
-    def search_guest_detailed(db: Session, query: str) -> Dict[str, Any]:
+    def search_guest_detailed(db: Session, query: str, skip: int = 0, limit: int = DEFAULT_LIMIT) -> Dict[str, Any]:
         """
         Recherche des invités dans la base de données en fonction d'un mot-clé.
         
         Args:
             db (Session): Session SQLAlchemy pour interagir avec la DB.
-            query (str): Chaîne de recherche (nom, email, téléphone, rôle, etc.).
+            query (str): Chaîne de recherche (nom, email ou téléphone, sans tenir compte des accents).
+            skip (int): Décalage de pagination.
+            limit (int): Nombre maximum de résultats (borné à MAX_LIMIT).
         
         Returns:
             Dict[str, Any]: Dictionnaire contenant le statut, un message et les résultats formatés.
@@ -326,18 +359,8 @@ class GuestService:
                     "data": []
                 }
 
-            # Recherche dans la base de données avec filtrage insensible à la casse
-            results = db.query(Guest).filter(
-                Guest.is_deleted.is_(False),
-                or_(
-                    Guest.name.ilike(f"%{query}%"),
-                    Guest.email.ilike(f"%{query}%"),
-                    Guest.phone.ilike(f"%{query}%"),
-                    Guest.role.ilike(f"%{query}%"),
-                    Guest.contact_info.ilike(f"%{query}%"),
-                    Guest.biography.ilike(f"%{query}%")
-                )
-            ).all()
+            # Recherche classée et paginée (index trigramme)
+            results, total = search_guests_directory(db, query, limit=limit, offset=skip)
 
             # Vérifier si des résultats ont été trouvés
             if not results:
@@ -347,16 +370,17 @@ class GuestService:
                     "data": []
                 }
 
-            # Structurer les résultats avec les participations
-            guests_data = []
-            for guest in results:
-                appearances = GuestService.get_guest_appearances(db, guest.id)
-                guest_response = GuestService.build_guest_response(guest, appearances)
-                guests_data.append(guest_response)
+            # Structurer les résultats avec les participations (une requête pour tous les invités)
+            appearances = GuestService.get_guests_appearances(db, [guest.id for guest in results])
+            guests_data = [
+                GuestService.build_guest_response(guest, appearances[guest.id])
+                for guest in results
+            ]
 
             return {
                 "status_code": 200,
                 "message": "Recherche effectuée avec succès.",
+                "total": total,
                 "data": guests_data
             }
 
@@ -0,0 +1,91 @@
+"""
+CRUD de l'historique du planificateur de taches (table job_runs).
+
+Utilise par app/services/job_runner.py et la route d'administration /admin/jobs.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, func
+from sqlalchemy.orm import Session
+
+from app.models.model_job_run import JobRun
+
+logger = logging.getLogger("hapson-api")
+
+
+def start_job_run(db: Session, job_name: str, worker: str) -> JobRun:
+    """Cree l'entree d'une execution qui demarre (statut running)."""
+    run = JobRun(job_name=job_name, status="running", started_at=datetime.now(timezone.utc), worker=worker)
+    db.add(run)
+    db.commit()
+    db.refresh(run)
+    return run
+
+
+def finish_job_run(
+    db: Session,
+    run_id: int,
+    status: str,
+    result: Optional[dict] = None,
+    error_message: Optional[str] = None,
+) -> Optional[JobRun]:
+    """Cloture une execution : statut final, duree, resultat ou erreur."""
+    run = db.query(JobRun).filter(JobRun.id == run_id).first()
+    if not run:
+        return None
+    now = datetime.now(timezone.utc)
+    started = run.started_at if run.started_at.tzinfo else run.started_at.replace(tzinfo=timezone.utc)
+    run.status = status
+    run.finished_at = now
+    run.duration_ms = int((now - started).total_seconds() * 1000)
+    run.result = result
+    run.error_message = error_message[:2000] if error_message else None
+    db.commit()
+    return run
+
+
+def get_last_runs(db: Session) -> Dict[str, JobRun]:
+    """Derniere execution de chaque tache (une requete)."""
+    latest = (
+        db.query(func.max(JobRun.id).label("id"))
+        .group_by(JobRun.job_name)
+        .subquery()
+    )
+    runs = db.query(JobRun).join(latest, JobRun.id == latest.c.id).all()
+    return {run.job_name: run for run in runs}
+
+
+def get_job_runs(db: Session, job_name: Optional[str] = None, limit: int = 50) -> List[JobRun]:
+    """Historique des executions, de la plus recente a la plus ancienne."""
+    query = db.query(JobRun)
+    if job_name:
+        query = query.filter(JobRun.job_name == job_name)
+    return query.order_by(JobRun.id.desc()).limit(limit).all()
+
+
+def mark_interrupted_runs(db: Session, job_names: List[str]) -> int:
+    """
+    Passe en erreur les executions restees "running" (leader precedent arrete
+    ou perdu en cours d'execution). Appele a la prise du leadership.
+    """
+    count = (
+        db.query(JobRun)
+        .filter(JobRun.status == "running", JobRun.job_name.in_(job_names))
+        .update(
+            {JobRun.status: "error", JobRun.error_message: "Execution interrompue (changement de leader)"},
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return count
+
+
+def purge_job_runs(db: Session, retention_days: int) -> int:
+    """Supprime l'historique plus ancien que retention_days."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    result = db.execute(delete(JobRun).where(JobRun.started_at < cutoff))
+    db.commit()
+    return result.rowcount or 0
@@ -0,0 +1,145 @@
+"""
+Operations de maintenance par lots (suppression / mise a jour en masse).
+
+Les grosses suppressions sont decoupees en plages de cle primaire :
+- chaque lot (MAINTENANCE_BATCH_SIZE lignes au plus) est une transaction courte,
+  les verrous et le volume WAL restent bornes
+- une pause (MAINTENANCE_PAUSE_MS) entre deux lots laisse passer le trafic normal
+- la progression est remontee via un callback (message, nombre de lignes traitees)
+
+VACUUM (ANALYZE) cible uniquement les tables ou beaucoup de lignes ont ete
+supprimees, et met a jour les estimations (pg_class.reltuples, pg_stats)
+utilisees par estimate_row_counts().
+
+Sur un autre dialecte (SQLite des tests), VACUUM et les estimations sont ignores.
+"""
+
+import logging
+import time
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config.config import settings
+
+logger = logging.getLogger("hapson-api")
+
+# Callback de progression : (table, lignes traitees jusqu'ici)
+BatchProgress = Callable[[str, int], None]
+
+
+def _next_upper_bound(db: Session, model, filters, last_id: int, batch_size: int) -> Optional[int]:
+    """Id de la derniere ligne du prochain lot (plage (last_id, upper]) ; None si moins d'un lot restant."""
+    return (
+        db.query(model.id)
+        .filter(*filters, model.id > last_id)
+        .order_by(model.id)
+        .offset(batch_size - 1)
+        .limit(1)
+        .scalar()
+    )
+
+
+def _run_in_batches(db: Session, model, filters, apply, progress: Optional[BatchProgress] = None) -> int:
+    batch_size = max(1, settings.MAINTENANCE_BATCH_SIZE)
+    pause = max(0, settings.MAINTENANCE_PAUSE_MS) / 1000
+    table = model.__tablename__
+    total = 0
+    last_id = 0
+    while True:
+        upper = _next_upper_bound(db, model, filters, last_id, batch_size)
+        batch_filters = [*filters, model.id > last_id]
+        if upper is not None:
+            batch_filters.append(model.id <= upper)
+        count = apply(db.query(model).filter(*batch_filters))
+        db.commit()
+        total += count
+        if progress and count:
+            progress(table, total)
+        if upper is None:
+            break
+        last_id = upper
+        if pause:
+            time.sleep(pause)
+    return total
+
+
+def delete_in_batches(db: Session, model, filters: Iterable, progress: Optional[BatchProgress] = None) -> int:
+    """Supprime (hard-delete) les lignes filtrees, lot par lot. Retourne le nombre supprime."""
+    return _run_in_batches(
+        db, model, list(filters),
+        lambda query: query.delete(synchronize_session=False),
+        progress,
+    )
+
+
+def update_in_batches(db: Session, model, filters: Iterable, values: dict, progress: Optional[BatchProgress] = None) -> int:
+    """Met a jour les lignes filtrees, lot par lot. Retourne le nombre modifie."""
+    return _run_in_batches(
+        db, model, list(filters),
+        lambda query: query.update(values, synchronize_session=False),
+        progress,
+    )
+
+
+def vacuum_analyze(db: Session, tables: Iterable[str]) -> list[str]:
+    """VACUUM (ANALYZE) des tables donnees (hors transaction). Retourne les tables traitees."""
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return []
+    done = []
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in tables:
+            try:
+                conn.execute(text(f'VACUUM (ANALYZE) "{table}"'))
+                done.append(table)
+            except Exception as e:
+                logger.warning(f"VACUUM (ANALYZE) {table} impossible: {e}")
+    return done
+
+
+def tables_to_vacuum(affected: dict[str, int]) -> list[str]:
+    """Tables dont le nombre de lignes supprimees/modifiees justifie un VACUUM (ANALYZE)."""
+    return [table for table, count in affected.items() if count >= settings.MAINTENANCE_VACUUM_MIN_ROWS]
+
+
+def estimate_row_counts(db: Session, tables: Iterable[str]) -> dict[str, dict]:
+    """
+    Estimations PostgreSQL sans parcours des tables :
+    total = pg_class.reltuples, part des lignes is_deleted = true d'apres pg_stats.
+
+    Retourne {table: {"total": n, "deleted": n}} ; une table jamais analysee
+    (reltuples < 0 ou sans statistiques is_deleted) est absente du resultat.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return {}
+    rows = db.execute(
+        text(
+            """
+            SELECT c.relname, c.reltuples,
+                   s.most_common_vals::text::text[] AS vals, s.most_common_freqs AS freqs,
+                   s.null_frac
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN pg_stats s
+              ON s.schemaname = n.nspname AND s.tablename = c.relname AND s.attname = 'is_deleted'
+            WHERE c.relkind = 'r' AND n.nspname = current_schema() AND c.relname = ANY(:tables)
+            """
+        ),
+        {"tables": list(tables)},
+    ).all()
+
+    estimates = {}
+    for relname, reltuples, vals, freqs, null_frac in rows:
+        if reltuples is None or reltuples < 0 or vals is None:
+            continue
+        frequencies = dict(zip(vals, freqs or []))
+        if "t" in frequencies:
+            deleted_fraction = frequencies["t"]
+        else:
+            # Colonne booleenne : ce qui n'est ni false ni NULL est true
+            deleted_fraction = max(0.0, 1.0 - frequencies.get("f", 0.0) - (null_frac or 0.0))
+        total = int(reltuples)
+        estimates[relname] = {"total": total, "deleted": int(round(total * deleted_fraction))}
+    return estimates
@@ -8,7 +8,7 @@ Opérations :
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func, text, or_
+from sqlalchemy import func, text, or_, tuple_
 from typing import Optional, List
 from datetime import date
 
@@ -195,32 +195,47 @@ def get_fiches_pannes(
     date_fin: Optional[date] = None,
     category_id: Optional[int] = None,
 ) -> dict:
-    from sqlalchemy.orm import joinedload
-
-    query = db.query(FichePanne).options(
-        joinedload(FichePanne.acteurs).joinedload(FicheActeur.acteur),
-        joinedload(FichePanne.category),
-        joinedload(FichePanne.vehicle).joinedload(LogisticsVehicle.company),
-    )
+    from sqlalchemy.orm import joinedload, load_only, selectinload
 
+    conditions = []
     if statut:
-        query = query.filter(FichePanne.statut == statut)
+        conditions.append(FichePanne.statut == statut)
     if societe:
-        query = query.filter(FichePanne.societe == societe)
+        conditions.append(FichePanne.societe == societe)
     if immatriculation:
-        query = query.filter(
-            FichePanne.immatriculation.ilike(f"%{immatriculation}%")
-        )
+        conditions.append(FichePanne.immatriculation.ilike(f"%{immatriculation}%"))
     if date_debut:
-        query = query.filter(FichePanne.date_panne >= date_debut)
+        conditions.append(FichePanne.date_panne >= date_debut)
     if date_fin:
-        query = query.filter(FichePanne.date_panne <= date_fin)
+        conditions.append(FichePanne.date_panne <= date_fin)
     if category_id is not None:
-        query = query.filter(FichePanne.category_id == category_id)
+        conditions.append(FichePanne.category_id == category_id)
 
-    query = query.order_by(FichePanne.date_panne.desc(), FichePanne.numero_fiche.desc())
-    total = query.count()
-    fiches = query.offset((page - 1) * page_size).limit(page_size).all()
+    # Comptage sur la seule table fiches_pannes (sans les jointures de chargement)
+    total = db.query(func.count(FichePanne.id)).filter(*conditions).scalar() or 0
+
+    # Projection allégée : colonnes de FichePanneListItem uniquement ; les acteurs
+    # sont chargés par une requête IN sur les fiches de la page (pas de produit cartésien)
+    fiches = (
+        db.query(FichePanne)
+        .options(
+            load_only(
+                FichePanne.id, FichePanne.numero_fiche, FichePanne.date_panne,
+                FichePanne.immatriculation, FichePanne.societe, FichePanne.statut,
+                FichePanne.category_id, FichePanne.vehicle_id, FichePanne.breakdown_types_json,
+                FichePanne.created_at, FichePanne.updated_at,
+            ),
+            joinedload(FichePanne.category).load_only(LogisticsConfigOption.name, LogisticsConfigOption.color),
+            selectinload(FichePanne.acteurs)
+            .selectinload(FicheActeur.acteur)
+            .load_only(Acteur.nom, Acteur.prenom),
+        )
+        .filter(*conditions)
+        .order_by(FichePanne.date_panne.desc(), FichePanne.numero_fiche.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+        .all()
+    )
 
     items = [_build_fiche_list_item(f) for f in fiches]
     return {"items": items, "total": total, "page": page, "page_size": page_size}
@@ -363,54 +378,68 @@ def delete_fiche_panne(db: Session, fiche_id: int) -> bool:
 # Dashboard
 # ---------------------------------------------------------------------------
 
+# Masques grouping(statut, societe, category_id, immatriculation) : un bit a 1
+# par colonne absente de l'ensemble de regroupement de la ligne
+_GROUPING_TOTAL = 0b1111
+_GROUPING_STATUT = 0b0111
+_GROUPING_SOCIETE = 0b1011
+_GROUPING_MOTIF = 0b1101
+_GROUPING_IMMATRICULATION = 0b1110
+
+
+def _pannes_breakdown_query(db: Session):
+    """
+    Total, répartitions par statut / société / motif et immatriculations
+    récurrentes en un seul parcours de fiches_pannes (GROUPING SETS).
+    Les immatriculations à une seule fiche sont écartées par le HAVING.
+    """
+    keys = (FichePanne.statut, FichePanne.societe, FichePanne.category_id, FichePanne.immatriculation)
+    return (
+        db.query(
+            func.grouping(*keys).label('ensemble'),
+            *keys,
+            LogisticsConfigOption.name.label('motif_name'),
+            LogisticsConfigOption.color.label('motif_color'),
+            func.count(FichePanne.id).label('nb'),
+        )
+        .outerjoin(LogisticsConfigOption, FichePanne.category_id == LogisticsConfigOption.id)
+        .group_by(func.grouping_sets(
+            tuple_(),
+            tuple_(FichePanne.statut),
+            tuple_(FichePanne.societe),
+            tuple_(FichePanne.category_id, LogisticsConfigOption.name, LogisticsConfigOption.color),
+            tuple_(FichePanne.immatriculation),
+        ))
+        .having(or_(
+            func.grouping(FichePanne.immatriculation) == 1,
+            func.count(FichePanne.id) > 1,
+        ))
+    )
+
+
 def get_pannes_dashboard(db: Session) -> PannesDashboardResponse:
+    rows_by_set: dict[int, list] = {}
+    for row in _pannes_breakdown_query(db).all():
+        rows_by_set.setdefault(row.ensemble, []).append(row)
+
+    def _rows(ensemble: int) -> list:
+        return sorted(rows_by_set.get(ensemble, []), key=lambda row: row.nb, reverse=True)
+
     # Totaux par statut
-    total_fiches = db.query(func.count(FichePanne.id)).scalar() or 0
-    fiches_en_attente = (
-        db.query(func.count(FichePanne.id))
-        .filter(FichePanne.statut == 'en_attente')
-        .scalar() or 0
-    )
-    fiches_en_cours = (
-        db.query(func.count(FichePanne.id))
-        .filter(FichePanne.statut == 'en_cours')
-        .scalar() or 0
-    )
-    fiches_cloturees = (
-        db.query(func.count(FichePanne.id))
-        .filter(FichePanne.statut == 'cloture')
-        .scalar() or 0
-    )
+    total_fiches = sum(row.nb for row in rows_by_set.get(_GROUPING_TOTAL, []))
+    par_statut = {row.statut: row.nb for row in rows_by_set.get(_GROUPING_STATUT, [])}
 
     # Répartition par société
-    societe_rows = (
-        db.query(FichePanne.societe, func.count(FichePanne.id).label('nb'))
-        .group_by(FichePanne.societe)
-        .order_by(func.count(FichePanne.id).desc())
-        .all()
-    )
     repartition_societe = [
         RepartitionSociete(
             societe=row.societe,
             nombre_fiches=row.nb,
             pourcentage=round((row.nb / total_fiches * 100), 1) if total_fiches > 0 else 0.0,
         )
-        for row in societe_rows
+        for row in _rows(_GROUPING_SOCIETE)
     ]
 
     # Répartition par motif d'intervention
-    motif_rows = (
-        db.query(
-            FichePanne.category_id,
-            LogisticsConfigOption.name.label('motif_name'),
-            LogisticsConfigOption.color.label('motif_color'),
-            func.count(FichePanne.id).label('nb'),
-        )
-        .outerjoin(LogisticsConfigOption, FichePanne.category_id == LogisticsConfigOption.id)
-        .group_by(FichePanne.category_id, LogisticsConfigOption.name, LogisticsConfigOption.color)
-        .order_by(func.count(FichePanne.id).desc())
-        .all()
-    )
     repartition_motif = [
         RepartitionMotif(
             motif_id=row.category_id,
@@ -419,21 +448,13 @@ def get_pannes_dashboard(db: Session) -> PannesDashboardResponse:
             nombre_fiches=row.nb,
             pourcentage=round((row.nb / total_fiches * 100), 1) if total_fiches > 0 else 0.0,
         )
-        for row in motif_rows
+        for row in _rows(_GROUPING_MOTIF)
     ]
 
     # Véhicules récurrents (immatriculation avec > 1 fiche)
-    vehicule_rows = (
-        db.query(FichePanne.immatriculation, func.count(FichePanne.id).label('nb'))
-        .group_by(FichePanne.immatriculation)
-        .having(func.count(FichePanne.id) > 1)
-        .order_by(func.count(FichePanne.id).desc())
-        .limit(10)
-        .all()
-    )
     vehicules_recurrents = [
         VehiculeRecurrent(immatriculation=row.immatriculation, nombre_fiches=row.nb)
-        for row in vehicule_rows
+        for row in _rows(_GROUPING_IMMATRICULATION)[:10]
     ]
 
     # Mécaniciens les plus actifs (top 10)
@@ -462,9 +483,9 @@ def get_pannes_dashboard(db: Session) -> PannesDashboardResponse:
 
     return PannesDashboardResponse(
         total_fiches=total_fiches,
-        fiches_en_attente=fiches_en_attente,
-        fiches_en_cours=fiches_en_cours,
-        fiches_cloturees=fiches_cloturees,
+        fiches_en_attente=par_statut.get('en_attente', 0),
+        fiches_en_cours=par_statut.get('en_cours', 0),
+        fiches_cloturees=par_statut.get('cloture', 0),
         repartition_societe=repartition_societe,
         repartition_motif=repartition_motif,
         vehicules_recurrents=vehicules_recurrents,
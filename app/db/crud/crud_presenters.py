@@ -11,6 +11,7 @@ from app.db.crud.crud_check_permission import check_permission
 from sqlalchemy.orm import joinedload
 from sqlalchemy import select
 from sqlalchemy.orm import aliased
+from app.db.crud.crud_counts import presenter_show_count
 
 # Configuration du logger
 logger = logging.getLogger(__name__)
@@ -109,12 +110,13 @@ def get_presenter(db: Session, presenter_id: int):
     """
     try:
         # Récupérer le présentateur avec la relation "user" chargée
-        presenter = (
-            db.query(Presenter)
+        row = (
+            db.query(Presenter, presenter_show_count())
             .options(joinedload(Presenter.user))
             .filter(Presenter.id == presenter_id)
             .first()
         )
+        presenter, show_count = row if row else (None, 0)
 
         if not presenter:
             # raise PresenterNotFoundError()
@@ -138,7 +140,7 @@ def get_presenter(db: Session, presenter_id: int):
             "users_id": presenter.users_id,
             "contact_info": presenter.contact_info,
             "profilePicture": presenter.profilePicture,
-            "shows_presented": len(presenter.shows),
+            "shows_presented": show_count,
             "username": user.username if user else None,
             "user_name": user.name if user else None,
             "family_name": user.family_name if user else None,
@@ -170,12 +172,13 @@ def get_presenter_by_user(db: Session, users_id: int):
     """
     try:
         # Récupérer le présentateur avec la relation "user" chargée, filtré par users_id
-        presenter = (
-            db.query(Presenter)
+        row = (
+            db.query(Presenter, presenter_show_count())
             .options(joinedload(Presenter.user))
             .filter(Presenter.users_id == users_id)
             .first()
         )
+        presenter, show_count = row if row else (None, 0)
 
         if not presenter:
             raise HTTPException(status_code=404, detail="Presenter not found for this user")
@@ -194,7 +197,7 @@ def get_presenter_by_user(db: Session, users_id: int):
             "users_id": presenter.users_id,
             "contact_info": presenter.contact_info,
             "profilePicture": presenter.profilePicture,
-            "shows_presented": len(presenter.shows) if presenter.shows else 0,
+            "shows_presented": show_count,
             "username": user.username if user else None,
             "user_name": user.name if user else None,
             "family_name": user.family_name if user else None,
@@ -232,7 +235,7 @@ def get_all_presenters(db: Session, skip: int = 0, limit: int = 10):
 # Alias pour éviter les conflits
         UserAlias = aliased(User, name="user_alias")
         stmt = (
-            select(Presenter, UserAlias)
+            select(Presenter, UserAlias, presenter_show_count())
             .join(UserAlias, Presenter.users_id == UserAlias.id)
             .filter(Presenter.is_deleted == False)
             .offset(skip)
@@ -242,7 +245,7 @@ def get_all_presenters(db: Session, skip: int = 0, limit: int = 10):
 
         # Sérialiser chaque résultat
         serialized_results = []
-        for presenter , user in results:
+        for presenter, user, show_count in results:
             # user = presenter.user
             # presenter = presenter_and_count
 
@@ -256,7 +259,7 @@ def get_all_presenters(db: Session, skip: int = 0, limit: int = 10):
                 "users_id": presenter.users_id,
                 "contact_info": presenter.contact_info,
                 "profilePicture": presenter.profilePicture,
-                "shows_presented": len(presenter.shows),
+                "shows_presented": show_count,
                 "username": user.username if user else None,
                 "presenter_name": presenter.name,
                 "user_name": user.name if user else None,
@@ -10,6 +10,7 @@ from app.models.model_presenter import Presenter
 from app.models.model_public_alert import PublicAlert
 from app.models.model_listen_event import ListenEvent
 from app.models.model_now_playing_track import NowPlayingTrack
+from app.utils.time_window import day_window, last_days_window, week_window
 
 
 # =============================================
@@ -124,17 +125,16 @@ def get_weekly_schedule(db: Session, week_offset: int = 0) -> Dict[str, Any]:
     Recupere la grille des programmes pour une semaine donnee.
     week_offset: 0 = semaine courante, 1 = semaine prochaine, etc.
     """
-    today = date.today()
-    # Calcul du lundi de la semaine demandee
-    monday = today - timedelta(days=today.weekday()) + timedelta(weeks=week_offset)
+    # Semaine du lundi au dimanche, en intervalle [lundi 00:00, lundi suivant 00:00)
+    week = week_window(week_offset=week_offset)
+    monday = week.start.date()
     sunday = monday + timedelta(days=6)
 
     shows = db.query(Show).options(
         joinedload(Show.emission),
         joinedload(Show.presenters)
     ).filter(
-        func.date(Show.broadcast_date) >= monday,
-        func.date(Show.broadcast_date) <= sunday
+        week.filter(Show.broadcast_date)
     ).order_by(Show.broadcast_date.asc()).all()
 
     # Grouper par jour
@@ -331,30 +331,32 @@ def create_listen_event(
 def get_listen_stats(db: Session) -> Dict[str, Any]:
     """Calcule les statistiques d'ecoute pour le dashboard SaaS."""
     today = date.today()
-    week_ago = today - timedelta(days=7)
+    # Intervalles sur created_at (index) plutot que func.date(created_at)
+    today_range = day_window(today)
+    week_range = last_days_window(7, today)
 
     # Stats aujourd'hui (seuls les play comptent)
     today_plays = db.query(ListenEvent).filter(
-        func.date(ListenEvent.created_at) == today,
+        today_range.filter(ListenEvent.created_at),
         ListenEvent.event_type == 'play'
     )
     total_listens_today = today_plays.count()
     unique_sessions_today = db.query(
         func.count(func.distinct(ListenEvent.session_id))
     ).filter(
-        func.date(ListenEvent.created_at) == today,
+        today_range.filter(ListenEvent.created_at),
         ListenEvent.event_type == 'play'
     ).scalar() or 0
 
     # Duree moyenne (heartbeats de la semaine * 30s)
     heartbeats_week = db.query(ListenEvent).filter(
-        func.date(ListenEvent.created_at) >= week_ago,
+        week_range.filter(ListenEvent.created_at),
         ListenEvent.event_type == 'heartbeat'
     ).count()
     sessions_week = db.query(
         func.count(func.distinct(ListenEvent.session_id))
     ).filter(
-        func.date(ListenEvent.created_at) >= week_ago,
+        week_range.filter(ListenEvent.created_at),
         ListenEvent.event_type == 'play'
     ).scalar() or 0
     avg_duration = (heartbeats_week * 30.0 / sessions_week) if sessions_week > 0 else 0.0
@@ -364,14 +366,14 @@ def get_listen_stats(db: Session) -> Dict[str, Any]:
         extract('hour', ListenEvent.created_at).label('hour'),
         func.count(ListenEvent.id).label('cnt')
     ).filter(
-        func.date(ListenEvent.created_at) == today,
+        today_range.filter(ListenEvent.created_at),
         ListenEvent.event_type == 'play'
     ).group_by('hour').order_by(func.count(ListenEvent.id).desc()).first()
     peak_hour = int(peak_hour_query.hour) if peak_hour_query else None
 
     # Total semaine
     total_listens_week = db.query(ListenEvent).filter(
-        func.date(ListenEvent.created_at) >= week_ago,
+        week_range.filter(ListenEvent.created_at),
         ListenEvent.event_type == 'play'
     ).count()
 
@@ -381,7 +383,7 @@ def get_listen_stats(db: Session) -> Dict[str, Any]:
         func.count(ListenEvent.id).label('count'),
         func.count(func.distinct(ListenEvent.session_id)).label('unique_sessions')
     ).filter(
-        func.date(ListenEvent.created_at) >= week_ago,
+        week_range.filter(ListenEvent.created_at),
         ListenEvent.event_type == 'play'
     ).group_by(cast(ListenEvent.created_at, Date)).all()
 
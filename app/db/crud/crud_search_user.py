@@ -3,34 +3,19 @@ from typing import List, Optional
 from app.models import User
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import create_engine, exc, or_
+from sqlalchemy import create_engine, exc
 from sqlalchemy.ext.declarative import declarative_base
-from app.models import Role
+from app.db.crud.crud_directory_search import DEFAULT_LIMIT, search_users_directory
 
-def search_users_by_keyword_db(db: Session, keyword: str) -> List[User]:
+def search_users_by_keyword_db(db: Session, keyword: str, skip: int = 0, limit: int = DEFAULT_LIMIT) -> List[User]:
     """
-    Rechercher des utilisateurs par mot-clé dans username, name, family_name et email.
-    La recherche est insensible à la casse et exclut les utilisateurs supprimés (soft delete).
+    Rechercher des utilisateurs par mot-clé dans username, name, family_name, email et téléphone.
+    La recherche est insensible à la casse et aux accents, classée (début du nom d'abord),
+    paginée, et exclut les utilisateurs supprimés (soft delete).
     """
     try:
-        # Préparer une requête avec filtre sur is_deleted
-        query = db.query(User).filter(User.is_deleted == False)
-
-        # Appliquer le filtre sur plusieurs champs avec OR
-        query = query.join(User.roles, isouter=True).filter(
-            or_(
-                User.username.ilike(f"%{keyword}%"),
-                User.name.ilike(f"%{keyword}%"),
-                User.family_name.ilike(f"%{keyword}%"),
-                User.email.ilike(f"%{keyword}%"),
-                User.phone_number.ilike(f"%{keyword}%"),
-                Role.name.ilike(f"%{keyword}%")
-                
-
-            )
-        )
-
-        return query.all()  # Retourne les objets User avec leurs relations
+        users, _ = search_users_directory(db, keyword, limit=limit, offset=skip)
+        return users
     except Exception as e:
         print(f"Erreur lors de la recherche par mot-clé : {e}")
         db.rollback()
@@ -1,15 +1,24 @@
 
-from sqlalchemy import func
+import logging
+from typing import List, Optional
+
+from sqlalchemy import case, distinct, func, or_, select, update
 from sqlalchemy.orm import Session
-from app.models import Segment
+from app.models import Segment, Show
 from app.schemas import SegmentCreate, SegmentUpdate
 from fastapi import HTTPException
 
+logger = logging.getLogger("hapson-api")
+
 # Créer un segment
 def create_segment(db: Session, segment: SegmentCreate):
     try:
-        # Calculate the new position for the segment
-        max_position_result = db.query(func.max(Segment.position)).scalar()
+        # Calculate the new position for the segment (within its show)
+        max_position_result = (
+            db.query(func.max(Segment.position))
+            .filter(Segment.show_id == segment.show_id)
+            .scalar()
+        )
         new_position = (max_position_result + 1) if max_position_result is not None else 1
 
         # Prepare data, excluding 'position' if present in input schema
@@ -114,13 +123,28 @@ def update_segment(db: Session, db_segment: Segment, segment: SegmentUpdate):
 #         db.rollback()
 #         raise HTTPException(status_code=500, detail=f"Failed to update segment: {str(e)}")
 
+# ──────────────────────────────────────────────────────────────
+# Ordre des segments (par emission)
+#
+# Les positions sont des entiers contigus au sein d'une emission. Chaque
+# deplacement est une seule instruction UPDATE bornee a l'emission, executee
+# sous verrou de la ligne `shows` (SELECT ... FOR UPDATE) pour serialiser les
+# reordonnancements concurrents d'un meme conducteur.
+# ──────────────────────────────────────────────────────────────
+
+def _lock_show_ordering(db: Session, show_id: Optional[int]) -> None:
+    """Verrouille la ligne de l'emission jusqu'a la fin de la transaction."""
+    if show_id is not None:
+        db.query(Show.id).filter(Show.id == show_id).with_for_update().first()
+
+
 # Modifier la position d'un segment
 def update_segment_position(db: Session, db_segment: Segment, position: int):
     try:
-        # Réorganiser les positions des autres segments si nécessaire
-        active_segments = db.query(Segment).order_by(Segment.position).all()
+        _lock_show_ordering(db, db_segment.show_id)
+        db.refresh(db_segment)
         if db_segment.position != position:
-            # Si la position a changé, réorganiser les autres segments
+            # Si la position a changé, décaler les segments entre l'ancienne et la nouvelle position
             reorganize_positions(db, db_segment, position)
 
         db_segment.position = position
@@ -134,21 +158,120 @@ def update_segment_position(db: Session, db_segment: Segment, position: int):
 # Réorganiser les positions des segments
 def reorganize_positions(db: Session, db_segment: Segment, new_position: int):
     """
-    Réorganise les positions des segments actifs pour maintenir la continuité.
+    Décale en une requête les segments de la même émission situés entre
+    l'ancienne et la nouvelle position du segment déplacé.
     """
-    active_segments = (
-        db.query(Segment)
-        .order_by(Segment.position)
-        .all()
-    )
+    old_position = db_segment.position
+    same_show = (Segment.show_id == db_segment.show_id, Segment.id != db_segment.id)
+    if new_position < old_position:
+        stmt = (
+            update(Segment)
+            .where(*same_show, Segment.position >= new_position, Segment.position < old_position)
+            .values(position=Segment.position + 1)
+        )
+    else:
+        stmt = (
+            update(Segment)
+            .where(*same_show, Segment.position > old_position, Segment.position <= new_position)
+            .values(position=Segment.position - 1)
+        )
+    db.execute(stmt.execution_options(synchronize_session=False))
+
+
+def apply_segment_order(db: Session, show_id: int, segment_ids: List[int]) -> List[Segment]:
+    """
+    Applique un nouvel ordre complet aux segments d'une émission (glisser-déposer).
 
-    # Réattribuer les positions séquentiellement
-    for index, segment in enumerate(active_segments):
-        if segment.id == db_segment.id:
-            continue
-        if segment.position >= new_position:
-            segment.position += 1
+    `segment_ids` doit contenir exactement les segments de l'émission. Les positions
+    reprennent la base de numérotation existante (0 ou 1) ; seuls les segments dont
+    la position change sont écrits, en un seul executemany.
+    """
+    try:
+        _lock_show_ordering(db, show_id)
+        current = dict(
+            db.query(Segment.id, Segment.position).filter(Segment.show_id == show_id).all()
+        )
+        if len(set(segment_ids)) != len(segment_ids) or set(segment_ids) != set(current):
+            raise HTTPException(
+                status_code=400,
+                detail="La liste doit contenir exactement les segments de l'émission, sans doublon."
+            )
+
+        base = min(min(current.values()), 1) if current else 0
+        changes = [
+            {"id": segment_id, "position": base + index}
+            for index, segment_id in enumerate(segment_ids)
+            if current[segment_id] != base + index
+        ]
+        if changes:
+            db.execute(update(Segment), changes)
         db.commit()
+        return db.query(Segment).filter(Segment.show_id == show_id).order_by(Segment.position).all()
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to apply segment order: {str(e)}")
+
+
+def rebalance_show_positions(db: Session, show_id: int) -> int:
+    """
+    Renumérote de façon contiguë (à partir de 0 ou 1, selon la base existante) les
+    positions d'une émission : doublons ou trous laissés par des écritures
+    concurrentes ou d'anciennes données. Une seule requête.
+    Retourne le nombre de segments renumérotés. Ne commite pas.
+    """
+    _lock_show_ordering(db, show_id)
+    ranked = (
+        select(
+            Segment.id.label("id"),
+            (
+                case((func.min(Segment.position).over() <= 0, 0), else_=1)
+                + func.row_number().over(order_by=(Segment.position, Segment.id))
+                - 1
+            ).label("new_position"),
+        )
+        .where(Segment.show_id == show_id)
+        .subquery()
+    )
+    result = db.execute(
+        update(Segment)
+        .where(Segment.id == ranked.c.id, Segment.position != ranked.c.new_position)
+        .values(position=ranked.c.new_position)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount or 0
+
+
+def rebalance_segment_positions(db: Session) -> dict:
+    """
+    Tâche périodique : renumérote uniquement les émissions dont l'ordre n'est plus
+    contigu. Une transaction courte par émission.
+    """
+    show_ids = [
+        show_id
+        for (show_id,) in db.query(Segment.show_id)
+        .filter(Segment.show_id.isnot(None))
+        .group_by(Segment.show_id)
+        .having(
+            or_(
+                func.count(Segment.id) != func.count(distinct(Segment.position)),
+                func.max(Segment.position) - func.min(Segment.position) + 1 != func.count(Segment.id),
+                func.min(Segment.position).notin_((0, 1)),
+            )
+        )
+        .all()
+    ]
+    updated = 0
+    for show_id in show_ids:
+        try:
+            updated += rebalance_show_positions(db, show_id)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.warning(f"Reequilibrage des positions echoue pour l'emission {show_id}", exc_info=True)
+    return {"shows": len(show_ids), "segments": updated}
 
 # Suppression (soft delete) d'un segment
 def soft_delete_segment(db: Session, db_segment: Segment):
@@ -156,11 +279,18 @@ def soft_delete_segment(db: Session, db_segment: Segment):
         # Étape 1: Marquer le segment comme supprimé
         # db_segment.is_deleted = True
         # db.commit()
+        show_id, position = db_segment.show_id, db_segment.position
+        _lock_show_ordering(db, show_id)
         db.delete(db_segment) # Marquer pour suppression
-        db.commit() 
-        
-        # Étape 2: Réorganiser les positions
-        reorganize_positions(db, db_segment, db_segment.position)
+
+        # Étape 2: Refermer le trou laissé dans l'ordre de l'émission
+        db.execute(
+            update(Segment)
+            .where(Segment.show_id == show_id, Segment.position > position)
+            .values(position=Segment.position - 1)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
 
         return {"message": "Segment deleted successfully"}
     except Exception as e:
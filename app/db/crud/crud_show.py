@@ -1,7 +1,7 @@
 from sqlalchemy.orm import joinedload, aliased
 from typing import List, Dict
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import asc
+from sqlalchemy import asc, delete, insert, tuple_, update
 from app.models import Show, Segment,Presenter, Guest, ShowPresenter, SegmentGuest
 from sqlalchemy.orm import Session
 from app.schemas import ShowCreateWithDetail, ShowUpdate ,ShowCreate,ShowBase_jsonShow # Schémas de validation pour Show
@@ -584,10 +584,139 @@ def create_show_with_details(db: Session, show_data: ShowCreateWithDetail,curent
 # //////////////////// update shw avec details////////////
 
 
+# Champs d'un segment modifiables depuis l'editeur de conducteur
+SEGMENT_EDITABLE_FIELDS = ("title", "type", "position", "duration", "description")
+
+
+def _invalid_guest_ids(guest_ids: List[int], valid_guest_ids: set) -> bool:
+    """Meme regle que l'ancien controle `len(guests) != len(guest_ids)` (doublons inclus)."""
+    return len(set(guest_ids)) != len(guest_ids) or not set(guest_ids) <= valid_guest_ids
+
+
+def _sync_show_segments(db: Session, show_id: int, segments_data: List[Dict]):
+    """
+    Synchronise les segments d'une emission et leurs invites par difference.
+
+    Charge les segments de l'emission, leurs liens invites et les invites references
+    en une requete chacun, calcule le diff en memoire puis applique suppressions,
+    mises a jour, insertions et changements de la table segment_guests par
+    instructions ensemblistes (nombre de requetes constant quelle que soit la taille).
+    """
+    existing = {seg.id: seg for seg in db.query(Segment).filter(Segment.show_id == show_id).all()}
+    sent_ids = {int(seg["id"]) for seg in segments_data if seg.get("id") is not None}
+
+    for segment_data in segments_data:
+        if segment_data.get("id") is not None and int(segment_data["id"]) not in existing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Segment avec l'ID {int(segment_data['id'])} introuvable pour cette émission."
+            )
+
+    # Validation de tous les invites references en une seule requete
+    referenced_guest_ids = {gid for seg in segments_data for gid in (seg.get("guest_ids") or [])}
+    valid_guest_ids = (
+        {gid for (gid,) in db.query(Guest.id).filter(Guest.id.in_(referenced_guest_ids))}
+        if referenced_guest_ids
+        else set()
+    )
+    for segment_data in segments_data:
+        guest_ids = segment_data.get("guest_ids")
+        if guest_ids is not None and _invalid_guest_ids(guest_ids, valid_guest_ids):
+            label = "le segment" if segment_data.get("id") is not None else "le nouveau segment"
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Un ou plusieurs IDs d'invités sont invalides pour {label} '{segment_data['title']}'."
+            )
+
+    # Suppressions (liens invites puis segments)
+    deleted_ids = [seg_id for seg_id in existing if seg_id not in sent_ids]
+    if deleted_ids:
+        db.execute(delete(SegmentGuest).where(SegmentGuest.segment_id.in_(deleted_ids)))
+        db.execute(delete(Segment).where(Segment.id.in_(deleted_ids)))
+
+    # Mises a jour : uniquement les segments dont un champ a change
+    updates = []
+    for segment_data in segments_data:
+        if segment_data.get("id") is None:
+            continue
+        segment = existing[int(segment_data["id"])]
+        changes = {
+            key: segment_data[key]
+            for key in SEGMENT_EDITABLE_FIELDS
+            if key in segment_data and getattr(segment, key) != segment_data[key]
+        }
+        if changes:
+            updates.append({"id": segment.id, **changes})
+    if updates:
+        # Regroupe par jeu de colonnes : un executemany par forme de ligne
+        by_shape: Dict[tuple, list] = {}
+        for row in updates:
+            by_shape.setdefault(tuple(sorted(row)), []).append(row)
+        for rows in by_shape.values():
+            db.execute(update(Segment), rows)
+
+    # Insertions en un seul INSERT ... RETURNING (ordre des parametres conserve)
+    new_segments = [seg for seg in segments_data if seg.get("id") is None]
+    new_ids: List[int] = []
+    if new_segments:
+        new_ids = list(db.scalars(
+            insert(Segment).returning(Segment.id, sort_by_parameter_order=True),
+            [
+                {
+                    "title": seg["title"],
+                    "type": seg["type"],
+                    "position": seg["position"],
+                    "duration": seg["duration"],
+                    "description": seg.get("description"),
+                    "show_id": show_id,
+                }
+                for seg in new_segments
+            ],
+        ))
+
+    # Diff de la table associative segment_guests
+    wanted_links: Dict[int, set] = {}
+    for segment_data in segments_data:
+        if segment_data.get("id") is not None and segment_data.get("guest_ids") is not None:
+            wanted_links[int(segment_data["id"])] = set(segment_data["guest_ids"])
+    for seg_id, seg in zip(new_ids, new_segments):
+        wanted_links[seg_id] = set(seg.get("guest_ids") or [])
+
+    kept_ids = [seg_id for seg_id in wanted_links if seg_id in existing]
+    current_links: Dict[int, set] = {seg_id: set() for seg_id in kept_ids}
+    if kept_ids:
+        for seg_id, guest_id in db.query(SegmentGuest.segment_id, SegmentGuest.guest_id).filter(
+            SegmentGuest.segment_id.in_(kept_ids)
+        ):
+            current_links[seg_id].add(guest_id)
+
+    links_to_remove = [
+        (seg_id, guest_id)
+        for seg_id, guest_ids in current_links.items()
+        for guest_id in guest_ids - wanted_links[seg_id]
+    ]
+    links_to_add = [
+        {"segment_id": seg_id, "guest_id": guest_id}
+        for seg_id, guest_ids in wanted_links.items()
+        for guest_id in guest_ids - current_links.get(seg_id, set())
+    ]
+    if links_to_remove:
+        db.execute(
+            delete(SegmentGuest).where(
+                tuple_(SegmentGuest.segment_id, SegmentGuest.guest_id).in_(links_to_remove)
+            )
+        )
+    if links_to_add:
+        db.execute(insert(SegmentGuest), links_to_add)
+
+
 def update_show_with_details(db: Session, show_id: int, show_data: Dict):
     """
     Met à jour une émission avec ses segments, présentateurs et invités, en synchronisant les segments.
 
+    Les segments sont synchronisés par différence (cf. _sync_show_segments) :
+    le nombre de requêtes ne dépend pas du nombre de segments envoyés.
+
     Args:
         db (Session): La session de base de données.
         show_id (int): L'ID de l'émission à mettre à jour.
@@ -597,8 +726,6 @@ def update_show_with_details(db: Session, show_id: int, show_data: Dict):
         dict: Les détails de l'émission mise à jour.
     """
     try:
-        print(f"Début de la mise à jour de l'émission {show_id} avec données : {show_data}")
-
         # Récupérer l'émission existante
         show = db.query(Show).filter(Show.id == show_id).first()
         if not show:
@@ -606,17 +733,15 @@ def update_show_with_details(db: Session, show_id: int, show_data: Dict):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Émission avec l'ID {show_id} introuvable."
             )
-        print(f"Émission trouvée : {show.id}, titre : {show.title}")
 
         # Mettre à jour les champs de l'émission
+        # (exclure les relations avant hasattr pour ne pas charger show.segments)
         for key, value in show_data.items():
-            if hasattr(show, key) and key not in ["segments", "presenter_ids"]:
-                print(f"Mise à jour du champ {key} avec la valeur {value}")
+            if key not in ["segments", "presenter_ids"] and hasattr(show, key):
                 setattr(show, key, value)
 
         # Mettre à jour les présentateurs
         if "presenter_ids" in show_data:
-            print(f"Mise à jour des présentateurs : {show_data['presenter_ids']}")
             presenters = (
                 db.query(Presenter)
                 .filter(Presenter.id.in_(show_data["presenter_ids"]))
@@ -630,94 +755,20 @@ def update_show_with_details(db: Session, show_id: int, show_data: Dict):
                     detail="Un ou plusieurs IDs de présentateurs sont invalides."
                 )
             show.presenters = presenters
-            print(f"Présentateurs mis à jour : {[p.id for p in presenters]}")
 
         # Synchroniser les segments
         if "segments" in show_data:
-            # Récupérer les IDs des segments envoyés
-            sent_segment_ids = {int(seg["id"]) for seg in show_data["segments"] if seg.get("id") is not None}
-            print(f"Segments envoyés (IDs) : {sent_segment_ids}")
-
-            # Supprimer les segments existants qui ne sont plus dans la payload
-            existing_segments = db.query(Segment).filter(Segment.show_id == show_id).all()
-            deleted_segment_ids = [seg.id for seg in existing_segments if seg.id not in sent_segment_ids]
-            print(f"Segments à supprimer (IDs) : {deleted_segment_ids}")
-            for segment in existing_segments:
-                if segment.id not in sent_segment_ids:
-                    print(f"Suppression du segment ID {segment.id}: {segment.title}")
-                    db.delete(segment)
-                    db.flush()  # Appliquer la suppression immédiatement
-
-            # Traiter les segments envoyés
-            for segment_data in show_data["segments"]:
-                segment_id = segment_data.get("id")
-                if segment_id is not None:  # Segment existant à mettre à jour
-                    segment_id = int(segment_id)
-                    segment = db.query(Segment).filter(Segment.id == segment_id, Segment.show_id == show_id).first()
-                    if not segment:
-                        raise HTTPException(
-                            status_code=status.HTTP_404_NOT_FOUND,
-                            detail=f"Segment avec l'ID {segment_id} introuvable pour cette émission."
-                        )
-                    print(f"Mise à jour du segment ID {segment_id}: {segment_data['title']}")
-                    for key, value in segment_data.items():
-                        if hasattr(segment, key) and key != "guest_ids":
-                            setattr(segment, key, value)
-                    if "guest_ids" in show_data:
-                        print(f"Guest IDs pour segment {segment_id} : {segment_data['guest_ids']}")
-                        guests = (
-                            db.query(Guest)
-                            .filter(Guest.id.in_(segment_data["guest_ids"]))
-                            .all()
-                            if segment_data["guest_ids"]
-                            else []
-                        )
-                        if len(guests) != len(segment_data["guest_ids"]):
-                            raise HTTPException(
-                                status_code=status.HTTP_400_BAD_REQUEST,
-                                detail=f"Un ou plusieurs IDs d'invités sont invalides pour le segment '{segment.title}'."
-                            )
-                        segment.guests = guests
-                else:  # Nouveau segment à ajouter
-                    print(f"Ajout d'un nouveau segment : {segment_data['title']}")
-                    new_segment = Segment(
-                        title=segment_data["title"],
-                        type=segment_data["type"],
-                        position=segment_data["position"],
-                        duration=segment_data["duration"],
-                        description=segment_data.get("description"),
-                        show_id=show.id
-                    )
-                    db.add(new_segment)
-                    db.flush()  # Générer un ID pour le nouveau segment
-                    if "guest_ids" in segment_data:
-                        print(f"Guest IDs pour nouveau segment : {segment_data['guest_ids']}")
-                        guests = (
-                            db.query(Guest)
-                            .filter(Guest.id.in_(segment_data["guest_ids"]))
-                            .all()
-                            if segment_data["guest_ids"]
-                            else []
-                        )
-                        if len(guests) != len(segment_data["guest_ids"]):
-                            raise HTTPException(
-                                status_code=status.HTTP_400_BAD_REQUEST,
-                                detail=f"Un ou plusieurs IDs d'invités sont invalides pour le nouveau segment '{new_segment.title}'."
-                            )
-                        new_segment.guests = guests
+            _sync_show_segments(db, show.id, show_data["segments"] or [])
 
         # Valider les changements dans la base de données
-        print("Validation des changements dans la base de données")
         db.commit()
         db.refresh(show)
-        print(f"Émission {show_id} mise à jour avec succès")
         return show
 
     except HTTPException as http_exc:
-        print(f"Erreur HTTP : {http_exc.detail}")
+        db.rollback()
         raise http_exc
     except Exception as e:
-        print(f"Erreur inattendue : {str(e)}")
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
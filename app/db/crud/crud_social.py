@@ -9,7 +9,7 @@ Inclut les fonctions de synchronisation avec Facebook Graph API.
 import logging
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.dialects.postgresql import insert as pg_insert
-from sqlalchemy import func, desc, and_
+from sqlalchemy import func, desc, and_, case
 from fastapi import HTTPException, status
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Callable
@@ -22,6 +22,15 @@ from app.models.model_social import (
 from app.schemas.schema_social import (
     SocialPostCreate, SocialPostUpdate,
 )
+from app.db.crud.crud_maintenance import (
+    delete_in_batches,
+    estimate_row_counts,
+    tables_to_vacuum,
+    update_in_batches,
+    vacuum_analyze,
+)
+from app.services.social_publish_queue import notify_schedule_change
+from app.utils.time_window import period_window
 
 logger = logging.getLogger("hapson-api")
 
@@ -338,6 +347,8 @@ def create_social_post(db: Session, post_data: SocialPostCreate, user_id: int) -
     db.add(new_post)
     db.commit()
     db.refresh(new_post)
+    if new_post.scheduled_at:
+        notify_schedule_change(db)
     return new_post
 
 
@@ -357,6 +368,8 @@ def update_social_post(db: Session, post_id: int, post_data: SocialPostUpdate) -
 
     db.commit()
     db.refresh(post)
+    if post.status == "scheduled" or "scheduled_at" in update_dict or "status" in update_dict:
+        notify_schedule_change(db)
     return post
 
 
@@ -380,35 +393,49 @@ def delete_social_post(db: Session, post_id: int) -> dict:
         r.deleted_at = now
         stats["post_results_deleted"] += 1
 
+    was_scheduled = post.status == "scheduled"
     post.is_deleted = True
     post.deleted_at = now
     db.commit()
+    if was_scheduled:
+        notify_schedule_change(db)
     return stats
 
 
-def publish_social_post(db: Session, post_id: int) -> SocialPost:
+def publish_social_post(db: Session, post_id: int, due_only: bool = False) -> SocialPost:
     """
     Publier un post sur les plateformes cibles.
 
-    Pour chaque compte cible sur Facebook :
-    1. Recupere le page access token via /me/accounts
-    2. Publie sur la page via Graph API
-    3. Cree un SocialPostResult avec le platform_post_id
+    due_only : publication planifiee — ne prend le post que s'il est encore
+    "scheduled" et que son echeance est passee (sinon 409).
+
+    Les comptes cibles sont publies en parallele (social_publish_fanout) :
+    chaque compte est retente independamment sur erreur passagere, et son
+    SocialPostResult est enregistre des que sa publication aboutit ou echoue.
 
     Pour les plateformes non-Facebook, simule le succes (TODO).
 
     Utilise un UPDATE atomique pour eviter les doublons quand
     plusieurs workers Gunicorn traitent le meme post planifie.
     """
-    from app.services.social_facebook import publish_to_page, get_post_media_urls
+    from app.services.social_facebook import get_post_media_urls
+    from app.services.social_publish_fanout import fan_out_publish
 
     # Transition atomique : seul le premier worker a reussir cet UPDATE continue.
     # Les autres workers verront updated == 0 et abandonneront.
-    updated = db.query(SocialPost).filter(
+    claim_filters = [
         SocialPost.id == post_id,
         SocialPost.is_deleted == False,
         SocialPost.status.in_(["draft", "scheduled"]),
-    ).update({"status": "publishing"}, synchronize_session="fetch")
+    ]
+    if due_only:
+        claim_filters += [
+            SocialPost.status == "scheduled",
+            SocialPost.scheduled_at <= datetime.now(timezone.utc),
+        ]
+    updated = db.query(SocialPost).filter(*claim_filters).update(
+        {"status": "publishing"}, synchronize_session="fetch"
+    )
     db.commit()
 
     if updated == 0:
@@ -426,6 +453,11 @@ def publish_social_post(db: Session, post_id: int) -> SocialPost:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Ce post est déjà publié"
             )
+        if due_only and post.status == "scheduled":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Publication replanifiée à une date ultérieure"
+            )
         # Status est "publishing" ou "error" — un autre worker l'a deja pris
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -472,60 +504,48 @@ def publish_social_post(db: Session, post_id: int) -> SocialPost:
             .all()
         )
 
-    for account in accounts:
+    # Publication en parallele sur tous les comptes ; chaque resultat est
+    # enregistre des qu'il est connu (la session reste dans ce thread)
+    accounts_by_id = {account.id: account for account in accounts}
+    targets = [
+        {
+            "account_id": account.id,
+            "platform": account.platform,
+            "access_token": account.access_token,
+            "page_id": account.account_id,
+        }
+        for account in accounts
+    ]
+    media_source = None
+    for outcome in fan_out_publish(targets, post.content, post.link_url, post.media_urls or []):
         result = SocialPostResult(
             post_id=post.id,
-            account_id=account.id,
-            platform=account.platform,
-            status="pending",
+            account_id=outcome["account_id"],
+            platform=outcome["platform"],
+            status=outcome["status"],
         )
-
-        if account.platform == "facebook":
-            try:
-                # Utiliser directement le page access token stocké en BDD
-                # (pas besoin de /me/accounts car le token est déjà un Page token)
-                if not account.access_token:
-                    result.status = "error"
-                    result.error_message = "Aucun access token disponible pour ce compte"
-                    has_error = True
-                elif not account.account_id:
-                    result.status = "error"
-                    result.error_message = "Aucun Page ID disponible pour ce compte"
-                    has_error = True
-                else:
-                    fb_result = publish_to_page(
-                        page_access_token=account.access_token,
-                        page_id=account.account_id,
-                        message=post.content,
-                        link=post.link_url,
-                        media_urls=post.media_urls or [],
-                    )
-                    result.status = "published"
-                    result.platform_post_id = fb_result["id"]
-                    result.platform_post_url = fb_result["permalink_url"]
-                    result.platform_url = fb_result["permalink_url"]
-                    result.published_at = now
-
-                    # Recuperer les URLs Facebook des images publiees
-                    # pour remplacer les URLs Firebase temporaires
-                    try:
-                        fb_media = get_post_media_urls(account.access_token, fb_result["id"])
-                        if fb_media:
-                            post.media_urls = fb_media
-                    except Exception as e:
-                        logger.warning(f"Impossible de recuperer les URLs media Facebook: {e}")
-
-            except Exception as e:
-                logger.error(f"Erreur publication Facebook: {e}")
-                result.status = "error"
-                result.error_message = str(e)[:500]
-                has_error = True
+        if outcome["status"] == "published":
+            result.platform_post_id = outcome["platform_post_id"]
+            result.platform_post_url = outcome["permalink_url"]
+            result.platform_url = outcome["permalink_url"]
+            result.published_at = datetime.now(timezone.utc)
+            if outcome["platform"] == "facebook" and outcome["platform_post_id"] and media_source is None:
+                media_source = (accounts_by_id[outcome["account_id"]].access_token, outcome["platform_post_id"])
         else:
-            # TODO: Implementer pour Instagram, LinkedIn, Twitter
-            result.status = "published"
-            result.published_at = now
-
+            result.error_message = outcome["error_message"]
+            has_error = True
         db.add(result)
+        db.commit()
+
+    # Recuperer les URLs Facebook des images publiees (une fois)
+    # pour remplacer les URLs Firebase temporaires
+    if media_source:
+        try:
+            fb_media = get_post_media_urls(*media_source)
+            if fb_media:
+                post.media_urls = fb_media
+        except Exception as e:
+            logger.warning(f"Impossible de recuperer les URLs media Facebook: {e}")
 
     post.status = "error" if has_error and not any(
         r.status == "published" for r in db.query(SocialPostResult).filter(
@@ -572,6 +592,7 @@ def schedule_social_post(db: Session, post_id: int, scheduled_at: datetime) -> S
     post.status = "scheduled"
     db.commit()
     db.refresh(post)
+    notify_schedule_change(db)
     return post
 
 
@@ -729,9 +750,9 @@ def get_analytics_overview(db: Session, period: str = "30d", account_id: Optiona
     """Calculer les statistiques d'ensemble pour la période donnée.
     Si account_id est fourni, filtre les stats pour ce compte uniquement.
     """
-    days = {"7d": 7, "30d": 30, "90d": 90, "12m": 365}.get(period, 30)
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-    prev_cutoff = cutoff - timedelta(days=days)
+    window = period_window(period)
+    cutoff = window.start
+    prev_cutoff = window.previous().start
 
     # Filtre de base pour les posts liés au compte (via SocialPostResult)
     if account_id:
@@ -903,7 +924,7 @@ def get_analytics_overview(db: Session, period: str = "30d", account_id: Optiona
         "top_hashtags": top_hashtags,
         "top_platforms": top_platforms,
         "period_start": cutoff.isoformat(),
-        "period_end": datetime.now(timezone.utc).isoformat(),
+        "period_end": window.end.isoformat(),
     }
 
 
@@ -911,8 +932,8 @@ def get_platform_stats(db: Session, period: str = "30d", account_id: Optional[in
     """Statistiques ventilées par plateforme.
     Si account_id est fourni, filtre les stats pour ce compte uniquement.
     """
-    days = {"7d": 7, "30d": 30, "90d": 90, "12m": 365}.get(period, 30)
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    window = period_window(period)
+    cutoff = window.start
 
     base_q = (
         db.query(
@@ -1012,8 +1033,8 @@ def get_best_times(db: Session, account_id: Optional[int] = None) -> list[dict]:
 
 def get_engagement_time_series(db: Session, period: str = "30d", account_id: Optional[int] = None) -> list[dict]:
     """Série temporelle de l'engagement par jour."""
-    days = {"7d": 7, "30d": 30, "90d": 90, "12m": 365}.get(period, 30)
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    window = period_window(period)
+    cutoff = window.start
 
     base_q = (
         db.query(
@@ -1705,152 +1726,137 @@ def sync_all_facebook_accounts(db: Session, force: bool = False, on_progress: Op
 # NETTOYAGE & OPTIMISATION BASE DE DONNÉES
 # ════════════════════════════════════════════════════════════════
 
-def get_database_stats(db: Session) -> dict:
+_STATS_TABLES = {
+    "accounts": SocialAccount,
+    "posts": SocialPost,
+    "post_results": SocialPostResult,
+    "comments": SocialComment,
+    "conversations": SocialConversation,
+    "messages": SocialMessage,
+}
+
+
+def _exact_active_deleted(db: Session, Model) -> tuple[int, int]:
+    """Compteurs actifs / soft-deletes exacts (un seul parcours de la table)."""
+    active, deleted = db.query(
+        func.count(case((Model.is_deleted == False, 1))),
+        func.count(case((Model.is_deleted == True, 1))),
+    ).one()
+    return active or 0, deleted or 0
+
+
+def _orphan_counts(db: Session) -> dict:
+    """Compteurs d'orphelins (parcours complets : mode exact uniquement)."""
+    deleted_accounts = db.query(SocialAccount.id).filter(SocialAccount.is_deleted == True)
+    return {
+        # Posts publiés sans aucun result actif
+        "posts": db.query(func.count(SocialPost.id)).filter(
+            SocialPost.is_deleted == False,
+            SocialPost.status.notin_(["draft", "scheduled"]),
+            ~SocialPost.id.in_(
+                db.query(SocialPostResult.post_id)
+                .filter(SocialPostResult.is_deleted == False)
+                .distinct()
+            )
+        ).scalar() or 0,
+        # Results liés à un compte supprimé mais eux-mêmes non supprimés
+        "post_results_account": db.query(func.count(SocialPostResult.id)).filter(
+            SocialPostResult.is_deleted == False,
+            SocialPostResult.account_id.in_(deleted_accounts),
+        ).scalar() or 0,
+        # Results liés à un post supprimé mais eux-mêmes non supprimés
+        "post_results_post": db.query(func.count(SocialPostResult.id)).filter(
+            SocialPostResult.is_deleted == False,
+            SocialPostResult.post_id.in_(
+                db.query(SocialPost.id).filter(SocialPost.is_deleted == True)
+            )
+        ).scalar() or 0,
+        # Commentaires liés à un compte supprimé
+        "comments": db.query(func.count(SocialComment.id)).filter(
+            SocialComment.is_deleted == False,
+            SocialComment.account_id.in_(deleted_accounts),
+        ).scalar() or 0,
+        "conversations": db.query(func.count(SocialConversation.id)).filter(
+            SocialConversation.is_deleted == False,
+            SocialConversation.account_id.in_(deleted_accounts),
+        ).scalar() or 0,
+        "messages": db.query(func.count(SocialMessage.id)).filter(
+            SocialMessage.is_deleted == False,
+            SocialMessage.conversation_id.in_(
+                db.query(SocialConversation.id).filter(SocialConversation.is_deleted == True)
+            )
+        ).scalar() or 0,
+    }
+
+
+def get_database_stats(db: Session, exact: bool = False) -> dict:
     """
     Statistiques de la base de données sociale.
 
-    Retourne les compteurs actifs, soft-deletés et orphelins
-    pour chaque table du module social.
+    Par défaut (exact=False), les compteurs sont des estimations PostgreSQL
+    (pg_class.reltuples et pg_stats, mises à jour par ANALYZE) : aucun parcours
+    de table, les orphelins ne sont pas calculés (None).
+    exact=True : compteurs exacts, orphelins compris (parcours complets).
+    Une table sans statistiques (jamais analysée) est toujours comptée exactement.
     """
-    now = datetime.now(timezone.utc)
+    estimates = {} if exact else estimate_row_counts(
+        db, [Model.__tablename__ for Model in _STATS_TABLES.values()]
+    )
 
-    # --- Comptes ---
-    accounts_active = db.query(func.count(SocialAccount.id)).filter(
-        SocialAccount.is_deleted == False
-    ).scalar() or 0
-    accounts_deleted = db.query(func.count(SocialAccount.id)).filter(
-        SocialAccount.is_deleted == True
-    ).scalar() or 0
-
-    # --- Posts ---
-    posts_active = db.query(func.count(SocialPost.id)).filter(
-        SocialPost.is_deleted == False
-    ).scalar() or 0
-    posts_deleted = db.query(func.count(SocialPost.id)).filter(
-        SocialPost.is_deleted == True
-    ).scalar() or 0
-    # Orphelins : posts publiés sans aucun result actif
-    posts_orphaned = db.query(func.count(SocialPost.id)).filter(
-        SocialPost.is_deleted == False,
-        SocialPost.status.notin_(["draft", "scheduled"]),
-        ~SocialPost.id.in_(
-            db.query(SocialPostResult.post_id)
-            .filter(SocialPostResult.is_deleted == False)
-            .distinct()
-        )
-    ).scalar() or 0
-
-    # --- PostResults ---
-    results_active = db.query(func.count(SocialPostResult.id)).filter(
-        SocialPostResult.is_deleted == False
-    ).scalar() or 0
-    results_deleted = db.query(func.count(SocialPostResult.id)).filter(
-        SocialPostResult.is_deleted == True
-    ).scalar() or 0
-    # Orphelins : results liés à un compte supprimé mais eux-mêmes non supprimés
-    results_orphaned_account = db.query(func.count(SocialPostResult.id)).filter(
-        SocialPostResult.is_deleted == False,
-        SocialPostResult.account_id.in_(
-            db.query(SocialAccount.id).filter(SocialAccount.is_deleted == True)
-        )
-    ).scalar() or 0
-    # Orphelins : results liés à un post supprimé mais eux-mêmes non supprimés
-    results_orphaned_post = db.query(func.count(SocialPostResult.id)).filter(
-        SocialPostResult.is_deleted == False,
-        SocialPostResult.post_id.in_(
-            db.query(SocialPost.id).filter(SocialPost.is_deleted == True)
-        )
-    ).scalar() or 0
-
-    # --- Commentaires ---
-    comments_active = db.query(func.count(SocialComment.id)).filter(
-        SocialComment.is_deleted == False
-    ).scalar() or 0
-    comments_deleted = db.query(func.count(SocialComment.id)).filter(
-        SocialComment.is_deleted == True
-    ).scalar() or 0
-    # Orphelins : commentaires liés à un compte supprimé
-    comments_orphaned = db.query(func.count(SocialComment.id)).filter(
-        SocialComment.is_deleted == False,
-        SocialComment.account_id.in_(
-            db.query(SocialAccount.id).filter(SocialAccount.is_deleted == True)
-        )
-    ).scalar() or 0
-
-    # --- Conversations ---
-    conversations_active = db.query(func.count(SocialConversation.id)).filter(
-        SocialConversation.is_deleted == False
-    ).scalar() or 0
-    conversations_deleted = db.query(func.count(SocialConversation.id)).filter(
-        SocialConversation.is_deleted == True
-    ).scalar() or 0
-    conversations_orphaned = db.query(func.count(SocialConversation.id)).filter(
-        SocialConversation.is_deleted == False,
-        SocialConversation.account_id.in_(
-            db.query(SocialAccount.id).filter(SocialAccount.is_deleted == True)
-        )
-    ).scalar() or 0
-
-    # --- Messages ---
-    messages_active = db.query(func.count(SocialMessage.id)).filter(
-        SocialMessage.is_deleted == False
-    ).scalar() or 0
-    messages_deleted = db.query(func.count(SocialMessage.id)).filter(
-        SocialMessage.is_deleted == True
-    ).scalar() or 0
-    messages_orphaned = db.query(func.count(SocialMessage.id)).filter(
-        SocialMessage.is_deleted == False,
-        SocialMessage.conversation_id.in_(
-            db.query(SocialConversation.id).filter(SocialConversation.is_deleted == True)
-        )
-    ).scalar() or 0
+    counts = {}
+    for key, Model in _STATS_TABLES.items():
+        estimate = estimates.get(Model.__tablename__)
+        if estimate:
+            counts[key] = (max(0, estimate["total"] - estimate["deleted"]), estimate["deleted"])
+        else:
+            counts[key] = _exact_active_deleted(db, Model)
 
-    total_orphans = (
-        posts_orphaned
-        + results_orphaned_account + results_orphaned_post
-        + comments_orphaned + conversations_orphaned + messages_orphaned
-    )
+    orphans = _orphan_counts(db) if exact else {}
 
-    return {
-        "accounts": {"active": accounts_active, "deleted": accounts_deleted},
-        "posts": {"active": posts_active, "deleted": posts_deleted, "orphaned": posts_orphaned},
+    stats = {
+        "accounts": {"active": counts["accounts"][0], "deleted": counts["accounts"][1]},
+        "posts": {"active": counts["posts"][0], "deleted": counts["posts"][1], "orphaned": orphans.get("posts")},
         "post_results": {
-            "active": results_active,
-            "deleted": results_deleted,
-            "orphaned_account": results_orphaned_account,
-            "orphaned_post": results_orphaned_post,
+            "active": counts["post_results"][0],
+            "deleted": counts["post_results"][1],
+            "orphaned_account": orphans.get("post_results_account"),
+            "orphaned_post": orphans.get("post_results_post"),
+        },
+        "comments": {"active": counts["comments"][0], "deleted": counts["comments"][1], "orphaned": orphans.get("comments")},
+        "conversations": {
+            "active": counts["conversations"][0],
+            "deleted": counts["conversations"][1],
+            "orphaned": orphans.get("conversations"),
         },
-        "comments": {"active": comments_active, "deleted": comments_deleted, "orphaned": comments_orphaned},
-        "conversations": {"active": conversations_active, "deleted": conversations_deleted, "orphaned": conversations_orphaned},
-        "messages": {"active": messages_active, "deleted": messages_deleted, "orphaned": messages_orphaned},
-        "total_records": (
-            accounts_active + accounts_deleted
-            + posts_active + posts_deleted
-            + results_active + results_deleted
-            + comments_active + comments_deleted
-            + conversations_active + conversations_deleted
-            + messages_active + messages_deleted
-        ),
-        "total_orphans": total_orphans,
-        "total_soft_deleted": (
-            accounts_deleted + posts_deleted + results_deleted
-            + comments_deleted + conversations_deleted + messages_deleted
-        ),
+        "messages": {"active": counts["messages"][0], "deleted": counts["messages"][1], "orphaned": orphans.get("messages")},
+        "total_records": sum(active + deleted for active, deleted in counts.values()),
+        "total_orphans": sum(orphans.values()) if exact else None,
+        "total_soft_deleted": sum(deleted for _, deleted in counts.values()),
+        "exact": exact,
     }
+    return stats
 
 
-def cleanup_database(db: Session, hard_delete_days: int = 30) -> dict:
+def cleanup_database(
+    db: Session,
+    hard_delete_days: int = 30,
+    on_progress: Optional[Callable[[str, int], None]] = None,
+) -> dict:
     """
     Nettoyer la base de données du module social.
 
     Effectue 3 opérations :
     1. Soft-delete les orphelins (données liées à des comptes/posts supprimés)
     2. Hard-delete les enregistrements soft-deleted depuis plus de `hard_delete_days` jours
-    3. Retourne les statistiques du nettoyage
+    3. VACUUM (ANALYZE) des tables fortement modifiées, puis retourne les statistiques
+
+    Chaque étape est exécutée par lots de clé primaire (crud_maintenance) :
+    transactions courtes, pause entre les lots.
 
     Args:
         db: Session SQLAlchemy
         hard_delete_days: Nombre de jours après soft-delete pour le hard-delete (0 = pas de hard-delete)
+        on_progress: Callback (message, pourcentage) pour le registre de tâches
     """
     now = datetime.now(timezone.utc)
     stats = {
@@ -1869,163 +1875,122 @@ def cleanup_database(db: Session, hard_delete_days: int = 30) -> dict:
             "conversations": 0,
             "messages": 0,
         },
+        "vacuumed": [],
     }
+    affected: dict[str, int] = {}
+    soft_delete = {"is_deleted": True, "deleted_at": now}
+    deleted_accounts = db.query(SocialAccount.id).filter(SocialAccount.is_deleted == True)
 
     # ── Étape 1 : Soft-delete les orphelins ──
-
-    # Posts publiés sans aucun result actif
-    orphan_posts = db.query(SocialPost).filter(
-        SocialPost.is_deleted == False,
-        SocialPost.status.notin_(["draft", "scheduled"]),
-        ~SocialPost.id.in_(
-            db.query(SocialPostResult.post_id)
-            .filter(SocialPostResult.is_deleted == False)
-            .distinct()
-        )
-    ).all()
-    for p in orphan_posts:
-        p.is_deleted = True
-        p.deleted_at = now
-        stats["orphans_cleaned"]["posts"] += 1
-
-    # PostResults liés à un compte supprimé
-    orphan_results_acc = db.query(SocialPostResult).filter(
-        SocialPostResult.is_deleted == False,
-        SocialPostResult.account_id.in_(
-            db.query(SocialAccount.id).filter(SocialAccount.is_deleted == True)
-        )
-    ).all()
-    for r in orphan_results_acc:
-        r.is_deleted = True
-        r.deleted_at = now
-        stats["orphans_cleaned"]["post_results"] += 1
-
-    # PostResults liés à un post supprimé
-    orphan_results_post = db.query(SocialPostResult).filter(
-        SocialPostResult.is_deleted == False,
-        SocialPostResult.post_id.in_(
-            db.query(SocialPost.id).filter(SocialPost.is_deleted == True)
-        )
-    ).all()
-    for r in orphan_results_post:
-        r.is_deleted = True
-        r.deleted_at = now
-        stats["orphans_cleaned"]["post_results"] += 1
-
-    # Commentaires liés à un compte supprimé
-    orphan_comments = db.query(SocialComment).filter(
-        SocialComment.is_deleted == False,
-        SocialComment.account_id.in_(
-            db.query(SocialAccount.id).filter(SocialAccount.is_deleted == True)
-        )
-    ).all()
-    for c in orphan_comments:
-        c.is_deleted = True
-        c.deleted_at = now
-        stats["orphans_cleaned"]["comments"] += 1
-
-    # Conversations liées à un compte supprimé
-    orphan_convs = db.query(SocialConversation).filter(
-        SocialConversation.is_deleted == False,
-        SocialConversation.account_id.in_(
-            db.query(SocialAccount.id).filter(SocialAccount.is_deleted == True)
-        )
-    ).all()
-    for conv in orphan_convs:
-        conv.is_deleted = True
-        conv.deleted_at = now
-        stats["orphans_cleaned"]["conversations"] += 1
-
-    # Messages liés à une conversation supprimée
-    orphan_msgs = db.query(SocialMessage).filter(
-        SocialMessage.is_deleted == False,
-        SocialMessage.conversation_id.in_(
-            db.query(SocialConversation.id).filter(SocialConversation.is_deleted == True)
-        )
-    ).all()
-    for m in orphan_msgs:
-        m.is_deleted = True
-        m.deleted_at = now
-        stats["orphans_cleaned"]["messages"] += 1
-
-    db.flush()
+    orphan_steps = [
+        # Posts publiés sans aucun result actif
+        ("posts", SocialPost, [
+            SocialPost.is_deleted == False,
+            SocialPost.status.notin_(["draft", "scheduled"]),
+            ~SocialPost.id.in_(
+                db.query(SocialPostResult.post_id)
+                .filter(SocialPostResult.is_deleted == False)
+                .distinct()
+            ),
+        ]),
+        # PostResults liés à un compte supprimé
+        ("post_results", SocialPostResult, [
+            SocialPostResult.is_deleted == False,
+            SocialPostResult.account_id.in_(deleted_accounts),
+        ]),
+        # PostResults liés à un post supprimé
+        ("post_results", SocialPostResult, [
+            SocialPostResult.is_deleted == False,
+            SocialPostResult.post_id.in_(
+                db.query(SocialPost.id).filter(SocialPost.is_deleted == True)
+            ),
+        ]),
+        # Commentaires liés à un compte supprimé
+        ("comments", SocialComment, [
+            SocialComment.is_deleted == False,
+            SocialComment.account_id.in_(deleted_accounts),
+        ]),
+        # Conversations liées à un compte supprimé
+        ("conversations", SocialConversation, [
+            SocialConversation.is_deleted == False,
+            SocialConversation.account_id.in_(deleted_accounts),
+        ]),
+        # Messages liés à une conversation supprimée (après les conversations)
+        ("messages", SocialMessage, [
+            SocialMessage.is_deleted == False,
+            SocialMessage.conversation_id.in_(
+                db.query(SocialConversation.id).filter(SocialConversation.is_deleted == True)
+            ),
+        ]),
+    ]
 
     # ── Étape 2 : Hard-delete les anciens soft-deleted ──
-
+    # 0 = purger TOUT immédiatement, >0 = purger les enregistrements plus vieux que X jours
+    # -1 = pas de purge (orphelins uniquement)
+    # Ordre important : enfants d'abord, parents ensuite (FK constraints)
+    purge_steps = []
     if hard_delete_days >= 0:
-        # 0 = purger TOUT immédiatement, >0 = purger les enregistrements plus vieux que X jours
-        # -1 = pas de purge (orphelins uniquement)
-
-        # Ordre important : enfants d'abord, parents ensuite (FK constraints)
-
-        def _build_delete_filter(Model):
-            """Construire le filtre de suppression selon hard_delete_days."""
-            base = db.query(Model).filter(
-                Model.is_deleted == True,
-            )
+        def _purge_filters(Model, *extra):
+            filters = [Model.is_deleted == True, *extra]
             if hard_delete_days > 0:
                 cutoff = now - timedelta(days=hard_delete_days)
-                base = base.filter(
-                    Model.deleted_at != None,
-                    Model.deleted_at < cutoff,
-                )
-            return base
-
-        # Messages
-        n = _build_delete_filter(SocialMessage).delete(synchronize_session="fetch")
-        stats["hard_deleted"]["messages"] = n
-
-        # Conversations
-        n = _build_delete_filter(SocialConversation).delete(synchronize_session="fetch")
-        stats["hard_deleted"]["conversations"] = n
-
-        # Commentaires (replies d'abord via parent_comment_id)
-        n_replies = db.query(SocialComment).filter(
-            SocialComment.is_deleted == True,
-            SocialComment.parent_comment_id != None,
-        )
-        if hard_delete_days > 0:
-            cutoff = now - timedelta(days=hard_delete_days)
-            n_replies = n_replies.filter(
-                SocialComment.deleted_at != None,
-                SocialComment.deleted_at < cutoff,
-            )
-        n_replies = n_replies.delete(synchronize_session="fetch")
-        # Puis les commentaires racine
-        n_root = _build_delete_filter(SocialComment).delete(synchronize_session="fetch")
-        stats["hard_deleted"]["comments"] = n_replies + n_root
+                filters += [Model.deleted_at != None, Model.deleted_at < cutoff]
+            return filters
+
+        purge_steps = [
+            ("messages", SocialMessage, _purge_filters(SocialMessage)),
+            ("conversations", SocialConversation, _purge_filters(SocialConversation)),
+            # Commentaires : replies d'abord via parent_comment_id, puis les racines
+            ("comments", SocialComment, _purge_filters(SocialComment, SocialComment.parent_comment_id != None)),
+            ("comments", SocialComment, _purge_filters(SocialComment)),
+            ("post_results", SocialPostResult, _purge_filters(SocialPostResult)),
+            ("posts", SocialPost, _purge_filters(SocialPost)),
+            ("accounts", SocialAccount, _purge_filters(SocialAccount)),
+        ]
+
+    total_steps = len(orphan_steps) + len(purge_steps) + 1
+
+    def _progress(step: int, label: str):
+        def report(table: str, done: int):
+            if on_progress:
+                on_progress(f"{label} {table} : {done} ligne(s)", int(step * 100 / total_steps))
+        if on_progress:
+            on_progress(label, int(step * 100 / total_steps))
+        return report
 
-        # PostResults
-        n = _build_delete_filter(SocialPostResult).delete(synchronize_session="fetch")
-        stats["hard_deleted"]["post_results"] = n
+    for step, (key, Model, filters) in enumerate(orphan_steps):
+        n = update_in_batches(db, Model, filters, soft_delete, _progress(step, "Orphelins"))
+        stats["orphans_cleaned"][key] += n
+        affected[Model.__tablename__] = affected.get(Model.__tablename__, 0) + n
 
-        # Posts
-        n = _build_delete_filter(SocialPost).delete(synchronize_session="fetch")
-        stats["hard_deleted"]["posts"] = n
+    for step, (key, Model, filters) in enumerate(purge_steps, start=len(orphan_steps)):
+        n = delete_in_batches(db, Model, filters, _progress(step, "Purge"))
+        stats["hard_deleted"][key] += n
+        affected[Model.__tablename__] = affected.get(Model.__tablename__, 0) + n
 
-        # Comptes
-        n = _build_delete_filter(SocialAccount).delete(synchronize_session="fetch")
-        stats["hard_deleted"]["accounts"] = n
-
-    db.commit()
+    # ── Étape 3 : VACUUM (ANALYZE) des tables fortement modifiées ──
+    _progress(total_steps - 1, "VACUUM (ANALYZE)")
+    stats["vacuumed"] = vacuum_analyze(db, tables_to_vacuum(affected))
 
     total_orphans = sum(stats["orphans_cleaned"].values())
     total_hard = sum(stats["hard_deleted"].values())
     logger.info(
         f"[CLEANUP] Nettoyage terminé: {total_orphans} orphelins nettoyés, "
-        f"{total_hard} enregistrements purgés (>{hard_delete_days}j)"
+        f"{total_hard} enregistrements purgés (>{hard_delete_days}j), "
+        f"VACUUM: {stats['vacuumed'] or 'aucun'}"
     )
 
     return stats
 
 
-def purge_published_data(db: Session) -> dict:
+def purge_published_data(db: Session, on_progress: Optional[Callable[[str, int], None]] = None) -> dict:
     """
     Purger toutes les donnees publiees du module social (hard-delete).
 
     Supprime definitivement les messages, conversations, commentaires,
     insights, resultats de publication et posts publies/erreur.
     Preserve les comptes OAuth, les brouillons et les posts planifies.
+    Suppression par lots de cle primaire, puis VACUUM (ANALYZE) des tables videes.
 
     Ordre de suppression (respect des FK) :
     1. SocialMessage (tous)
@@ -2046,34 +2011,30 @@ def purge_published_data(db: Session) -> dict:
         "post_results": 0,
         "posts": 0,
     }
+    steps = [
+        ("messages", SocialMessage, []),
+        ("conversations", SocialConversation, []),
+        ("comments", SocialComment, [SocialComment.parent_comment_id != None]),
+        ("comments", SocialComment, []),
+        ("insights", SocialPageInsight, []),
+        ("post_results", SocialPostResult, []),
+        ("posts", SocialPost, [SocialPost.status.notin_(["draft", "scheduled"])]),
+    ]
+    affected: dict[str, int] = {}
+    for step, (key, Model, filters) in enumerate(steps):
+        def report(table: str, done: int, step=step):
+            if on_progress:
+                on_progress(f"Purge {table} : {done} ligne(s)", int(step * 100 / (len(steps) + 1)))
+        n = delete_in_batches(db, Model, filters, report)
+        stats[key] += n
+        affected[Model.__tablename__] = affected.get(Model.__tablename__, 0) + n
 
-    # 1. Messages (tous)
-    stats["messages"] = db.query(SocialMessage).delete(synchronize_session="fetch")
-
-    # 2. Conversations (tous)
-    stats["conversations"] = db.query(SocialConversation).delete(synchronize_session="fetch")
-
-    # 3. Commentaires (replies d'abord via parent_comment_id, puis racines)
-    stats["comments"] = db.query(SocialComment).filter(
-        SocialComment.parent_comment_id != None,
-    ).delete(synchronize_session="fetch")
-    stats["comments"] += db.query(SocialComment).delete(synchronize_session="fetch")
-
-    # 4. Page Insights (tous)
-    stats["insights"] = db.query(SocialPageInsight).delete(synchronize_session="fetch")
-
-    # 5. PostResults (tous)
-    stats["post_results"] = db.query(SocialPostResult).delete(synchronize_session="fetch")
-
-    # 6. Posts publies/erreur (pas draft/scheduled)
-    stats["posts"] = db.query(SocialPost).filter(
-        SocialPost.status.notin_(["draft", "scheduled"]),
-    ).delete(synchronize_session="fetch")
-
-    db.commit()
+    if on_progress:
+        on_progress("VACUUM (ANALYZE)", int(len(steps) * 100 / (len(steps) + 1)))
+    vacuumed = vacuum_analyze(db, tables_to_vacuum(affected))
 
     total = sum(stats.values())
-    logger.info(f"[PURGE] Donnees publiees purgees: {total} enregistrements ({stats})")
+    logger.info(f"[PURGE] Donnees publiees purgees: {total} enregistrements ({stats}), VACUUM: {vacuumed or 'aucun'}")
     return stats
 
 
@@ -2083,8 +2044,8 @@ def purge_published_data(db: Session) -> dict:
 
 def get_reactions_breakdown(db: Session, period: str = "30d", account_id: Optional[int] = None) -> dict:
     """Repartition des reactions par type depuis les insights page."""
-    days = {"7d": 7, "30d": 30, "90d": 90, "12m": 365}.get(period, 30)
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    window = period_window(period)
+    cutoff = window.start
 
     base_q = db.query(
         func.coalesce(func.sum(SocialPageInsight.reactions_like), 0),
@@ -2116,14 +2077,14 @@ def get_reactions_breakdown(db: Session, period: str = "30d", account_id: Option
         "anger": anger,
         "total": like + love + wow + haha + sorry + anger,
         "period_start": cutoff.isoformat(),
-        "period_end": datetime.now(timezone.utc).isoformat(),
+        "period_end": window.end.isoformat(),
     }
 
 
 def get_follower_trend(db: Session, period: str = "30d", account_id: Optional[int] = None) -> dict:
     """Serie temporelle des abonnes depuis les insights page."""
-    days = {"7d": 7, "30d": 30, "90d": 90, "12m": 365}.get(period, 30)
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    window = period_window(period)
+    cutoff = window.start
 
     base_q = db.query(
         SocialPageInsight.date,
@@ -2175,14 +2136,14 @@ def get_follower_trend(db: Session, period: str = "30d", account_id: Optional[in
         "net_change_period": total_new - total_unfollows,
         "trend": trend,
         "period_start": cutoff.isoformat(),
-        "period_end": datetime.now(timezone.utc).isoformat(),
+        "period_end": window.end.isoformat(),
     }
 
 
 def get_video_performance(db: Session, period: str = "30d", account_id: Optional[int] = None) -> dict:
     """Performance video agregee depuis les insights page."""
-    days = {"7d": 7, "30d": 30, "90d": 90, "12m": 365}.get(period, 30)
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    window = period_window(period)
+    cutoff = window.start
 
     base_q = db.query(
         func.coalesce(func.sum(SocialPageInsight.page_video_views), 0),
@@ -2206,5 +2167,5 @@ def get_video_performance(db: Session, period: str = "30d", account_id: Optional
         "total_view_time_ms": total_view_time_ms,
         "avg_view_time_seconds": avg_view_time_seconds,
         "period_start": cutoff.isoformat(),
-        "period_end": datetime.now(timezone.utc).isoformat(),
+        "period_end": window.end.isoformat(),
     }
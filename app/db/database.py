@@ -1,10 +1,14 @@
 from functools import lru_cache
+from typing import Optional
+
 from fastapi import Depends
 
 from sqlalchemy import create_engine, MetaData
-from sqlalchemy.engine import URL
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.config import config
 
 # Utiliser URL.create() pour gerer nativement les caracteres speciaux
@@ -18,14 +22,170 @@ SQLALCHEMY_DATABASE_URL = URL.create(
     database=config.settings.DATABASE_NAME,
 )
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+
+def _connect_args(role: str, statement_timeout_ms: int, idle_in_transaction_timeout_ms: int) -> dict:
+    """
+    Parametres de connexion psycopg2 : application_name (visible dans
+    pg_stat_activity) et delais par session (0 = pas de limite).
+    Derriere PgBouncer, le parametre de demarrage "options" est refuse : les
+    delais se configurent alors sur le role (ALTER ROLE ... SET statement_timeout).
+    """
+    args = {"application_name": f"audace-api:{role}"}
+    if config.settings.DB_PGBOUNCER:
+        return args
+    options = []
+    if statement_timeout_ms:
+        options.append(f"-c statement_timeout={statement_timeout_ms}")
+    if idle_in_transaction_timeout_ms:
+        options.append(f"-c idle_in_transaction_session_timeout={idle_in_transaction_timeout_ms}")
+    if options:
+        args["options"] = " ".join(options)
+    return args
+
+
+def _async_connect_args(role: str, statement_timeout_ms: int, idle_in_transaction_timeout_ms: int) -> dict:
+    """
+    Equivalent asyncpg de _connect_args : parametres de session passes au
+    demarrage (server_settings). Derriere PgBouncer (mode transaction), les
+    requetes preparees ne survivent pas d'une transaction a l'autre : cache desactive.
+    """
+    server_settings = {"application_name": f"audace-api:{role}"}
+    if config.settings.DB_PGBOUNCER:
+        return {"server_settings": server_settings, "statement_cache_size": 0}
+    if statement_timeout_ms:
+        server_settings["statement_timeout"] = str(statement_timeout_ms)
+    if idle_in_transaction_timeout_ms:
+        server_settings["idle_in_transaction_session_timeout"] = str(idle_in_transaction_timeout_ms)
+    return {"server_settings": server_settings}
+
+
+def _pool_args(pool_size: int, max_overflow: int) -> dict:
+    settings = config.settings
+    if settings.DB_PGBOUNCER:
+        return {"poolclass": NullPool}
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        # Les connexions inutilisees restent en fond de pile et expirent (pool_recycle)
+        "pool_use_lifo": True,
+    }
+
+
+def direct_url(url):
+    """
+    URL des connexions de session (verrous consultatifs, LISTEN) : l'URL du
+    moteur, ou DB_DIRECT_URL derriere PgBouncer, qui en mode transaction ne
+    garde ni verrou ni LISTEN au-dela de la transaction.
+    """
+    settings = config.settings
+    if not settings.DB_PGBOUNCER:
+        return url
+    if not settings.DB_DIRECT_URL:
+        raise RuntimeError("DB_PGBOUNCER=true exige DB_DIRECT_URL (connexion directe a PostgreSQL)")
+    return make_url(settings.DB_DIRECT_URL)
+
+
+def create_app_engine(role: str, pool_size: int, max_overflow: int, statement_timeout_ms: int,
+                      idle_in_transaction_timeout_ms: int, url=SQLALCHEMY_DATABASE_URL) -> Engine:
+    """
+    Moteur PostgreSQL de l'application :
+    - pool borne (pool_size + max_overflow connexions par worker), connexions
+      verifiees avant usage (DB_POOL_PRE_PING) et renouvelees (DB_POOL_RECYCLE_SECONDS)
+    - executemany psycopg2 rapide : INSERT multi-lignes et execute_batch pour UPDATE/DELETE
+    - DB_PGBOUNCER : pas de pool local (NullPool), PgBouncer mutualise les connexions
+    """
+    pool_args = _pool_args(pool_size, max_overflow)
+    return create_engine(
+        url,
+        connect_args=_connect_args(role, statement_timeout_ms, idle_in_transaction_timeout_ms),
+        executemany_mode="values_plus_batch",
+        **pool_args,
+    )
+
+
+def create_app_async_engine(role: str, pool_size: int, max_overflow: int, statement_timeout_ms: int,
+                            idle_in_transaction_timeout_ms: int,
+                            url=SQLALCHEMY_DATABASE_URL.set(drivername="postgresql+asyncpg")) -> AsyncEngine:
+    """
+    Moteur PostgreSQL asyncpg (AsyncSession) : memes reglages de pool que
+    create_app_engine. Une requete en attente de la base ne bloque ni la
+    boucle d'evenements ni un thread du threadpool.
+    """
+    return create_async_engine(
+        url,
+        connect_args=_async_connect_args(role, statement_timeout_ms, idle_in_transaction_timeout_ms),
+        **_pool_args(pool_size, max_overflow),
+    )
+
+
+# Pool des requetes HTTP
+engine = create_app_engine(
+    "api",
+    pool_size=config.settings.DB_POOL_SIZE,
+    max_overflow=config.settings.DB_MAX_OVERFLOW,
+    statement_timeout_ms=config.settings.DB_STATEMENT_TIMEOUT_MS,
+    idle_in_transaction_timeout_ms=config.settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS,
+)
+# Pool des taches d'arriere-plan (planificateur, sauvegardes, synchronisations) :
+# une tache longue ne prive jamais les requetes HTTP de connexions
+background_engine = create_app_engine(
+    "jobs",
+    pool_size=config.settings.DB_JOBS_POOL_SIZE,
+    max_overflow=config.settings.DB_JOBS_MAX_OVERFLOW,
+    statement_timeout_ms=config.settings.DB_JOBS_STATEMENT_TIMEOUT_MS,
+    idle_in_transaction_timeout_ms=config.settings.DB_JOBS_IDLE_IN_TRANSACTION_TIMEOUT_MS,
+)
+
+# Pool des routes async (asyncpg) : endpoints publics, tableau de bord, listes
+async_engine = create_app_async_engine(
+    "api-async",
+    pool_size=config.settings.DB_ASYNC_POOL_SIZE,
+    max_overflow=config.settings.DB_ASYNC_MAX_OVERFLOW,
+    statement_timeout_ms=config.settings.DB_STATEMENT_TIMEOUT_MS,
+    idle_in_transaction_timeout_ms=config.settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS,
+)
+
+# DB_PGBOUNCER sans DB_DIRECT_URL : refus au demarrage plutot qu'a la premiere election
+direct_url(SQLALCHEMY_DATABASE_URL)
 
 SessionLocal=sessionmaker(autocommit=False, autoflush=False, bind=engine)
+BackgroundSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=background_engine)
+# expire_on_commit=False : pas de rechargement implicite (donc d'I/O) apres commit
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 # donne acces a tout le model  SQLAlchemy dans le projet
 Base = declarative_base()
 
 metadata = MetaData()
 
+
+def pool_status(pool_engine: Engine, role: Optional[str] = None) -> dict:
+    """Etat du pool de connexions d'un moteur (pour ce worker)."""
+    pool = pool_engine.pool
+    status = {"role": role, "pool": type(pool).__name__}
+    if hasattr(pool, "checkedout"):
+        status.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "timeout_seconds": pool.timeout(),
+        })
+    return status
+
+
+def get_pools_status() -> list[dict]:
+    """Etat des pools requetes HTTP et taches d'arriere-plan."""
+    return [
+        pool_status(engine, "api"),
+        pool_status(background_engine, "jobs"),
+        pool_status(async_engine.sync_engine, "api-async"),
+    ]
+
+
 # Dependency (cree une session sur la db et donne une connectivite a la db et ferme la session a la fin de la requette)
 def get_db():
     db = SessionLocal()
@@ -35,6 +195,14 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """
+    Dependance des routes `async def` : AsyncSession sur le pool asyncpg.
+    Le code CRUD synchrone existant s'y execute tel quel via
+    `await db.run_sync(fonction_crud, ...)` (les requetes restent asynchrones).
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
 
 
-# create_default_role_and_permission(Depends(get_db))
\ No newline at end of file
+# create_default_role_and_permission(Depends(get_db))
@@ -1,30 +1,83 @@
-import time  # Module pour mesurer le temps
-from fastapi import Request  # Classe pour représenter une requête HTTP
-from starlette.middleware.base import BaseHTTPMiddleware  # Classe de base pour créer des middlewares
-import logging  # Module pour la gestion des logs
+"""
+Middleware ASGI de journalisation des acces HTTP.
 
-# Configuration du logger
-logger = logging.getLogger("hapson-api")  # Création d'un logger spécifique pour l'API
+Implementation ASGI pure (pas de BaseHTTPMiddleware) : la reponse n'est ni
+copiee ni rejouee, seul le message http.response.start est lu pour le statut.
+Une ligne par requete (methode, chemin, statut, duree), ecrite par le thread
+du QueueListener (app/config/logging_config.py), hors de la boucle d'evenements.
 
-class LoggerMiddleware(BaseHTTPMiddleware):
+Parametres (app/config/config.py) :
+- ACCESS_LOG_SAMPLE_RATE : part des requetes reussies et rapides journalisees
+  (0.0 a 1.0) ; erreurs (statut >= 400) et requetes lentes toujours journalisees
+- ACCESS_LOG_SLOW_MS : seuil de requete lente (ms)
+- ACCESS_LOG_FORMAT : "text" ou "json" (une ligne JSON par requete)
+"""
+
+import logging
+import random
+import time
+from typing import Optional
+
+import orjson
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.config import settings
+
+logger = logging.getLogger("hapson-api.access")
+
+
+class LoggerMiddleware:
     """
-    Middleware pour journaliser les requêtes entrantes, les réponses et le temps de traitement.
+    Middleware pour journaliser les requetes : statut et temps de traitement
+    (jusqu'a l'envoi complet de la reponse).
     """
-    async def dispatch(self, request: Request, call_next):
-        # Temps de départ pour mesurer la durée de la requête
-        start_time = time.time()
 
-        # Log de la requête entrante
-        logger.info(f"Incoming Request: {request.method} {request.url}")
+    def __init__(self, app: ASGIApp, sample_rate: Optional[float] = None,
+                 slow_ms: Optional[int] = None, log_format: Optional[str] = None):
+        self.app = app
+        self.sample_rate = settings.ACCESS_LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.slow_ms = settings.ACCESS_LOG_SLOW_MS if slow_ms is None else slow_ms
+        self.json = (settings.ACCESS_LOG_FORMAT if log_format is None else log_format) == "json"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500  # Exception avant l'envoi des en-tetes
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
-        # Passer la requête au prochain middleware ou endpoint
-        response = await call_next(request)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self._log(scope, status_code, (time.perf_counter() - start_time) * 1000)
 
-        # Calculer le temps de traitement
-        process_time = time.time() - start_time
+    def _log(self, scope: Scope, status_code: int, duration_ms: float) -> None:
+        if status_code < 400 and duration_ms < self.slow_ms:
+            if self.sample_rate <= 0 or (self.sample_rate < 1 and random.random() >= self.sample_rate):
+                return
+        if not logger.isEnabledFor(logging.INFO):
+            return
 
-        # Log de la réponse avec le statut et le temps de traitement
-        logger.info(f"Completed Request: {request.method} {request.url} - Status: {response.status_code} - Time: {process_time:.2f}s")
+        path = scope["path"]
+        if scope.get("query_string"):
+            path = f"{path}?{scope['query_string'].decode('latin-1')}"
+        client = scope.get("client")
 
-        # Retourner la réponse au client
-        return response
+        if self.json:
+            logger.info(orjson.dumps({
+                "method": scope["method"],
+                "path": path,
+                "status": status_code,
+                "duration_ms": round(duration_ms, 1),
+                "client": client[0] if client else None,
+            }).decode())
+        else:
+            logger.info("Completed Request: %s %s - Status: %d - Time: %.1fms",
+                        scope["method"], path, status_code, duration_ms)
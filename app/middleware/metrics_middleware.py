@@ -0,0 +1,44 @@
+"""
+Middleware ASGI des metriques HTTP (app/services/metrics.py).
+
+Mesure chaque requete jusqu'a l'envoi complet de la reponse et l'enregistre
+sous le modele de la route resolue par FastAPI (scope["route"]) ; les chemins
+sans route sont regroupes sous "<unmatched>".
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services import metrics
+
+
+class MetricsMiddleware:
+    """Latence, statut et requetes SQL par route."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        stats, token = metrics.start_request()
+        status_code = 500  # Exception avant l'envoi des en-tetes
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            metrics.observe_request(
+                scope["method"], getattr(route, "path", "<unmatched>"), status_code,
+                time.perf_counter() - start_time, stats, token,
+            )
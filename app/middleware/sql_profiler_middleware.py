@@ -0,0 +1,52 @@
+"""
+Middleware ASGI de profilage SQL (app/services/sql_profiler.py), active en
+developpement / recette par SQL_PROFILING=true.
+
+- En-tetes X-DB-Queries (nombre de requetes) et Server-Timing (duree SQL,
+  visible dans l'onglet Timing des outils de developpement du navigateur)
+- Avertissement journalise si la requete depasse SQL_QUERY_BUDGET requetes ou
+  repete une meme forme SQL_REPEAT_THRESHOLD fois (N+1), avec l'origine dans le code
+
+Les en-tetes sont ecrits au debut de la reponse : les requetes executees
+pendant le streaming du corps ne sont comptees que dans le journal.
+"""
+
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.config import settings
+from app.services import sql_profiler
+
+logger = logging.getLogger("hapson-api.sql")
+
+
+class SQLProfilerMiddleware:
+    """Compte et analyse les requetes SQL de chaque requete HTTP."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        sql_profiler.install()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile, token = sql_profiler.start()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Queries"] = str(profile.count)
+                headers.append("Server-Timing", f'db;dur={profile.duration_ms:.1f};desc="{profile.count} queries"')
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            sql_profiler.stop(token)
+            if profile.count > settings.SQL_QUERY_BUDGET or profile.repeated():
+                logger.warning("Requetes SQL a surveiller : %s %s - %s",
+                               scope["method"], scope["path"], profile.report())
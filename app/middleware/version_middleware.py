@@ -3,11 +3,14 @@ Middleware pour gérer le versioning de l'API.
 
 Ce middleware ajoute automatiquement les headers de version dans toutes les réponses
 et permet de gérer les versions dépréciées.
+
+Implementation ASGI pure : les headers sont ajoutes au message
+http.response.start, sans envelopper le corps de la reponse.
 """
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app.__version__ import (
     get_version,
     get_api_version,
@@ -21,34 +24,42 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class APIVersionMiddleware(BaseHTTPMiddleware):
+class APIVersionMiddleware:
     """
     Middleware pour injecter les informations de version dans les réponses.
-    
+
     Ajoute automatiquement :
     - X-API-Version: Version actuelle de l'API
     - X-Min-Client-Version: Version minimale du client requise
     - Avertissements pour les versions dépréciées
     """
-    
-    async def dispatch(self, request: Request, call_next):
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Extraire la version de l'URL si présente (ex: /api/v1/...)
-        path = request.url.path
+        path = scope["path"]
         requested_version = None
-        
+
         if path.startswith("/api/v"):
             parts = path.split("/")
             if len(parts) > 2:
                 requested_version = parts[2]  # v1, v2, etc.
-        
+
         # Vérifier si la version est dépréciée
         if requested_version and is_version_deprecated(requested_version):
+            client = scope.get("client")
             logger.warning(
                 f"Deprecated API version {requested_version} accessed from "
-                f"{request.client.host} - {request.method} {path}"
+                f"{client[0] if client else 'unknown'} - {scope['method']} {path}"
             )
-            
-            return JSONResponse(
+
+            response = JSONResponse(
                 status_code=410,
                 content={
                     "error": "API version deprecated",
@@ -61,20 +72,23 @@ class APIVersionMiddleware(BaseHTTPMiddleware):
                     "X-Deprecated-Version": requested_version,
                 }
             )
-        
-        # Continuer le traitement
-        response = await call_next(request)
-        
-        # Ajouter les headers de version
-        response.headers[VERSION_HEADER] = get_version()
-        response.headers[MIN_VERSION_HEADER] = VERSION_INFO["min_client_version"]
-        response.headers["X-API-Path-Version"] = get_api_version()
-        
-        # Ajouter un warning si la version est proche de la dépréciation
-        if requested_version and requested_version != get_api_version():
-            response.headers["Warning"] = (
-                f'299 - "You are using API version {requested_version}. '
-                f'Latest version is {get_api_version()}."'
-            )
-        
-        return response
+            await response(scope, receive, send)
+            return
+
+        async def send_with_version(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Ajouter les headers de version
+                headers = MutableHeaders(scope=message)
+                headers[VERSION_HEADER] = get_version()
+                headers[MIN_VERSION_HEADER] = VERSION_INFO["min_client_version"]
+                headers["X-API-Path-Version"] = get_api_version()
+
+                # Ajouter un warning si la version est proche de la dépréciation
+                if requested_version and requested_version != get_api_version():
+                    headers["Warning"] = (
+                        f'299 - "You are using API version {requested_version}. '
+                        f'Latest version is {get_api_version()}."'
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_with_version)
@@ -16,7 +16,7 @@ from .model_permission import Permission
 from .model_role import Role
 from .model_role_permission import RolePermission
 from .model_login_history import LoginHistory
-from .model_audit_log import AuditLog
+from .model_audit_log import AuditLog, AuditLogCounter
 from .model_archive_log_audit import ArchivedAuditLog
 from .model_notification import Notification
 from .model_presenter import Presenter
@@ -77,6 +77,12 @@ from .model_ga_property import GaProperty
 # Module RSS
 from .model_rss import RssFeed, RssArticle
 
+# Planificateur de taches
+from .model_job_run import JobRun
+
+# Cache partage entre workers
+from .model_shared_cache import SharedCacheEntry
+
 # from .model_show_segment import ShowSegment
 # from .model_show_presenter import ShowPresenter
 
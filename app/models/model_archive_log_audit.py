@@ -16,7 +16,7 @@ class ArchivedAuditLog(Base):
     __tablename__ = "archived_audit_logs"  # Table pour l'archivage des logs d'audit
     id = Column(Integer, primary_key=True)  # Identifiant du log archivé
     # user_id = Column(Integer, ForeignKey('users.id'))  # Référence à l'utilisateur
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # NULL pour les actions systeme
     action = Column(String, nullable=False)  # Action effectuée
     table_name = Column(String, nullable=False)  # Table concernée
     record_id = Column(Integer, nullable=False)  # Identifiant de l'enregistrement concerné
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, BigInteger, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -10,12 +10,23 @@ from app.db.database import Base #metadata
 class AuditLog(Base):
     __tablename__ = "audit_logs"  # Table des logs d'audit
 
-    id = Column(Integer, primary_key=True)  # Identifiant du log
+    # Table partitionnee par mois sur `timestamp` (cle primaire composite
+    # imposee par PostgreSQL pour les tables partitionnees).
+    # Partitions : audit_logs_pYYYYMM + audit_logs_default (voir crud_audit_logs).
+    # autoincrement=True : id genere par la sequence (cle composite) et relu via RETURNING
+    id = Column(Integer, primary_key=True, autoincrement=True)  # Identifiant du log
     user_id = Column(Integer, ForeignKey('users.id'))  # Référence à l'utilisateur ayant effectué l'action
     action = Column(String, nullable=False)  # Action effectuée (par exemple : "create", "update", "delete")
     table_name = Column(String, nullable=False)  # Nom de la table concernée
     record_id = Column(Integer, nullable=False)  # Identifiant de l'enregistrement concerné
-    timestamp = Column(DateTime, nullable=False, default=datetime.utcnow)  # Date et heure de l'action
+    timestamp = Column(DateTime, primary_key=True, nullable=False, default=datetime.utcnow)  # Date et heure de l'action
+
+    __table_args__ = (
+        Index("ix_audit_logs_user_id_timestamp", "user_id", "timestamp"),
+        Index("ix_audit_logs_table_name_timestamp", "table_name", "timestamp"),
+        Index("ix_audit_logs_timestamp_id", "timestamp", "id"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
 
     # # Relation vers l'utilisateur
     # user = relationship("User", back_populates="audit_logs")
@@ -23,7 +34,25 @@ class AuditLog(Base):
     user = relationship("User", back_populates="audit_logs")
 
 
+# -------------------------
+# Compteurs agreges des logs d'audit
+# -------------------------
+class AuditLogCounter(Base):
+    """
+    Compteurs incrementaux par action et par table.
+
+    Maintenus par le trigger PostgreSQL `audit_log_counters_bump` (INSERT/DELETE
+    sur audit_logs) et decrementes en bloc lors du detachement d'une partition.
+    Evite le GROUP BY sur toute la table a chaque affichage des statistiques.
+    """
+    __tablename__ = "audit_log_counters"
+
+    dimension = Column(String(16), primary_key=True)  # "action" ou "table"
+    key = Column(String, primary_key=True)  # Valeur de l'action ou nom de la table
+    count = Column(BigInteger, nullable=False, default=0)
+
+
 
 
 # Ce fichier définit la table des logs d'audit, où chaque action effectuée par un utilisateur est enregistrée.
-# Cela permet de tracer les modifications dans les données du système.
\ No newline at end of file
+# Cela permet de tracer les modifications dans les données du système.
@@ -1,6 +1,6 @@
 from sqlalchemy import (
     Column, Integer, String, Text, DateTime, Date, Boolean, Float, JSON,
-    ForeignKey, Index, func,
+    ForeignKey, Index, func, text,
 )
 from sqlalchemy.orm import relationship
 from app.db.database import Base
@@ -119,4 +119,6 @@ class InventoryEquipment(BaseModel):
         Index('ix_equipment_company_status', 'company_id', 'status_id'),
         Index('ix_equipment_category', 'category_id'),
         Index('ix_equipment_is_archived', 'is_archived'),
+        # Liste par defaut : equipements non supprimes, archives ou non, plus recents d'abord
+        Index('ix_equipment_active_created', 'is_archived', 'created_at', postgresql_where=text('is_deleted = false')),
     )
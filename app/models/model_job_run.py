@@ -0,0 +1,30 @@
+"""
+Modele SQLAlchemy de l'historique du planificateur de taches.
+
+Table :
+- job_runs : une ligne par execution d'une tache periodique (job_runner)
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+
+
+class JobRun(Base):
+    """Execution d'une tache planifiee (statut running, success, error ou timeout)."""
+    __tablename__ = "job_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_name = Column(String(64), nullable=False)
+    status = Column(String(20), nullable=False, default="running")
+    started_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    duration_ms = Column(Integer, nullable=True)
+    result = Column(JSON, nullable=True)
+    error_message = Column(Text, nullable=True)
+    worker = Column(String(100), nullable=True)  # hote:pid du worker leader
+
+    __table_args__ = (
+        Index("ix_job_runs_job_name_started_at", "job_name", "started_at"),
+    )
@@ -11,7 +11,7 @@ class SegmentGuest(Base):
     
     id = Column(Integer, primary_key=True)  # Identifiant unique pour la table associative
     segment_id = Column(Integer, ForeignKey("segments.id", ondelete="CASCADE"), nullable=False)
-    guest_id = Column(Integer, ForeignKey("guests.id", ondelete="CASCADE"), nullable=False)
+    guest_id = Column(Integer, ForeignKey("guests.id", ondelete="CASCADE"), nullable=False, index=True)  # Index : comptage des participations par invité
     # segment_id = Column(Integer, ForeignKey("segments.id"), nullable=False, index=True)  # Clé étrangère vers Segment
     # guest_id = Column(Integer, ForeignKey("guests.id"), nullable=False, index=True)  # Clé étrangère vers Guest
     created_at = Column(DateTime, server_default=func.now(), nullable=False)  # Date de création de la liaison
@@ -0,0 +1,30 @@
+"""
+Modele SQLAlchemy du cache partage entre workers.
+
+Table :
+- shared_cache_entries : une ligne par cle (espace de noms + cle), valeur JSON
+  avec ses echeances de fraicheur et de peremption (app/services/shared_cache.py)
+"""
+
+from sqlalchemy import Column, String, DateTime, JSON, Index
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+
+
+class SharedCacheEntry(Base):
+    """Valeur en cache : fraiche jusqu'a expires_at, encore servie jusqu'a stale_until."""
+    __tablename__ = "shared_cache_entries"
+
+    namespace = Column(String(50), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    value = Column(JSON, nullable=True)
+    stored_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    stale_until = Column(DateTime(timezone=True), nullable=False)
+    accessed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # Eviction LRU par espace de noms
+        Index("ix_shared_cache_entries_namespace_accessed", "namespace", "accessed_at"),
+    )
@@ -16,7 +16,7 @@ class ShowPresenter(Base):
     id = Column(Integer, primary_key=True)  # Identifiant unique de la relation
     show_id = Column(Integer, ForeignKey("shows.id", ondelete="CASCADE"), nullable=False, index=True)  # Clé étrangère vers Show
    #  presenter_id = Column(Integer, ForeignKey("presenters.id"), nullable=False, index=True)  # Clé étrangère vers Presenter
-    presenter_id = Column(Integer, ForeignKey("presenters.id", ondelete="CASCADE"), nullable=False)
+    presenter_id = Column(Integer, ForeignKey("presenters.id", ondelete="CASCADE"), nullable=False, index=True)  # Index : comptage des émissions par présentateur
 
     role = Column(String, nullable=True)  # Rôle du présentateur dans l'émission (e.g., Animateur, Invité)
     added_at = Column(DateTime, server_default=func.now(), nullable=False)  # Date d'ajout de la relation
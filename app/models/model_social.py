@@ -15,7 +15,7 @@ Tous les modèles utilisent le soft delete (BaseModel).
 
 from sqlalchemy import (
     Column, Integer, String, Text, DateTime, Boolean, Float, Date,
-    ForeignKey, func, Enum as SAEnum, UniqueConstraint, text,
+    ForeignKey, func, Enum as SAEnum, UniqueConstraint, Index, text,
 )
 from sqlalchemy.orm import relationship, backref
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
@@ -76,6 +76,15 @@ class SocialAccount(SocialBaseModel):
 class SocialPost(SocialBaseModel):
     """Publication multi-plateformes."""
     __tablename__ = "social_posts"
+    __table_args__ = (
+        # File de publication planifiee : prochaines echeances (index partiel, petit)
+        Index(
+            "ix_social_posts_scheduled_due", "scheduled_at",
+            postgresql_where=text("status = 'scheduled' AND is_deleted = false"),
+        ),
+        # Liste des publications (non supprimees, plus recentes d'abord)
+        Index("ix_social_posts_active_created", "created_at", postgresql_where=text("is_deleted = false")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
@@ -109,6 +118,11 @@ class SocialPost(SocialBaseModel):
 class SocialPostResult(SocialBaseModel):
     """Résultat de publication d'un post sur un compte spécifique."""
     __tablename__ = "social_post_results"
+    __table_args__ = (
+        # Synchronisation : post existant pour (page, id Facebook)
+        Index("ix_social_post_results_account_platform_post", "account_id", "platform_post_id"),
+        Index("ix_social_post_results_post_id", "post_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     post_id = Column(Integer, ForeignKey("social_posts.id", ondelete="CASCADE"), nullable=False)
@@ -143,6 +157,16 @@ class SocialPostResult(SocialBaseModel):
 class SocialComment(SocialBaseModel):
     """Commentaire reçu sur un post social."""
     __tablename__ = "social_comments"
+    __table_args__ = (
+        # Boite de reception : commentaires racine non supprimes, plus recents d'abord
+        Index(
+            "ix_social_comments_root_created", "created_at",
+            postgresql_where=text("is_deleted = false AND parent_comment_id IS NULL"),
+        ),
+        Index("ix_social_comments_post_id", "post_id"),
+        Index("ix_social_comments_parent_comment_id", "parent_comment_id"),
+        Index("ix_social_comments_account_id", "account_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     platform_comment_id = Column(String(255), nullable=False, unique=True)
@@ -187,6 +211,9 @@ class SocialComment(SocialBaseModel):
 class SocialConversation(SocialBaseModel):
     """Conversation de messages privés avec un utilisateur externe."""
     __tablename__ = "social_conversations"
+    __table_args__ = (
+        Index("ix_social_conversations_account_id", "account_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     account_id = Column(Integer, ForeignKey("social_accounts.id", ondelete="CASCADE"), nullable=False)
@@ -210,6 +237,10 @@ class SocialConversation(SocialBaseModel):
 class SocialMessage(SocialBaseModel):
     """Message privé individuel dans une conversation."""
     __tablename__ = "social_messages"
+    __table_args__ = (
+        # Fil d'une conversation (relation ordonnee par created_at)
+        Index("ix_social_messages_conversation_created", "conversation_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     conversation_id = Column(Integer, ForeignKey("social_conversations.id", ondelete="CASCADE"), nullable=False)
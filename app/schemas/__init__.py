@@ -12,7 +12,7 @@ from .schema_notifications import NotificationCreate, NotificationRead, Notifica
 from .schema_presenters import PresenterCreate, PresenterUpdate, PresenterResponse,PresenterHistory, PresenterSearch,PresenterResponsePaged
 from .schema_presenter_history import PresenterHistoryCreate, PresenterHistoryRead
 from .schema_guests import GuestCreate,  GuestUpdate,GuestResponse
-from .schema_segment import SegmentCreate, SegmentUpdate,SegmentPositionUpdate,SegmentBase,SegmentResponse
+from .schema_segment import SegmentCreate, SegmentUpdate,SegmentPositionUpdate,SegmentOrderUpdate,SegmentBase,SegmentResponse
 from .schema_show import ShowCreate, ShowOut,ShowUpdate,ShowCreateWithDetail,SegmentDetailCreate,ShowUpdateWithDetails, SegmentUpdateWithDetails,ShowWithdetailResponse,ShowBase_jsonShow,ShowStatuslUpdate, SearchShowFilters
 from .schema_public import (
     PublicAlertCreate, PublicAlertUpdate, PublicAlertResponse,
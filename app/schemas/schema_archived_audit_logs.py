@@ -1,8 +1,9 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
+from typing import Optional
 
 class ArchivedAuditLogBase(BaseModel):
-    user_id: int
+    user_id: Optional[int] = None
     action: str
     table_name: str
     record_id: int
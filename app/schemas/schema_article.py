@@ -135,6 +135,7 @@ class ArticleStatsResponse(BaseModel):
     top_articles: list[TopArticle]
     by_site: list[ArticleSiteStat]
     by_category: list[ArticleCategoryStat]
+    generated_at: Optional[str] = None  # date de l'instantane
 
 
 # ════════════════════════════════════════════════════════════════
@@ -34,11 +34,15 @@ class AuditLog(AuditLogBase):
 class AuditLogPaginated(BaseModel):
     """
     Réponse paginée pour les logs d'audit.
+
+    total vaut None en pagination par curseur (comptage non recalculé).
+    next_cursor permet de demander la page suivante via ?cursor=.
     """
-    total: int
+    total: Optional[int] = None
     items: List[AuditLog]
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
 
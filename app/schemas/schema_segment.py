@@ -38,6 +38,10 @@ class SegmentPositionUpdate(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class SegmentOrderUpdate(BaseModel):
+    """Nouvel ordre complet des segments d'une émission (IDs dans l'ordre voulu)."""
+    segment_ids: List[int]
+
 class SegmentResponse(SegmentBase):
     id: int
     created_at: datetime
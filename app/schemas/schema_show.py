@@ -78,7 +78,7 @@ class SegmentUpdateWithDetails(BaseModel):
     position: int
     duration: int
     description: Optional[str] = None
-    guest_ids: Optional[List[int]] = []
+    guest_ids: Optional[List[int]] = None  # None : liens invites inchanges
 
     model_config = ConfigDict(from_attributes=True)
 
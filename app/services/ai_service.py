@@ -8,13 +8,19 @@ adaptee a une radio communautaire.
 
 import re
 import html
+import hashlib
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import httpx
 from fastapi import HTTPException, status
 
 from app.config.config import settings
+from app.services import http_client
+from app.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger("hapson-api")
 
@@ -24,6 +30,93 @@ FETCH_TIMEOUT = 15.0
 MAX_ARTICLE_CHARS = 4000
 # Limite de caracteres pour les transcriptions YouTube (plus genereux car contenu dense)
 MAX_YOUTUBE_TRANSCRIPT_CHARS = 8000
+# Nombre maximal de sources lues en parallele pour un article
+MAX_ARTICLE_SOURCES = 3
+
+# Contenu extrait par URL normalisee (15 min) et reponses IA des ameliorations (1 h)
+_source_cache = TTLCache(ttl=15 * 60, maxsize=256)
+_improve_cache = TTLCache(ttl=60 * 60, maxsize=512)
+
+# Options des requetes sortantes (client poole par hote, cf. http_client)
+FETCH_HTTP_OPTIONS = {
+    "follow_redirects": True,
+    "headers": {"User-Agent": "Mozilla/5.0 (compatible; RadioManager/1.0)"},
+}
+
+# Client LLM reutilisable, cree a la demande
+_llm_client = None
+_clients_lock = threading.Lock()
+
+
+class _MistralChatClient:
+    """
+    Adaptateur unique autour du SDK Mistral (v1.x ou v0.x).
+
+    Toute implementation exposant `complete(messages, max_tokens, temperature) -> str`
+    peut le remplacer via set_llm_client() (ex: stub dans les tests).
+    """
+
+    def __init__(self, api_key: str):
+        # SDK v1.x : from mistralai import Mistral
+        # SDK v0.x : from mistralai.client import MistralClient
+        try:
+            from mistralai import Mistral
+            self._client = Mistral(api_key=api_key)
+            self._legacy = False
+        except ImportError:
+            from mistralai.client import MistralClient
+            self._client = MistralClient(api_key=api_key)
+            self._legacy = True
+
+    def complete(self, messages: list[dict], max_tokens: int, temperature: float) -> str:
+        if self._legacy:
+            from mistralai.models.chat_completion import ChatMessage
+            response = self._client.chat(
+                model="mistral-small-latest",
+                messages=[ChatMessage(role=m["role"], content=m["content"]) for m in messages],
+                max_tokens=max_tokens,
+                temperature=temperature,
+            )
+        else:
+            response = self._client.chat.complete(
+                model="mistral-small-latest",
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+            )
+        return response.choices[0].message.content.strip()
+
+
+def _get_llm_client():
+    """Retourne le client LLM partage (cree a la premiere utilisation)."""
+    global _llm_client
+    with _clients_lock:
+        if _llm_client is None:
+            _llm_client = _MistralChatClient(settings.MISTRAL_API_KEY)
+        return _llm_client
+
+
+def set_llm_client(client) -> None:
+    """Remplace le client LLM (tests) et vide le cache des ameliorations."""
+    global _llm_client
+    with _clients_lock:
+        _llm_client = client
+    _improve_cache.clear()
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalise une URL pour la cle de cache : schema/hote en minuscules,
+    sans fragment, sans parametres de tracking (utm_*, fbclid, gclid),
+    parametres tries et sans slash final.
+    """
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in ("fbclid", "gclid")
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
 
 # ═══════════════════════════════════════════════════════════════
 # Unicode Bold — pour le formatage Facebook (pas de Markdown)
@@ -91,13 +184,12 @@ def fetch_youtube_transcript(url: str) -> dict:
     title = ""
     author = ""
     try:
-        with httpx.Client(timeout=10.0) as client:
-            oembed_url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
-            resp = client.get(oembed_url)
-            if resp.status_code == 200:
-                data = resp.json()
-                title = data.get("title", "")
-                author = data.get("author_name", "")
+        oembed_url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
+        resp = http_client.get(oembed_url, timeout=10.0, **FETCH_HTTP_OPTIONS)
+        if resp.status_code == 200:
+            data = resp.json()
+            title = data.get("title", "")
+            author = data.get("author_name", "")
     except Exception as e:
         logger.warning(f"Impossible de recuperer les metadonnees oEmbed pour {video_id}: {e}")
 
@@ -141,7 +233,14 @@ def fetch_content_from_url(url: str) -> dict:
       - source_type: 'article' | 'youtube'
       - text: le texte extrait
       - metadata: dict de metadonnees (vide pour les articles, riche pour YouTube)
+
+    Le resultat est mis en cache 15 min par URL normalisee.
     """
+    return _source_cache.get_or_set(normalize_url(url), lambda: _fetch_content_from_url_uncached(url))
+
+
+def _fetch_content_from_url_uncached(url: str) -> dict:
+    """Extraction effective du contenu (sans cache), voir fetch_content_from_url."""
     if is_youtube_url(url):
         yt_data = fetch_youtube_transcript(url)
         return {
@@ -173,10 +272,7 @@ def fetch_article_text(url: str) -> str:
     Pas de dependance externe (pas de BeautifulSoup).
     """
     try:
-        with httpx.Client(timeout=FETCH_TIMEOUT, follow_redirects=True) as client:
-            response = client.get(url, headers={
-                "User-Agent": "Mozilla/5.0 (compatible; RadioManager/1.0)"
-            })
+        response = http_client.get(url, timeout=FETCH_TIMEOUT, **FETCH_HTTP_OPTIONS)
 
         if response.status_code != 200:
             raise HTTPException(
@@ -233,7 +329,7 @@ def generate_post_from_article(article_text: str, url: str, mode: str = "post_en
     Le prompt est adapte selon le mode choisi et enrichi
     par les instructions supplementaires de l'utilisateur.
     """
-    if not settings.MISTRAL_API_KEY:
+    if _llm_client is None and not settings.MISTRAL_API_KEY:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Service IA non configure (cle API Mistral manquante)"
@@ -350,51 +446,13 @@ def generate_post_from_article(article_text: str, url: str, mode: str = "post_en
         {"role": "user", "content": user_prompt},
     ]
 
-    try:
-        # SDK v1.x : from mistralai import Mistral
-        # SDK v0.x : from mistralai.client import MistralClient
-        try:
-            from mistralai import Mistral
-            client = Mistral(api_key=settings.MISTRAL_API_KEY)
-            response = client.chat.complete(
-                model="mistral-small-latest",
-                messages=messages,
-                max_tokens=300,
-                temperature=0.7,
-            )
-        except ImportError:
-            from mistralai.client import MistralClient
-            from mistralai.models.chat_completion import ChatMessage
-            client = MistralClient(api_key=settings.MISTRAL_API_KEY)
-            response = client.chat(
-                model="mistral-small-latest",
-                messages=[ChatMessage(role=m["role"], content=m["content"]) for m in messages],
-                max_tokens=300,
-                temperature=0.7,
-            )
-
-        generated = response.choices[0].message.content.strip()
-
-        if not generated:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail="L'IA n'a pas genere de contenu"
-            )
+    generated = _call_mistral(messages, max_tokens=300, temperature=0.7)
 
-        # Convertir le markdown bold (**texte**) en Unicode bold pour Facebook
-        generated = _markdown_bold_to_unicode(generated)
+    # Convertir le markdown bold (**texte**) en Unicode bold pour Facebook
+    generated = _markdown_bold_to_unicode(generated)
 
-        logger.info(f"Post IA genere ({len(generated)} chars) pour URL: {url}")
-        return generated
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Erreur Mistral API: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=f"Erreur lors de la generation IA : {str(e)}"
-        )
+    logger.info(f"Post IA genere ({len(generated)} chars) pour URL: {url}")
+    return generated
 
 
 # ════════════════════════════════════════════════════════════════
@@ -413,35 +471,15 @@ def _strip_html_simple(html_text: str) -> str:
 
 
 def _call_mistral(messages: list[dict], max_tokens: int = 300, temperature: float = 0.7) -> str:
-    """Appelle l'API Mistral et retourne le texte genere."""
-    if not settings.MISTRAL_API_KEY:
+    """Appelle l'API Mistral (client partage) et retourne le texte genere."""
+    if _llm_client is None and not settings.MISTRAL_API_KEY:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Service IA non configure (cle API Mistral manquante)"
         )
 
     try:
-        try:
-            from mistralai import Mistral
-            client = Mistral(api_key=settings.MISTRAL_API_KEY)
-            response = client.chat.complete(
-                model="mistral-small-latest",
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=temperature,
-            )
-        except ImportError:
-            from mistralai.client import MistralClient
-            from mistralai.models.chat_completion import ChatMessage
-            client = MistralClient(api_key=settings.MISTRAL_API_KEY)
-            response = client.chat(
-                model="mistral-small-latest",
-                messages=[ChatMessage(role=m["role"], content=m["content"]) for m in messages],
-                max_tokens=max_tokens,
-                temperature=temperature,
-            )
-
-        generated = response.choices[0].message.content.strip()
+        generated = _get_llm_client().complete(messages, max_tokens=max_tokens, temperature=temperature)
         if not generated:
             raise HTTPException(
                 status_code=status.HTTP_502_BAD_GATEWAY,
@@ -472,26 +510,37 @@ def generate_article_from_urls(
 
     Retourne un dict avec title, content, excerpt.
     """
-    # Extraire le texte de chaque URL (max 3)
-    sources = []
-    has_youtube = False
-    for url in urls[:3]:
+    # Extraire le texte de chaque URL (max 3), en parallele, dans l'ordre d'origine
+    def _safe_fetch(url: str) -> dict | None:
         try:
-            content_data = fetch_content_from_url(url)
-            text = content_data["text"]
-            # Augmenter la limite pour les articles
-            if len(text) > MAX_ARTICLE_SOURCE_CHARS:
-                text = text[:MAX_ARTICLE_SOURCE_CHARS] + "..."
-            source_entry = {"url": url, "text": text, "source_type": content_data["source_type"]}
-            if content_data["source_type"] == "youtube":
-                has_youtube = True
-                meta = content_data["metadata"]
-                if meta.get("title"):
-                    source_entry["yt_title"] = meta["title"]
-            sources.append(source_entry)
+            return fetch_content_from_url(url)
         except Exception as e:
             logger.warning(f"Impossible d'extraire {url}: {e}")
+            return None
+
+    selected_urls = urls[:MAX_ARTICLE_SOURCES]
+    if len(selected_urls) > 1:
+        with ThreadPoolExecutor(max_workers=len(selected_urls), thread_name_prefix="ai-fetch") as pool:
+            fetched = list(pool.map(_safe_fetch, selected_urls))
+    else:
+        fetched = [_safe_fetch(url) for url in selected_urls]
+
+    sources = []
+    has_youtube = False
+    for url, content_data in zip(selected_urls, fetched):
+        if content_data is None:
             continue
+        text = content_data["text"]
+        # Augmenter la limite pour les articles
+        if len(text) > MAX_ARTICLE_SOURCE_CHARS:
+            text = text[:MAX_ARTICLE_SOURCE_CHARS] + "..."
+        source_entry = {"url": url, "text": text, "source_type": content_data["source_type"]}
+        if content_data["source_type"] == "youtube":
+            has_youtube = True
+            meta = content_data["metadata"]
+            if meta.get("title"):
+                source_entry["yt_title"] = meta["title"]
+        sources.append(source_entry)
 
     if not sources:
         raise HTTPException(
@@ -710,18 +759,21 @@ def improve_text(
 
     is_html = content_type == "article"
 
-    if action == "correct":
-        result = _improve_correct(input_text, is_html)
-    elif action == "improve":
-        result = _improve_layout(input_text, is_html)
-    elif action == "generate_title":
-        result = _improve_generate_title(input_text, is_html)
-    else:
+    improvers = {
+        "correct": _improve_correct,
+        "improve": _improve_layout,
+        "generate_title": _improve_generate_title,
+    }
+    if action not in improvers:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=f"Action invalide: {action}"
         )
 
+    # Meme texte + meme action → meme reponse (evite de rappeler le modele)
+    cache_key = (action, is_html, hashlib.sha256(input_text.encode("utf-8")).hexdigest())
+    result = _improve_cache.get_or_set(cache_key, lambda: improvers[action](input_text, is_html))
+
     # Pour les posts (texte brut), convertir le markdown bold en Unicode bold
     if not is_html:
         result = _markdown_bold_to_unicode(result)
@@ -4,30 +4,25 @@ Planificateur de sauvegardes automatiques.
 Execute un pg_dump quotidien + upload Google Drive selon la configuration
 stockee en base (backup_config.auto_backup_enabled, auto_backup_hour).
 
-Le scheduler tourne dans un thread daemon, verifie toutes les 60 secondes
-si l'heure programmee est atteinte, et utilise get_today_backup() pour
-eviter les doublons.
-
-Partage entre workers : un fichier lock (/app/data/backup_scheduler.lock)
-garantit qu'un seul worker a la main. Les autres workers ne lancent pas
-le thread scheduler.
+La verification (check_and_run) est une tache du planificateur commun
+(app/services/job_runner.py, tache "backup_check") : executee toutes les
+60 secondes par le seul worker leader, elle regarde si l'heure programmee
+est atteinte et utilise get_today_backup() pour eviter les doublons.
 
 L'heure configuree (auto_backup_hour) est interprete en heure locale
 Africa/Douala (UTC+1). Le scheduler la convertit en UTC pour comparer.
 
 Usage :
     from app.services.backup_scheduler import backup_scheduler
-    backup_scheduler.start()    # dans lifespan startup
-    backup_scheduler.stop()     # dans lifespan shutdown
+    backup_scheduler.check_and_run()    # tache periodique
+    backup_scheduler.get_status()
 """
 
-import fcntl
 import glob
 import gzip
 import logging
 import os
 import subprocess
-import threading
 import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional
@@ -37,7 +32,6 @@ from app.config.config import settings
 logger = logging.getLogger("backup-scheduler")
 
 BACKUP_DIR = "/backups"
-LOCK_FILE = "/app/data/backup_scheduler.lock"
 
 # Fuseau horaire local (Africa/Douala = UTC+1)
 LOCAL_UTC_OFFSET_HOURS = 1
@@ -47,69 +41,18 @@ class BackupScheduler:
     """Planificateur de sauvegardes automatiques quotidiennes."""
 
     def __init__(self):
-        self._running = False
-        self._thread: Optional[threading.Thread] = None
-        self._stop_event = threading.Event()
         self._last_check_date: Optional[str] = None
         self._last_result: Optional[dict] = None
-        self._lock_fd = None
-
-    # ── Lifecycle ───────────────────────
-
-    def _acquire_lock(self) -> bool:
-        """Tente d'acquerir le fichier lock (un seul worker parmi les 4 de Gunicorn)."""
-        try:
-            os.makedirs(os.path.dirname(LOCK_FILE), exist_ok=True)
-            self._lock_fd = open(LOCK_FILE, 'w')
-            fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
-            self._lock_fd.write(f"{os.getpid()}\n")
-            self._lock_fd.flush()
-            return True
-        except (IOError, OSError):
-            # Un autre worker a deja le lock
-            if self._lock_fd:
-                self._lock_fd.close()
-                self._lock_fd = None
-            return False
-
-    def _release_lock(self):
-        """Libere le fichier lock."""
-        if self._lock_fd:
-            try:
-                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
-                self._lock_fd.close()
-            except Exception:
-                pass
-            self._lock_fd = None
-
-    def start(self):
-        """Demarrer le scheduler en arriere-plan (un seul worker via flock)."""
-        if self._running:
-            return
-        if not self._acquire_lock():
-            logger.info("Backup scheduler: un autre worker a le lock, skip")
-            return
-        self._running = True
-        self._stop_event.clear()
-        self._thread = threading.Thread(target=self._loop, daemon=True, name="backup-scheduler")
-        self._thread.start()
-        logger.info(f"Backup scheduler demarre (PID={os.getpid()})")
-
-    def stop(self):
-        """Arreter le scheduler proprement."""
-        self._running = False
-        self._stop_event.set()
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=5)
-        self._release_lock()
-        logger.info("Backup scheduler arrete")
 
     def get_status(self) -> dict:
         """Retourne le statut du scheduler."""
+        from app.services.job_runner import job_runner
+
         now_utc = datetime.now(timezone.utc)
         local_hour = (now_utc + timedelta(hours=LOCAL_UTC_OFFSET_HOURS)).hour
         return {
-            "running": self._running,
+            "running": job_runner.is_running(),
+            "leader": job_runner.is_leader,
             "pid": os.getpid(),
             "utc_hour": now_utc.hour,
             "local_hour": local_hour,
@@ -118,24 +61,14 @@ class BackupScheduler:
             "last_result": self._last_result,
         }
 
-    # ── Main loop ───────────────────────
+    # ── Verification periodique ─────────
 
-    def _loop(self):
-        """Boucle principale : verifie toutes les 60 secondes."""
-        while not self._stop_event.is_set():
-            try:
-                self._check_and_run()
-            except Exception as e:
-                logger.error(f"Erreur dans la boucle backup scheduler: {e}")
-            # Dormir 60 secondes entre chaque verification
-            self._stop_event.wait(timeout=60)
-
-    def _check_and_run(self):
-        """Verifie si un backup automatique doit etre lance."""
-        from app.db.database import SessionLocal
+    def check_and_run(self) -> Optional[dict]:
+        """Verifie si un backup automatique doit etre lance (resultat, ou None si rien a faire)."""
+        from app.db.database import BackgroundSessionLocal
         from app.db.crud.crud_backup import get_backup_config, get_today_backup
 
-        session = SessionLocal()
+        session = BackgroundSessionLocal()
         try:
             config = get_backup_config(session)
             if not config:
@@ -163,10 +96,12 @@ class BackupScheduler:
             self._last_check_date = now_utc.isoformat()
             logger.info(f"Backup automatique declenche (heure locale={target_hour}h, UTC={now_utc.hour}h)")
             self._run_backup(session, config)
+            return self._last_result
 
         except Exception as e:
             logger.error(f"Erreur verification backup: {e}")
             self._last_result = {"status": "error", "message": str(e), "at": datetime.now(timezone.utc).isoformat()}
+            return self._last_result
         finally:
             session.close()
 
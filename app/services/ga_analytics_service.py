@@ -5,17 +5,24 @@ Wrappe le client BetaAnalyticsDataClient pour fournir des fonctions
 de haut niveau renvoyant les donnees formatees pour le frontend.
 
 - Authentification via Service Account (JSON dans variable d'environnement)
-- Cache en memoire avec TTL configurable (5 min standard, 30s realtime)
-- Realtime : pas de cache long (30s seulement)
+- Rapports d'un meme endpoint regroupes en un appel batchRunReports
+  (overview, geographie, technologie) ; les rapports temps reel, sans
+  equivalent batch, sont lances en parallele
+- Cache partage entre workers (SharedCache, table shared_cache_entries) :
+  un seul appel GA par cle pour tous les workers, valeur perimee servie
+  pendant son rafraichissement (GA_CACHE_TTL_SECONDS / GA_CACHE_STALE_SECONDS,
+  GA_REALTIME_CACHE_TTL_SECONDS pour le temps reel)
 
 Quotas : 10 000 requetes/jour/propriete (avec cache 5 min, largement suffisant)
 """
 
+import functools
+import inspect
 import json
 import logging
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from google.analytics.data_v1beta import BetaAnalyticsDataClient
 from google.analytics.data_v1beta.types import (
@@ -30,29 +37,45 @@ from google.analytics.data_v1beta.types import (
 from google.oauth2 import service_account
 
 from app.config.config import settings
+from app.services.shared_cache import SharedCache
 
 logger = logging.getLogger("hapson-api")
 
-# ─── Cache en memoire ───
+# ─── Cache partage entre workers ───
+
+_cache = SharedCache(
+    "ga",
+    ttl=settings.GA_CACHE_TTL_SECONDS,
+    stale_ttl=settings.GA_CACHE_STALE_SECONDS,
+    maxsize=settings.GA_CACHE_MAX_ENTRIES,
+)
 
-_cache: dict[str, tuple[float, Any]] = {}
-CACHE_TTL_SECONDS = 300       # 5 minutes pour les rapports standard
-REALTIME_CACHE_TTL = 30       # 30 secondes pour le temps reel
 
+def _cached(report: str, realtime: bool = False) -> Callable:
+    """
+    Met en cache le resultat de la fonction decoree, par rapport, propriete et
+    periode : cle "report:property_id[:period]".
+    """
+    def decorator(fetch: Callable[..., dict]) -> Callable[..., dict]:
+        signature = inspect.signature(fetch)
 
-def _get_cached(key: str, ttl: int = CACHE_TTL_SECONDS) -> Any:
-    """Retourne la valeur en cache si encore valide, sinon None."""
-    if key in _cache:
-        ts, val = _cache[key]
-        if time.time() - ts < ttl:
-            return val
-        del _cache[key]
-    return None
+        @functools.wraps(fetch)
+        def wrapper(*args, **kwargs) -> dict:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = ":".join([report, *(str(v) for v in bound.arguments.values())])
+            if realtime:
+                ttl = stale_ttl = settings.GA_REALTIME_CACHE_TTL_SECONDS
+            else:
+                ttl, stale_ttl = settings.GA_CACHE_TTL_SECONDS, settings.GA_CACHE_STALE_SECONDS
+            return _cache.get_or_compute(key, lambda: fetch(*bound.args, **bound.kwargs), ttl=ttl, stale_ttl=stale_ttl)
+        return wrapper
+    return decorator
 
 
-def _set_cache(key: str, val: Any) -> None:
-    """Met en cache une valeur avec le timestamp actuel."""
-    _cache[key] = (time.time(), val)
+def cache_stats() -> dict:
+    """Compteurs du cache GA (hits, misses, ...) du worker courant."""
+    return _cache.stats()
 
 
 # ─── Client GA4 ───
@@ -76,6 +99,24 @@ def _get_client() -> BetaAnalyticsDataClient:
     return _client
 
 
+# Rapports par appel batchRunReports (limite de l'API)
+BATCH_MAX_REPORTS = 5
+
+# Rapports temps reel lances en parallele (pas de batch pour runRealtimeReport)
+_realtime_pool = ThreadPoolExecutor(max_workers=5, thread_name_prefix="ga-realtime")
+
+
+def _batch_reports(client: BetaAnalyticsDataClient, prop: str, requests: list[RunReportRequest]) -> list[Any]:
+    """Execute plusieurs rapports d'une propriete en un seul appel batchRunReports (par paquets de 5)."""
+    reports = []
+    for i in range(0, len(requests), BATCH_MAX_REPORTS):
+        response = client.batch_run_reports(
+            BatchRunReportsRequest(property=prop, requests=requests[i:i + BATCH_MAX_REPORTS])
+        )
+        reports.extend(response.reports)
+    return reports
+
+
 def _prop(property_id: str) -> str:
     """Normalise l'ID de propriete en format 'properties/XXXXX'."""
     if property_id.startswith("properties/"):
@@ -126,81 +167,52 @@ def _pct_change(current: float, previous: float) -> float:
 
 # ═══ REALTIME ═══
 
+@_cached("realtime", realtime=True)
 def get_realtime(property_id: str) -> dict:
     """Donnees temps reel (30 dernieres minutes)."""
-    cache_key = f"ga:realtime:{property_id}"
-    cached = _get_cached(cache_key, REALTIME_CACHE_TTL)
-    if cached is not None:
-        return cached
-
     client = _get_client()
     prop = _prop(property_id)
 
-    # Rapport temps reel avec plusieurs dimensions
-    request = RunRealtimeReportRequest(
-        property=prop,
-        dimensions=[
-            Dimension(name="unifiedScreenName"),
-        ],
-        metrics=[
-            Metric(name="activeUsers"),
-        ],
-        limit=10,
-    )
-    response = client.run_realtime_report(request)
-
-    top_pages = []
-    for row in response.rows:
-        top_pages.append({
-            "page_title": row.dimension_values[0].value,
-            "page_path": "",
-            "active_users": _safe_int(row.metric_values[0].value),
-        })
+    def _by(dimension_name: str, limit: Optional[int] = 10) -> RunRealtimeReportRequest:
+        return RunRealtimeReportRequest(
+            property=prop,
+            dimensions=[Dimension(name=dimension_name)],
+            metrics=[Metric(name="activeUsers")],
+            limit=limit,
+        )
 
-    # Sources
-    req_sources = RunRealtimeReportRequest(
-        property=prop,
-        dimensions=[Dimension(name="source")],
-        metrics=[Metric(name="activeUsers")],
-        limit=10,
+    requests = [
+        _by("unifiedScreenName"),
+        _by("source"),
+        _by("deviceCategory", limit=None),
+        _by("country"),
+        # Total actifs
+        RunRealtimeReportRequest(
+            property=prop,
+            metrics=[Metric(name="activeUsers"), Metric(name="screenPageViews"), Metric(name="eventCount")],
+        ),
+    ]
+    resp_pages, resp_sources, resp_device, resp_country, resp_total = _realtime_pool.map(
+        client.run_realtime_report, requests
     )
-    resp_sources = client.run_realtime_report(req_sources)
+
+    top_pages = [
+        {"page_title": r.dimension_values[0].value, "page_path": "", "active_users": _safe_int(r.metric_values[0].value)}
+        for r in resp_pages.rows
+    ]
     top_sources = [
         {"source": r.dimension_values[0].value, "active_users": _safe_int(r.metric_values[0].value)}
         for r in resp_sources.rows
     ]
-
-    # Appareils
-    req_device = RunRealtimeReportRequest(
-        property=prop,
-        dimensions=[Dimension(name="deviceCategory")],
-        metrics=[Metric(name="activeUsers")],
-    )
-    resp_device = client.run_realtime_report(req_device)
     by_device = [
         {"device_category": r.dimension_values[0].value, "active_users": _safe_int(r.metric_values[0].value)}
         for r in resp_device.rows
     ]
-
-    # Pays
-    req_country = RunRealtimeReportRequest(
-        property=prop,
-        dimensions=[Dimension(name="country")],
-        metrics=[Metric(name="activeUsers")],
-        limit=10,
-    )
-    resp_country = client.run_realtime_report(req_country)
     by_country = [
         {"country": r.dimension_values[0].value, "active_users": _safe_int(r.metric_values[0].value)}
         for r in resp_country.rows
     ]
 
-    # Total actifs
-    req_total = RunRealtimeReportRequest(
-        property=prop,
-        metrics=[Metric(name="activeUsers"), Metric(name="screenPageViews"), Metric(name="eventCount")],
-    )
-    resp_total = client.run_realtime_report(req_total)
     active_users = 0
     pageviews = 0
     events = 0
@@ -222,19 +234,14 @@ def get_realtime(property_id: str) -> dict:
         "by_device": by_device,
         "by_country": by_country,
     }
-    _set_cache(cache_key, result)
     return result
 
 
 # ═══ OVERVIEW ═══
 
+@_cached("overview")
 def get_overview(property_id: str, period: str = "28d") -> dict:
     """Vue d'ensemble des metriques avec comparaison periode precedente."""
-    cache_key = f"ga:overview:{property_id}:{period}"
-    cached = _get_cached(cache_key)
-    if cached is not None:
-        return cached
-
     client = _get_client()
     prop = _prop(property_id)
     start, end = _period_to_dates(period)
@@ -252,21 +259,11 @@ def get_overview(property_id: str, period: str = "28d") -> dict:
         Metric(name="eventCount"),
     ]
 
-    # Periode courante
-    req_current = RunReportRequest(
-        property=prop,
-        date_ranges=[DateRange(start_date=start, end_date=end)],
-        metrics=metrics,
-    )
-    resp_current = client.run_report(req_current)
-
-    # Periode precedente
-    req_prev = RunReportRequest(
-        property=prop,
-        date_ranges=[DateRange(start_date=prev_start, end_date=prev_end)],
-        metrics=metrics,
-    )
-    resp_prev = client.run_report(req_prev)
+    # Periode courante et periode precedente : un seul appel batch
+    resp_current, resp_prev = _batch_reports(client, prop, [
+        RunReportRequest(date_ranges=[DateRange(start_date=start, end_date=end)], metrics=metrics),
+        RunReportRequest(date_ranges=[DateRange(start_date=prev_start, end_date=prev_end)], metrics=metrics),
+    ])
 
     def _extract(resp: Any) -> list[float]:
         if resp.rows:
@@ -296,19 +293,14 @@ def get_overview(property_id: str, period: str = "28d") -> dict:
         "period_start": start,
         "period_end": end,
     }
-    _set_cache(cache_key, result)
     return result
 
 
 # ═══ SOURCES ═══
 
+@_cached("sources")
 def get_sources(property_id: str, period: str = "28d") -> dict:
     """Sources de trafic (source/medium)."""
-    cache_key = f"ga:sources:{property_id}:{period}"
-    cached = _get_cached(cache_key)
-    if cached is not None:
-        return cached
-
     client = _get_client()
     prop = _prop(property_id)
     start, end = _period_to_dates(period)
@@ -346,19 +338,14 @@ def get_sources(property_id: str, period: str = "28d") -> dict:
         })
 
     result = {"items": items, "total_sessions": total_sessions}
-    _set_cache(cache_key, result)
     return result
 
 
 # ═══ TOP PAGES ═══
 
+@_cached("pages")
 def get_top_pages(property_id: str, period: str = "28d") -> dict:
     """Top pages visitees."""
-    cache_key = f"ga:pages:{property_id}:{period}"
-    cached = _get_cached(cache_key)
-    if cached is not None:
-        return cached
-
     client = _get_client()
     prop = _prop(property_id)
     start, end = _period_to_dates(period)
@@ -396,35 +383,39 @@ def get_top_pages(property_id: str, period: str = "28d") -> dict:
         })
 
     result = {"items": items, "total_page_views": total_pv}
-    _set_cache(cache_key, result)
     return result
 
 
 # ═══ GEOGRAPHY ═══
 
+@_cached("geography")
 def get_geography(property_id: str, period: str = "28d") -> dict:
     """Geographie des visiteurs (pays + villes)."""
-    cache_key = f"ga:geography:{property_id}:{period}"
-    cached = _get_cached(cache_key)
-    if cached is not None:
-        return cached
-
     client = _get_client()
     prop = _prop(property_id)
     start, end = _period_to_dates(period)
     date_range = [DateRange(start_date=start, end_date=end)]
     metrics = [Metric(name="totalUsers"), Metric(name="sessions"), Metric(name="screenPageViews")]
 
-    # Par pays
-    req_country = RunReportRequest(
-        property=prop,
-        date_ranges=date_range,
-        dimensions=[Dimension(name="country")],
-        metrics=metrics,
-        order_bys=[OrderBy(metric=OrderBy.MetricOrderBy(metric_name="totalUsers"), desc=True)],
-        limit=20,
-    )
-    resp_country = client.run_report(req_country)
+    order_by_users = [OrderBy(metric=OrderBy.MetricOrderBy(metric_name="totalUsers"), desc=True)]
+
+    # Par pays et par ville : un seul appel batch
+    resp_country, resp_city = _batch_reports(client, prop, [
+        RunReportRequest(
+            date_ranges=date_range,
+            dimensions=[Dimension(name="country")],
+            metrics=metrics,
+            order_bys=order_by_users,
+            limit=20,
+        ),
+        RunReportRequest(
+            date_ranges=date_range,
+            dimensions=[Dimension(name="city"), Dimension(name="country")],
+            metrics=metrics,
+            order_bys=order_by_users,
+            limit=20,
+        ),
+    ])
 
     by_country = [
         {
@@ -437,17 +428,6 @@ def get_geography(property_id: str, period: str = "28d") -> dict:
         for r in resp_country.rows
     ]
 
-    # Par ville
-    req_city = RunReportRequest(
-        property=prop,
-        date_ranges=date_range,
-        dimensions=[Dimension(name="city"), Dimension(name="country")],
-        metrics=metrics,
-        order_bys=[OrderBy(metric=OrderBy.MetricOrderBy(metric_name="totalUsers"), desc=True)],
-        limit=20,
-    )
-    resp_city = client.run_report(req_city)
-
     by_city = [
         {
             "country": r.dimension_values[1].value,
@@ -460,35 +440,34 @@ def get_geography(property_id: str, period: str = "28d") -> dict:
     ]
 
     result = {"by_country": by_country, "by_city": by_city}
-    _set_cache(cache_key, result)
     return result
 
 
 # ═══ TECHNOLOGY ═══
 
+@_cached("technology")
 def get_technology(property_id: str, period: str = "28d") -> dict:
     """Navigateurs, OS, appareils."""
-    cache_key = f"ga:technology:{property_id}:{period}"
-    cached = _get_cached(cache_key)
-    if cached is not None:
-        return cached
-
     client = _get_client()
     prop = _prop(property_id)
     start, end = _period_to_dates(period)
     date_range = [DateRange(start_date=start, end_date=end)]
     metrics = [Metric(name="totalUsers"), Metric(name="sessions")]
 
-    def _run_tech(dimension_name: str) -> list[dict]:
-        req = RunReportRequest(
-            property=prop,
+    dimensions = ["browser", "operatingSystem", "deviceCategory"]
+    # Un rapport par dimension, tous dans un seul appel batch
+    responses = _batch_reports(client, prop, [
+        RunReportRequest(
             date_ranges=date_range,
             dimensions=[Dimension(name=dimension_name)],
             metrics=metrics,
             order_bys=[OrderBy(metric=OrderBy.MetricOrderBy(metric_name="totalUsers"), desc=True)],
             limit=10,
         )
-        resp = client.run_report(req)
+        for dimension_name in dimensions
+    ])
+
+    def _tech_items(resp: Any) -> list[dict]:
         total = sum(_safe_int(r.metric_values[0].value) for r in resp.rows) or 1
         return [
             {
@@ -500,24 +479,16 @@ def get_technology(property_id: str, period: str = "28d") -> dict:
             for r in resp.rows
         ]
 
-    result = {
-        "by_browser": _run_tech("browser"),
-        "by_os": _run_tech("operatingSystem"),
-        "by_device": _run_tech("deviceCategory"),
-    }
-    _set_cache(cache_key, result)
+    by_browser, by_os, by_device = (_tech_items(resp) for resp in responses)
+    result = {"by_browser": by_browser, "by_os": by_os, "by_device": by_device}
     return result
 
 
 # ═══ TRENDS ═══
 
+@_cached("trends")
 def get_trends(property_id: str, period: str = "28d") -> dict:
     """Series temporelles pour les graphiques."""
-    cache_key = f"ga:trends:{property_id}:{period}"
-    cached = _get_cached(cache_key)
-    if cached is not None:
-        return cached
-
     client = _get_client()
     prop = _prop(property_id)
     start, end = _period_to_dates(period)
@@ -553,5 +524,4 @@ def get_trends(property_id: str, period: str = "28d") -> dict:
         })
 
     result = {"points": points, "period_start": start, "period_end": end}
-    _set_cache(cache_key, result)
     return result
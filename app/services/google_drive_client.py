@@ -25,6 +25,7 @@ import httpx
 from fastapi import HTTPException, status
 
 from app.config.config import settings
+from app.services import http_client
 from app.utils.crypto import encrypt_totp_secret, decrypt_totp_secret
 
 logger = logging.getLogger("hapson-api")
@@ -145,8 +146,7 @@ def exchange_google_code(code: str) -> dict:
     }
 
     try:
-        with httpx.Client(timeout=TIMEOUT_DEFAULT) as client:
-            response = client.post(GOOGLE_TOKEN_URL, data=data)
+        response = http_client.post(GOOGLE_TOKEN_URL, data=data, timeout=TIMEOUT_DEFAULT)
 
         if response.status_code != 200:
             logger.error(f"Echange token Google echoue: {response.status_code} - {response.text[:500]}")
@@ -162,11 +162,11 @@ def exchange_google_code(code: str) -> dict:
         access_token = token_data.get("access_token")
         if access_token:
             try:
-                with httpx.Client(timeout=TIMEOUT_DEFAULT) as client:
-                    resp = client.get(
-                        GOOGLE_USERINFO_URL,
-                        headers={"Authorization": f"Bearer {access_token}"}
-                    )
+                resp = http_client.get(
+                    GOOGLE_USERINFO_URL,
+                    headers={"Authorization": f"Bearer {access_token}"},
+                    timeout=TIMEOUT_DEFAULT,
+                )
                 if resp.status_code == 200:
                     email = resp.json().get("email")
             except Exception as e:
@@ -209,8 +209,7 @@ def refresh_google_token(encrypted_refresh_token: str) -> dict:
     }
 
     try:
-        with httpx.Client(timeout=TIMEOUT_DEFAULT) as client:
-            response = client.post(GOOGLE_TOKEN_URL, data=data)
+        response = http_client.post(GOOGLE_TOKEN_URL, data=data, timeout=TIMEOUT_DEFAULT)
 
         if response.status_code != 200:
             logger.error(f"Refresh token Google echoue: {response.status_code} - {response.text[:300]}")
@@ -282,15 +281,15 @@ def upload_to_drive(access_token: str, folder_id: str, filepath: str, filename:
 
     try:
         with open(filepath, "rb") as f:
-            with httpx.Client(timeout=TIMEOUT_UPLOAD) as client:
-                response = client.post(
-                    f"{GOOGLE_UPLOAD_API}/files?uploadType=multipart",
-                    headers=headers,
-                    files={
-                        "metadata": ("metadata", json.dumps(metadata), "application/json"),
-                        "file": (filename, f, "application/gzip"),
-                    },
-                )
+            response = http_client.post(
+                f"{GOOGLE_UPLOAD_API}/files?uploadType=multipart",
+                headers=headers,
+                files={
+                    "metadata": ("metadata", json.dumps(metadata), "application/json"),
+                    "file": (filename, f, "application/gzip"),
+                },
+                timeout=TIMEOUT_UPLOAD,
+            )
 
         if response.status_code not in (200, 201):
             logger.error(f"Upload Drive echoue: {response.status_code} - {response.text[:300]}")
@@ -337,12 +336,12 @@ def list_drive_files(access_token: str, folder_id: str) -> list[dict]:
     }
 
     try:
-        with httpx.Client(timeout=TIMEOUT_DEFAULT) as client:
-            response = client.get(
-                f"{GOOGLE_DRIVE_API}/files",
-                headers=headers,
-                params=params,
-            )
+        response = http_client.get(
+            f"{GOOGLE_DRIVE_API}/files",
+            headers=headers,
+            params=params,
+            timeout=TIMEOUT_DEFAULT,
+        )
 
         if response.status_code != 200:
             logger.error(f"Liste Drive echouee: {response.status_code} - {response.text[:300]}")
@@ -365,11 +364,11 @@ def download_from_drive(access_token: str, file_id: str, dest_path: str) -> str:
     headers = {"Authorization": f"Bearer {access_token}"}
 
     try:
-        with httpx.Client(timeout=TIMEOUT_UPLOAD) as client:
-            response = client.get(
-                f"{GOOGLE_DRIVE_API}/files/{file_id}?alt=media",
-                headers=headers,
-            )
+        response = http_client.get(
+            f"{GOOGLE_DRIVE_API}/files/{file_id}?alt=media",
+            headers=headers,
+            timeout=TIMEOUT_UPLOAD,
+        )
 
         if response.status_code != 200:
             raise HTTPException(
@@ -415,12 +414,12 @@ def create_drive_folder(access_token: str, folder_name: str, parent_id: str | No
         metadata["parents"] = [parent_id]
 
     try:
-        with httpx.Client(timeout=TIMEOUT_DEFAULT) as client:
-            response = client.post(
-                f"{GOOGLE_DRIVE_API}/files",
-                headers=headers,
-                json=metadata,
-            )
+        response = http_client.post(
+            f"{GOOGLE_DRIVE_API}/files",
+            headers=headers,
+            json=metadata,
+            timeout=TIMEOUT_DEFAULT,
+        )
 
         if response.status_code not in (200, 201):
             logger.error(f"Creation dossier Drive echouee: {response.status_code} - {response.text[:300]}")
@@ -461,12 +460,12 @@ def list_drive_folders(access_token: str) -> list[dict]:
     }
 
     try:
-        with httpx.Client(timeout=TIMEOUT_DEFAULT) as client:
-            response = client.get(
-                f"{GOOGLE_DRIVE_API}/files",
-                headers=headers,
-                params=params,
-            )
+        response = http_client.get(
+            f"{GOOGLE_DRIVE_API}/files",
+            headers=headers,
+            params=params,
+            timeout=TIMEOUT_DEFAULT,
+        )
 
         if response.status_code != 200:
             logger.error(f"Liste dossiers Drive echouee: {response.status_code} - {response.text[:300]}")
@@ -484,11 +483,11 @@ def delete_drive_file(access_token: str, file_id: str) -> bool:
     headers = {"Authorization": f"Bearer {access_token}"}
 
     try:
-        with httpx.Client(timeout=TIMEOUT_DEFAULT) as client:
-            response = client.delete(
-                f"{GOOGLE_DRIVE_API}/files/{file_id}",
-                headers=headers,
-            )
+        response = http_client.delete(
+            f"{GOOGLE_DRIVE_API}/files/{file_id}",
+            headers=headers,
+            timeout=TIMEOUT_DEFAULT,
+        )
         return response.status_code == 204
 
     except Exception as e:
@@ -0,0 +1,291 @@
+"""
+Couche HTTP sortante partagee pour les integrations externes.
+
+Un client httpx poole par hote (synchrone et asynchrone) est reutilise entre
+les appels : connexions keep-alive, pas de nouvelle poignee de main TCP/TLS
+a chaque requete, HTTP/2 si le paquet `h2` est installe.
+
+Fonctionnalites :
+- request()/get()/post()/delete() : equivalents des methodes httpx
+- arequest() : variante asynchrone (client AsyncClient par hote)
+- retry avec backoff exponentiel et jitter (erreurs reseau, 429/502/503/504)
+- limite de requetes simultanees par hote (HTTP_MAX_PER_HOST)
+- nombre de clients borne (HTTP_MAX_HOSTS) : le client de l'hote le moins
+  recemment utilise, sans requete en cours, est ferme et evince
+- metriques de temps par hote (get_http_metrics)
+
+Les exceptions httpx (TimeoutException, RequestError...) sont propagees
+telles quelles : les services conservent leur gestion d'erreurs.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Union
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config.config import settings
+
+logger = logging.getLogger("hapson-api")
+
+DEFAULT_TIMEOUT = 30.0
+
+# Statuts transitoires pour lesquels une nouvelle tentative a du sens
+RETRY_STATUSES = {429, 502, 503, 504}
+# Methodes rejouables sans risque (POST seulement si retries explicite)
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+
+try:
+    import h2  # noqa: F401
+    HTTP2_ENABLED = True
+except ImportError:
+    HTTP2_ENABLED = False
+
+
+
+class _HostPool:
+    """Client d'un hote, sa limite de requetes simultanees et ses requetes en cours."""
+
+    __slots__ = ("client", "semaphore", "active")
+
+    def __init__(self, client: Union[httpx.Client, httpx.AsyncClient], semaphore):
+        self.client = client
+        self.semaphore = semaphore
+        self.active = 0
+
+
+_lock = threading.Lock()
+# Ordre LRU : l'hote le plus recemment utilise en fin de dictionnaire
+_sync_pools: "OrderedDict[str, _HostPool]" = OrderedDict()
+_async_pools: "OrderedDict[str, _HostPool]" = OrderedDict()
+_metrics: dict[str, dict] = {}
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.HTTP_MAX_PER_HOST,
+        max_keepalive_connections=settings.HTTP_MAX_PER_HOST,
+        keepalive_expiry=30.0,
+    )
+
+
+def _evict(pools: "OrderedDict[str, _HostPool]") -> list:
+    """
+    Retire les hotes les moins recemment utilises au-dela de HTTP_MAX_HOSTS
+    (appele sous _lock). Un hote avec des requetes en cours n'est jamais evince.
+    Retourne les clients a fermer, hors verrou.
+    """
+    excess = len(pools) - max(settings.HTTP_MAX_HOSTS, 1)
+    evicted = []
+    for host in list(pools)[:-1]:  # jamais l'hote qui vient d'etre demande
+        if excess <= 0:
+            break
+        if pools[host].active == 0:
+            evicted.append(pools.pop(host).client)
+            excess -= 1
+    return evicted
+
+
+def _sync_pool(url: str, acquire: bool = False) -> _HostPool:
+    host = _host_key(url)
+    with _lock:
+        pool = _sync_pools.get(host)
+        if pool is None or pool.client.is_closed:
+            client = httpx.Client(timeout=DEFAULT_TIMEOUT, limits=_limits(), http2=HTTP2_ENABLED)
+            pool = _HostPool(client, threading.BoundedSemaphore(settings.HTTP_MAX_PER_HOST))
+            _sync_pools[host] = pool
+        _sync_pools.move_to_end(host)
+        pool.active += int(acquire)
+        evicted = _evict(_sync_pools)
+    for client in evicted:
+        client.close()
+    return pool
+
+
+async def _async_pool(url: str, acquire: bool = False) -> _HostPool:
+    host = _host_key(url)
+    with _lock:
+        pool = _async_pools.get(host)
+        if pool is None or pool.client.is_closed:
+            client = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, limits=_limits(), http2=HTTP2_ENABLED)
+            pool = _HostPool(client, asyncio.Semaphore(settings.HTTP_MAX_PER_HOST))
+            _async_pools[host] = pool
+        _async_pools.move_to_end(host)
+        pool.active += int(acquire)
+        evicted = _evict(_async_pools)
+    for client in evicted:
+        try:
+            await client.aclose()
+        except Exception as e:  # Client cree sur une autre boucle d'evenements
+            logger.debug(f"[http] fermeture d'un client evince impossible : {e}")
+    return pool
+
+
+def _release(pool: _HostPool) -> None:
+    with _lock:
+        pool.active -= 1
+
+
+def get_client(url: str) -> httpx.Client:
+    """Client synchrone partage pour l'hote de `url` (cree a la demande)."""
+    return _sync_pool(url).client
+
+
+async def get_async_client(url: str) -> httpx.AsyncClient:
+    """Client asynchrone partage pour l'hote de `url` (cree a la demande)."""
+    return (await _async_pool(url)).client
+
+
+def _backoff_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """Backoff exponentiel avec jitter complet ; respecte Retry-After si present."""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), BACKOFF_MAX)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _default_retries(method: str, retries: Optional[int]) -> int:
+    if retries is not None:
+        return retries
+    return settings.HTTP_RETRIES if method in IDEMPOTENT_METHODS else 0
+
+
+def _record(host: str, elapsed: float, error: bool = False, retried: bool = False) -> None:
+    with _lock:
+        m = _metrics.setdefault(host, {"requests": 0, "errors": 0, "retries": 0, "total_ms": 0.0, "max_ms": 0.0})
+        if retried:
+            m["retries"] += 1
+            return
+        elapsed_ms = elapsed * 1000
+        m["requests"] += 1
+        m["errors"] += int(error)
+        m["total_ms"] += elapsed_ms
+        m["max_ms"] = max(m["max_ms"], elapsed_ms)
+
+
+def request(method: str, url: str, *, retries: Optional[int] = None, **kwargs) -> httpx.Response:
+    """
+    Requete HTTP synchrone via le client poole de l'hote.
+
+    Args:
+        retries: nombre de nouvelles tentatives (defaut : HTTP_RETRIES pour les
+                 methodes idempotentes, 0 pour POST/PATCH)
+        **kwargs: arguments httpx (params, json, data, files, headers, timeout, follow_redirects...)
+    """
+    method = method.upper()
+    host = _host_key(url)
+    pool = _sync_pool(url, acquire=True)
+    max_retries = _default_retries(method, retries)
+
+    attempt = 0
+    try:
+        while True:
+            started = time.perf_counter()
+            with pool.semaphore:
+                try:
+                    response = pool.client.request(method, url, **kwargs)
+                except (httpx.TimeoutException, httpx.NetworkError) as e:
+                    _record(host, time.perf_counter() - started, error=True)
+                    if attempt >= max_retries:
+                        raise
+                    logger.warning(f"[http] {method} {host} erreur reseau ({type(e).__name__}), nouvelle tentative")
+                    response = None
+            if response is not None:
+                _record(host, time.perf_counter() - started, error=response.status_code >= 500)
+                if response.status_code not in RETRY_STATUSES or attempt >= max_retries:
+                    return response
+                logger.warning(f"[http] {method} {host} HTTP {response.status_code}, nouvelle tentative")
+            _record(host, 0, retried=True)
+            time.sleep(_backoff_delay(attempt, response))
+            attempt += 1
+    finally:
+        _release(pool)
+
+
+async def arequest(method: str, url: str, *, retries: Optional[int] = None, **kwargs) -> httpx.Response:
+    """Variante asynchrone de request() (memes regles de retry et de limite par hote)."""
+    method = method.upper()
+    host = _host_key(url)
+    pool = await _async_pool(url, acquire=True)
+    max_retries = _default_retries(method, retries)
+
+    attempt = 0
+    try:
+        while True:
+            started = time.perf_counter()
+            async with pool.semaphore:
+                try:
+                    response = await pool.client.request(method, url, **kwargs)
+                except (httpx.TimeoutException, httpx.NetworkError) as e:
+                    _record(host, time.perf_counter() - started, error=True)
+                    if attempt >= max_retries:
+                        raise
+                    logger.warning(f"[http] {method} {host} erreur reseau ({type(e).__name__}), nouvelle tentative")
+                    response = None
+            if response is not None:
+                _record(host, time.perf_counter() - started, error=response.status_code >= 500)
+                if response.status_code not in RETRY_STATUSES or attempt >= max_retries:
+                    return response
+                logger.warning(f"[http] {method} {host} HTTP {response.status_code}, nouvelle tentative")
+            _record(host, 0, retried=True)
+            await asyncio.sleep(_backoff_delay(attempt, response))
+            attempt += 1
+    finally:
+        _release(pool)
+
+
+def get(url: str, **kwargs) -> httpx.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> httpx.Response:
+    return request("POST", url, **kwargs)
+
+
+def delete(url: str, **kwargs) -> httpx.Response:
+    return request("DELETE", url, **kwargs)
+
+
+def get_http_metrics() -> dict:
+    """Metriques par hote : requetes, erreurs, retries, temps moyen et max (ms)."""
+    with _lock:
+        return {
+            host: {
+                **m,
+                "total_ms": round(m["total_ms"], 1),
+                "max_ms": round(m["max_ms"], 1),
+                "avg_ms": round(m["total_ms"] / m["requests"], 1) if m["requests"] else 0.0,
+            }
+            for host, m in _metrics.items()
+        }
+
+
+def close_http_clients() -> None:
+    """Ferme les clients synchrones (arret de l'application)."""
+    with _lock:
+        clients = [pool.client for pool in _sync_pools.values()]
+        _sync_pools.clear()
+    for client in clients:
+        client.close()
+
+
+async def aclose_http_clients() -> None:
+    """Ferme les clients asynchrones (arret de l'application)."""
+    with _lock:
+        clients = [pool.client for pool in _async_pools.values()]
+        _async_pools.clear()
+    for client in clients:
+        await client.aclose()
@@ -0,0 +1,394 @@
+"""
+Planificateur de taches periodiques avec election d'un leader.
+
+Un seul worker Gunicorn (le leader) execute les taches : il detient un verrou
+consultatif PostgreSQL de session (pg_try_advisory_lock) sur une connexion
+dediee. Les autres workers retentent regulierement de prendre le verrou ; si
+le leader s'arrete ou perd sa connexion, le verrou est libere par PostgreSQL
+et un autre worker prend le relais.
+
+Chaque tache a son propre executeur (un thread) : une tache lente (sync
+Facebook, RSS) ne retarde plus les autres (publication planifiee). Une tache
+n'est jamais lancee deux fois en parallele ; au-dela de son timeout elle est
+signalee (les threads Python ne peuvent pas etre interrompus).
+
+Historique des executions dans la table job_runs (crud_job_runs) :
+- taches normales : ligne "running" au demarrage, cloturee a la fin
+- taches frequentes (quiet=True) : ligne ecrite a la fin, seulement si la
+  tache a eu quelque chose a faire (resultat non None) ou a echoue
+
+Services de leader (register_service) : objets start()/stop() demarres a la
+prise du leadership et arretes a sa perte (ex. file de publication sociale).
+
+Hors PostgreSQL (tests SQLite), le worker est considere comme leader.
+
+Usage :
+    from app.services.job_runner import job_runner
+    job_runner.register("rss_refresh", refresh, interval=1800, timeout=1500)
+    job_runner.start()    # dans lifespan startup
+    job_runner.stop()     # dans lifespan shutdown
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional, Union
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from app.config.config import settings
+from app.services import metrics
+
+logger = logging.getLogger("hapson-api")
+
+# Cle du verrou consultatif (commune a tous les workers de l'application)
+LEADER_LOCK_KEY = 72_617_001
+# Periode de la boucle de repartition (secondes)
+TICK_SECONDS = 1.0
+
+Interval = Union[float, Callable[[], Optional[float]]]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class Job:
+    """Tache periodique : fonction, intervalle (fixe ou dynamique), timeout et executeur dedie."""
+
+    def __init__(self, name: str, func: Callable[[], Optional[dict]], interval: Interval,
+                 timeout: float, description: str = "", quiet: bool = False):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.timeout = timeout
+        self.description = description
+        self.quiet = quiet
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"job-{name}")
+        self.future: Optional[Future] = None
+        self.started_monotonic: Optional[float] = None
+        self.last_started_at: Optional[datetime] = None
+        self.timeout_reported = False
+
+    def current_interval(self) -> Optional[float]:
+        """Intervalle en secondes, ou None si la tache est desactivee."""
+        return self.interval() if callable(self.interval) else self.interval
+
+    def is_running(self) -> bool:
+        return self.future is not None and not self.future.done()
+
+    def is_due(self, now: datetime) -> bool:
+        interval = self.current_interval()
+        if interval is None or self.is_running():
+            return False
+        return self.last_started_at is None or (now - self.last_started_at).total_seconds() >= interval
+
+
+class JobRunner:
+    """Repartiteur des taches periodiques, actif uniquement sur le worker leader."""
+
+    def __init__(self, session_factory=None, engine=None):
+        self._session_factory = session_factory
+        self._engine = engine
+        self._jobs: Dict[str, Job] = {}
+        self._services: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._lock_engine = None
+        self._lock_conn = None
+        self._last_leader_check = float("-inf")
+        self.is_leader = False
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+
+    # ── Enregistrement ──────────────────
+
+    def register(self, name: str, func: Callable[[], Optional[dict]], interval: Interval,
+                 timeout: float, description: str = "", quiet: bool = False) -> Job:
+        """
+        Enregistre une tache. `interval` : secondes, ou fonction retournant les
+        secondes (None = desactivee, relue a chaque tour). `func` retourne un
+        dict de resultat, ou None s'il n'y avait rien a faire.
+        """
+        job = Job(name, func, interval, timeout, description=description, quiet=quiet)
+        with self._lock:
+            self._jobs[name] = job
+        return job
+
+    def register_service(self, name: str, service) -> None:
+        """Service long (start/stop, get_metrics optionnel) actif uniquement sur le leader."""
+        with self._lock:
+            self._services[name] = service
+
+    def get_job(self, name: str) -> Optional[Job]:
+        return self._jobs.get(name)
+
+    # ── Lifecycle ───────────────────────
+
+    def _db(self):
+        if self._session_factory is None:
+            from app.db.database import BackgroundSessionLocal
+            self._session_factory = BackgroundSessionLocal
+        return self._session_factory()
+
+    def _get_engine(self):
+        if self._engine is None:
+            from app.db.database import background_engine
+            self._engine = background_engine
+        return self._engine
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Demarre la boucle (election du leader + repartition des taches)."""
+        if self.is_running():
+            return
+        if not settings.JOB_RUNNER_ENABLED:
+            logger.info("Planificateur de taches desactive (JOB_RUNNER_ENABLED=false)")
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="job-runner")
+        self._thread.start()
+        logger.info(f"Planificateur de taches demarre ({self.worker}, {len(self._jobs)} taches)")
+
+    def stop(self):
+        """Arrete la boucle, libere le leadership et les executeurs (sans attendre les taches en cours)."""
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self._release_leadership()
+        for job in self._jobs.values():
+            job.executor.shutdown(wait=False, cancel_futures=True)
+        logger.info("Planificateur de taches arrete")
+
+    # ── Leadership ──────────────────────
+
+    def _check_leadership(self) -> bool:
+        """Prend ou verifie le verrou de leader (au plus toutes les JOB_LEADER_CHECK_SECONDS)."""
+        now = time.monotonic()
+        if now - self._last_leader_check < settings.JOB_LEADER_CHECK_SECONDS:
+            return self.is_leader
+        self._last_leader_check = now
+
+        engine = self._get_engine()
+        if engine.dialect.name != "postgresql":
+            if not self.is_leader:
+                self._on_leadership_acquired()
+            return self.is_leader
+
+        if self.is_leader:
+            try:
+                self._lock_conn.execute(text("SELECT 1"))
+                self._lock_conn.commit()
+            except Exception as e:
+                logger.warning(f"Planificateur: connexion du verrou perdue ({e}), leadership abandonne")
+                self._release_leadership()
+            return self.is_leader
+
+        try:
+            if self._lock_engine is None:
+                from app.db.database import direct_url
+
+                # Connexion hors pool (et hors PgBouncer) : le verrou vit tant que cette connexion est ouverte
+                self._lock_engine = create_engine(direct_url(engine.url), poolclass=NullPool)
+            conn = self._lock_engine.connect()
+            acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": LEADER_LOCK_KEY}).scalar()
+            conn.commit()
+            if acquired:
+                self._lock_conn = conn
+                self._on_leadership_acquired()
+            else:
+                conn.close()
+        except Exception as e:
+            logger.warning(f"Planificateur: election du leader impossible: {e}")
+        return self.is_leader
+
+    def _on_leadership_acquired(self):
+        """Reprend les dates de derniere execution depuis l'historique (pas de double execution)."""
+        from app.db.crud.crud_job_runs import get_last_runs, mark_interrupted_runs
+
+        self.is_leader = True
+        logger.info(f"Planificateur: {self.worker} est leader")
+        db = self._db()
+        try:
+            mark_interrupted_runs(db, list(self._jobs))
+            last_runs = get_last_runs(db)
+            for name, job in self._jobs.items():
+                run = last_runs.get(name)
+                if run is not None and not job.is_running():
+                    job.last_started_at = _aware(run.started_at)
+        except Exception as e:
+            logger.warning(f"Planificateur: lecture de l'historique impossible: {e}")
+            db.rollback()
+        finally:
+            db.close()
+        for name, service in self._services.items():
+            try:
+                service.start()
+            except Exception as e:
+                logger.error(f"Planificateur: demarrage du service {name} impossible: {e}")
+
+    def _release_leadership(self):
+        if self.is_leader:
+            for name, service in self._services.items():
+                try:
+                    service.stop()
+                except Exception as e:
+                    logger.warning(f"Planificateur: arret du service {name} impossible: {e}")
+        self.is_leader = False
+        if self._lock_conn is not None:
+            try:
+                self._lock_conn.close()
+            except Exception:
+                pass
+            self._lock_conn = None
+
+    # ── Boucle ──────────────────────────
+
+    def _loop(self):
+        while not self._stop_event.is_set():
+            try:
+                if self._check_leadership():
+                    self._dispatch_due_jobs()
+            except Exception as e:
+                logger.error(f"Erreur dans la boucle du planificateur: {e}", exc_info=True)
+            self._stop_event.wait(timeout=TICK_SECONDS)
+
+    def _dispatch_due_jobs(self):
+        now = _now()
+        for job in list(self._jobs.values()):
+            if job.is_running():
+                elapsed = time.monotonic() - job.started_monotonic
+                if elapsed > job.timeout and not job.timeout_reported:
+                    job.timeout_reported = True
+                    logger.error(f"Tache {job.name}: timeout depasse ({int(elapsed)}s > {int(job.timeout)}s)")
+                continue
+            try:
+                due = job.is_due(now)
+            except Exception as e:
+                logger.warning(f"Tache {job.name}: intervalle indisponible ({e})")
+                continue
+            if due:
+                self.submit(job)
+
+    def submit(self, job: Job) -> Future:
+        """Lance immediatement une execution de la tache sur son executeur."""
+        job.last_started_at = _now()
+        job.started_monotonic = time.monotonic()
+        job.timeout_reported = False
+        job.future = job.executor.submit(self._execute, job)
+        return job.future
+
+    def _execute(self, job: Job):
+        """Execute la tache et enregistre le resultat dans l'historique."""
+        from app.db.crud.crud_job_runs import finish_job_run, start_job_run
+        from app.models.model_job_run import JobRun
+
+        started_at = job.last_started_at
+        run_id = None
+        if not job.quiet:
+            run_id = self._record(lambda db: start_job_run(db, job.name, self.worker).id)
+
+        result, error = None, None
+        try:
+            result = job.func()
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Tache {job.name} echouee: {e}", exc_info=True)
+        if error is None and isinstance(result, dict):
+            # Conventions des services : {"error": ...} ou {"status": "error", "message": ...}
+            if result.get("error"):
+                error = str(result["error"])
+            elif result.get("status") == "error":
+                error = str(result.get("message") or "error")
+
+        elapsed = time.monotonic() - job.started_monotonic
+        status = "error" if error else ("timeout" if elapsed > job.timeout else "success")
+        metrics.observe_job(job.name, status, elapsed)
+
+        if run_id is not None:
+            self._record(lambda db: finish_job_run(db, run_id, status, result=result, error_message=error))
+        elif result is not None or error:
+            def _insert(db):
+                db.add(JobRun(
+                    job_name=job.name, status=status, started_at=started_at,
+                    finished_at=_now(), duration_ms=int(elapsed * 1000),
+                    result=result, error_message=error[:2000] if error else None, worker=self.worker,
+                ))
+                db.commit()
+            self._record(_insert)
+        return result
+
+    def _record(self, write: Callable):
+        """Ecriture d'historique : une erreur de journalisation n'interrompt jamais une tache."""
+        db = self._db()
+        try:
+            return write(db)
+        except Exception as e:
+            logger.warning(f"Planificateur: ecriture de l'historique impossible: {e}")
+            db.rollback()
+            return None
+        finally:
+            db.close()
+
+    # ── Statut ──────────────────────────
+
+    def get_status(self, db) -> dict:
+        """Statut des taches (historique partage entre workers) pour l'administration."""
+        from app.db.crud.crud_job_runs import get_last_runs
+
+        last_runs = get_last_runs(db)
+        jobs = []
+        for name, job in sorted(self._jobs.items()):
+            try:
+                interval = job.current_interval()
+            except Exception:
+                interval = None
+            run = last_runs.get(name)
+            last_started = _aware(run.started_at) if run else None
+            jobs.append({
+                "name": name,
+                "description": job.description,
+                "enabled": interval is not None,
+                "interval_seconds": interval,
+                "timeout_seconds": job.timeout,
+                "running": job.is_running() or (run is not None and run.status == "running"),
+                "running_on_this_worker": job.is_running(),
+                "next_run_at": (last_started + timedelta(seconds=interval)).isoformat()
+                if last_started and interval is not None else None,
+                "last_run": {
+                    "status": run.status,
+                    "started_at": last_started.isoformat(),
+                    "finished_at": _aware(run.finished_at).isoformat() if run.finished_at else None,
+                    "duration_ms": run.duration_ms,
+                    "result": run.result,
+                    "error_message": run.error_message,
+                    "worker": run.worker,
+                } if run else None,
+            })
+        return {
+            "worker": self.worker,
+            "runner_started": self.is_running(),
+            "is_leader": self.is_leader,
+            "jobs": jobs,
+            "services": {
+                name: service.get_metrics() if hasattr(service, "get_metrics") else {}
+                for name, service in sorted(self._services.items())
+            },
+        }
+
+
+# Singleton global
+job_runner = JobRunner()
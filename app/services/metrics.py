@@ -0,0 +1,207 @@
+"""
+Metriques Prometheus de l'application (exposees par GET /metrics).
+
+- http_requests_total{method, route, status} et
+  http_request_duration_seconds{method, route} : par modele de route
+  (/shows/{show_id}), pas par URL, pour garder un nombre de series borne
+- http_request_db_queries{route} et http_request_db_seconds{route} : nombre et
+  duree cumulee des requetes SQL par requete HTTP (evenements de curseur de
+  tous les moteurs, une seule paire d'ecouteurs partagee avec sql_profiler)
+- db_pool_checked_out / db_pool_overflow / db_pool_size {pool} : etat des pools
+  de connexions (api : requetes HTTP, jobs : taches d'arriere-plan), somme des workers
+- job_duration_seconds{job, status} : taches du planificateur (job_runner :
+  social_sync, backup_check, ...) et synchronisations sociales lancees a la
+  demande (orchestrateur, job="social_sync:<portee>")
+
+Multi-workers (gunicorn) : si PROMETHEUS_MULTIPROC_DIR est defini avant le
+demarrage des workers (gunicorn.conf.py), chaque worker ecrit ses valeurs dans
+ce repertoire et /metrics agrege tous les workers.
+
+Usage :
+    from app.services import metrics
+    metrics.instrument_engine(engine, "api")
+    metrics.observe_job("social_sync:sync-all", "success", 12.4)
+"""
+
+import os
+import threading
+import time
+import weakref
+from contextvars import ContextVar, Token
+from typing import Callable, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "Requetes HTTP traitees", ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "Duree de traitement des requetes HTTP", ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+DB_QUERIES = Histogram(
+    "http_request_db_queries", "Requetes SQL par requete HTTP", ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Duree cumulee des requetes SQL par requete HTTP", ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connexions du pool en cours d'utilisation", ["pool"], multiprocess_mode="livesum",
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connexions utilisees au-dela de pool_size", ["pool"], multiprocess_mode="livesum",
+)
+POOL_SIZE = Gauge(
+    "db_pool_size", "Taille configuree du pool de connexions", ["pool"], multiprocess_mode="livesum",
+)
+JOB_DURATION = Histogram(
+    "job_duration_seconds", "Duree des taches periodiques et synchronisations", ["job", "status"],
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 900.0, 1800.0),
+)
+
+
+class RequestStats:
+    """
+    Compteurs SQL de la requete HTTP en cours (partages avec le threadpool).
+    profile : QueryProfile de sql_profiler si le profilage est actif.
+    """
+
+    __slots__ = ("queries", "db_seconds", "profile")
+
+    def __init__(self, profile=None):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.profile = profile
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+# Observateurs de toutes les requetes SQL du processus, tous threads (sql_profiler.capture)
+_query_observers: tuple[Callable[[str, float], None], ...] = ()
+_listeners_lock = threading.Lock()
+_instrumented_pools: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def start_request(profile=None) -> tuple[RequestStats, Optional[Token]]:
+    """
+    Ouvre les compteurs SQL de la requete (MetricsMiddleware, SQLProfilerMiddleware).
+    Deja ouverts par un middleware englobant : ils sont partages (token None).
+    """
+    stats = _request_stats.get()
+    if stats is not None:
+        if profile is not None:
+            stats.profile = profile
+        return stats, None
+    stats = RequestStats(profile)
+    return stats, _request_stats.set(stats)
+
+
+def end_request(token: Optional[Token]) -> None:
+    if token is not None:
+        _request_stats.reset(token)
+
+
+def observe_request(method: str, route: str, status_code: int, duration: float,
+                    stats: RequestStats, token: Optional[Token]) -> None:
+    end_request(token)
+    HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+    HTTP_LATENCY.labels(method, route).observe(duration)
+    DB_QUERIES.labels(route).observe(stats.queries)
+    DB_SECONDS.labels(route).observe(stats.db_seconds)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    observers = _query_observers
+    if stats is None and not observers:
+        return
+    duration = time.perf_counter() - conn.info.get("query_started", time.perf_counter())
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += duration
+        if stats.profile is not None:
+            stats.profile.record(statement, duration)
+    for observer in observers:
+        observer(statement, duration)
+
+
+def install_query_listeners() -> None:
+    """Ecoute les requetes SQL de tous les moteurs SQLAlchemy (idempotent)."""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    with _listeners_lock:
+        if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+            return
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def add_query_observer(observer: Callable[[str, float], None]) -> None:
+    """Appelle observer(statement, duree) apres chaque requete SQL du processus."""
+    global _query_observers
+    install_query_listeners()
+    with _listeners_lock:
+        _query_observers = _query_observers + (observer,)
+
+
+def remove_query_observer(observer: Callable[[str, float], None]) -> None:
+    global _query_observers
+    with _listeners_lock:
+        _query_observers = tuple(o for o in _query_observers if o != observer)
+
+
+def instrument_engine(engine, pool_name: str = "api") -> None:
+    """Compte les requetes SQL par requete HTTP et suit l'etat du pool du moteur."""
+    from sqlalchemy import event
+
+    install_query_listeners()
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return  # NullPool / StaticPool : pas de compteurs
+    with _listeners_lock:
+        if pool in _instrumented_pools:
+            return
+        _instrumented_pools.add(pool)
+
+    checked_out_gauge = POOL_CHECKED_OUT.labels(pool_name)
+    overflow_gauge = POOL_OVERFLOW.labels(pool_name)
+
+    def _update_pool(checked_out: int):
+        checked_out_gauge.set(checked_out)
+        overflow_gauge.set(max(checked_out - pool.size(), 0))
+
+    POOL_SIZE.labels(pool_name).set(pool.size())
+    # L'evenement checkin precede le retour effectif de la connexion au pool
+    event.listen(pool, "checkout", lambda *_: _update_pool(pool.checkedout()))
+    event.listen(pool, "checkin", lambda *_: _update_pool(pool.checkedout() - 1))
+
+
+def observe_job(job: str, status: str, duration: float) -> None:
+    JOB_DURATION.labels(job, status).observe(duration)
+
+
+def render() -> tuple[bytes, str]:
+    """Exposition au format texte Prometheus (tous les workers en mode multiprocess)."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -1,14 +1,51 @@
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Optional
 
 import ovh
 from fastapi import HTTPException, status
 
 from app.config.config import settings
+from app.services.shared_cache import SharedCache
+from app.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger("hapson-api")
 
+# Nombre maximal d'appels OVH simultanes (par worker)
+OVH_MAX_CONCURRENCY = 8
+
+# Caches par endpoint (par worker) :
+# - listes de services : changent rarement (1 h)
+# - serviceInfos / details / comptes : 15 min
+# - factures : immuables une fois emises (pas d'expiration)
+_list_cache = TTLCache(ttl=3600, maxsize=256)
+_detail_cache = TTLCache(ttl=900, maxsize=4096)
+_bill_cache = TTLCache(ttl=None, maxsize=2000)
+
+# Instantanes de l'inventaire (services, factures, solde, taches) partages entre
+# workers (SharedCache "ovh"), rafraichis sur le leader par la tache ovh_inventory
+# (OVH_PREFETCH_INTERVAL_SECONDS) ; servis perimes jusqu'a 24 h si l'API OVH est
+# indisponible. Solde et taches, plus volatils, expirent plus tot (5 min / 1 min)
+# et sont alors rafraichis par un seul worker.
+BALANCE_CACHE_TTL = 300
+TASKS_CACHE_TTL = 60
+_inventory = SharedCache(
+    "ovh",
+    ttl=2 * (settings.OVH_PREFETCH_INTERVAL_SECONDS or 600),
+    stale_ttl=24 * 3600,
+    maxsize=16,
+)
+# Factures de l'instantane rafraichi par la tache periodique
+PREFETCH_BILLS_COUNT = 20
+
+# Un client OVH (session HTTP requests) par thread : les sessions ne sont pas
+# partagees entre les threads du pool d'appels concurrents
+_thread_local = threading.local()
+_executor: ThreadPoolExecutor | None = None
+_init_lock = threading.Lock()
+
 # Mapping type URL -> endpoint OVH
 SERVICE_TYPE_MAP = {
     "dedicated": "/dedicated/server",
@@ -25,20 +62,29 @@ SERVICE_TYPE_MAP = {
 }
 
 
+def is_ovh_configured() -> bool:
+    return bool(settings.OVH_APPLICATION_KEY and settings.OVH_APPLICATION_SECRET and settings.OVH_CONSUMER_KEY)
+
+
 def get_ovh_client() -> ovh.Client:
-    """Retourne une instance du client OVH. Leve une exception si non configure."""
-    if not settings.OVH_APPLICATION_KEY or not settings.OVH_APPLICATION_SECRET or not settings.OVH_CONSUMER_KEY:
+    """Retourne le client OVH du thread courant (session HTTP reutilisee). Leve une exception si non configure."""
+    if not is_ovh_configured():
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="OVH API n'est pas configuree. Veuillez renseigner les variables OVH_APPLICATION_KEY, OVH_APPLICATION_SECRET et OVH_CONSUMER_KEY."
         )
+    client = getattr(_thread_local, "client", None)
+    if client is not None:
+        return client
     try:
-        return ovh.Client(
+        client = ovh.Client(
             endpoint=settings.OVH_ENDPOINT,
             application_key=settings.OVH_APPLICATION_KEY,
             application_secret=settings.OVH_APPLICATION_SECRET,
             consumer_key=settings.OVH_CONSUMER_KEY,
         )
+        _thread_local.client = client
+        return client
     except Exception as e:
         logger.error(f"Erreur lors de la creation du client OVH: {e}")
         raise HTTPException(
@@ -91,6 +137,41 @@ def _ovh_call(client: ovh.Client, method: str, path: str, **kwargs):
         )
 
 
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _init_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=OVH_MAX_CONCURRENCY, thread_name_prefix="ovh")
+        return _executor
+
+
+def _cached_call(client: ovh.Client, path: str, cache: Optional[TTLCache] = None) -> Any:
+    """GET OVH avec cache optionnel par chemin (les erreurs ne sont pas mises en cache)."""
+    if cache is None:
+        return _ovh_call(client, "GET", path)
+    return cache.get_or_set(path, lambda: _ovh_call(client, "GET", path))
+
+
+def _fetch_many(paths: list[str], cache: Optional[TTLCache] = None) -> dict[str, Any]:
+    """
+    Execute des GET OVH en parallele (au plus OVH_MAX_CONCURRENCY a la fois),
+    chaque thread avec son propre client.
+
+    Retourne {chemin: resultat} ; un appel en echec a pour valeur l'HTTPException
+    levee, a traiter par l'appelant comme l'aurait fait un appel sequentiel.
+    """
+    def _one(path: str) -> Any:
+        try:
+            return _cached_call(get_ovh_client(), path, cache)
+        except HTTPException as e:
+            return e
+
+    unique_paths = list(dict.fromkeys(paths))
+    if len(unique_paths) <= 1:
+        return {path: _one(path) for path in unique_paths}
+    return dict(zip(unique_paths, _get_executor().map(_one, unique_paths)))
+
+
 def get_account_info() -> dict:
     """Recupere les informations du compte OVH (/me)."""
     client = get_ovh_client()
@@ -98,83 +179,113 @@ def get_account_info() -> dict:
 
 
 def get_all_services() -> list[dict]:
-    """Recupere tous les services avec leurs infos (expiration, statut, displayName) en iterant par type.
-    Pour les services Email Pro, ajoute aussi chaque compte email comme un sous-service."""
-    client = get_ovh_client()
-    services = []
+    """Recupere tous les services avec leurs infos (expiration, statut, displayName), depuis l'instantane partage.
+    Pour les services Email Pro, ajoute aussi chaque compte email comme un sous-service.
+    """
+    return get_inventory("services")
+
 
+def _fetch_all_services() -> list[dict]:
+    """
+    Appels OVH de get_all_services, par niveaux, en parallele et via les caches
+    par endpoint : listes par type → serviceInfos/detail/comptes par service →
+    detail des comptes Email Pro.
+    """
+    get_ovh_client()  # Leve 503 si OVH n'est pas configure
+
+    # Niveau 1 : noms des services de chaque type
+    listings = _fetch_many(list(SERVICE_TYPE_MAP.values()), _list_cache)
+    entries = []
     for svc_type, endpoint in SERVICE_TYPE_MAP.items():
-        try:
-            names = _ovh_call(client, "GET", endpoint)
-            if not isinstance(names, list):
-                continue
-            for name in names:
-                try:
-                    # Recuperer les infos de service (expiration, renouvellement, etc.)
-                    info = _ovh_call(client, "GET", f"{endpoint}/{name}/serviceInfos")
-                    info["serviceType"] = svc_type
-                    info["serviceName"] = str(name)
-
-                    # Recuperer le displayName depuis le detail du service
-                    try:
-                        detail = _ovh_call(client, "GET", f"{endpoint}/{name}")
-                        if isinstance(detail, dict) and detail.get("displayName"):
-                            info["displayName"] = detail["displayName"]
-                    except HTTPException:
-                        pass  # displayName est optionnel, on continue sans
-
-                    # Pour Email Domain, ne garder que ceux qui ont des comptes email
-                    if svc_type == "email_domain":
-                        try:
-                            email_accounts = _ovh_call(client, "GET", f"{endpoint}/{name}/account")
-                            if not isinstance(email_accounts, list) or len(email_accounts) == 0:
-                                logger.info(f"Email Domain {name} ignore: aucun compte email configure")
-                                continue  # Passer au service suivant, ne pas ajouter
-                        except HTTPException:
-                            logger.info(f"Email Domain {name} ignore: impossible de verifier les comptes")
-                            continue
-
-                    services.append(info)
-
-                    # Pour Email Pro, ajouter chaque compte email comme sous-service
-                    if svc_type == "email_pro":
-                        try:
-                            account_emails = _ovh_call(client, "GET", f"{endpoint}/{name}/account")
-                            if isinstance(account_emails, list):
-                                for email_addr in account_emails:
-                                    try:
-                                        acct = _ovh_call(client, "GET", f"{endpoint}/{name}/account/{email_addr}")
-                                        # Mapper les champs du compte vers le format service standard
-                                        services.append({
-                                            "serviceType": "email_pro_account",
-                                            "serviceName": email_addr,
-                                            "displayName": acct.get("displayName") or email_addr,
-                                            "status": "ok" if acct.get("state") == "ok" else acct.get("state", "unknown"),
-                                            "expiration": acct.get("expirationDate"),
-                                            "creation": acct.get("creationDate"),
-                                            "domain": acct.get("domain"),
-                                            "renewPeriod": acct.get("renewPeriod"),
-                                            "deleteAtExpiration": acct.get("deleteAtExpiration", False),
-                                            "currentUsage": acct.get("currentUsage"),
-                                            "quota": acct.get("quota"),
-                                            "parentService": str(name),
-                                        })
-                                    except HTTPException:
-                                        logger.warning(f"Impossible de recuperer le compte email: {email_addr}")
-                        except HTTPException:
-                            logger.warning(f"Impossible de lister les comptes Email Pro de {name}")
-
-                except HTTPException:
-                    # Si un service specifique echoue, on ajoute un placeholder
-                    logger.warning(f"Impossible de recuperer les infos du service {svc_type}/{name}")
-                    services.append({
-                        "serviceType": svc_type,
-                        "serviceName": str(name),
-                        "status": "unknown",
-                    })
-        except HTTPException as e:
-            logger.warning(f"Impossible de lister les services de type {svc_type}: {e.detail}")
+        names = listings[endpoint]
+        if isinstance(names, HTTPException):
+            logger.warning(f"Impossible de lister les services de type {svc_type}: {names.detail}")
+            continue
+        if not isinstance(names, list):
             continue
+        entries.extend((svc_type, endpoint, name) for name in names)
+
+    # Niveau 2 : serviceInfos, detail (displayName) et comptes email
+    paths = []
+    for svc_type, endpoint, name in entries:
+        paths += [f"{endpoint}/{name}/serviceInfos", f"{endpoint}/{name}"]
+        if svc_type in ("email_domain", "email_pro"):
+            paths.append(f"{endpoint}/{name}/account")
+    results = _fetch_many(paths, _detail_cache)
+
+    # Niveau 3 : detail de chaque compte Email Pro
+    account_paths = []
+    for svc_type, endpoint, name in entries:
+        if svc_type != "email_pro" or isinstance(results[f"{endpoint}/{name}/serviceInfos"], HTTPException):
+            continue
+        account_emails = results[f"{endpoint}/{name}/account"]
+        if isinstance(account_emails, list):
+            account_paths += [f"{endpoint}/{name}/account/{email_addr}" for email_addr in account_emails]
+    accounts = _fetch_many(account_paths, _detail_cache)
+
+    services = []
+    for svc_type, endpoint, name in entries:
+        info = results[f"{endpoint}/{name}/serviceInfos"]
+        if isinstance(info, HTTPException):
+            # Si un service specifique echoue, on ajoute un placeholder
+            logger.warning(f"Impossible de recuperer les infos du service {svc_type}/{name}")
+            services.append({
+                "serviceType": svc_type,
+                "serviceName": str(name),
+                "status": "unknown",
+            })
+            continue
+
+        # Copie : le resultat brut reste partage dans le cache
+        info = dict(info)
+        info["serviceType"] = svc_type
+        info["serviceName"] = str(name)
+
+        # displayName depuis le detail du service (optionnel)
+        detail = results[f"{endpoint}/{name}"]
+        if isinstance(detail, dict) and detail.get("displayName"):
+            info["displayName"] = detail["displayName"]
+
+        # Pour Email Domain, ne garder que ceux qui ont des comptes email
+        if svc_type == "email_domain":
+            email_accounts = results[f"{endpoint}/{name}/account"]
+            if isinstance(email_accounts, HTTPException):
+                logger.info(f"Email Domain {name} ignore: impossible de verifier les comptes")
+                continue
+            if not isinstance(email_accounts, list) or len(email_accounts) == 0:
+                logger.info(f"Email Domain {name} ignore: aucun compte email configure")
+                continue
+
+        services.append(info)
+
+        # Pour Email Pro, ajouter chaque compte email comme sous-service
+        if svc_type == "email_pro":
+            account_emails = results[f"{endpoint}/{name}/account"]
+            if isinstance(account_emails, HTTPException):
+                logger.warning(f"Impossible de lister les comptes Email Pro de {name}")
+                continue
+            if not isinstance(account_emails, list):
+                continue
+            for email_addr in account_emails:
+                acct = accounts[f"{endpoint}/{name}/account/{email_addr}"]
+                if isinstance(acct, HTTPException):
+                    logger.warning(f"Impossible de recuperer le compte email: {email_addr}")
+                    continue
+                # Mapper les champs du compte vers le format service standard
+                services.append({
+                    "serviceType": "email_pro_account",
+                    "serviceName": email_addr,
+                    "displayName": acct.get("displayName") or email_addr,
+                    "status": "ok" if acct.get("state") == "ok" else acct.get("state", "unknown"),
+                    "expiration": acct.get("expirationDate"),
+                    "creation": acct.get("creationDate"),
+                    "domain": acct.get("domain"),
+                    "renewPeriod": acct.get("renewPeriod"),
+                    "deleteAtExpiration": acct.get("deleteAtExpiration", False),
+                    "currentUsage": acct.get("currentUsage"),
+                    "quota": acct.get("quota"),
+                    "parentService": str(name),
+                })
 
     return services
 
@@ -195,31 +306,33 @@ def get_services_by_type(service_type: str, status_filter: str = None) -> list[d
         )
     client = get_ovh_client()
     endpoint = SERVICE_TYPE_MAP[service_type]
-    names = _ovh_call(client, "GET", endpoint)
+    names = _cached_call(client, endpoint, _list_cache)
     if not isinstance(names, list):
         return []
 
+    results = _fetch_many(
+        [path for name in names for path in (f"{endpoint}/{name}/serviceInfos", f"{endpoint}/{name}")],
+        _detail_cache,
+    )
     services = []
     for name in names:
-        try:
-            info = _ovh_call(client, "GET", f"{endpoint}/{name}/serviceInfos")
+        info = results[f"{endpoint}/{name}/serviceInfos"]
+        if not isinstance(info, HTTPException):
+            info = dict(info)
             info["serviceType"] = service_type
             info["serviceName"] = str(name)
 
             # Recuperer le displayName depuis le detail du service
-            try:
-                detail = _ovh_call(client, "GET", f"{endpoint}/{name}")
-                if isinstance(detail, dict) and detail.get("displayName"):
-                    info["displayName"] = detail["displayName"]
-            except HTTPException:
-                pass
+            detail = results[f"{endpoint}/{name}"]
+            if isinstance(detail, dict) and detail.get("displayName"):
+                info["displayName"] = detail["displayName"]
 
             # Appliquer le filtre par statut si demande
             if status_filter and info.get("status") != status_filter:
                 continue
 
             services.append(info)
-        except HTTPException:
+        else:
             logger.warning(f"Impossible de recuperer les infos du service {service_type}/{name}")
             # Ajouter un placeholder sauf si on filtre par statut
             if not status_filter:
@@ -263,17 +376,19 @@ def get_email_pro_accounts(service_name: str) -> list[dict]:
     if not endpoint:
         raise HTTPException(status_code=500, detail="Type email_pro non configure")
 
-    account_emails = _ovh_call(client, "GET", f"{endpoint}/{service_name}/account")
+    account_emails = _cached_call(client, f"{endpoint}/{service_name}/account", _detail_cache)
     if not isinstance(account_emails, list):
         return []
 
+    details = _fetch_many([f"{endpoint}/{service_name}/account/{email}" for email in account_emails], _detail_cache)
     accounts = []
     for email in account_emails:
-        try:
-            detail = _ovh_call(client, "GET", f"{endpoint}/{service_name}/account/{email}")
+        detail = details[f"{endpoint}/{service_name}/account/{email}"]
+        if not isinstance(detail, HTTPException):
+            detail = dict(detail)
             detail["email"] = email
             accounts.append(detail)
-        except HTTPException:
+        else:
             logger.warning(f"Impossible de recuperer le detail du compte email: {email}")
             accounts.append({
                 "email": email,
@@ -303,21 +418,26 @@ def get_email_pro_accounts(service_name: str) -> list[dict]:
 
 
 def get_bills(count: int = 20) -> list[dict]:
-    """Recupere les dernieres factures OVH, triees par date decroissante."""
+    """Recupere les dernieres factures OVH, triees par date decroissante (instantane partage)."""
+    return get_inventory(f"bills:{count}")
+
+
+def _fetch_bills(count: int) -> list[dict]:
+    """Le detail d'une facture est immuable : il est mis en cache sans expiration."""
     client = get_ovh_client()
-    bill_ids = _ovh_call(client, "GET", "/me/bill")
+    bill_ids = _cached_call(client, "/me/bill", _detail_cache)
     # Trier les IDs par ordre decroissant pour prioriser les plus recents
     bill_ids = sorted(bill_ids, reverse=True)
     # Limiter le nombre de factures recuperees
     bill_ids = bill_ids[:count] if len(bill_ids) > count else bill_ids
+    details = _fetch_many([f"/me/bill/{bill_id}" for bill_id in bill_ids], _bill_cache)
     bills = []
     for bill_id in bill_ids:
-        try:
-            detail = _ovh_call(client, "GET", f"/me/bill/{bill_id}")
-            bills.append(detail)
-        except HTTPException:
+        detail = details[f"/me/bill/{bill_id}"]
+        if isinstance(detail, HTTPException):
             logger.warning(f"Impossible de recuperer la facture {bill_id}")
             continue
+        bills.append(detail)
     # Tri final par date decroissante (plus recente en premier)
     bills.sort(key=lambda b: b.get("date", ""), reverse=True)
     return bills
@@ -326,7 +446,7 @@ def get_bills(count: int = 20) -> list[dict]:
 def get_bill_detail(bill_id: str) -> dict:
     """Recupere le detail d'une facture specifique."""
     client = get_ovh_client()
-    return _ovh_call(client, "GET", f"/me/bill/{bill_id}")
+    return _cached_call(client, f"/me/bill/{bill_id}", _bill_cache)
 
 
 def get_account_balance() -> dict:
@@ -337,7 +457,13 @@ def get_account_balance() -> dict:
     - balance: solde /me/balance (ou null si indisponible)
     - debtAccount: compte de dettes /me/debtAccount (ou null)
     - paymentMethods: liste des methodes de paiement actives
+
+    Le resultat est partage entre workers (instantane "balance", frais 5 min).
     """
+    return get_inventory("balance")
+
+
+def _fetch_account_balance() -> dict:
     client = get_ovh_client()
     result = {
         "balance": None,
@@ -361,12 +487,9 @@ def get_account_balance() -> dict:
     try:
         method_ids = _ovh_call(client, "GET", "/me/payment/method")
         if isinstance(method_ids, list):
-            for mid in method_ids[:10]:  # Limiter a 10
-                try:
-                    detail = _ovh_call(client, "GET", f"/me/payment/method/{mid}")
-                    result["paymentMethods"].append(detail)
-                except HTTPException:
-                    pass
+            paths = [f"/me/payment/method/{mid}" for mid in method_ids[:10]]  # Limiter a 10
+            details = _fetch_many(paths)
+            result["paymentMethods"] = [details[p] for p in paths if not isinstance(details[p], HTTPException)]
     except HTTPException:
         logger.info("Endpoint /me/payment/method non disponible")
 
@@ -466,55 +589,49 @@ def get_active_tasks() -> list[dict]:
     Recupere les taches actives sur tous les services VPS et serveurs dedies.
 
     Retourne une liste de taches avec type, statut, date, progression.
+    Resultat partage entre workers (instantane "tasks", frais TASKS_CACHE_TTL secondes).
     """
-    client = get_ovh_client()
-    tasks = []
+    return get_inventory("tasks")
 
-    # Taches VPS
-    try:
-        vps_names = _ovh_call(client, "GET", "/vps")
-        if isinstance(vps_names, list):
-            for vps_name in vps_names:
-                try:
-                    task_ids = _ovh_call(client, "GET", f"/vps/{vps_name}/tasks")
-                    if isinstance(task_ids, list):
-                        for task_id in task_ids[:20]:  # Limiter par VPS
-                            try:
-                                task = _ovh_call(client, "GET", f"/vps/{vps_name}/tasks/{task_id}")
-                                task["resourceName"] = vps_name
-                                task["resourceType"] = "vps"
-                                tasks.append(task)
-                            except HTTPException:
-                                pass
-                except HTTPException:
-                    pass
-    except HTTPException:
-        logger.warning("Impossible de lister les VPS pour les taches")
 
-    # Taches serveurs dedies
-    try:
-        server_names = _ovh_call(client, "GET", "/dedicated/server")
-        if isinstance(server_names, list):
-            for server_name in server_names:
-                try:
-                    task_ids = _ovh_call(client, "GET", f"/dedicated/server/{server_name}/task")
-                    if isinstance(task_ids, list):
-                        for task_id in task_ids[:20]:
-                            try:
-                                task = _ovh_call(client, "GET", f"/dedicated/server/{server_name}/task/{task_id}")
-                                task["resourceName"] = server_name
-                                task["resourceType"] = "dedicated"
-                                tasks.append(task)
-                            except HTTPException:
-                                pass
-                except HTTPException:
-                    pass
-    except HTTPException:
-        logger.warning("Impossible de lister les serveurs pour les taches")
+def _fetch_active_tasks() -> list[dict]:
+    get_ovh_client()  # Leve 503 si OVH n'est pas configure
+    tasks = []
+
+    resources = [
+        ("vps", "/vps", "tasks"),           # Taches VPS
+        ("dedicated", "/dedicated/server", "task"),  # Taches serveurs dedies
+    ]
+    listings = _fetch_many([endpoint for _, endpoint, _ in resources], _list_cache)
+
+    task_list_paths = []
+    for resource_type, endpoint, task_segment in resources:
+        names = listings[endpoint]
+        if isinstance(names, HTTPException):
+            label = "les VPS" if resource_type == "vps" else "les serveurs"
+            logger.warning(f"Impossible de lister {label} pour les taches")
+            continue
+        if isinstance(names, list):
+            task_list_paths += [(resource_type, name, f"{endpoint}/{name}/{task_segment}") for name in names]
+    task_lists = _fetch_many([path for _, _, path in task_list_paths])
+
+    task_paths = []
+    for resource_type, name, path in task_list_paths:
+        task_ids = task_lists[path]
+        if isinstance(task_ids, list):
+            task_paths += [(resource_type, name, f"{path}/{task_id}") for task_id in task_ids[:20]]  # Limiter par ressource
+    task_details = _fetch_many([path for _, _, path in task_paths])
+
+    for resource_type, name, path in task_paths:
+        task = task_details[path]
+        if isinstance(task, dict):
+            task = dict(task)
+            task["resourceName"] = name
+            task["resourceType"] = resource_type
+            tasks.append(task)
 
     # Trier par date decroissante (taches recentes en premier)
     tasks.sort(key=lambda t: t.get("startDate", t.get("todoDate", "")), reverse=True)
-
     return tasks
 
 
@@ -529,7 +646,6 @@ def get_services_dashboard(days_threshold: int = 30) -> dict:
     - expired: services deja expires
     - active: nombre de services actifs
     """
-    client = get_ovh_client()
     all_services = get_all_services()
 
     now = datetime.utcnow()
@@ -609,3 +725,54 @@ def get_services_dashboard(days_threshold: int = 30) -> dict:
         dashboard["recent_tasks"] = []
 
     return dashboard
+
+
+# ════════════════════════════════════════════════════════════════
+# INSTANTANES PARTAGES (rafraichis par la tache periodique ovh_inventory)
+# ════════════════════════════════════════════════════════════════
+
+def _inventory_loader(key: str) -> tuple[Callable[[], Any], Optional[float]]:
+    """Fonction de chargement et duree de fraicheur (None = celle du cache) d'un instantane."""
+    if key == "services":
+        return _fetch_all_services, None
+    if key == "balance":
+        return _fetch_account_balance, BALANCE_CACHE_TTL
+    if key == "tasks":
+        return _fetch_active_tasks, TASKS_CACHE_TTL
+    if key.startswith("bills:"):
+        count = int(key.split(":", 1)[1])
+        return (lambda: _fetch_bills(count)), None
+    raise KeyError(key)
+
+
+def get_inventory(key: str, refresh: bool = False) -> Any:
+    """
+    Instantane partage entre workers ("services", "bills:<n>", "balance", "tasks").
+    refresh=True force un nouvel appel a l'API OVH ; les demandes simultanees
+    (tous workers) partagent le meme appel.
+    """
+    fetch, ttl = _inventory_loader(key)
+    if refresh:
+        return _inventory.refresh(key, fetch, ttl=ttl)
+    return _inventory.get_or_compute(key, fetch, ttl=ttl)
+
+
+def refresh_inventory() -> Optional[dict]:
+    """Rafraichit les instantanes utilises par le dashboard OVH (tache periodique ovh_inventory)."""
+    if not is_ovh_configured():
+        return None
+    counts = {}
+    failed = []
+    for key in ("services", f"bills:{PREFETCH_BILLS_COUNT}", "balance", "tasks"):
+        try:
+            data = get_inventory(key, refresh=True)
+        except Exception as e:
+            logger.warning(f"[ovh-inventory] Echec rafraichissement {key}: {e}")
+            failed.append(key)
+            continue
+        counts[key] = len(data) if isinstance(data, list) else 1
+    if not counts:
+        raise RuntimeError("API OVH indisponible, instantanes perimes conserves")
+    if failed:
+        counts["failed"] = failed
+    return counts
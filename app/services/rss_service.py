@@ -15,6 +15,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from app.models.model_rss import RssFeed, RssArticle
+from app.services import http_client
 
 logger = logging.getLogger("hapson-api")
 
@@ -64,7 +65,7 @@ def fetch_single_feed(db: Session, feed: RssFeed) -> dict:
     """
     new_count = 0
     try:
-        response = httpx.get(
+        response = http_client.get(
             feed.url,
             timeout=FETCH_TIMEOUT,
             headers={"User-Agent": USER_AGENT},
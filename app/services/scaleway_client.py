@@ -4,21 +4,49 @@ Client Dedibox API — Gestion des services Scaleway Dedibox (Online.net).
 Utilise l'API REST Online.net (api.online.net/api/v1) avec authentification
 par token prive (Bearer token).
 Supporte : Serveurs dedies, Hebergements, Domaines, Informations utilisateur.
+
+Inventaire : les listes (serveurs, hebergements, domaines, IPs failover,
+compte) sont servies depuis des instantanes partages entre workers
+(SharedCache "scaleway"), rafraichis par la tache periodique
+scaleway_inventory (SCW_INVENTORY_REFRESH_SECONDS). Les details manquants
+des listes sont recuperes en parallele (au plus SCW_MAX_CONCURRENCY appels).
 """
 
 import logging
-from typing import Optional, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Optional, Union
 
 import httpx
 from fastapi import HTTPException, status
 
 from app.config.config import settings
+from app.services import http_client
+from app.services.shared_cache import SharedCache
 
 logger = logging.getLogger("hapson-api")
 
 # Base URL de l'API Online.net (Dedibox)
 DEDIBOX_API_BASE = "https://api.online.net/api/v1"
 
+# Appels de detail simultanes lors de l'enrichissement des listes
+SCW_MAX_CONCURRENCY = 8
+
+_executor: ThreadPoolExecutor | None = None
+_init_lock = threading.Lock()
+# Instantanes charges en parallele (pool distinct : ils utilisent eux-memes _executor)
+_snapshot_pool = ThreadPoolExecutor(max_workers=5, thread_name_prefix="scw-inventory")
+
+# Instantanes d'inventaire : frais pendant deux intervalles de rafraichissement,
+# servis perimes jusqu'a 24 h si l'API Dedibox est indisponible
+_inventory = SharedCache(
+    "scaleway",
+    ttl=2 * settings.SCW_INVENTORY_REFRESH_SECONDS,
+    stale_ttl=24 * 3600,
+    maxsize=16,
+)
+
 
 def _get_headers() -> dict:
     """Retourne les headers d'authentification Dedibox (Bearer token)."""
@@ -48,8 +76,7 @@ def _dedibox_get(path: str, params: Optional[dict] = None) -> Union[dict, list]:
     headers = _get_headers()
 
     try:
-        with httpx.Client(timeout=30.0, follow_redirects=True) as client:
-            response = client.get(url, headers=headers, params=params)
+        response = http_client.get(url, headers=headers, params=params, timeout=30.0, follow_redirects=True)
 
         if response.status_code == 200:
             return response.json()
@@ -94,6 +121,46 @@ def _dedibox_get(path: str, params: Optional[dict] = None) -> Union[dict, list]:
         )
 
 
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _init_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=SCW_MAX_CONCURRENCY, thread_name_prefix="scw")
+        return _executor
+
+
+def _enrich(items: list, is_complete: Callable[[dict], bool], fetch_detail: Callable[[int], dict]) -> list[dict]:
+    """
+    Remplace les elements minimaux d'une liste Dedibox par leur detail.
+
+    Les details sont recuperes en parallele (au plus SCW_MAX_CONCURRENCY a la
+    fois) ; l'ordre de la liste est conserve. Un detail en echec laisse
+    l'element tel quel ({"id": ...} pour un identifiant nu).
+    """
+    def _one(item) -> dict:
+        if isinstance(item, dict) and is_complete(item):
+            return item
+        item_id = None
+        if isinstance(item, dict):
+            item_id = item.get("id")
+        elif isinstance(item, (int, float)):
+            item_id = int(item)
+
+        if item_id:
+            try:
+                detail = fetch_detail(item_id)
+                if detail:
+                    return detail
+            except Exception:
+                pass
+
+        return item if isinstance(item, dict) else {"id": item}
+
+    if len(items) <= 1:
+        return [_one(item) for item in items]
+    return list(_get_executor().map(_one, items))
+
+
 # ════════════════════════════════════════════════════════════════
 # UTILISATEUR / COMPTE
 # ════════════════════════════════════════════════════════════════
@@ -119,34 +186,7 @@ def get_servers() -> list[dict]:
     data = _dedibox_get("/server")
     if not isinstance(data, list):
         return []
-
-    enriched: list[dict] = []
-    for item in data:
-        server_id = None
-        if isinstance(item, dict):
-            # Si l'objet a deja les champs essentiels, pas besoin d'enrichir
-            if item.get("hostname") and item.get("offer"):
-                enriched.append(item)
-                continue
-            server_id = item.get("id")
-        elif isinstance(item, (int, float)):
-            server_id = int(item)
-
-        if server_id:
-            try:
-                detail = get_server_detail(server_id)
-                if detail:
-                    enriched.append(detail)
-                    continue
-            except Exception:
-                pass
-
-        if isinstance(item, dict):
-            enriched.append(item)
-        else:
-            enriched.append({"id": item})
-
-    return enriched
+    return _enrich(data, lambda item: bool(item.get("hostname") and item.get("offer")), get_server_detail)
 
 
 def get_server_detail(server_id: int) -> dict:
@@ -178,33 +218,7 @@ def get_hostings() -> list[dict]:
     data = _dedibox_get("/hosting")
     if not isinstance(data, list):
         return []
-
-    enriched: list[dict] = []
-    for item in data:
-        hosting_id = None
-        if isinstance(item, dict):
-            if item.get("hostname") or item.get("fqdn"):
-                enriched.append(item)
-                continue
-            hosting_id = item.get("id")
-        elif isinstance(item, (int, float)):
-            hosting_id = int(item)
-
-        if hosting_id:
-            try:
-                detail = get_hosting_detail(hosting_id)
-                if detail:
-                    enriched.append(detail)
-                    continue
-            except Exception:
-                pass
-
-        if isinstance(item, dict):
-            enriched.append(item)
-        else:
-            enriched.append({"id": item})
-
-    return enriched
+    return _enrich(data, lambda item: bool(item.get("hostname") or item.get("fqdn")), get_hosting_detail)
 
 
 def get_hosting_detail(hosting_id: int) -> dict:
@@ -228,31 +242,7 @@ def get_domains() -> list[dict]:
     data = _dedibox_get("/domain")
     if not isinstance(data, list):
         return []
-
-    enriched: list[dict] = []
-    for item in data:
-        domain_id = None
-        if isinstance(item, dict):
-            domain_id = item.get("id")
-        elif isinstance(item, (int, float)):
-            domain_id = int(item)
-
-        if domain_id:
-            try:
-                detail = get_domain_detail(domain_id)
-                if detail:
-                    enriched.append(detail)
-                    continue
-            except Exception:
-                pass
-
-        # Fallback: garder l'item tel quel
-        if isinstance(item, dict):
-            enriched.append(item)
-        else:
-            enriched.append({"id": item})
-
-    return enriched
+    return _enrich(data, lambda item: False, get_domain_detail)
 
 
 def get_domain_detail(domain_id: int) -> dict:
@@ -273,13 +263,74 @@ def get_failover_ips() -> list[dict]:
     return []
 
 
+# ════════════════════════════════════════════════════════════════
+# INSTANTANES D'INVENTAIRE
+# ════════════════════════════════════════════════════════════════
+
+INVENTORY_FETCHERS: dict[str, Callable[[], Union[dict, list]]] = {
+    "servers": get_servers,
+    "hostings": get_hostings,
+    "domains": get_domains,
+    "failover": get_failover_ips,
+    "user": get_user_info,
+}
+
+
+def _snapshot(fetch: Callable[[], Union[dict, list]]) -> Callable[[], dict]:
+    return lambda: {"data": fetch(), "generated_at": datetime.now(timezone.utc).isoformat()}
+
+
+def get_inventory(kind: str, refresh: bool = False) -> dict:
+    """
+    Instantane d'une liste de l'inventaire : {"data": ..., "generated_at": iso}.
+
+    refresh=True force un nouvel appel a l'API Dedibox ; les demandes de
+    rafraichissement simultanees (tous workers) partagent le meme appel.
+    """
+    compute = _snapshot(INVENTORY_FETCHERS[kind])
+    if refresh:
+        return _inventory.refresh(kind, compute)
+    return _inventory.get_or_compute(kind, compute)
+
+
+def snapshot_age(snapshot: dict) -> int:
+    """Age d'un instantane en secondes."""
+    generated_at = datetime.fromisoformat(snapshot["generated_at"])
+    return max(0, int((datetime.now(timezone.utc) - generated_at).total_seconds()))
+
+
+def refresh_inventory() -> Optional[dict]:
+    """Rafraichit tous les instantanes (tache periodique scaleway_inventory)."""
+    if not settings.SCW_SECRET_KEY:
+        return None
+
+    def _one(kind: str):
+        try:
+            snapshot = get_inventory(kind, refresh=True)
+        except HTTPException as e:
+            logger.warning(f"Inventaire Dedibox: rafraichissement de '{kind}' echoue: {e.detail}")
+            return None
+        data = snapshot["data"]
+        return len(data) if isinstance(data, list) else 1
+
+    counts = dict(zip(INVENTORY_FETCHERS, _snapshot_pool.map(_one, INVENTORY_FETCHERS)))
+    failed = [kind for kind, count in counts.items() if count is None]
+    if len(failed) == len(counts):
+        raise RuntimeError("API Dedibox indisponible, instantanes perimes conserves")
+    result = {kind: count for kind, count in counts.items() if count is not None}
+    if failed:
+        result["failed"] = failed
+    return result
+
+
 # ════════════════════════════════════════════════════════════════
 # DASHBOARD
 # ════════════════════════════════════════════════════════════════
 
-def get_dashboard() -> dict:
+def get_dashboard(refresh: bool = False) -> dict:
     """
-    Genere un tableau de bord synthetique des services Dedibox.
+    Genere un tableau de bord synthetique des services Dedibox, a partir des
+    instantanes d'inventaire (charges en parallele).
 
     Retourne:
     - total_servers: nombre de serveurs dedies
@@ -288,7 +339,21 @@ def get_dashboard() -> dict:
     - total_domains: nombre de domaines
     - failover_ips_count: nombre d'IPs failover
     - user: infos utilisateur
+    - generated_at / snapshot_age_seconds: date et age du plus ancien instantane
     """
+    def _load(kind: str) -> Optional[dict]:
+        try:
+            return get_inventory(kind, refresh=refresh)
+        except HTTPException:
+            return None
+
+    snapshots = dict(zip(INVENTORY_FETCHERS, _snapshot_pool.map(_load, INVENTORY_FETCHERS)))
+
+    def _data(kind: str) -> Union[dict, list]:
+        if snapshots[kind] is None:
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Inventaire Dedibox '{kind}' indisponible")
+        return snapshots[kind]["data"]
+
     result = {
         "total_servers": 0,
         "servers_by_status": {},
@@ -297,11 +362,13 @@ def get_dashboard() -> dict:
         "total_domains": 0,
         "failover_ips_count": 0,
         "user": None,
+        "generated_at": None,
+        "snapshot_age_seconds": None,
     }
 
     # Serveurs
     try:
-        servers = get_servers()
+        servers = _data("servers")
         result["total_servers"] = len(servers)
         for srv in servers:
             # Le champ "abuse" ou "status" indique l'etat
@@ -317,29 +384,35 @@ def get_dashboard() -> dict:
 
     # Hebergements
     try:
-        hostings = get_hostings()
+        hostings = _data("hostings")
         result["total_hostings"] = len(hostings)
     except HTTPException:
         logger.warning("Impossible de recuperer les hebergements Dedibox")
 
     # Domaines
     try:
-        domains = get_domains()
+        domains = _data("domains")
         result["total_domains"] = len(domains)
     except HTTPException:
         logger.warning("Impossible de recuperer les domaines Dedibox")
 
     # IPs failover
     try:
-        ips = get_failover_ips()
+        ips = _data("failover")
         result["failover_ips_count"] = len(ips)
     except HTTPException:
         logger.warning("Impossible de recuperer les IPs failover")
 
     # User info
     try:
-        result["user"] = get_user_info()
+        result["user"] = _data("user")
     except HTTPException:
         logger.warning("Impossible de recuperer les infos utilisateur Dedibox")
 
+    available = [snapshot for snapshot in snapshots.values() if snapshot]
+    if available:
+        oldest = min(available, key=lambda snapshot: snapshot["generated_at"])
+        result["generated_at"] = oldest["generated_at"]
+        result["snapshot_age_seconds"] = snapshot_age(oldest)
+
     return result
@@ -0,0 +1,145 @@
+"""
+Taches periodiques de l'application, executees par le planificateur commun
+(app/services/job_runner.py) sur le seul worker leader.
+
+- social_publisher (service) : publication des posts planifies a leur echeance
+- social_sync / social_optimize : selon les reglages du module Social (desactivables)
+- rss_refresh : toutes les 30 min
+- wp_article_stats : instantane des statistiques WordPress (WP_STATS_REFRESH_SECONDS)
+- scaleway_inventory : instantanes de l'inventaire Dedibox (SCW_INVENTORY_REFRESH_SECONDS)
+- ovh_inventory : instantanes de l'inventaire OVH (OVH_PREFETCH_INTERVAL_SECONDS, 0 = desactivee)
+- backup_check : toutes les 60 s (sauvegarde a l'heure programmee)
+- token_cleanup : toutes les heures
+- segment_rebalance : toutes les 6 h
+- audit_log_partitions : tous les jours (partitions mensuelles a 3 mois)
+- job_history_purge : tous les jours
+
+Usage :
+    from app.services.job_runner import job_runner
+    from app.services.scheduled_jobs import register_default_jobs
+    register_default_jobs(job_runner)
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.config.config import settings
+from app.services.job_runner import JobRunner
+
+logger = logging.getLogger("hapson-api")
+
+
+def cleanup_revoked_tokens() -> dict:
+    """Supprime les tokens revoques expires de la base."""
+    from app.db.database import BackgroundSessionLocal
+    from app.db.crud.crud_auth import delete_expired_tokens
+
+    db = BackgroundSessionLocal()
+    try:
+        delete_expired_tokens(db, datetime.now(timezone.utc))
+        return {"status": "ok"}
+    finally:
+        db.close()
+
+
+def rebalance_segments() -> Optional[dict]:
+    """Renumerote les conducteurs dont l'ordre des segments n'est plus contigu."""
+    from app.db.database import BackgroundSessionLocal
+    from app.db.crud.crud_segments import rebalance_segment_positions
+
+    db = BackgroundSessionLocal()
+    try:
+        result = rebalance_segment_positions(db)
+        return result if result["shows"] else None
+    finally:
+        db.close()
+
+
+def ensure_audit_partitions() -> Optional[dict]:
+    """Cree les partitions mensuelles de audit_logs (mois courant + 3 mois)."""
+    from app.db.database import BackgroundSessionLocal
+    from app.db.crud.crud_audit_logs import ensure_audit_log_partitions
+
+    db = BackgroundSessionLocal()
+    try:
+        created = ensure_audit_log_partitions(db)
+        return {"created": created} if created else None
+    finally:
+        db.close()
+
+
+def purge_job_history() -> Optional[dict]:
+    """Supprime l'historique des executions au-dela de JOB_HISTORY_RETENTION_DAYS."""
+    from app.db.database import BackgroundSessionLocal
+    from app.db.crud.crud_job_runs import purge_job_runs
+
+    db = BackgroundSessionLocal()
+    try:
+        deleted = purge_job_runs(db, settings.JOB_HISTORY_RETENTION_DAYS)
+        return {"deleted": deleted} if deleted else None
+    finally:
+        db.close()
+
+
+def register_default_jobs(runner: JobRunner) -> None:
+    """Enregistre les taches periodiques de l'application."""
+    from app.services.backup_scheduler import backup_scheduler
+    from app.services.social_publish_queue import social_publisher
+    from app.services.social_scheduler import RSS_REFRESH_INTERVAL_MINUTES, scheduler as social_scheduler
+    from app.services import ovh_client
+    from app.services.scaleway_client import refresh_inventory
+    from app.services.wp_article_service import refresh_article_stats
+
+    runner.register_service("social_publisher", social_publisher)
+    runner.register(
+        "social_sync", social_scheduler.run_scheduled_sync,
+        interval=social_scheduler.sync_interval_seconds, timeout=3600,
+        description="Synchronisation des comptes Facebook",
+    )
+    runner.register(
+        "social_optimize", social_scheduler.run_scheduled_optimize,
+        interval=social_scheduler.optimize_interval_seconds, timeout=3600,
+        description="Nettoyage de la base du module Social",
+    )
+    runner.register(
+        "rss_refresh", social_scheduler._run_rss_refresh,
+        interval=RSS_REFRESH_INTERVAL_MINUTES * 60, timeout=1500,
+        description="Rafraichissement des flux RSS actifs",
+    )
+    runner.register(
+        "wp_article_stats", refresh_article_stats,
+        interval=settings.WP_STATS_REFRESH_SECONDS, timeout=300,
+        description="Instantane des statistiques des articles WordPress",
+    )
+    runner.register(
+        "scaleway_inventory", refresh_inventory,
+        interval=settings.SCW_INVENTORY_REFRESH_SECONDS, timeout=600,
+        description="Instantanes de l'inventaire Dedibox (serveurs, hebergements, domaines)",
+    )
+    runner.register(
+        "ovh_inventory", ovh_client.refresh_inventory,
+        interval=lambda: (settings.OVH_PREFETCH_INTERVAL_SECONDS or None) if ovh_client.is_ovh_configured() else None,
+        timeout=600,
+        description="Instantanes de l'inventaire OVH (services, factures, solde, taches)",
+    )
+    runner.register(
+        "backup_check", backup_scheduler.check_and_run, interval=60, timeout=1800,
+        description="Sauvegarde automatique quotidienne (pg_dump + Google Drive)", quiet=True,
+    )
+    runner.register(
+        "token_cleanup", cleanup_revoked_tokens, interval=3600, timeout=600,
+        description="Suppression des tokens revoques expires",
+    )
+    runner.register(
+        "segment_rebalance", rebalance_segments, interval=6 * 3600, timeout=1800,
+        description="Renumerotation des positions de segments non contigues", quiet=True,
+    )
+    runner.register(
+        "audit_log_partitions", ensure_audit_partitions, interval=24 * 3600, timeout=600,
+        description="Creation des partitions mensuelles des logs d'audit", quiet=True,
+    )
+    runner.register(
+        "job_history_purge", purge_job_history, interval=24 * 3600, timeout=600,
+        description="Purge de l'historique du planificateur", quiet=True,
+    )
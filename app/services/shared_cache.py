@@ -0,0 +1,373 @@
+"""
+Cache partage entre workers, stocke en base (table shared_cache_entries).
+
+Contrairement a TTLCache (app/utils/ttl_cache.py, local a chaque worker),
+une valeur calculee par un worker sert a tous les autres :
+
+- fraiche (moins de ttl secondes) : servie directement
+- perimee mais dans la fenetre stale_ttl : servie immediatement et rafraichie
+  en arriere-plan par un seul worker (stale-while-revalidate) ; si le
+  rafraichissement echoue, la valeur perimee reste en place
+- absente ou trop ancienne : calculee une seule fois (single-flight) — verrou
+  par cle dans le worker, puis verrou consultatif PostgreSQL entre workers ;
+  les appels concurrents attendent le resultat au lieu de refaire le calcul.
+  Le verrou est pris sur une connexion dediee (NullPool), hors des pools de
+  requetes : un calcul long ou une attente n'immobilise aucune connexion du pool
+
+Taille bornee par espace de noms (maxsize) : a chaque ecriture, les entrees
+depassees puis les moins recemment lues sont evincees.
+Compteurs par worker (hits, stale_hits, misses, waits, refreshes, errors)
+via stats() / shared_cache_stats().
+
+Les valeurs doivent etre serialisables en JSON. Une base indisponible ne
+bloque pas l'appelant : la valeur est alors calculee sans cache.
+
+Usage :
+    from app.services.shared_cache import SharedCache
+    cache = SharedCache("ga", ttl=300, stale_ttl=900, maxsize=500)
+    data = cache.get_or_compute("overview:123:28d", lambda: fetch_overview(...))
+    data = cache.refresh("overview:123:28d", lambda: fetch_overview(...))  # force
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, NamedTuple, Optional
+
+from sqlalchemy import create_engine, delete, func, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import NullPool
+
+from app.models.model_shared_cache import SharedCacheEntry
+
+logger = logging.getLogger("hapson-api")
+
+# Intervalle minimal entre deux mises a jour de accessed_at d'une entree (LRU)
+TOUCH_INTERVAL = timedelta(seconds=60)
+# Attente max du calcul d'un autre worker avant de calculer soi-meme (secondes)
+WAIT_TIMEOUT_SECONDS = 30
+
+# Rafraichissements stale-while-revalidate (partages par tous les caches)
+_refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="shared-cache")
+_registry: dict[str, "SharedCache"] = {}
+# Moteurs NullPool des verrous consultatifs, un par base
+_lock_engines: dict = {}
+_lock_engines_guard = threading.Lock()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: datetime) -> datetime:
+    """SQLite renvoie des dates naives : on les considere en UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _lock_engine(bind: Engine) -> Engine:
+    """Moteur sans pool (ni PgBouncer) pour les verrous : connexion ouverte le temps du verrou seulement."""
+    from app.db.database import direct_url
+
+    with _lock_engines_guard:
+        engine = _lock_engines.get(bind.url)
+        if engine is None:
+            engine = create_engine(direct_url(bind.url), poolclass=NullPool)
+            _lock_engines[bind.url] = engine
+        return engine
+
+
+class _Entry(NamedTuple):
+    value: Any
+    stored_at: datetime
+    expires_at: datetime
+    stale_until: datetime
+
+
+class SharedCache:
+    """Cache cle → valeur JSON d'un espace de noms, partage par tous les workers."""
+
+    def __init__(self, namespace: str, ttl: float, stale_ttl: float = 0, maxsize: int = 500,
+                 session_factory: Optional[Callable] = None):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self._session_factory = session_factory
+        self._guard = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._refreshing: set[str] = set()
+        self._counters = {"hits": 0, "stale_hits": 0, "misses": 0, "waits": 0, "refreshes": 0, "errors": 0}
+        _registry[namespace] = self
+
+    # ─── Lecture / calcul ───
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any],
+                       ttl: Optional[float] = None, stale_ttl: Optional[float] = None) -> Any:
+        """Valeur en cache pour `key`, ou resultat de compute() mis en cache."""
+        ttl = self.ttl if ttl is None else ttl
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+
+        entry = self._read(key)
+        now = _now()
+        if entry and now < entry.expires_at:
+            self._count("hits")
+            return entry.value
+        if entry and now < entry.stale_until:
+            self._count("stale_hits")
+            self._schedule_refresh(key, compute, ttl, stale_ttl)
+            return entry.value
+
+        self._count("misses")
+        with self._key_lock(key):
+            # Un autre thread du worker vient peut-etre de la calculer
+            entry = self._read(key)
+            if entry and _now() < entry.expires_at:
+                self._count("waits")
+                return entry.value
+            with self._shared_lock(key, wait=True):
+                # ... ou un autre worker, pendant qu'on attendait son verrou
+                entry = self._read(key)
+                if entry and _now() < entry.expires_at:
+                    self._count("waits")
+                    return entry.value
+                try:
+                    value = compute()
+                except Exception:
+                    self._count("errors")
+                    raise
+                self._write(key, value, ttl, stale_ttl)
+                return value
+
+    def _schedule_refresh(self, key: str, compute: Callable[[], Any], ttl: float, stale_ttl: float) -> None:
+        with self._guard:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        _refresh_pool.submit(self._refresh, key, compute, ttl, stale_ttl)
+
+    def _refresh(self, key: str, compute: Callable[[], Any], ttl: float, stale_ttl: float) -> None:
+        try:
+            with self._shared_lock(key, wait=False) as acquired:
+                if not acquired:
+                    return  # un autre worker rafraichit deja cette cle
+                entry = self._read(key)
+                if entry and _now() < entry.expires_at:
+                    return
+                self._write(key, compute(), ttl, stale_ttl)
+                self._count("refreshes")
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Cache {self.namespace}: rafraichissement de '{key}' echoue, valeur perimee conservee: {e}")
+        finally:
+            with self._guard:
+                self._refreshing.discard(key)
+
+    def refresh(self, key: str, compute: Callable[[], Any],
+                ttl: Optional[float] = None, stale_ttl: Optional[float] = None) -> Any:
+        """
+        Recalcule `key` meme si la valeur est fraiche (rafraichissement force).
+        Les demandes simultanees sont regroupees : celles qui attendaient le
+        verrou recoivent la valeur ecrite apres leur demande, sans recalcul.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+        requested_at = _now()
+        with self._key_lock(key):
+            entry = self._read(key)
+            if entry and entry.stored_at >= requested_at:
+                self._count("waits")
+                return entry.value
+            with self._shared_lock(key, wait=True):
+                entry = self._read(key)
+                if entry and entry.stored_at >= requested_at:
+                    self._count("waits")
+                    return entry.value
+                try:
+                    value = compute()
+                except Exception:
+                    self._count("errors")
+                    raise
+                self._write(key, value, ttl, stale_ttl)
+                self._count("refreshes")
+                return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, stale_ttl: Optional[float] = None) -> None:
+        """Ecrit une valeur calculee ailleurs (ex: instantane rafraichi par une tache periodique)."""
+        self._write(key, value, self.ttl if ttl is None else ttl, self.stale_ttl if stale_ttl is None else stale_ttl)
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Supprime une cle (ou tout l'espace de noms) pour tous les workers."""
+        db = self._session()
+        try:
+            condition = [SharedCacheEntry.namespace == self.namespace]
+            if key is not None:
+                condition.append(SharedCacheEntry.key == key)
+            db.execute(delete(SharedCacheEntry).where(*condition).execution_options(synchronize_session=False))
+            db.commit()
+        finally:
+            db.close()
+
+    # ─── Stockage ───
+
+    def _session(self):
+        if self._session_factory is None:
+            from app.db.database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def _read(self, key: str) -> Optional[_Entry]:
+        db = self._session()
+        try:
+            row = db.get(SharedCacheEntry, (self.namespace, key))
+            if row is None:
+                return None
+            entry = _Entry(row.value, _aware(row.stored_at), _aware(row.expires_at), _aware(row.stale_until))
+            now = _now()
+            if now - _aware(row.accessed_at) > TOUCH_INTERVAL:
+                row.accessed_at = now
+                db.commit()
+            return entry
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning(f"Cache {self.namespace}: lecture de '{key}' impossible: {e}")
+            return None
+        finally:
+            db.close()
+
+    def _write(self, key: str, value: Any, ttl: float, stale_ttl: float) -> None:
+        now = _now()
+        expires_at = now + timedelta(seconds=ttl)
+        values = {
+            "namespace": self.namespace,
+            "key": key,
+            "value": value,
+            "stored_at": now,
+            "expires_at": expires_at,
+            "stale_until": expires_at + timedelta(seconds=stale_ttl),
+            "accessed_at": now,
+        }
+        db = self._session()
+        try:
+            if db.get_bind().dialect.name == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            stmt = insert(SharedCacheEntry).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["namespace", "key"],
+                set_={name: stmt.excluded[name] for name in values if name not in ("namespace", "key")},
+            )
+            db.execute(stmt)
+            self._evict(db, now)
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning(f"Cache {self.namespace}: ecriture de '{key}' impossible: {e}")
+        finally:
+            db.close()
+
+    def _evict(self, db, now: datetime) -> None:
+        """Entrees depassees, puis les moins recemment lues au-dela de maxsize."""
+        in_namespace = SharedCacheEntry.namespace == self.namespace
+        db.execute(
+            delete(SharedCacheEntry)
+            .where(in_namespace, SharedCacheEntry.stale_until < now)
+            .execution_options(synchronize_session=False)
+        )
+        size = db.execute(select(func.count()).select_from(SharedCacheEntry).where(in_namespace)).scalar()
+        excess = size - self.maxsize
+        if excess > 0:
+            oldest = (
+                select(SharedCacheEntry.key)
+                .where(in_namespace)
+                .order_by(SharedCacheEntry.accessed_at)
+                .limit(excess)
+            )
+            db.execute(
+                delete(SharedCacheEntry)
+                .where(in_namespace, SharedCacheEntry.key.in_(oldest.scalar_subquery()))
+                .execution_options(synchronize_session=False)
+            )
+
+    # ─── Verrous ───
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._guard:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    @contextmanager
+    def _shared_lock(self, key: str, wait: bool):
+        """
+        Verrou consultatif PostgreSQL (namespace, key) entre workers.
+        wait=True : attend au plus WAIT_TIMEOUT_SECONDS puis continue sans verrou.
+        wait=False : rend False si un autre worker le detient.
+        Hors PostgreSQL (tests SQLite) : toujours accorde.
+        Connexion dediee (_lock_engine) et non celle du pool de la session.
+        """
+        db = self._session()
+        bind = db.get_bind()
+        db.close()
+        if bind.dialect.name != "postgresql":
+            yield True
+            return
+
+        params = {"ns": self.namespace, "key": key}
+        conn = None
+        acquired = False
+        try:
+            conn = _lock_engine(bind).connect().execution_options(isolation_level="AUTOCOMMIT")
+            if wait:
+                conn.execute(text(f"SET lock_timeout = {WAIT_TIMEOUT_SECONDS * 1000}"))
+                conn.execute(text("SELECT pg_advisory_lock(hashtext(:ns), hashtext(:key))"), params)
+                acquired = True
+            else:
+                acquired = bool(conn.execute(
+                    text("SELECT pg_try_advisory_lock(hashtext(:ns), hashtext(:key))"), params
+                ).scalar())
+        except SQLAlchemyError as e:
+            # Attente depassee ou base indisponible : calcul sans verrou
+            logger.warning(f"Cache {self.namespace}: verrou de '{key}' non obtenu: {e}")
+        try:
+            yield acquired
+        finally:
+            if conn is not None:
+                try:
+                    if acquired:
+                        conn.execute(text("SELECT pg_advisory_unlock(hashtext(:ns), hashtext(:key))"), params)
+                except SQLAlchemyError:
+                    pass  # la fermeture de la connexion libere le verrou
+                conn.close()
+
+    # ─── Metriques ───
+
+    def _count(self, name: str) -> None:
+        with self._guard:
+            self._counters[name] += 1
+
+    def stats(self) -> dict:
+        """Compteurs du worker courant et taille de l'espace de noms (tous workers)."""
+        with self._guard:
+            stats = dict(self._counters)
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_ratio"] = round((stats["hits"] + stats["stale_hits"]) / lookups, 3) if lookups else None
+        stats.update({"namespace": self.namespace, "ttl": self.ttl, "stale_ttl": self.stale_ttl,
+                      "maxsize": self.maxsize, "size": None})
+        db = self._session()
+        try:
+            stats["size"] = db.execute(
+                select(func.count()).select_from(SharedCacheEntry)
+                .where(SharedCacheEntry.namespace == self.namespace)
+            ).scalar()
+        except SQLAlchemyError:
+            db.rollback()
+        finally:
+            db.close()
+        return stats
+
+
+def shared_cache_stats() -> dict[str, dict]:
+    """Statistiques de tous les caches partages du worker."""
+    return {name: cache.stats() for name, cache in _registry.items()}
@@ -7,7 +7,7 @@ Gere les appels vers la Graph API v21.0 pour :
 - Importer les commentaires d'un post
 - Publier un post sur une page
 
-Toutes les fonctions sont synchrones (httpx.Client).
+Toutes les fonctions sont synchrones (client httpx poole partage, cf. http_client).
 """
 
 import logging
@@ -17,26 +17,13 @@ from typing import Optional, Callable
 import httpx
 from fastapi import HTTPException, status
 
+from app.services import http_client
+
 logger = logging.getLogger("hapson-api")
 
 GRAPH_API_BASE = "https://graph.facebook.com/v21.0"
 DEFAULT_TIMEOUT = 30.0
 
-# Client HTTP réutilisable (connection pooling)
-_shared_client: Optional[httpx.Client] = None
-
-
-def _get_client() -> httpx.Client:
-    """Client HTTP partagé avec connection pooling."""
-    global _shared_client
-    if _shared_client is None or _shared_client.is_closed:
-        _shared_client = httpx.Client(
-            timeout=DEFAULT_TIMEOUT,
-            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
-        )
-    return _shared_client
-
-
 def _graph_get(url: str, params: dict, description: str = "Graph API") -> dict:
     """
     Appel GET generique vers la Graph API avec gestion d'erreurs.
@@ -46,8 +33,7 @@ def _graph_get(url: str, params: dict, description: str = "Graph API") -> dict:
     logger.info(f"[FB API] {description} -> GET {url} (params sans token)")
 
     try:
-        client = _get_client()
-        response = client.get(url, params=params)
+        response = http_client.get(url, params=params, timeout=DEFAULT_TIMEOUT)
 
         print(f"[FB API] {description} <- HTTP {response.status_code}", flush=True)
         logger.info(f"[FB API] {description} <- HTTP {response.status_code}")
@@ -96,27 +82,32 @@ def _graph_get(url: str, params: dict, description: str = "Graph API") -> dict:
         )
 
 
-def _graph_post(url: str, data: dict, access_token: str, description: str = "Graph API POST", as_form: bool = False) -> dict:
+def _graph_post(url: str, data: dict, access_token: str, description: str = "Graph API POST",
+                as_form: bool = False, retryable_errors: bool = False) -> dict:
     """
     Appel POST generique vers la Graph API.
 
     Args:
         as_form: Si True, envoie les donnees en form-encoded (requis pour /{page_id}/photos).
                  Si False, envoie en JSON (comportement par defaut).
+        retryable_errors: Si True, un 429 ou une connexion impossible (requete non
+                 traitee par Facebook) leve un 503 que l'appelant peut retenter.
+                 Un 5xx reste un 502 : l'objet a pu etre cree malgre l'erreur.
     """
     try:
-        client = _get_client()
         if as_form:
-            response = client.post(
+            response = http_client.post(
                 url,
                 params={"access_token": access_token},
                 data=data,
+                timeout=DEFAULT_TIMEOUT,
             )
         else:
-            response = client.post(
+            response = http_client.post(
                 url,
                 params={"access_token": access_token},
                 json=data,
+                timeout=DEFAULT_TIMEOUT,
             )
 
         if response.status_code not in (200, 201):
@@ -126,8 +117,10 @@ def _graph_post(url: str, data: dict, access_token: str, description: str = "Gra
                 if isinstance(error_data, dict) else response.text[:300]
             )
             logger.error(f"{description} echoue: {response.status_code} - {error_msg}")
+            # 429 : requete refusee avant traitement, rejouable sans doublon
+            retryable = retryable_errors and response.status_code == 429
             raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE if retryable else status.HTTP_502_BAD_GATEWAY,
                 detail=f"Facebook API error: {error_msg}"
             )
 
@@ -138,6 +131,13 @@ def _graph_post(url: str, data: dict, access_token: str, description: str = "Gra
             status_code=status.HTTP_504_GATEWAY_TIMEOUT,
             detail=f"Timeout Facebook ({description})"
         )
+    except httpx.ConnectError as e:
+        # Connexion impossible : la requete n'a pas ete envoyee
+        logger.error(f"Connexion impossible {description}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE if retryable_errors else status.HTTP_502_BAD_GATEWAY,
+            detail=f"Facebook injoignable ({description})"
+        )
     except httpx.RequestError as e:
         logger.error(f"Erreur reseau {description}: {e}")
         raise HTTPException(
@@ -645,12 +645,12 @@ def hide_facebook_comment(
     """
     url = f"{GRAPH_API_BASE}/{comment_id}"
     try:
-        with httpx.Client(timeout=DEFAULT_TIMEOUT) as client:
-            response = client.post(
-                url,
-                params={"access_token": page_access_token},
-                json={"is_hidden": hide},
-            )
+        response = http_client.post(
+            url,
+            params={"access_token": page_access_token},
+            json={"is_hidden": hide},
+            timeout=DEFAULT_TIMEOUT,
+        )
         if response.status_code == 200:
             logger.info(f"Facebook: commentaire {comment_id} {'masque' if hide else 'affiche'}")
             return True
@@ -679,11 +679,11 @@ def delete_facebook_comment(
     """
     url = f"{GRAPH_API_BASE}/{comment_id}"
     try:
-        with httpx.Client(timeout=DEFAULT_TIMEOUT) as client:
-            response = client.delete(
-                url,
-                params={"access_token": page_access_token},
-            )
+        response = http_client.delete(
+            url,
+            params={"access_token": page_access_token},
+            timeout=DEFAULT_TIMEOUT,
+        )
         if response.status_code == 200:
             logger.info(f"Facebook: commentaire {comment_id} supprime")
             return True
@@ -719,6 +719,7 @@ def _upload_photo_from_url(
     image_url: str,
     published: bool = True,
     caption: Optional[str] = None,
+    retryable_errors: bool = False,
 ) -> dict:
     """
     Uploader une photo sur une page Facebook depuis une URL.
@@ -730,6 +731,7 @@ def _upload_photo_from_url(
         image_url: URL publique de l'image (ex: Firebase Storage URL)
         published: False pour upload unpublished (multi-photo), True pour publication directe
         caption: Legende de la photo (= message du post)
+        retryable_errors: voir _graph_post
 
     Returns:
         {"id": "photo_id"} — pour unpublished, l'id sert dans attached_media
@@ -739,7 +741,10 @@ def _upload_photo_from_url(
     if caption:
         data["caption"] = caption
 
-    return _graph_post(url, data, page_access_token, f"POST /{page_id}/photos (published={published})", as_form=True)
+    return _graph_post(
+        url, data, page_access_token, f"POST /{page_id}/photos (published={published})",
+        as_form=True, retryable_errors=retryable_errors,
+    )
 
 
 def publish_to_page(
@@ -748,6 +753,8 @@ def publish_to_page(
     message: str,
     link: Optional[str] = None,
     media_urls: Optional[list[str]] = None,
+    uploaded_photos: Optional[dict[str, str]] = None,
+    retryable_errors: bool = False,
 ) -> dict:
     """
     Publier un post sur une page Facebook.
@@ -763,6 +770,11 @@ def publish_to_page(
         message: Contenu du post
         link: URL a partager (optionnel)
         media_urls: Liste d'URLs de medias a joindre (optionnel)
+        uploaded_photos: {url: media_fbid} des photos non publiees deja uploadees
+            sur cette page ; complete au fil des uploads et reutilise lors d'une
+            nouvelle tentative (les media_fbid sont propres a la page)
+        retryable_errors: True pour lever 503 sur 429 / connexion impossible
+            (publication multi-comptes avec nouvelles tentatives, cf. _graph_post)
 
     Returns:
         {id: "post_id", permalink_url: "..."}
@@ -774,7 +786,7 @@ def publish_to_page(
     if len(image_urls) == 1:
         result = _upload_photo_from_url(
             page_access_token, page_id, image_urls[0],
-            published=True, caption=message,
+            published=True, caption=message, retryable_errors=retryable_errors,
         )
         photo_id = result.get("id", "")
         post_id = result.get("post_id", photo_id)
@@ -784,15 +796,21 @@ def publish_to_page(
 
     # ── CAS 2 : Plusieurs images → unpublished uploads + feed avec attached_media
     if len(image_urls) > 1:
+        uploaded = uploaded_photos if uploaded_photos is not None else {}
         photo_ids = []
         for img_url in image_urls:
-            r = _upload_photo_from_url(
-                page_access_token, page_id, img_url, published=False,
-            )
-            fbid = r.get("id")
+            fbid = uploaded.get(img_url)
+            if not fbid:
+                r = _upload_photo_from_url(
+                    page_access_token, page_id, img_url, published=False,
+                    retryable_errors=retryable_errors,
+                )
+                fbid = r.get("id")
+                if fbid:
+                    uploaded[img_url] = fbid
+                    logger.info(f"Facebook: photo unpublished uploadee -> {fbid}")
             if fbid:
                 photo_ids.append(fbid)
-                logger.info(f"Facebook: photo unpublished uploadee -> {fbid}")
 
         # Creer le post avec les photos attachees
         url = f"{GRAPH_API_BASE}/{page_id}/feed"
@@ -802,7 +820,10 @@ def publish_to_page(
         for i, fbid in enumerate(photo_ids):
             data[f"attached_media[{i}]"] = f'{{"media_fbid":"{fbid}"}}'
 
-        result = _graph_post(url, data, page_access_token, f"POST /{page_id}/feed (multi-photo)", as_form=True)
+        result = _graph_post(
+            url, data, page_access_token, f"POST /{page_id}/feed (multi-photo)",
+            as_form=True, retryable_errors=retryable_errors,
+        )
         post_id = result.get("id", "")
         permalink = f"https://www.facebook.com/{post_id}" if post_id else ""
         logger.info(f"Facebook: multi-photo post publie -> {post_id}")
@@ -814,7 +835,7 @@ def publish_to_page(
     if link:
         data["link"] = link
 
-    result = _graph_post(url, data, page_access_token, f"POST /{page_id}/feed")
+    result = _graph_post(url, data, page_access_token, f"POST /{page_id}/feed", retryable_errors=retryable_errors)
     post_id = result.get("id", "")
     permalink = f"https://www.facebook.com/{post_id}" if post_id else ""
     logger.info(f"Facebook: post publie sur la page {page_id} -> {post_id}")
@@ -999,8 +1020,7 @@ def debug_token_permissions(access_token: str) -> list[str]:
     try:
         url_me = f"{GRAPH_API_BASE}/me"
         params_me = {"access_token": access_token, "fields": "id,name"}
-        with httpx.Client(timeout=DEFAULT_TIMEOUT) as client:
-            resp = client.get(url_me, params=params_me)
+        resp = http_client.get(url_me, params=params_me, timeout=DEFAULT_TIMEOUT)
         me_data = resp.json() if resp.status_code == 200 else {}
         print(f"[DEBUG TOKEN] /me -> {me_data}", flush=True)
         logger.info(f"[DEBUG TOKEN] /me -> {me_data}")
@@ -1011,8 +1031,7 @@ def debug_token_permissions(access_token: str) -> list[str]:
     try:
         url_perms = f"{GRAPH_API_BASE}/me/permissions"
         params_perms = {"access_token": access_token}
-        with httpx.Client(timeout=DEFAULT_TIMEOUT) as client:
-            resp = client.get(url_perms, params=params_perms)
+        resp = http_client.get(url_perms, params=params_perms, timeout=DEFAULT_TIMEOUT)
         if resp.status_code == 200:
             perms_data = resp.json().get("data", [])
             for p in perms_data:
@@ -1034,8 +1053,7 @@ def debug_token_permissions(access_token: str) -> list[str]:
             "fields": "id,name",
             "limit": 10,
         }
-        with httpx.Client(timeout=DEFAULT_TIMEOUT) as client:
-            resp = client.get(url_accounts, params=params_acc)
+        resp = http_client.get(url_accounts, params=params_acc, timeout=DEFAULT_TIMEOUT)
         raw = resp.text[:500]
         print(f"[DEBUG TOKEN] /me/accounts RAW: {raw}", flush=True)
         logger.info(f"[DEBUG TOKEN] /me/accounts RAW: {raw}")
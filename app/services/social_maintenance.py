@@ -0,0 +1,91 @@
+"""
+Maintenance de la base du module Social (nettoyage, purge) suivie dans le
+registre de taches partage (sync_tasks).
+
+Le nettoyage et la purge sont executes par lots (crud_maintenance) et publient
+leur progression : le frontend la suit via GET /social/sync/status/{task_id},
+comme une synchronisation. Une seule maintenance a la fois par conteneur.
+
+Usage :
+    from app.services.social_maintenance import start_optimize, run_tracked
+    launch = start_optimize(hard_delete_days=30)        # arriere-plan
+    task_id, result = run_tracked("scheduled-optimize", cleanup_database, 30)
+"""
+
+import logging
+import threading
+from typing import Callable, Optional
+
+from app.services import sync_tasks
+
+logger = logging.getLogger("hapson-api")
+
+MAINTENANCE_LABELS = ("optimize", "scheduled-optimize", "purge")
+
+_lock = threading.Lock()
+
+
+def get_running_maintenance() -> Optional[dict]:
+    """Tache de maintenance en cours, si elle existe."""
+    return sync_tasks.get_running(labels=MAINTENANCE_LABELS)
+
+
+def _run(task_id: str, func: Callable, *args) -> dict:
+    from app.db.database import BackgroundSessionLocal
+
+    session = BackgroundSessionLocal()
+    try:
+        def progress(msg: str, pct: int) -> None:
+            sync_tasks.update(task_id, progress=msg, percent=pct)
+
+        result = func(session, *args, on_progress=progress)
+        sync_tasks.complete(task_id, result)
+        return result
+    except Exception as e:
+        logger.exception(f"Maintenance sociale echouee ({task_id})")
+        session.rollback()
+        sync_tasks.fail(task_id, str(e))
+        raise
+    finally:
+        session.close()
+
+
+def run_tracked(label: str, func: Callable, *args) -> tuple[str, dict]:
+    """
+    Execute func(session, *args, on_progress=...) dans le thread courant,
+    avec une entree du registre de taches. Retourne (task_id, resultat).
+    """
+    sync_tasks.cleanup()
+    task_id = sync_tasks.create(label=label)
+    return task_id, _run(task_id, func, *args)
+
+
+def start_optimize(hard_delete_days: int) -> dict:
+    """Lance le nettoyage en arriere-plan ; reprend la maintenance deja en cours le cas echeant."""
+    from app.db.crud.crud_social import cleanup_database
+
+    with _lock:
+        running = get_running_maintenance()
+        if running:
+            return {
+                "task_id": running["id"],
+                "status": "running",
+                "message": "Une maintenance est deja en cours.",
+                "reused": True,
+            }
+        sync_tasks.cleanup()
+        task_id = sync_tasks.create(label="optimize")
+
+    def _target():
+        try:
+            _run(task_id, cleanup_database, hard_delete_days)
+        except Exception:
+            pass  # deja consigne dans le registre
+
+    threading.Thread(target=_target, daemon=True, name="social-optimize").start()
+    return {
+        "task_id": task_id,
+        "status": "running",
+        "message": "Nettoyage lance en arriere-plan",
+        "reused": False,
+    }
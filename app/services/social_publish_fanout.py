@@ -0,0 +1,148 @@
+"""
+Publication d'un post sur plusieurs comptes cibles en parallele (fan-out).
+
+- chaque compte cible est publie dans un pool borne (SOCIAL_FANOUT_CONCURRENCY) :
+  la duree totale est celle du compte le plus lent, plus la somme des latences
+- les resultats sont rendus au fil de l'eau (as_completed) pour etre enregistres
+  un par un par l'appelant (la session SQLAlchemy reste dans le thread appelant)
+- chaque compte est retente independamment, avec backoff exponentiel, sur les
+  seules erreurs sans risque de doublon (HTTP 503 : 429 Facebook ou connexion
+  impossible, la requete n'a pas ete traitee). Un 5xx ou un timeout n'est pas
+  retente : le post a pu etre cree cote Facebook.
+- les photos non publiees deja uploadees sont reutilisees lors d'une nouvelle
+  tentative (les media_fbid Facebook sont propres a une page : pas de partage
+  entre comptes)
+
+Les cibles sont des dicts simples (pas d'objets ORM dans les threads) :
+    {"account_id": 3, "platform": "facebook", "access_token": "...", "page_id": "123"}
+
+Usage :
+    from app.services.social_publish_fanout import fan_out_publish
+    for outcome in fan_out_publish(targets, message, link, media_urls):
+        ...  # {"account_id", "platform", "status", "platform_post_id", "permalink_url", "error_message", "attempts"}
+"""
+
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterator, Optional
+
+from fastapi import HTTPException, status
+
+from app.config.config import settings
+
+logger = logging.getLogger("hapson-api")
+
+# Erreurs pour lesquelles une nouvelle tentative a du sens
+RETRYABLE_STATUS_CODES = (status.HTTP_503_SERVICE_UNAVAILABLE,)
+BACKOFF_MAX = 30.0
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Backoff exponentiel (base SOCIAL_PUBLISH_RETRY_BASE_SECONDS) avec jitter."""
+    delay = settings.SOCIAL_PUBLISH_RETRY_BASE_SECONDS * (2 ** (attempt - 1))
+    return min(BACKOFF_MAX, delay) * random.uniform(0.5, 1.0)
+
+
+def _publish_facebook(target: dict, message: str, link: Optional[str], media_urls: list[str], uploaded_photos: dict) -> dict:
+    from app.services.social_facebook import publish_to_page
+
+    if not target.get("access_token"):
+        raise ValueError("Aucun access token disponible pour ce compte")
+    if not target.get("page_id"):
+        raise ValueError("Aucun Page ID disponible pour ce compte")
+    return publish_to_page(
+        page_access_token=target["access_token"],
+        page_id=target["page_id"],
+        message=message,
+        link=link,
+        media_urls=media_urls,
+        uploaded_photos=uploaded_photos,
+        retryable_errors=True,
+    )
+
+
+def publish_target(target: dict, message: str, link: Optional[str], media_urls: list[str]) -> dict:
+    """
+    Publie sur un compte cible, avec nouvelles tentatives sur erreur passagere.
+    Ne leve pas : retourne le resultat (status "published" ou "error").
+    """
+    outcome = {
+        "account_id": target["account_id"],
+        "platform": target["platform"],
+        "status": "error",
+        "platform_post_id": None,
+        "permalink_url": None,
+        "error_message": None,
+        "attempts": 0,
+    }
+
+    if target["platform"] != "facebook":
+        # TODO: Implementer pour Instagram, LinkedIn, Twitter
+        outcome["status"] = "published"
+        return outcome
+
+    uploaded_photos: dict[str, str] = {}
+    max_attempts = max(1, settings.SOCIAL_PUBLISH_MAX_ATTEMPTS)
+    while True:
+        outcome["attempts"] += 1
+        try:
+            fb_result = _publish_facebook(target, message, link, media_urls, uploaded_photos)
+            outcome.update(
+                status="published",
+                platform_post_id=fb_result["id"],
+                permalink_url=fb_result["permalink_url"],
+            )
+            return outcome
+        except HTTPException as he:
+            if he.status_code in RETRYABLE_STATUS_CODES and outcome["attempts"] < max_attempts:
+                delay = _backoff_delay(outcome["attempts"])
+                logger.warning(
+                    f"Publication Facebook compte #{target['account_id']}: {he.detail}, "
+                    f"nouvelle tentative dans {delay:.1f}s"
+                )
+                time.sleep(delay)
+                continue
+            logger.error(f"Erreur publication Facebook compte #{target['account_id']}: {he.detail}")
+            outcome["error_message"] = str(he.detail)[:500]
+            return outcome
+        except Exception as e:
+            logger.error(f"Erreur publication Facebook compte #{target['account_id']}: {e}")
+            outcome["error_message"] = str(e)[:500]
+            return outcome
+
+
+def fan_out_publish(
+    targets: list[dict],
+    message: str,
+    link: Optional[str] = None,
+    media_urls: Optional[list[str]] = None,
+    publish_func: Optional[Callable[[dict, str, Optional[str], list[str]], dict]] = None,
+) -> Iterator[dict]:
+    """Publie sur toutes les cibles en parallele ; rend chaque resultat des qu'il est connu."""
+    if not targets:
+        return
+    publish_func = publish_func or publish_target
+    media_urls = list(media_urls or [])
+    workers = max(1, min(settings.SOCIAL_FANOUT_CONCURRENCY, len(targets)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="social-fanout") as executor:
+        futures = {
+            executor.submit(publish_func, target, message, link, media_urls): target
+            for target in targets
+        }
+        for future in as_completed(futures):
+            target = futures[future]
+            try:
+                yield future.result()
+            except Exception as e:
+                # publish_func personnalisee qui leve : resultat en erreur pour ce compte
+                yield {
+                    "account_id": target["account_id"],
+                    "platform": target["platform"],
+                    "status": "error",
+                    "platform_post_id": None,
+                    "permalink_url": None,
+                    "error_message": str(e)[:500],
+                    "attempts": 1,
+                }
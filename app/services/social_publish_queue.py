@@ -0,0 +1,341 @@
+"""
+File de publication des posts sociaux planifies.
+
+Remplace le sondage toutes les 30 secondes de get_due_scheduled_posts :
+- charge les prochaines echeances (scheduled_at) dans une file de priorite
+- dort exactement jusqu'a la prochaine echeance
+- est reveille par schedule_social_post / update_social_post / create / delete
+  (NOTIFY PostgreSQL sur le canal SCHEDULE_CHANNEL, ou wake() dans le processus)
+- publie les posts independants en parallele (pool borne SOCIAL_PUBLISH_CONCURRENCY)
+- mesure le retard de publication (debut effectif - scheduled_at)
+
+Service du planificateur commun : demarre uniquement sur le worker leader
+(job_runner.register_service), arrete s'il perd le leadership. Une resynchro
+complete a lieu toutes les RESYNC_SECONDS au cas ou une notification serait perdue.
+
+Usage :
+    from app.services.social_publish_queue import notify_schedule_change, social_publisher
+    notify_schedule_change(db)    # apres commit d'une planification
+    social_publisher.get_metrics()
+"""
+
+import heapq
+import logging
+import os
+import select
+import statistics
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.config.config import settings
+
+logger = logging.getLogger("hapson-api")
+
+SCHEDULE_CHANNEL = "social_post_schedule"
+# Nombre d'echeances chargees a chaque resynchro
+QUEUE_LOAD_LIMIT = 200
+# Resynchro de securite (notification perdue, modification hors API)
+RESYNC_SECONDS = 300
+# Fenetre des metriques de retard
+LAG_WINDOW = 200
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def load_next_due_posts(db: Session, limit: int = QUEUE_LOAD_LIMIT) -> List[Tuple[int, datetime]]:
+    """Prochaines echeances (id, scheduled_at) des posts planifies (index ix_social_posts_scheduled_due)."""
+    from app.models.model_social import SocialPost
+
+    rows = (
+        db.query(SocialPost.id, SocialPost.scheduled_at)
+        .filter(
+            SocialPost.status == "scheduled",
+            SocialPost.scheduled_at != None,
+            SocialPost.is_deleted == False,
+        )
+        .order_by(SocialPost.scheduled_at)
+        .limit(limit)
+        .all()
+    )
+    return [(post_id, _aware(scheduled_at)) for post_id, scheduled_at in rows]
+
+
+def _publish_due_post(db: Session, post_id: int) -> str:
+    """Publie un post planifie et l'enregistre dans l'etat du module Social ; retourne le statut final."""
+    from fastapi import HTTPException
+    from app.db.crud.crud_social import publish_social_post
+    from app.services.social_scheduler import scheduler as social_scheduler
+
+    try:
+        post_status = publish_social_post(db, post_id, due_only=True).status
+    except HTTPException as he:
+        social_scheduler.record_auto_publish({"post_id": post_id, "skipped": he.detail})
+        raise
+    except Exception as e:
+        social_scheduler.record_auto_publish({"post_id": post_id, "error": str(e)})
+        raise
+    social_scheduler.record_auto_publish({"post_id": post_id, "status": post_status})
+    return post_status
+
+
+def notify_schedule_change(db: Session) -> None:
+    """
+    Signale une modification de planification (a appeler apres commit).
+    NOTIFY atteint le worker leader ; wake() couvre le processus courant et SQLite.
+    """
+    bind = db.get_bind()
+    if bind.dialect.name == "postgresql":
+        try:
+            # Connexion a part : ne pas expirer les objets de la session appelante
+            with bind.connect() as conn:
+                conn.execute(text("SELECT pg_notify(:channel, '')"), {"channel": SCHEDULE_CHANNEL})
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"NOTIFY {SCHEDULE_CHANNEL} impossible: {e}")
+    social_publisher.wake()
+
+
+class ScheduledPublisher:
+    """Publieur a echeances : file de priorite + attente sur NOTIFY ou sur la prochaine echeance."""
+
+    def __init__(self, session_factory=None, engine=None,
+                 loader: Optional[Callable[[Session], List[Tuple[int, datetime]]]] = None,
+                 publish_func: Optional[Callable[[Session, int], str]] = None):
+        self._session_factory = session_factory
+        self._engine = engine
+        self._loader = loader or load_next_due_posts
+        self._publish_func = publish_func or _publish_due_post
+        self._queue: List[Tuple[datetime, int]] = []
+        self._in_flight: set = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._listen_raw = None
+        self._listen_conn = None
+        self._lags: deque = deque(maxlen=LAG_WINDOW)
+        self._published = 0
+        self._errors = 0
+        self._last_reload: Optional[datetime] = None
+
+    # ── Lifecycle ───────────────────────
+
+    def _db(self):
+        if self._session_factory is None:
+            from app.db.database import BackgroundSessionLocal
+            self._session_factory = BackgroundSessionLocal
+        return self._session_factory()
+
+    def _get_engine(self):
+        if self._engine is None:
+            from app.db.database import background_engine
+            self._engine = background_engine
+        return self._engine
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.SOCIAL_PUBLISH_CONCURRENCY), thread_name_prefix="social-publish"
+        )
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="social-publisher")
+        self._thread.start()
+        logger.info("File de publication sociale demarree")
+
+    def stop(self):
+        self._stop_event.set()
+        self.wake()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._close_listener()
+        logger.info("File de publication sociale arretee")
+
+    def wake(self):
+        """Reveille la boucle : rechargement des echeances (sans effet hors leader)."""
+        if not self.is_running() and not self._stop_event.is_set():
+            return
+        try:
+            os.write(self._wake_w, b"\0")
+        except OSError:
+            # Tube plein : un reveil est deja en attente
+            pass
+
+    # ── LISTEN (PostgreSQL) ─────────────
+
+    def _open_listener(self):
+        engine = self._get_engine()
+        if engine.dialect.name != "postgresql" or self._listen_conn is not None:
+            return
+        from app.db.database import direct_url
+
+        try:
+            # LISTEN vit sur la session : connexion directe, hors PgBouncer
+            raw = create_engine(direct_url(engine.url), poolclass=NullPool).raw_connection()
+            conn = raw.dbapi_connection
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {SCHEDULE_CHANNEL}")
+            # Garder le proxy : sa liberation fermerait la connexion
+            self._listen_raw, self._listen_conn = raw, conn
+        except Exception as e:
+            logger.warning(f"LISTEN {SCHEDULE_CHANNEL} impossible, resynchro periodique seule: {e}")
+
+    def _close_listener(self):
+        if self._listen_raw is not None:
+            try:
+                self._listen_raw.close()
+            except Exception:
+                pass
+        self._listen_raw, self._listen_conn = None, None
+
+    def _wait(self, timeout: float) -> bool:
+        """Attend une notification, un wake() ou la fin du delai. True si reveille."""
+        sources = [self._wake_r] + ([self._listen_conn] if self._listen_conn is not None else [])
+        try:
+            ready, _, _ = select.select(sources, [], [], max(0.0, timeout))
+        except (OSError, ValueError):
+            self._close_listener()
+            return True
+        woken = False
+        if self._wake_r in ready:
+            try:
+                while os.read(self._wake_r, 512):
+                    pass
+            except BlockingIOError:
+                pass
+            woken = True
+        if self._listen_conn is not None and self._listen_conn in ready:
+            try:
+                self._listen_conn.poll()
+                self._listen_conn.notifies.clear()
+            except Exception as e:
+                logger.warning(f"Connexion LISTEN perdue: {e}")
+                self._close_listener()
+            woken = True
+        return woken
+
+    # ── Boucle ──────────────────────────
+
+    def _reload(self):
+        db = self._db()
+        try:
+            entries = self._loader(db)
+        except Exception as e:
+            logger.warning(f"Chargement des publications planifiees impossible: {e}")
+            db.rollback()
+            return
+        finally:
+            db.close()
+        with self._lock:
+            self._queue = [(at, post_id) for post_id, at in entries if post_id not in self._in_flight]
+            heapq.heapify(self._queue)
+        self._last_reload = _now()
+
+    def _loop(self):
+        self._open_listener()
+        self._reload()
+        while not self._stop_event.is_set():
+            now = _now()
+            with self._lock:
+                due = []
+                while self._queue and self._queue[0][0] <= now:
+                    due.append(heapq.heappop(self._queue))
+                next_at = self._queue[0][0] if self._queue else None
+            for scheduled_at, post_id in due:
+                self._submit(post_id, scheduled_at)
+
+            resync_at = self._last_reload + timedelta(seconds=RESYNC_SECONDS)
+            wake_at = min(next_at, resync_at) if next_at else resync_at
+            woken = self._wait((wake_at - _now()).total_seconds())
+            if self._stop_event.is_set():
+                break
+            if self._listen_conn is None:
+                self._open_listener()
+            if woken or _now() >= resync_at:
+                self._reload()
+
+    def _submit(self, post_id: int, scheduled_at: datetime):
+        with self._lock:
+            if post_id in self._in_flight or self._executor is None:
+                return
+            self._in_flight.add(post_id)
+        self._executor.submit(self._publish, post_id, scheduled_at)
+
+    def _publish(self, post_id: int, scheduled_at: datetime):
+        from fastapi import HTTPException
+
+        lag = (_now() - scheduled_at).total_seconds()
+        db = self._db()
+        try:
+            status = self._publish_func(db, post_id)
+            with self._lock:
+                self._lags.append(lag)
+                self._published += 1
+            logger.info(f"Publication planifiee: post #{post_id} {status} (retard {lag:.1f}s)")
+        except HTTPException as he:
+            if he.status_code in (400, 404, 409):
+                # Supprime, deja publie/pris, ou replanifie plus tard entre-temps
+                logger.info(f"Publication planifiee: post #{post_id} ignore ({he.detail})")
+            else:
+                with self._lock:
+                    self._errors += 1
+                logger.error(f"Publication planifiee: post #{post_id} echoue: {he.detail}")
+        except Exception as e:
+            with self._lock:
+                self._errors += 1
+            logger.error(f"Publication planifiee: post #{post_id} echoue: {e}")
+            db.rollback()
+        finally:
+            db.close()
+            with self._lock:
+                self._in_flight.discard(post_id)
+
+    # ── Metriques ───────────────────────
+
+    def get_metrics(self) -> dict:
+        """Retard de publication (secondes) et compteurs depuis le demarrage."""
+        with self._lock:
+            lags = sorted(self._lags)
+            next_due = self._queue[0][0].isoformat() if self._queue else None
+            return {
+                "running": self.is_running(),
+                "listening": self._listen_conn is not None,
+                "queued": len(self._queue),
+                "in_flight": len(self._in_flight),
+                "next_due_at": next_due,
+                "published": self._published,
+                "errors": self._errors,
+                "lag_seconds": {
+                    "last": round(self._lags[-1], 3) if self._lags else None,
+                    "avg": round(statistics.fmean(lags), 3) if lags else None,
+                    "p95": round(lags[max(0, int(len(lags) * 0.95) - 1)], 3) if lags else None,
+                    "max": round(lags[-1], 3) if lags else None,
+                },
+            }
+
+
+# Singleton global
+social_publisher = ScheduledPublisher()
@@ -1,21 +1,25 @@
 """
-Planificateur périodique pour le module Social.
+Réglages et tâches périodiques du module Social.
 
 Tâches :
 - Auto-sync : synchronise tous les comptes Facebook à intervalle régulier
 - Auto-optimize : nettoie la BDD (orphelins, purge soft-deleted) à intervalle régulier
+- RSS : rafraîchit les flux actifs toutes les 30 minutes
+- Auto-publish : publie les posts planifiés à leur échéance
+  (file dédiée : app/services/social_publish_queue.py)
 
-Configuration stockée en mémoire avec persistance via les endpoints REST.
-Le scheduler est démarré au lancement de l'app et s'arrête proprement au shutdown.
+L'exécution est confiée au planificateur commun (app/services/job_runner.py,
+enregistrement dans scheduled_jobs.py) : un seul worker leader, un exécuteur
+par tâche. Ce module garde les réglages (persistés dans STATE_FILE, relus
+quand un autre worker les modifie) et le dernier résultat de chaque tâche.
 
 Usage :
     from app.services.social_scheduler import scheduler
-    scheduler.start()    # dans lifespan startup
-    scheduler.stop()     # dans lifespan shutdown
+    scheduler.get_settings()
+    scheduler.sync_interval_seconds()   # None si l'auto-sync est désactivée
 """
 
 import threading
-import time
 import logging
 import json
 import os
@@ -52,6 +56,16 @@ DEFAULT_SETTINGS = {
     "analytics_top_hashtags_limit": 10, # top hashtags dans overview
 }
 
+# Rafraîchissement des flux RSS (toujours actif)
+RSS_REFRESH_INTERVAL_MINUTES = 30
+
+
+def _state_mtime() -> Optional[float]:
+    try:
+        return os.path.getmtime(STATE_FILE)
+    except OSError:
+        return None
+
 
 def _read_state() -> dict:
     """Lire l'etat persistant du scheduler."""
@@ -89,32 +103,57 @@ class SocialScheduler:
     """Planificateur de tâches périodiques pour le module Social."""
 
     def __init__(self):
-        saved_state = _read_state()
-        saved_settings = saved_state.get("settings", {}) if isinstance(saved_state, dict) else {}
-        self._settings: dict = {**DEFAULT_SETTINGS, **saved_settings}
-        self._running = False
-        self._thread: Optional[threading.Thread] = None
-        self._stop_event = threading.Event()
         self._lock = threading.Lock()
+        self._settings: dict = dict(DEFAULT_SETTINGS)
+        self._state_mtime: Optional[float] = None
 
         # Timestamps de dernière exécution
-        self._last_sync: Optional[str] = saved_state.get("last_sync_at")
-        self._last_optimize: Optional[str] = saved_state.get("last_optimize_at")
-        self._last_sync_result: Optional[dict] = saved_state.get("last_sync_result")
-        self._last_optimize_result: Optional[dict] = saved_state.get("last_optimize_result")
-        self._last_auto_publish: Optional[str] = saved_state.get("last_auto_publish_at")
-        self._last_auto_publish_result: Optional[dict] = saved_state.get("last_auto_publish_result")
-        self._last_rss_refresh: Optional[str] = saved_state.get("last_rss_refresh_at")
-        self._last_rss_refresh_result: Optional[dict] = saved_state.get("last_rss_refresh_result")
+        self._last_sync: Optional[str] = None
+        self._last_optimize: Optional[str] = None
+        self._last_sync_result: Optional[dict] = None
+        self._last_optimize_result: Optional[dict] = None
+        self._last_auto_publish: Optional[str] = None
+        self._last_auto_publish_result: Optional[dict] = None
+        self._last_rss_refresh: Optional[str] = None
+        self._last_rss_refresh_result: Optional[dict] = None
+        self._reload_if_changed()
+
+    def _reload_if_changed(self, settings_only: bool = False):
+        """
+        Relire l'état persistant s'il a été modifié (par un autre worker).
+        settings_only : garder en mémoire les derniers résultats (écrits par le leader).
+        """
+        mtime = _state_mtime()
+        if mtime is None or mtime == self._state_mtime:
+            return
+        saved_state = _read_state()
+        if not isinstance(saved_state, dict):
+            return
+        with self._lock:
+            self._state_mtime = mtime
+            self._settings = {**DEFAULT_SETTINGS, **saved_state.get("settings", {})}
+            if settings_only:
+                return
+            self._last_sync = saved_state.get("last_sync_at")
+            self._last_optimize = saved_state.get("last_optimize_at")
+            self._last_sync_result = saved_state.get("last_sync_result")
+            self._last_optimize_result = saved_state.get("last_optimize_result")
+            self._last_auto_publish = saved_state.get("last_auto_publish_at")
+            self._last_auto_publish_result = saved_state.get("last_auto_publish_result")
+            self._last_rss_refresh = saved_state.get("last_rss_refresh_at")
+            self._last_rss_refresh_result = saved_state.get("last_rss_refresh_result")
 
     # ── Settings ────────────────────────
 
     def get_settings(self) -> dict:
         """Retourner les paramètres courants + statut."""
+        from app.services.job_runner import job_runner
+
+        self._reload_if_changed()
         with self._lock:
             return {
                 **self._settings,
-                "scheduler_running": self._running,
+                "scheduler_running": job_runner.is_running(),
                 "last_sync_at": self._last_sync,
                 "last_optimize_at": self._last_optimize,
                 "last_sync_result": self._last_sync_result,
@@ -126,21 +165,45 @@ class SocialScheduler:
             }
 
     def update_settings(self, new_settings: dict) -> dict:
-        """Mettre à jour les paramètres. Redémarre le scheduler si nécessaire."""
+        """Mettre à jour les paramètres (pris en compte par le leader au tour suivant)."""
+        self._reload_if_changed()
         with self._lock:
             for key, value in new_settings.items():
                 if key in self._settings:
                     self._settings[key] = value
 
-        # Redémarrer le scheduler si actif pour prendre en compte les nouveaux intervalles
         self._persist_state()
-        if self._running:
-            self._restart()
-
         return self.get_settings()
 
+    # ── Intervalles (lus par le planificateur à chaque tour) ──
+
+    def sync_interval_seconds(self) -> Optional[float]:
+        self._reload_if_changed()
+        with self._lock:
+            if not self._settings["auto_sync_enabled"]:
+                return None
+            return self._settings["auto_sync_interval_minutes"] * 60
+
+    def optimize_interval_seconds(self) -> Optional[float]:
+        self._reload_if_changed()
+        with self._lock:
+            if not self._settings["auto_optimize_enabled"]:
+                return None
+            return self._settings["auto_optimize_interval_hours"] * 3600
+
+    def run_scheduled_sync(self) -> dict:
+        with self._lock:
+            force = self._settings["auto_sync_force"]
+        return self._run_sync(force)
+
+    def run_scheduled_optimize(self) -> dict:
+        with self._lock:
+            purge_days = self._settings["auto_optimize_purge_days"]
+        return self._run_optimize(purge_days)
+
     def _persist_state(self):
         """Persister les reglages et les derniers resultats."""
+        self._reload_if_changed(settings_only=True)
         with self._lock:
             state = {
                 "settings": self._settings,
@@ -154,77 +217,12 @@ class SocialScheduler:
                 "last_rss_refresh_result": self._last_rss_refresh_result,
             }
         _write_state(state)
-
-    # ── Lifecycle ───────────────────────
-
-    def start(self):
-        """Démarrer le scheduler en arrière-plan."""
-        if self._running:
-            return
-
-        self._running = True
-        self._stop_event.clear()
-        self._thread = threading.Thread(target=self._loop, daemon=True, name="social-scheduler")
-        self._thread.start()
-        logger.info("🟢 Social scheduler démarré")
-
-    def stop(self):
-        """Arrêter le scheduler proprement."""
-        self._running = False
-        self._stop_event.set()
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=5)
-        logger.info("🔴 Social scheduler arrêté")
-
-    def _restart(self):
-        """Redémarrer le scheduler (changement de config)."""
-        self.stop()
-        self.start()
-
-    # ── Main loop ───────────────────────
-
-    def _loop(self):
-        """Boucle principale du scheduler. Vérifie toutes les 30 secondes."""
-        last_sync_time = 0.0
-        last_optimize_time = 0.0
-        last_rss_time = 0.0
-
-        while not self._stop_event.is_set():
-            now = time.time()
-
-            with self._lock:
-                sync_enabled = self._settings["auto_sync_enabled"]
-                sync_interval = self._settings["auto_sync_interval_minutes"] * 60
-                sync_force = self._settings["auto_sync_force"]
-                opt_enabled = self._settings["auto_optimize_enabled"]
-                opt_interval = self._settings["auto_optimize_interval_hours"] * 3600
-                opt_purge_days = self._settings["auto_optimize_purge_days"]
-
-            # Auto-sync
-            if sync_enabled and (now - last_sync_time) >= sync_interval:
-                self._run_sync(sync_force)
-                last_sync_time = now
-
-            # Auto-optimize
-            if opt_enabled and (now - last_optimize_time) >= opt_interval:
-                self._run_optimize(opt_purge_days)
-                last_optimize_time = now
-
-            # RSS auto-refresh (toutes les 30 min)
-            rss_interval = 30 * 60  # 30 minutes
-            if (now - last_rss_time) >= rss_interval:
-                self._run_rss_refresh()
-                last_rss_time = now
-
-            # Auto-publish (toujours actif — les posts planifiés doivent être publiés)
-            self._run_auto_publish()
-
-            # Dormir 30 secondes entre chaque vérification
-            self._stop_event.wait(timeout=30)
+        with self._lock:
+            self._state_mtime = _state_mtime()
 
     # ── Tâches ──────────────────────────
 
-    def _run_sync(self, force: bool):
+    def _run_sync(self, force: bool) -> dict:
         """Exécuter la synchronisation de tous les comptes Facebook."""
         from app.services.social_sync_orchestrator import social_sync_orchestrator
 
@@ -238,20 +236,21 @@ class SocialScheduler:
             logger.info(f"✅ Auto-sync terminée: {result}")
         except Exception as e:
             logger.error(f"❌ Auto-sync échouée: {e}")
+            result = {"error": str(e)}
             with self._lock:
                 self._last_sync = datetime.now(timezone.utc).isoformat()
-                self._last_sync_result = {"error": str(e)}
+                self._last_sync_result = result
             self._persist_state()
+        return result
 
-    def _run_optimize(self, purge_days: int):
-        """Exécuter le nettoyage/optimisation de la BDD."""
-        from app.db.database import SessionLocal
+    def _run_optimize(self, purge_days: int) -> dict:
+        """Exécuter le nettoyage/optimisation de la BDD (par lots, suivi dans le registre de tâches)."""
         from app.db.crud.crud_social import cleanup_database
+        from app.services.social_maintenance import run_tracked
 
         logger.info(f"⏰ Auto-optimize démarrée (purge_days={purge_days})...")
-        session = SessionLocal()
         try:
-            result = cleanup_database(session, purge_days)
+            _, result = run_tracked("scheduled-optimize", cleanup_database, purge_days)
             with self._lock:
                 self._last_optimize = datetime.now(timezone.utc).isoformat()
                 self._last_optimize_result = result
@@ -259,66 +258,26 @@ class SocialScheduler:
             logger.info(f"✅ Auto-optimize terminée: {result}")
         except Exception as e:
             logger.error(f"❌ Auto-optimize échouée: {e}")
+            result = {"error": str(e)}
             with self._lock:
                 self._last_optimize = datetime.now(timezone.utc).isoformat()
-                self._last_optimize_result = {"error": str(e)}
+                self._last_optimize_result = result
             self._persist_state()
-        finally:
-            session.close()
-
-    def _run_auto_publish(self):
-        """Publier automatiquement les posts planifies dont l'heure est passee."""
-        from app.db.database import SessionLocal
-        from app.db.crud.crud_social import get_due_scheduled_posts, publish_social_post
-        from fastapi import HTTPException
+        return result
 
-        session = SessionLocal()
-        try:
-            due_posts = get_due_scheduled_posts(session)
-            if not due_posts:
-                return
-
-            logger.info(f"⏰ Auto-publish: {len(due_posts)} post(s) a publier")
-            published = 0
-            errors = 0
-
-            for post in due_posts:
-                try:
-                    publish_social_post(session, post.id)
-                    published += 1
-                    logger.info(f"✅ Auto-publish: post #{post.id} publie")
-                except HTTPException as he:
-                    if he.status_code == 409:
-                        # Un autre worker a deja pris ce post — normal en multi-worker
-                        logger.debug(f"Post #{post.id} deja pris par un autre worker")
-                    else:
-                        errors += 1
-                        logger.error(f"❌ Auto-publish: post #{post.id} echoue: {he.detail}")
-                except Exception as e:
-                    errors += 1
-                    logger.error(f"❌ Auto-publish: post #{post.id} echoue: {e}")
-
-            result = {"due": len(due_posts), "published": published, "errors": errors}
-            with self._lock:
-                self._last_auto_publish = datetime.now(timezone.utc).isoformat()
-                self._last_auto_publish_result = result
-            self._persist_state()
-            logger.info(f"✅ Auto-publish termine: {result}")
-        except Exception as e:
-            logger.error(f"❌ Auto-publish echoue: {e}")
-            with self._lock:
-                self._last_auto_publish = datetime.now(timezone.utc).isoformat()
-                self._last_auto_publish_result = {"error": str(e)}
-            self._persist_state()
-        finally:
-            session.close()
+    def record_auto_publish(self, result: dict):
+        """Enregistrer le dernier resultat de la file de publication planifiee."""
+        with self._lock:
+            self._last_auto_publish = datetime.now(timezone.utc).isoformat()
+            self._last_auto_publish_result = result
+        self._persist_state()
 
-    def _run_rss_refresh(self):
+    def _run_rss_refresh(self) -> dict:
         """Rafraichir tous les flux RSS actifs."""
-        from app.db.database import SessionLocal
+        from app.db.database import BackgroundSessionLocal
         from app.services.rss_service import refresh_all_feeds
 
-        session = SessionLocal()
+        session = BackgroundSessionLocal()
         try:
             results = refresh_all_feeds(session)
             total_new = sum(r.get("new_articles", 0) for r in results)
@@ -332,12 +291,14 @@ class SocialScheduler:
                 logger.info(f"RSS refresh: {total_new} new articles, {errors} errors across {len(results)} feeds")
         except Exception as e:
             logger.error(f"RSS refresh echoue: {e}")
+            result = {"error": str(e)}
             with self._lock:
                 self._last_rss_refresh = datetime.now(timezone.utc).isoformat()
-                self._last_rss_refresh_result = {"error": str(e)}
+                self._last_rss_refresh_result = result
             self._persist_state()
         finally:
             session.close()
+        return result
 
 
 # Singleton global
@@ -16,9 +16,9 @@ from typing import Callable, Optional
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.db.database import SessionLocal
+from app.db.database import BackgroundSessionLocal
 from app.models.model_user_permissions import UserPermissions
-from app.services import sync_tasks
+from app.services import metrics, sync_tasks
 
 logger = logging.getLogger("social-sync-orchestrator")
 
@@ -118,6 +118,15 @@ class SchedulerSyncAgent(AllAccountsSyncAgent):
     label = "scheduler-sync"
 
 
+# Labels des taches de synchronisation (le registre contient aussi la maintenance)
+SYNC_LABELS = (
+    SocialSyncAgent.label,
+    AccountSyncAgent.label,
+    AllAccountsSyncAgent.label,
+    SchedulerSyncAgent.label,
+)
+
+
 class SocialSyncOrchestrator:
     """
     Coordonne les agents de sync.
@@ -135,7 +144,7 @@ class SocialSyncOrchestrator:
 
     def get_current(self) -> Optional[dict]:
         if not self._active_task_id:
-            running = sync_tasks.get_running()
+            running = sync_tasks.get_running(labels=SYNC_LABELS)
             if not running:
                 return None
             self._active_task_id = running["id"]
@@ -214,17 +223,21 @@ class SocialSyncOrchestrator:
             )
 
     def _run_agent(self, task_id: str, agent: SocialSyncAgent, force: bool) -> None:
-        session = SessionLocal()
+        session = BackgroundSessionLocal()
+        started = time.monotonic()
+        job_status = "error"
         try:
             def progress(msg: str, pct: int) -> None:
                 sync_tasks.update(task_id, progress=msg, percent=pct)
 
             result = agent.run(session, force, progress)
             sync_tasks.complete(task_id, result)
+            job_status = "success"
         except Exception as e:
             logger.exception("Synchronisation sociale echouee")
             sync_tasks.fail(task_id, str(e))
         finally:
+            metrics.observe_job(f"social_sync:{agent.label}", job_status, time.monotonic() - started)
             session.close()
             self._clear_active_if(task_id)
 
@@ -0,0 +1,134 @@
+"""
+Profilage des requetes SQL (developpement / recette) : nombre, duree et formes
+de requetes par requete HTTP ou par bloc de code, pour reperer les N+1.
+
+Chaque requete executee par un moteur SQLAlchemy est reduite a sa forme
+(fingerprint) : parametres, litteraux et listes IN
+remplaces par "?". Une forme executee SQL_REPEAT_THRESHOLD fois ou plus dans
+une meme requete HTTP est un N+1 probable ; l'origine (appelant le plus
+proche dans le code du projet) est relevee a ce moment-la.
+
+Les requetes sont observees par les ecouteurs de curseur de app/services/metrics.py
+(une seule paire pour les deux modules) : le profil d'une requete HTTP est
+rattache a ses compteurs SQL (metrics.RequestStats.profile), ceux de capture()
+sont des observateurs de toutes les requetes du processus.
+
+- Par requete HTTP : SQLProfilerMiddleware (actif si SQL_PROFILING=true)
+- Dans les tests : plugin pytest tests/sql_budget.py (budgets par test)
+- Ailleurs :
+    with sql_profiler.capture() as profile:
+        get_fuel_alerts(db)
+    print(profile.report())
+"""
+
+import re
+import threading
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import Token
+from pathlib import Path
+from typing import Iterator, Optional
+
+from app.config.config import settings
+from app.services import metrics
+
+PROJECT_ROOT = str(Path(__file__).resolve().parents[2])
+
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAMS = re.compile(r"%\(\w+\)s|%s|\?")
+_IN_LISTS = re.compile(r"\(\?(?:\s*,\s*\?)+\)")
+_SPACES = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Forme d'une requete : memes colonnes et tables, valeurs ignorees."""
+    shape = _STRINGS.sub("?", statement)
+    shape = _NUMBERS.sub("?", shape)
+    shape = _PARAMS.sub("?", shape)
+    shape = _IN_LISTS.sub("(?)", shape)
+    return _SPACES.sub(" ", shape).strip()
+
+
+def _origin() -> str:
+    """Appelant le plus proche dans le code du projet (hors ce module et les ecouteurs de metrics)."""
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if (filename.startswith(PROJECT_ROOT) and filename not in (__file__, metrics.__file__)
+                and "site-packages" not in filename):
+            return f"{filename[len(PROJECT_ROOT) + 1:]}:{frame.lineno} in {frame.name}"
+    return "?"
+
+
+class QueryProfile:
+    """Requetes SQL observees pendant une requete HTTP ou un bloc `capture()`."""
+
+    def __init__(self, repeat_threshold: Optional[int] = None):
+        self.repeat_threshold = repeat_threshold or settings.SQL_REPEAT_THRESHOLD
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+        self.origins: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, duration: float) -> None:
+        shape = fingerprint(statement)
+        with self._lock:
+            self.count += 1
+            self.duration += duration
+            self.shapes[shape] += 1
+            repeated = self.shapes[shape] == self.repeat_threshold
+        if repeated:
+            self.origins[shape] = _origin()
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+    def repeated(self, threshold: Optional[int] = None) -> list[tuple[str, int]]:
+        """Formes executees au moins `threshold` fois, les plus frequentes d'abord."""
+        threshold = threshold or self.repeat_threshold
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def report(self, threshold: Optional[int] = None) -> str:
+        lines = [f"{self.count} requetes SQL ({self.duration_ms:.1f} ms)"]
+        for shape, n in self.repeated(threshold):
+            origin = self.origins.get(shape)
+            lines.append(f"  x{n} {shape[:300]}" + (f"  [{origin}]" if origin else ""))
+        return "\n".join(lines)
+
+    def assert_budget(self, max_queries: int, repeats: Optional[int] = None) -> None:
+        """AssertionError si plus de `max_queries` requetes ou une forme repetee plus de `repeats` fois."""
+        if self.count > max_queries:
+            raise AssertionError(f"Budget SQL depasse : {self.count} > {max_queries}\n{self.report(2)}")
+        if repeats is not None and self.repeated(repeats + 1):
+            raise AssertionError(f"Requete repetee plus de {repeats} fois (N+1 ?)\n{self.report(repeats + 1)}")
+
+
+def install() -> None:
+    """Ecoute les requetes de tous les moteurs SQLAlchemy (idempotent)."""
+    metrics.install_query_listeners()
+
+
+def start(repeat_threshold: Optional[int] = None) -> tuple[QueryProfile, Optional[Token]]:
+    """Profil de la requete HTTP courante (contexte asyncio et threadpool)."""
+    install()
+    profile = QueryProfile(repeat_threshold)
+    _, token = metrics.start_request(profile)
+    return profile, token
+
+
+def stop(token: Optional[Token]) -> None:
+    metrics.end_request(token)
+
+
+@contextmanager
+def capture(repeat_threshold: Optional[int] = None) -> Iterator[QueryProfile]:
+    """Profil de toutes les requetes executees pendant le bloc, tous threads confondus."""
+    profile = QueryProfile(repeat_threshold)
+    metrics.add_query_observer(profile.record)
+    try:
+        yield profile
+    finally:
+        metrics.remove_query_observer(profile.record)
@@ -9,16 +9,23 @@ Strategie : YouTube → YTA d'abord, yt-dlp en fallback.
             Autres plateformes → yt-dlp directement.
 
 Deux modes d'utilisation :
-- Asynchrone (tache de fond) : extract_subtitles() + create_task() + get_task()
+- Asynchrone (pool d'extraction) : create_task() + submit_extraction() + get_task()
 - Synchrone (pipeline IA) : extract_subtitles_sync() retourne directement le texte
+
+Les deux modes passent par le meme pool de threads borne (SUBTITLE_WORKERS)
+et par un cache disque partage entre workers, cle (video_id, langue, format),
+avec eviction LRU au-dela de SUBTITLE_CACHE_MAX_MB.
 """
 
+import hashlib
 import json
 import os
 import re
+import threading
 import uuid
 import time
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional
 
 import yt_dlp
@@ -42,6 +49,13 @@ TASK_TTL_SECONDS = 3600
 # Chemin du fichier cookies converti au format Netscape (cache en memoire)
 _netscape_cookies_path: str | None = None
 
+# Pool d'extraction dedie (cree a la premiere utilisation) et extractions en cours
+# par cle de cache : deux demandes identiques simultanees partagent le meme Future
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_inflight: dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
 
 # ════════════════════════════════════════════════════════════════
 # GESTION DES COOKIES (upload, paste, statut)
@@ -460,7 +474,151 @@ def _extract_with_fallback(url: str, lang: str, fmt: str, task_id: str) -> dict:
 
 
 # ════════════════════════════════════════════════════════════════
-# MODE ASYNCHRONE (tache de fond via BackgroundTasks)
+# CACHE DISQUE (partage entre workers, eviction LRU par taille)
+# ════════════════════════════════════════════════════════════════
+
+def _cache_key(url: str, lang: str, fmt: str) -> str:
+    """
+    Cle de cache (video_id, langue, format).
+
+    YouTube : l'ID video (11 chars), quel que soit le format d'URL.
+    Autres plateformes : l'URL normalisee (sans fragment ni espaces).
+    """
+    video_id = _extract_video_id(url) if _is_youtube_url(url) else None
+    if not video_id:
+        video_id = url.strip().split('#', 1)[0]
+    raw = f"{video_id}|{lang}|{fmt}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _cache_path(key: str) -> str:
+    return os.path.join(settings.SUBTITLE_CACHE_DIR, f"{key}.json")
+
+
+def _cache_get(key: str) -> Optional[dict]:
+    """Lit une entree du cache et rafraichit sa date d'acces (LRU via mtime)."""
+    path = _cache_path(key)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        os.utime(path, None)
+        return data
+    except FileNotFoundError:
+        return None
+    except (json.JSONDecodeError, OSError) as e:
+        logger.warning(f"[subtitles-cache] Entree illisible {key}: {e}")
+        return None
+
+
+def _cache_put(key: str, result: dict) -> None:
+    """Ecrit une entree (ecriture atomique) puis applique l'eviction LRU."""
+    try:
+        os.makedirs(settings.SUBTITLE_CACHE_DIR, exist_ok=True)
+        path = _cache_path(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        _cache_evict()
+    except OSError as e:
+        logger.warning(f"[subtitles-cache] Erreur ecriture {key}: {e}")
+
+
+def _cache_evict() -> None:
+    """Supprime les entrees les moins recemment utilisees au-dela de SUBTITLE_CACHE_MAX_MB."""
+    max_bytes = settings.SUBTITLE_CACHE_MAX_MB * 1024 * 1024
+    entries = []
+    total = 0
+    for f in os.listdir(settings.SUBTITLE_CACHE_DIR):
+        if not f.endswith('.json'):
+            continue
+        filepath = os.path.join(settings.SUBTITLE_CACHE_DIR, f)
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, filepath))
+        total += stat.st_size
+
+    if total <= max_bytes:
+        return
+    for _, size, filepath in sorted(entries):
+        try:
+            os.remove(filepath)
+            total -= size
+        except OSError:
+            pass
+        if total <= max_bytes:
+            break
+
+
+def get_cached_subtitles(url: str, lang: str, fmt: str) -> Optional[dict]:
+    """Retourne le resultat en cache pour (url, lang, fmt) ou None."""
+    return _cache_get(_cache_key(url, lang, fmt))
+
+
+# ════════════════════════════════════════════════════════════════
+# POOL D'EXTRACTION (concurrence bornee, hors threadpool web)
+# ════════════════════════════════════════════════════════════════
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.SUBTITLE_WORKERS),
+                thread_name_prefix="subtitles",
+            )
+        return _executor
+
+
+def _run_cached_extraction(key: str, url: str, lang: str, fmt: str) -> dict:
+    """Execute l'extraction dans le pool et met en cache les resultats valides."""
+    try:
+        # Un autre worker a pu remplir le cache pendant l'attente dans le pool
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+        result = _extract_with_fallback(url, lang, fmt, str(uuid.uuid4()))
+        if result["status"] == "done":
+            _cache_put(key, result)
+        return result
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def _submit(url: str, lang: str, fmt: str) -> Future:
+    """
+    Soumet une extraction au pool. Retourne un Future deja resolu en cas de
+    cache hit, ou le Future d'une extraction identique deja en cours.
+    """
+    key = _cache_key(url, lang, fmt)
+    cached = _cache_get(key)
+    if cached is not None:
+        future: Future = Future()
+        future.set_result(cached)
+        return future
+
+    with _inflight_lock:
+        future = _inflight.get(key)
+        if future is None:
+            future = _get_executor().submit(_run_cached_extraction, key, url, lang, fmt)
+            _inflight[key] = future
+        return future
+
+
+def shutdown_extraction_pool() -> None:
+    """Arrete le pool d'extraction (appele au shutdown de l'application)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+# ════════════════════════════════════════════════════════════════
+# MODE ASYNCHRONE (pool d'extraction, statut par tache)
 # Stockage sur filesystem partage entre workers Gunicorn
 # ════════════════════════════════════════════════════════════════
 
@@ -524,15 +682,41 @@ def _save_task(task_id: str, data: dict) -> None:
 
 def extract_subtitles(task_id: str, url: str, lang: str, fmt: str) -> None:
     """
-    Extrait les sous-titres en tache de fond (BackgroundTasks FastAPI).
+    Extrait les sous-titres et sauvegarde le resultat de la tache (bloquant).
 
-    Utilise la cascade YTA → yt-dlp pour YouTube, yt-dlp direct pour les autres.
+    Utilise la cascade YTA → yt-dlp pour YouTube, yt-dlp direct pour les autres,
+    via le pool d'extraction et le cache disque.
     Sauvegarde le resultat sur le filesystem (partage entre workers).
     """
-    result = _extract_with_fallback(url, lang, fmt, task_id)
+    result = _submit(url, lang, fmt).result()
     _save_task(task_id, result)
 
 
+def submit_extraction(task_id: str, url: str, lang: str, fmt: str) -> Optional[dict]:
+    """
+    Soumet une extraction au pool sans bloquer l'appelant.
+
+    Retourne immediatement le resultat (et le sauvegarde dans la tache) si
+    les sous-titres sont deja en cache, sinon None : la tache sera mise a
+    jour par le pool a la fin de l'extraction.
+    """
+    future = _submit(url, lang, fmt)
+    if future.done() and not future.exception():
+        result = future.result()
+        _save_task(task_id, result)
+        return result
+
+    def _on_done(f: Future) -> None:
+        try:
+            _save_task(task_id, f.result())
+        except Exception as e:
+            logger.error(f"[subtitles] Erreur extraction (task={task_id}) pour {url}: {e}")
+            _save_task(task_id, {"status": "error", "message": str(e)})
+
+    future.add_done_callback(_on_done)
+    return None
+
+
 # ════════════════════════════════════════════════════════════════
 # MODE SYNCHRONE (pour le pipeline IA — ai_service.py)
 # ════════════════════════════════════════════════════════════════
@@ -544,13 +728,14 @@ def extract_subtitles_sync(url: str, lang: str = "fr", fmt: str = "txt") -> str:
       2. yt-dlp → universel, plus robuste
 
     Utilise par ai_service.fetch_youtube_transcript() pour alimenter
-    le pipeline de generation de contenu Mistral.
+    le pipeline de generation de contenu Mistral. Partage le cache et le
+    pool d'extraction avec subtitle_route : une URL deja extraite est
+    servie immediatement.
 
     Raises:
         RuntimeError si les deux methodes echouent.
     """
-    task_id = str(uuid.uuid4())
-    result = _extract_with_fallback(url, lang, fmt, task_id)
+    result = _submit(url, lang, fmt).result()
 
     if result["status"] == "error":
         raise RuntimeError(result.get("message", "Erreur extraction sous-titres"))
@@ -18,7 +18,7 @@ import time
 import json
 import fcntl
 import os
-from typing import Optional
+from typing import Iterable, Optional
 
 # Fichier partage entre tous les workers du meme container.
 # /app/data est deja utilise par les schedulers pour les locks/etats persistants.
@@ -120,12 +120,13 @@ def get(task_id: str) -> Optional[dict]:
     return None
 
 
-def get_running() -> Optional[dict]:
-    """Retourner la tache running la plus recente, si elle existe."""
+def get_running(labels: Optional[Iterable[str]] = None) -> Optional[dict]:
+    """Retourner la tache running la plus recente (parmi `labels` si fourni), si elle existe."""
     tasks = _read_tasks()
+    labels = set(labels) if labels is not None else None
     running = [
         task for task in tasks.values()
-        if task.get("status") == "running"
+        if task.get("status") == "running" and (labels is None or task.get("label") in labels)
     ]
     if not running:
         return None
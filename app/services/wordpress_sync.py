@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session, joinedload
 from app.models.model_show import Show
 from app.models.model_segment import Segment
 from app.config.config import settings
+from app.services import http_client
 
 logger = logging.getLogger("hapson-api")
 
@@ -62,7 +63,7 @@ def sync_show_to_wordpress(show_id: int, db: Session) -> bool:
 
         endpoint = f"{wp_site_url.rstrip('/')}/wp-json/rap/v1/sync-show"
 
-        response = httpx.post(
+        response = http_client.post(
             endpoint,
             json=payload,
             headers={
@@ -3,22 +3,61 @@ Service proxy pour l'API REST WordPress.
 
 Interroge les sites WordPress (audacemagazine.com et radioaudace.com)
 via wp-json/wp/v2 en utilisant les Application Passwords pour l'authentification.
+
+Agregation multi-sites :
+- les sites sont interroges en parallele
+- seule l'image mise en avant est embarquee (_embed=wp:featuredmedia) ;
+  categories, tags et auteurs sont resolus par id depuis un cache TTL
+  (les ids inconnus sont charges en un appel ?include=)
+- la liste fusionnee est paginee par fusion k-way des flux de chaque site
+  (tries par date) : la page N est bien la N-ieme page de la liste fusionnee.
+  Les articles deja lus de chaque site (curseurs) sont gardes 60 s pour
+  les pages suivantes, et oublies a chaque creation/modification/suppression
+- les statistiques sont un instantane (cache partage entre workers)
+  rafraichi par le planificateur (tache wp_article_stats)
 """
 
+import heapq
 import logging
 import math
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterator, Optional
 from datetime import datetime, timezone
 
 import httpx
 from fastapi import HTTPException, status
 
 from app.config.config import settings
+from app.services import http_client
+from app.services.shared_cache import SharedCache
+from app.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger("hapson-api")
 
 WP_TIMEOUT = 15.0
 WP_USER_AGENT = "RadioManager/1.0 (https://api.radio.audace.ovh)"
+# Options httpx communes aux appels WordPress (client poole par site, cf. http_client)
+WP_HTTP_OPTIONS = {"timeout": WP_TIMEOUT, "follow_redirects": True, "headers": {"User-Agent": WP_USER_AGENT}}
+WP_HTTP_OPTIONS_UPLOAD = {**WP_HTTP_OPTIONS, "timeout": 30.0}
+
+# Listes : seule l'image mise en avant est embarquee, le reste vient des caches
+WP_LIST_EMBED = "wp:featuredmedia"
+# Taille max d'une page de l'API REST WordPress
+WP_MAX_PER_PAGE = 100
+
+# Appels simultanes vers les sites (liste fusionnee, stats) et resolution des termes
+# (pools distincts : une tache de _site_pool attend des taches de _lookup_pool)
+_site_pool = ThreadPoolExecutor(max_workers=6, thread_name_prefix="wp-sites")
+_lookup_pool = ThreadPoolExecutor(max_workers=6, thread_name_prefix="wp-lookup")
+# Categories, tags et auteurs : (site, endpoint, id) → objet WordPress
+_lookup_cache = TTLCache(ttl=15 * 60, maxsize=8192)
+# Curseurs de la liste fusionnee : (site, filtres, taille de lot) → _SiteCursor
+_cursor_cache = TTLCache(ttl=60, maxsize=128)
+# Instantane des statistiques (partage entre workers)
+_stats_cache = SharedCache("wp", ttl=2 * settings.WP_STATS_REFRESH_SECONDS, stale_ttl=24 * 3600, maxsize=16)
+STATS_CACHE_KEY = "article-stats"
 
 # ════════════════════════════════════════════════════════════════
 # CONFIGURATION DES SITES
@@ -94,8 +133,13 @@ def _strip_html(html: str) -> str:
 # TRANSFORMATION WP → ARTICLE RESPONSE
 # ════════════════════════════════════════════════════════════════
 
-def _parse_wp_post(post: dict, site_key: str, categories_map: dict = None, tags_map: dict = None) -> dict:
-    """Convertit un post WordPress en dict ArticleResponse."""
+def _parse_wp_post(post: dict, site_key: str, categories_map: dict = None, tags_map: dict = None,
+                   authors_map: dict = None) -> dict:
+    """
+    Convertit un post WordPress en dict ArticleResponse.
+    Categories, tags et auteur : depuis _embedded s'ils y sont, sinon depuis
+    les maps id → objet (cf. _resolve_terms).
+    """
 
     # Image mise en avant
     featured_media = None
@@ -127,6 +171,12 @@ def _parse_wp_post(post: dict, site_key: str, categories_map: dict = None, tags_
                     "count": term.get("count", 0),
                 })
 
+    elif categories_map is not None:
+        for cat_id in post.get("categories", []):
+            term = categories_map.get(cat_id)
+            if term:
+                cats.append({k: term.get(k, "" if k != "count" else 0) for k in ("id", "name", "slug", "count")})
+
     tags = []
     if embedded_terms and len(embedded_terms) > 1:
         for term in embedded_terms[1]:
@@ -136,12 +186,19 @@ def _parse_wp_post(post: dict, site_key: str, categories_map: dict = None, tags_
                     "name": term.get("name", ""),
                     "slug": term.get("slug", ""),
                 })
+    elif tags_map is not None:
+        for tag_id in post.get("tags", []):
+            term = tags_map.get(tag_id)
+            if term:
+                tags.append({k: term.get(k, "") for k in ("id", "name", "slug")})
 
     # Auteur depuis _embedded
     author_name = ""
     authors = embedded.get("author", [])
     if authors and isinstance(authors[0], dict):
         author_name = authors[0].get("name", "")
+    elif authors_map is not None:
+        author_name = (authors_map.get(post.get("author")) or {}).get("name", "")
 
     # Excerpt : nettoyer le HTML
     excerpt_raw = post.get("excerpt", {}).get("rendered", "")
@@ -171,6 +228,190 @@ def _parse_wp_post(post: dict, site_key: str, categories_map: dict = None, tags_
 # ARTICLES CRUD
 # ════════════════════════════════════════════════════════════════
 
+def _lookup(site_key: str, endpoint: str, ids: set[int]) -> dict[int, dict]:
+    """
+    Objets WordPress par id (categories, tags, users) depuis le cache ;
+    les ids absents sont charges en un appel ?include= par lot de 100.
+    Un echec laisse les ids non resolus (l'article reste affichable).
+    """
+    found: dict[int, dict] = {}
+    missing = []
+    for obj_id in ids:
+        cached = _lookup_cache.get((site_key, endpoint, obj_id))
+        if cached is None:
+            missing.append(obj_id)
+        else:
+            found[obj_id] = cached
+    if not missing:
+        return found
+
+    config = _get_site_config(site_key)
+    for i in range(0, len(missing), WP_MAX_PER_PAGE):
+        chunk = missing[i:i + WP_MAX_PER_PAGE]
+        try:
+            response = http_client.get(
+                _wp_api_url(config, endpoint),
+                params={"include": ",".join(map(str, chunk)), "per_page": len(chunk), "_fields": "id,name,slug,count"},
+                auth=_wp_auth(config),
+                **WP_HTTP_OPTIONS,
+            )
+            if response.status_code != 200:
+                logger.warning(f"WordPress {endpoint} ({site_key}): HTTP {response.status_code}")
+                continue
+            for obj in response.json():
+                _lookup_cache.set((site_key, endpoint, obj["id"]), obj)
+                found[obj["id"]] = obj
+        except Exception as e:
+            logger.warning(f"WordPress {endpoint} ({site_key}): {e}")
+    return found
+
+
+def _parse_posts(site_key: str, posts: list[dict]) -> list[dict]:
+    """Parse une page de posts : categories, tags et auteurs resolus en parallele."""
+    wanted = {
+        "categories": {cat_id for post in posts for cat_id in post.get("categories", [])},
+        "tags": {tag_id for post in posts for tag_id in post.get("tags", [])},
+        "users": {post["author"] for post in posts if post.get("author")},
+    }
+    futures = {endpoint: _lookup_pool.submit(_lookup, site_key, endpoint, ids) for endpoint, ids in wanted.items()}
+    maps = {endpoint: future.result() for endpoint, future in futures.items()}
+    return [
+        _parse_wp_post(post, site_key, maps["categories"], maps["tags"], maps["users"])
+        for post in posts
+    ]
+
+
+def _fetch_posts(site_key: str, filters: dict, page: int, per_page: int) -> Optional[tuple[list[dict], int]]:
+    """
+    Une page de posts d'un site (date decroissante) et le total X-WP-Total.
+    None si le site est ignore (brouillons demandes sans credentials).
+    """
+    config = _get_site_config(site_key)
+    status_filter = filters.get("status_filter")
+    params: dict = {
+        "page": page,
+        "per_page": per_page,
+        "orderby": "date",
+        "order": "desc",
+        "_embed": WP_LIST_EMBED,
+    }
+    if filters.get("search"):
+        params["search"] = filters["search"]
+    if status_filter and status_filter != "publish":
+        params["status"] = status_filter
+    if filters.get("category"):
+        params["categories"] = filters["category"]
+    if filters.get("sticky") is not None:
+        params["sticky"] = filters["sticky"]
+
+    auth = _wp_auth(config)
+    # Si on veut les brouillons, il faut l'auth
+    if status_filter and status_filter != "publish" and not auth:
+        logger.warning(f"WordPress list ({site_key}): auth requise pour status={status_filter}")
+        return None
+
+    response = http_client.get(_wp_api_url(config, "posts"), params=params, auth=auth, **WP_HTTP_OPTIONS)
+    _handle_wp_error(response, f"list_articles({site_key})")
+    posts = response.json()
+    return posts, int(response.headers.get("X-WP-Total", len(posts)))
+
+
+def _created_at(item: dict) -> str:
+    return item.get("created_at") or ""
+
+
+class _SiteCursor:
+    """
+    Articles d'un site deja lus pour une recherche donnee, dans l'ordre de
+    l'API (date decroissante), charges par lots de `batch` a la demande.
+    """
+
+    def __init__(self, site_key: str, filters: dict, batch: int):
+        self.site_key = site_key
+        self.filters = filters
+        self.batch = batch
+        self.items: list[dict] = []
+        self.total = 0
+        self.exhausted = False
+        # Erreur passagere : plus de lot pour cette recherche, curseur retire du cache
+        self.failed = False
+        self._pages = 0
+        self._lock = threading.Lock()
+
+    def ensure(self, count: int) -> None:
+        """Charge des lots jusqu'a avoir `count` articles (ou la fin du site)."""
+        with self._lock:
+            while len(self.items) < count and not self.exhausted and not self.failed:
+                try:
+                    fetched = _fetch_posts(self.site_key, self.filters, self._pages + 1, self.batch)
+                except HTTPException:
+                    raise
+                except Exception as e:
+                    # Site momentanement injoignable : pas marque epuise, la
+                    # prochaine recherche repart d'un curseur neuf
+                    logger.error(f"WordPress list_articles({self.site_key}): {e}")
+                    self.failed = True
+                    _evict_cursor(self)
+                    break
+                if fetched is None:
+                    self.exhausted = True
+                    break
+                posts, self.total = fetched
+                self._pages += 1
+                self.items.extend(_parse_posts(self.site_key, posts))
+                if len(posts) < self.batch or len(self.items) >= self.total:
+                    self.exhausted = True
+
+    def __iter__(self) -> Iterator[dict]:
+        index = 0
+        while True:
+            if index >= len(self.items):
+                self.ensure(index + 1)
+                if index >= len(self.items):
+                    return
+            yield self.items[index]
+            index += 1
+
+
+def _cursor_key(site_key: str, filters: dict, batch: int) -> tuple:
+    return (site_key, tuple(sorted(filters.items())), batch)
+
+
+def _get_cursor(site_key: str, filters: dict, batch: int) -> _SiteCursor:
+    key = _cursor_key(site_key, filters, batch)
+    return _cursor_cache.get_or_set(key, lambda: _SiteCursor(site_key, filters, batch))
+
+
+def _evict_cursor(cursor: _SiteCursor) -> None:
+    """Retire ce curseur du cache (sans toucher un curseur plus recent de meme cle)."""
+    key = _cursor_key(cursor.site_key, cursor.filters, cursor.batch)
+    if _cursor_cache.get(key) is cursor:
+        _cursor_cache.delete(key)
+
+
+def _invalidate_listings() -> None:
+    """Les listes fusionnees en cache ne refletent plus les sites."""
+    _cursor_cache.clear()
+
+
+def _merged_page(sites: list[str], filters: dict, page: int, per_page: int) -> tuple[list[dict], int]:
+    """
+    Page `page` de la fusion des sites triee par date decroissante (fusion k-way).
+    Seuls les articles necessaires sont charges, par lots, depuis chaque site.
+    """
+    batch = min(per_page, WP_MAX_PER_PAGE)
+    cursors = [_get_cursor(site_key, filters, batch) for site_key in sites]
+    offset = (page - 1) * per_page
+
+    # Premier lot de chaque site en parallele (donne aussi les totaux)
+    for future in [_site_pool.submit(cursor.ensure, min(offset + per_page, batch)) for cursor in cursors]:
+        future.result()
+
+    merged = heapq.merge(*cursors, key=_created_at, reverse=True)
+    items = list(islice(merged, offset, offset + per_page))
+    return items, sum(cursor.total for cursor in cursors)
+
+
 def list_articles(
     site_key: Optional[str] = None,
     search: Optional[str] = None,
@@ -182,71 +423,29 @@ def list_articles(
 ) -> dict:
     """
     Liste des articles, eventuellement filtre par site.
-    Si site_key est None, interroge les deux sites et merge.
+    Si site_key est None, interroge les deux sites et fusionne (pagination globale).
     """
-    sites = [site_key] if site_key else list(WP_SITES_CONFIG.keys())
-    all_items = []
-    total = 0
-
-    for sk in sites:
-        config = _get_site_config(sk)
-        params: dict = {
-            "page": page,
-            "per_page": per_page,
-            "orderby": "date",
-            "order": "desc",
-            "_embed": "1",
-        }
-        if search:
-            params["search"] = search
-        if status_filter and status_filter != "publish":
-            params["status"] = status_filter
-        if category:
-            params["categories"] = category
-        if sticky is not None:
-            params["sticky"] = sticky
+    filters = {"search": search, "status_filter": status_filter, "category": category, "sticky": sticky}
 
+    if site_key:
+        items, total = [], 0
         try:
-            with httpx.Client(timeout=WP_TIMEOUT, follow_redirects=True, headers={"User-Agent": WP_USER_AGENT}) as client:
-                auth = _wp_auth(config)
-                # Si on veut les brouillons, il faut l'auth
-                if status_filter and status_filter != "publish":
-                    if not auth:
-                        logger.warning(f"WordPress list ({sk}): auth requise pour status={status_filter}")
-                        continue
-                    response = client.get(
-                        _wp_api_url(config, "posts"),
-                        params=params,
-                        auth=auth,
-                    )
-                else:
-                    response = client.get(
-                        _wp_api_url(config, "posts"),
-                        params=params,
-                        auth=auth,
-                    )
-
-                _handle_wp_error(response, f"list_articles({sk})")
-                posts = response.json()
-                site_total = int(response.headers.get("X-WP-Total", len(posts)))
-                total += site_total
-
-                for post in posts:
-                    all_items.append(_parse_wp_post(post, sk))
-
+            fetched = _fetch_posts(site_key, filters, page, per_page)
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"WordPress list_articles({sk}): {e}")
-            continue
-
-    # Trier par date decroissante
-    all_items.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+            logger.error(f"WordPress list_articles({site_key}): {e}")
+            fetched = None
+        if fetched:
+            posts, total = fetched
+            items = _parse_posts(site_key, posts)
+    else:
+        items, total = _merged_page(list(WP_SITES_CONFIG.keys()), filters, page, per_page)
 
     total_pages = max(1, math.ceil(total / per_page)) if total > 0 else 1
 
     return {
-        "items": all_items,
+        "items": items,
         "total": total,
         "page": page,
         "per_page": per_page,
@@ -259,15 +458,15 @@ def get_article(site_key: str, article_id: int) -> dict:
     config = _get_site_config(site_key)
     auth = _wp_auth(config)
 
-    with httpx.Client(timeout=WP_TIMEOUT, follow_redirects=True, headers={"User-Agent": WP_USER_AGENT}) as client:
-        response = client.get(
-            _wp_api_url(config, f"posts/{article_id}"),
-            params={"_embed": "1"},
-            auth=auth,
-        )
-        _handle_wp_error(response, f"get_article({site_key}, {article_id})")
-        post = response.json()
-        return _parse_wp_post(post, site_key)
+    response = http_client.get(
+        _wp_api_url(config, f"posts/{article_id}"),
+        params={"_embed": "1"},
+        auth=auth,
+        **WP_HTTP_OPTIONS,
+    )
+    _handle_wp_error(response, f"get_article({site_key}, {article_id})")
+    post = response.json()
+    return _parse_wp_post(post, site_key)
 
 
 def create_article(site_key: str, data: dict) -> dict:
@@ -296,17 +495,18 @@ def create_article(site_key: str, data: dict) -> dict:
     if "sticky" in data and data["sticky"] is not None:
         payload["sticky"] = data["sticky"]
 
-    with httpx.Client(timeout=WP_TIMEOUT, follow_redirects=True, headers={"User-Agent": WP_USER_AGENT}) as client:
-        response = client.post(
-            _wp_api_url(config, "posts"),
-            json=payload,
-            auth=auth,
-        )
-        _handle_wp_error(response, f"create_article({site_key})")
+    response = http_client.post(
+        _wp_api_url(config, "posts"),
+        json=payload,
+        auth=auth,
+        **WP_HTTP_OPTIONS,
+    )
+    _handle_wp_error(response, f"create_article({site_key})")
+    _invalidate_listings()
 
-        # Recharger avec _embed pour avoir les donnees completes
-        post_id = response.json().get("id")
-        return get_article(site_key, post_id)
+    # Recharger avec _embed pour avoir les donnees completes
+    post_id = response.json().get("id")
+    return get_article(site_key, post_id)
 
 
 def update_article(site_key: str, article_id: int, data: dict) -> dict:
@@ -337,14 +537,15 @@ def update_article(site_key: str, article_id: int, data: dict) -> dict:
     if "sticky" in data and data["sticky"] is not None:
         payload["sticky"] = data["sticky"]
 
-    with httpx.Client(timeout=WP_TIMEOUT, follow_redirects=True, headers={"User-Agent": WP_USER_AGENT}) as client:
-        response = client.post(
-            _wp_api_url(config, f"posts/{article_id}"),
-            json=payload,
-            auth=auth,
-        )
-        _handle_wp_error(response, f"update_article({site_key}, {article_id})")
-        return get_article(site_key, article_id)
+    response = http_client.post(
+        _wp_api_url(config, f"posts/{article_id}"),
+        json=payload,
+        auth=auth,
+        **WP_HTTP_OPTIONS,
+    )
+    _handle_wp_error(response, f"update_article({site_key}, {article_id})")
+    _invalidate_listings()
+    return get_article(site_key, article_id)
 
 
 def delete_article(site_key: str, article_id: int) -> dict:
@@ -357,13 +558,14 @@ def delete_article(site_key: str, article_id: int) -> dict:
             detail=f"Credentials WordPress manquants pour {site_key}"
         )
 
-    with httpx.Client(timeout=WP_TIMEOUT, follow_redirects=True, headers={"User-Agent": WP_USER_AGENT}) as client:
-        response = client.delete(
-            _wp_api_url(config, f"posts/{article_id}"),
-            auth=auth,
-        )
-        _handle_wp_error(response, f"delete_article({site_key}, {article_id})")
-        return {"success": True, "id": article_id}
+    response = http_client.delete(
+        _wp_api_url(config, f"posts/{article_id}"),
+        auth=auth,
+        **WP_HTTP_OPTIONS,
+    )
+    _handle_wp_error(response, f"delete_article({site_key}, {article_id})")
+    _invalidate_listings()
+    return {"success": True, "id": article_id}
 
 
 # ════════════════════════════════════════════════════════════════
@@ -374,21 +576,21 @@ def list_categories(site_key: str) -> list[dict]:
     """Liste les categories d'un site WordPress."""
     config = _get_site_config(site_key)
 
-    with httpx.Client(timeout=WP_TIMEOUT, follow_redirects=True, headers={"User-Agent": WP_USER_AGENT}) as client:
-        response = client.get(
-            _wp_api_url(config, "categories"),
-            params={"per_page": 100, "orderby": "count", "order": "desc"},
-        )
-        _handle_wp_error(response, f"list_categories({site_key})")
-        return [
-            {
-                "id": cat.get("id"),
-                "name": cat.get("name", ""),
-                "slug": cat.get("slug", ""),
-                "count": cat.get("count", 0),
-            }
-            for cat in response.json()
-        ]
+    response = http_client.get(
+        _wp_api_url(config, "categories"),
+        params={"per_page": 100, "orderby": "count", "order": "desc"},
+        **WP_HTTP_OPTIONS,
+    )
+    _handle_wp_error(response, f"list_categories({site_key})")
+    return [
+        {
+            "id": cat.get("id"),
+            "name": cat.get("name", ""),
+            "slug": cat.get("slug", ""),
+            "count": cat.get("count", 0),
+        }
+        for cat in response.json()
+    ]
 
 
 # ════════════════════════════════════════════════════════════════
@@ -405,33 +607,57 @@ def upload_media(site_key: str, file_content: bytes, filename: str, content_type
             detail=f"Credentials WordPress manquants pour {site_key}"
         )
 
-    with httpx.Client(timeout=30.0, follow_redirects=True, headers={"User-Agent": WP_USER_AGENT}) as client:
-        # Utiliser multipart/form-data au lieu de raw binary
-        # pour eviter le blocage par le pare-feu OVH (ModSecurity)
-        response = client.post(
-            _wp_api_url(config, "media"),
-            files={"file": (filename, file_content, content_type)},
-            auth=auth,
-        )
-        _handle_wp_error(response, f"upload_media({site_key})")
-        media = response.json()
-        details = media.get("media_details", {})
-        sizes = details.get("sizes", {})
-        return {
-            "id": media.get("id"),
-            "url": media.get("source_url", ""),
-            "alt": media.get("alt_text", ""),
-            "width": sizes.get("full", {}).get("width", details.get("width", 0)),
-            "height": sizes.get("full", {}).get("height", details.get("height", 0)),
-        }
+    # Utiliser multipart/form-data au lieu de raw binary
+    # pour eviter le blocage par le pare-feu OVH (ModSecurity)
+    response = http_client.post(
+        _wp_api_url(config, "media"),
+        files={"file": (filename, file_content, content_type)},
+        auth=auth,
+        **WP_HTTP_OPTIONS_UPLOAD,
+    )
+    _handle_wp_error(response, f"upload_media({site_key})")
+    media = response.json()
+    details = media.get("media_details", {})
+    sizes = details.get("sizes", {})
+    return {
+        "id": media.get("id"),
+        "url": media.get("source_url", ""),
+        "alt": media.get("alt_text", ""),
+        "width": sizes.get("full", {}).get("width", details.get("width", 0)),
+        "height": sizes.get("full", {}).get("height", details.get("height", 0)),
+    }
 
 
 # ════════════════════════════════════════════════════════════════
 # STATISTIQUES (AGREGEES)
 # ════════════════════════════════════════════════════════════════
 
-def get_article_stats() -> dict:
-    """Recupere des statistiques agregees sur les articles des deux sites."""
+def _site_stats(site_key: str, config: dict, month_start: str) -> Optional[dict]:
+    """Total publie, publies depuis le debut du mois et 5 derniers articles d'un site."""
+    auth = _wp_auth(config)
+    url = _wp_api_url(config, "posts")
+    try:
+        # X-WP-Total suffit : une ligne par appel
+        total = http_client.get(url, params={"per_page": 1, "status": "publish"}, auth=auth, **WP_HTTP_OPTIONS)
+        this_month = http_client.get(
+            url, params={"per_page": 1, "status": "publish", "after": month_start}, auth=auth, **WP_HTTP_OPTIONS,
+        )
+        recent = http_client.get(
+            url, params={"per_page": 5, "orderby": "date", "order": "desc", "_embed": WP_LIST_EMBED},
+            auth=auth, **WP_HTTP_OPTIONS,
+        )
+        return {
+            "total": int(total.headers.get("X-WP-Total", 0)) if total.status_code == 200 else None,
+            "this_month": int(this_month.headers.get("X-WP-Total", 0)) if this_month.status_code == 200 else 0,
+            "recent": _parse_posts(site_key, recent.json()) if recent.status_code == 200 else [],
+        }
+    except Exception as e:
+        logger.error(f"WordPress stats ({site_key}): {e}")
+        return None
+
+
+def compute_article_stats() -> dict:
+    """Statistiques agregees sur les articles des deux sites (sites interroges en parallele)."""
     total_articles = 0
     total_views = 0
     articles_this_month = 0
@@ -440,53 +666,33 @@ def get_article_stats() -> dict:
     by_category: dict[str, int] = {}
 
     now = datetime.now(timezone.utc)
-    current_month = now.strftime("%Y-%m")
-
-    for site_key, config in WP_SITES_CONFIG.items():
-        if not config["url"]:
-            continue
-
-        try:
-            auth = _wp_auth(config)
-            with httpx.Client(timeout=WP_TIMEOUT, follow_redirects=True, headers={"User-Agent": WP_USER_AGENT}) as client:
-                # Total d'articles publies
-                response = client.get(
-                    _wp_api_url(config, "posts"),
-                    params={"per_page": 1, "status": "publish"},
-                    auth=auth,
-                )
-                if response.status_code == 200:
-                    site_total = int(response.headers.get("X-WP-Total", 0))
-                    total_articles += site_total
-                    by_site.append({"site": site_key, "count": site_total, "views": 0})
-
-                # Articles recents pour le top
-                response = client.get(
-                    _wp_api_url(config, "posts"),
-                    params={"per_page": 5, "orderby": "date", "order": "desc", "_embed": "1"},
-                    auth=auth,
-                )
-                if response.status_code == 200:
-                    for post in response.json():
-                        parsed = _parse_wp_post(post, site_key)
-                        top_articles.append({
-                            "id": parsed["id"],
-                            "site": site_key,
-                            "title": parsed["title"],
-                            "views": parsed.get("views", 0),
-                            "link": parsed["link"],
-                        })
-                        # Compter les articles du mois
-                        if parsed["created_at"].startswith(current_month):
-                            articles_this_month += 1
-                        # Categories
-                        for cat in parsed.get("categories", []):
-                            cat_name = cat.get("name", "Autre")
-                            by_category[cat_name] = by_category.get(cat_name, 0) + 1
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0).strftime("%Y-%m-%dT%H:%M:%S")
 
-        except Exception as e:
-            logger.error(f"WordPress stats ({site_key}): {e}")
+    sites = {site_key: config for site_key, config in WP_SITES_CONFIG.items() if config["url"]}
+    futures = {
+        site_key: _site_pool.submit(_site_stats, site_key, config, month_start)
+        for site_key, config in sites.items()
+    }
+    for site_key, future in futures.items():
+        stats = future.result()
+        if stats is None:
             continue
+        if stats["total"] is not None:
+            total_articles += stats["total"]
+            by_site.append({"site": site_key, "count": stats["total"], "views": 0})
+        articles_this_month += stats["this_month"]
+        for parsed in stats["recent"]:
+            top_articles.append({
+                "id": parsed["id"],
+                "site": site_key,
+                "title": parsed["title"],
+                "views": parsed.get("views", 0),
+                "link": parsed["link"],
+            })
+            # Categories
+            for cat in parsed.get("categories", []):
+                cat_name = cat.get("name", "Autre")
+                by_category[cat_name] = by_category.get(cat_name, 0) + 1
 
     return {
         "total_articles": total_articles,
@@ -495,4 +701,20 @@ def get_article_stats() -> dict:
         "top_articles": top_articles[:10],
         "by_site": by_site,
         "by_category": [{"category": k, "count": v} for k, v in sorted(by_category.items(), key=lambda x: -x[1])],
+        "generated_at": now.isoformat(),
     }
+
+
+def refresh_article_stats() -> dict:
+    """Recalcule l'instantane des statistiques (tache periodique wp_article_stats)."""
+    stats = compute_article_stats()
+    _stats_cache.set(STATS_CACHE_KEY, stats)
+    return {"total_articles": stats["total_articles"], "sites": len(stats["by_site"])}
+
+
+def get_article_stats() -> dict:
+    """
+    Statistiques depuis l'instantane partage (aucun appel WordPress en temps normal).
+    Instantane absent (premier demarrage) : calcule une fois pour tous les workers.
+    """
+    return _stats_cache.get_or_compute(STATS_CACHE_KEY, compute_article_stats)
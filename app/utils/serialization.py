@@ -0,0 +1,78 @@
+"""
+Serialisation rapide des reponses JSON.
+
+Chemin par defaut de FastAPI pour une route : validation du resultat par le
+response_model, conversion en objets Python (ou jsonable_encoder, tres lent
+sur les gros dicts imbriques, en l'absence de response_model), puis json.dumps.
+
+- FastJSONResponse : classe de reponse par defaut de l'application (orjson,
+  environ 8x plus rapide que json.dumps ; cles non textuelles acceptees comme
+  avec json.dumps)
+- json_response(content) : dict/list de types simples (datetime, Decimal...)
+  serialise directement par orjson, sans jsonable_encoder
+- model_response(Type, content) : une validation (instances deja typees :
+  quasi gratuite ; objets ORM : from_attributes) puis une serialisation en
+  octets par un TypeAdapter pre-construit, en un seul passage pydantic-core
+
+Les routes gardent leur response_model pour la documentation OpenAPI.
+
+Usage :
+    from app.utils.serialization import json_response, model_response
+    return model_response(EquipmentListResponse, result)
+    return model_response(list[SocialCommentResponse], comments, headers={"X-Total-Count": str(total)})
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Optional
+
+import orjson
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Types non geres par orjson, convertis comme le ferait jsonable_encoder."""
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, bytes):
+        return value.decode()
+    raise TypeError(f"Type non serialisable en JSON: {type(value).__name__}")
+
+
+class FastJSONResponse(ORJSONResponse):
+    """Reponse JSON serialisee par orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+def json_response(content: Any, status_code: int = 200, headers: Optional[dict] = None) -> FastJSONResponse:
+    """Reponse pour un dict/list construit par le code (pas d'objets ORM ni de jsonable_encoder)."""
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def model_response(response_type: Any, content: Any, status_code: int = 200,
+                   headers: Optional[dict] = None) -> Response:
+    """
+    Reponse conforme a response_type (modele, list[Modele]...) : validation
+    puis serialisation JSON par un TypeAdapter mis en cache par type.
+    Un contenu non conforme leve pydantic.ValidationError (erreur 500).
+    """
+    adapter = _adapter(response_type)
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True), by_alias=True)
+    return Response(body, status_code=status_code, headers=headers, media_type="application/json")
@@ -0,0 +1,110 @@
+"""
+Fenetres temporelles semi-ouvertes [start, end) pour filtrer les colonnes
+date/heure indexees.
+
+Un filtre `func.date(colonne) == jour` (ou `cast(colonne, Date)`) empeche
+PostgreSQL d'utiliser l'index de la colonne : chaque ligne est convertie
+avant comparaison (Seq Scan). La meme condition ecrite en intervalle,
+`colonne >= debut AND colonne < fin`, reste sargable (Index Scan).
+
+Fuseaux horaires :
+- tz=None : bornes naives a l'heure locale du serveur, pour les colonnes
+  `DateTime` sans fuseau (shows.broadcast_date, listen_events.created_at),
+  comme date.today() / datetime.now()
+- tz=timezone.utc (ou un ZoneInfo) : bornes aware, pour les colonnes
+  `DateTime(timezone=True)` ; les jours commencent a minuit dans ce fuseau
+
+Usage :
+    from app.utils.time_window import day_window, week_window, period_window
+    db.query(Show).filter(day_window().filter(Show.broadcast_date))
+    window = period_window("30d")       # 7d / 30d / 90d / 12m
+    SocialPost.created_at >= window.start
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import Optional
+
+from sqlalchemy import and_
+
+# Vocabulaire des periodes des statistiques (module Social)
+PERIOD_DAYS = {"7d": 7, "30d": 30, "90d": 90, "12m": 365}
+DEFAULT_PERIOD = "30d"
+
+
+@dataclass(frozen=True)
+class TimeWindow:
+    """Intervalle [start, end) : start inclus, end exclu."""
+    start: datetime
+    end: datetime
+
+    def filter(self, column):
+        """Condition SQL sargable : column >= start AND column < end."""
+        return and_(column >= self.start, column < self.end)
+
+    def previous(self) -> "TimeWindow":
+        """Fenetre de meme duree qui precede immediatement celle-ci."""
+        return TimeWindow(self.start - (self.end - self.start), self.start)
+
+    def days(self) -> list[date]:
+        """Jours calendaires couverts (pour completer une serie journaliere)."""
+        first = self.start.date()
+        last = (self.end - timedelta(microseconds=1)).date()
+        return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+    def __contains__(self, moment: datetime) -> bool:
+        return self.start <= moment < self.end
+
+
+def _today(tz: Optional[tzinfo]) -> date:
+    return datetime.now(tz).date() if tz else date.today()
+
+
+def _midnight(day: date, tz: Optional[tzinfo]) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=tz)
+
+
+def date_range_window(first_day: date, last_day: date, tz: Optional[tzinfo] = None) -> TimeWindow:
+    """Jours first_day a last_day inclus : [minuit first_day, minuit du lendemain de last_day)."""
+    if last_day < first_day:
+        raise ValueError("last_day doit etre posterieur ou egal a first_day")
+    return TimeWindow(_midnight(first_day, tz), _midnight(last_day + timedelta(days=1), tz))
+
+
+def day_window(day: Optional[date] = None, tz: Optional[tzinfo] = None) -> TimeWindow:
+    """Journee entiere (aujourd'hui par defaut)."""
+    day = day or _today(tz)
+    return date_range_window(day, day, tz)
+
+
+def week_window(day: Optional[date] = None, week_offset: int = 0, tz: Optional[tzinfo] = None) -> TimeWindow:
+    """Semaine du lundi au dimanche contenant `day`, decalee de week_offset semaines."""
+    day = day or _today(tz)
+    monday = day - timedelta(days=day.weekday()) + timedelta(weeks=week_offset)
+    return date_range_window(monday, monday + timedelta(days=6), tz)
+
+
+def month_window(day: Optional[date] = None, month_offset: int = 0, tz: Optional[tzinfo] = None) -> TimeWindow:
+    """Mois calendaire contenant `day`, decale de month_offset mois."""
+    day = day or _today(tz)
+    index = day.year * 12 + (day.month - 1) + month_offset
+    first = date(index // 12, index % 12 + 1, 1)
+    following = date((index + 1) // 12, (index + 1) % 12 + 1, 1)
+    return TimeWindow(_midnight(first, tz), _midnight(following, tz))
+
+
+def last_days_window(days: int, day: Optional[date] = None, tz: Optional[tzinfo] = None) -> TimeWindow:
+    """Les `days` jours precedant `day` plus `day` lui-meme (jours entiers)."""
+    day = day or _today(tz)
+    return date_range_window(day - timedelta(days=days), day, tz)
+
+
+def period_days(period: str) -> int:
+    """Nombre de jours d'une periode 7d/30d/90d/12m (30 si inconnue)."""
+    return PERIOD_DAYS.get(period, PERIOD_DAYS[DEFAULT_PERIOD])
+
+
+def period_window(period: str, now: Optional[datetime] = None) -> TimeWindow:
+    """Periode glissante se terminant maintenant (UTC par defaut) : [now - n jours, now)."""
+    now = now or datetime.now(timezone.utc)
+    return TimeWindow(now - timedelta(days=period_days(period)), now)
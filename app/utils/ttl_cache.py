@@ -0,0 +1,82 @@
+"""
+Cache memoire TTL borne (LRU), thread-safe.
+
+Utilise par les services d'integration (IA, OVH, Scaleway, WordPress...) pour
+eviter de refaire des appels reseau identiques dans un meme worker.
+Le cache est local au processus : chaque worker Gunicorn a le sien.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+# Sentinelle pour distinguer "absent" d'une valeur None mise en cache
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Cache cle → valeur avec expiration (ttl en secondes) et taille bornee.
+
+    - ttl=None : pas d'expiration (ex: factures OVH, immuables une fois emises)
+    - maxsize : au-dela, l'entree la moins recemment utilisee est evincee
+    """
+
+    def __init__(self, ttl: Optional[float] = 300, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _expired(self, stored_at: float, ttl: Optional[float]) -> bool:
+        return ttl is not None and time.monotonic() - stored_at > ttl
+
+    def get(self, key: Hashable, default: Any = None, ttl: Optional[float] = _MISSING) -> Any:
+        """Retourne la valeur en cache ou `default` si absente/expiree."""
+        effective_ttl = self.ttl if ttl is _MISSING else ttl
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or self._expired(entry[0], effective_ttl):
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Retourne la valeur en cache, ou appelle `loader()` et met le resultat en cache."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def age(self, key: Hashable) -> Optional[float]:
+        """Age en secondes de l'entree (None si absente)."""
+        with self._lock:
+            entry = self._data.get(key)
+            return None if entry is None else time.monotonic() - entry[0]
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
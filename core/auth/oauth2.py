@@ -9,6 +9,7 @@ from app.db import database
 # import database as database, table_models as table_models
 from app.schemas.schemas import TokenData
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.config.config import settings
 from app.models import table_models
 from app.models import model_user
@@ -134,6 +135,16 @@ def get_current_user(token: str= Depends(oauth2_scheme), db: Session = Depends(d
     return current_user_info
 
 
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(database.get_async_db)):
+    """
+    Variante de get_current_user pour les routes `async def` (pool asyncpg) :
+    memes verifications (token revoque, signature, utilisateur), sans occuper
+    de thread du threadpool. Seules les colonnes de l'utilisateur sont chargees :
+    une relation non chargee leverait MissingGreenlet hors de run_sync.
+    """
+    return await db.run_sync(lambda session: get_current_user(token, session))
+
+
 def get_2fa_temp_user(temp_token: str, db: Session):
     """
     Valide un token temporaire 2FA et retourne l'utilisateur.
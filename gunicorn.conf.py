@@ -0,0 +1,26 @@
+"""
+Configuration gunicorn commune (chargee automatiquement depuis le repertoire
+de travail, en complement des options de la ligne de commande).
+
+Metriques Prometheus multi-workers (app/services/metrics.py) : chaque worker
+ecrit ses valeurs dans PROMETHEUS_MULTIPROC_DIR, vide au demarrage ; les
+fichiers d'un worker arrete sont marques pour ne plus compter dans les jauges.
+"""
+
+import os
+import shutil
+
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+
+
+def on_starting(server):
+    """Repertoire des metriques vide a chaque demarrage (avant le fork des workers)."""
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
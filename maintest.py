@@ -4,6 +4,7 @@ from fastapi import FastAPI, Request  # Classe principale pour créer une applic
 from fastapi.middleware.cors import CORSMiddleware  # Middleware pour la gestion des CORS
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
+from app.utils.serialization import FastJSONResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
@@ -37,6 +38,7 @@ from routeur import (
      segment_route, # Ajout de l'importation du routeur de segments
      setup_route,  # Route de configuration initiale (sans auth)
      version_route,  # Route d'information sur la version
+     metrics_route,  # Metriques Prometheus
      ovh_route,  # Routes pour la consultation des services OVH
      scaleway_route,  # Routes pour la consultation des services Scaleway
      social_route,  # Routes pour le module Social (réseaux sociaux)
@@ -57,6 +59,7 @@ from routeur import (
 
     logistics_route,  # Routes pour le module Logistique (gestion de flotte)
      pannes_route,  # Routes pour le module Gestion des Pannes (fiches + acteurs)
+     jobs_route,  # Routes d'administration du planificateur de taches
 
 
 )  # Importation des routeurs de l'appication
@@ -75,22 +78,12 @@ from app.config.config import settings  # Importation des paramètres de configu
 from sqlalchemy import text
 from app.middleware.logger import LoggerMiddleware  # Importation du middleware personnalisé
 
-# Configuration du logger global
+# Configuration du logger global : fichier rotatif + stdout (Docker), ecrits
+# par un thread dedie (QueueListener) hors de la boucle d'evenements
 import logging
-from logging.handlers import RotatingFileHandler  # Gestionnaire pour fichiers de logs rotatifs
+from app.config.logging_config import setup_logging
 
-# Configuration de base pour les logs
-log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')  # Format des logs
-file_handler = RotatingFileHandler(
-    "api_logs.log", maxBytes=5 * 1024 * 1024, backupCount=3
-)  # Fichier de logs avec rotation (5 Mo max, 3 sauvegardes)
-file_handler.setFormatter(log_formatter)  # Appliquer le format au gestionnaire
-
-# Handler console pour que les logs apparaissent dans Docker
-stream_handler = logging.StreamHandler()
-stream_handler.setFormatter(log_formatter)
-
-logging.basicConfig(level=logging.INFO, handlers=[file_handler, stream_handler])  # Fichier + stdout
+setup_logging()
 logger = logging.getLogger("hapson-api")  # Créer un logger spécifique pour l'API
 
 @lru_cache
@@ -164,10 +157,8 @@ async def lifespan(app: FastAPI):
     from app.db.database import SessionLocal
     from app.db.init_admin import create_default_admin
     from app.db.init_logistics import initialize_logistics_config
-    from app.services.social_scheduler import scheduler as social_scheduler
-    from app.services.backup_scheduler import backup_scheduler
-    from app.db.crud.crud_auth import delete_expired_tokens
-    from datetime import datetime, timezone
+    from app.services.job_runner import job_runner
+    from app.services.scheduled_jobs import register_default_jobs
     logger.info("🚀 Démarrage de l'application - Vérification de l'admin par défaut...")
     
     db = SessionLocal()
@@ -184,53 +175,24 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Erreur lors de l'initialisation de l'admin: {e}")
     finally:
         db.close()
-    
-    # Démarrer le scheduler Social (tâches périodiques)
-    social_scheduler.start()
-    logger.info("✅ Social scheduler démarré")
-
-    # Demarrer le scheduler Backup (sauvegarde automatique quotidienne)
-    backup_scheduler.start()
-    logger.info("✅ Backup scheduler demarre")
-
-    # Nettoyage initial des tokens revoques expires
-    try:
-        cleanup_db = SessionLocal()
-        delete_expired_tokens(cleanup_db, datetime.now(timezone.utc))
-        cleanup_db.close()
-        logger.info("✅ Nettoyage initial des tokens revoques termine")
-    except Exception as e:
-        logger.warning(f"⚠️ Echec nettoyage initial tokens: {e}")
 
-    # Scheduler periodique pour le nettoyage des tokens revoques (toutes les heures)
-    try:
-        from apscheduler.schedulers.background import BackgroundScheduler
-        token_cleanup_scheduler = BackgroundScheduler()
-
-        def cleanup_revoked_tokens_job():
-            """Supprime les tokens revoques expires de la base."""
-            try:
-                job_db = SessionLocal()
-                delete_expired_tokens(job_db, datetime.now(timezone.utc))
-                job_db.close()
-                logger.info("🧹 Nettoyage periodique des tokens revoques termine")
-            except Exception as e:
-                logger.warning(f"⚠️ Echec nettoyage tokens: {e}")
-
-        token_cleanup_scheduler.add_job(cleanup_revoked_tokens_job, 'interval', hours=1)
-        token_cleanup_scheduler.start()
-        logger.info("✅ Token cleanup scheduler demarre (toutes les heures)")
-    except ImportError:
-        token_cleanup_scheduler = None
-        logger.warning("⚠️ apscheduler non installe — nettoyage periodique des tokens desactive")
+    # Taches periodiques (social, RSS, inventaires, backup, tokens, segments, partitions d'audit) :
+    # un seul worker leader
+    register_default_jobs(job_runner)
+    job_runner.start()
 
     yield  # L'application s'exécute ici
 
     # Shutdown
-    if token_cleanup_scheduler:
-        token_cleanup_scheduler.shutdown()
-    backup_scheduler.stop()
-    social_scheduler.stop()
+    job_runner.stop()
+    from app.services.subtitle_service import shutdown_extraction_pool
+    shutdown_extraction_pool()
+    from app.services.http_client import aclose_http_clients, close_http_clients
+    close_http_clients()
+    await aclose_http_clients()
+    # Ferme proprement les connexions asyncpg (dans la boucle d'evenements)
+    from app.db.database import async_engine
+    await async_engine.dispose()
     logger.info("🛑 Arrêt de l'application...")
 
 
@@ -240,6 +202,8 @@ limiter = Limiter(key_func=get_remote_address)
 # Initialisation de l'application FastAPI avec lifespan
 app = FastAPI(
     lifespan=lifespan,
+    # Serialisation orjson pour toutes les routes (app/utils/serialization.py)
+    default_response_class=FastJSONResponse,
     title="Audace API",
     description="API pour la gestion des émissions radio",
     version=get_version(),  # Version dynamique depuis __version__.py
@@ -291,6 +255,20 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 # Ajout du middleware personnalisé pour journaliser les requêtes
 app.add_middleware(LoggerMiddleware)
 
+# Metriques Prometheus : latence par route, requetes SQL par requete, pool (GET /metrics)
+from app.db.database import async_engine, background_engine, engine
+from app.middleware.metrics_middleware import MetricsMiddleware
+from app.services import metrics
+metrics.instrument_engine(engine, "api")
+metrics.instrument_engine(background_engine, "jobs")
+metrics.instrument_engine(async_engine.sync_engine, "api-async")
+app.add_middleware(MetricsMiddleware)
+
+# Profilage SQL par requete (N+1, budget) : developpement / recette uniquement
+if settings.SQL_PROFILING:
+    from app.middleware.sql_profiler_middleware import SQLProfilerMiddleware
+    app.add_middleware(SQLProfilerMiddleware)
+
 # Ajout du middleware de versioning de l'API
 from app.middleware.version_middleware import APIVersionMiddleware
 app.add_middleware(APIVersionMiddleware)
@@ -321,6 +299,7 @@ app.add_middleware(
 # ⚠️ IMPORTANT: setup_route doit être inclus EN PREMIER (pas d'auth requise)
 app.include_router(setup_route.router)  # Routes de configuration initiale (SANS authentification)
 app.include_router(version_route.router)  # Routes d'information sur la version
+app.include_router(metrics_route.router)  # Metriques Prometheus (GET /metrics)
 app.include_router(public_route.router)  # Routes publiques integration WordPress (SANS authentification)
 
 # app.include_router(posts.router)  # Routes liées aux posts
@@ -369,6 +348,7 @@ app.include_router(ga_analytics_route.router) # Routes pour Google Analytics 4 (
 app.include_router(rss_route.router) # Routes pour l'agregateur RSS (Social)
 app.include_router(logistics_route.router) # Routes pour le module Logistique (gestion de flotte)
 app.include_router(pannes_route.router) # Routes pour le module Gestion des Pannes (fiches + acteurs)
+app.include_router(jobs_route.router) # Routes d'administration du planificateur de taches
 
 # Endpoint par défaut pour vérifier que l'API est opérationnelle
 @app.get("/")
@@ -1,20 +1,32 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+import logging
+import threading
+
+from fastapi import APIRouter, HTTPException, Depends, Query, status
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from app.db.crud.crud_audit_logs import (
     get_all_audit_logs,
     get_audit_log,
     create_audit_log,
     archive_audit_log,
+    archive_audit_log_partitions,
     get_all_archived_audit_logs,
     get_archived_audit_log,
-    get_audit_log_stats
+    get_audit_log_stats,
+    log_action,
 )
+from app.models.model_user_permissions import UserPermissions
 from app.schemas import AuditLog, AuditLogBase, AuditLogPaginated, AuditLogStats
-from app.db.database import get_db
+from app.db.database import BackgroundSessionLocal, get_db
+from app.services import sync_tasks
+from app.utils.serialization import model_response
 from core.auth import oauth2
 
+logger = logging.getLogger("hapson-api")
+
+ARCHIVE_TASK_LABEL = "audit-logs-archive"
+
 
 router = APIRouter(
     prefix="/audit-logs",
@@ -33,6 +45,8 @@ def get_all_audit_logs_route(
     table_name: Optional[str] = Query(None, description="Filtrer par table (users, shows, emissions...)"),
     start_date: Optional[datetime] = Query(None, description="Date de début (ISO 8601)"),
     end_date: Optional[datetime] = Query(None, description="Date de fin (ISO 8601)"),
+    exact: bool = Query(False, description="Correspondance exacte sur action/table_name (sinon recherche partielle)"),
+    cursor: Optional[str] = Query(None, description="Curseur de la page suivante (next_cursor) ; remplace skip"),
     db: Session = Depends(get_db),
     current_user: int = Depends(oauth2.get_current_user)
 ):
@@ -44,18 +58,27 @@ def get_all_audit_logs_route(
     - **action** : Type d'action (create, update, delete, login, logout, etc.)
     - **table_name** : Table concernée (users, shows, emissions, etc.)
     - **start_date / end_date** : Plage de dates
+    - **exact** : égalité stricte au lieu de la recherche partielle sur action/table_name
+
+    Pagination : **skip/limit** (avec total) ou **cursor** (pagination par clé,
+    sans recomptage ; utiliser `next_cursor` de la réponse précédente).
     """
-    items, total = get_all_audit_logs(
-        db, skip=skip, limit=limit,
-        user_id=user_id, action=action, table_name=table_name,
-        start_date=start_date, end_date=end_date
-    )
-    return {
+    try:
+        items, total, next_cursor = get_all_audit_logs(
+            db, skip=skip, limit=limit,
+            user_id=user_id, action=action, table_name=table_name,
+            start_date=start_date, end_date=end_date,
+            exact=exact, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return model_response(AuditLogPaginated, {
         "total": total,
         "items": items,
         "skip": skip,
-        "limit": limit
-    }
+        "limit": limit,
+        "next_cursor": next_cursor
+    })
 
 
 @router.get("/stats", response_model=AuditLogStats)
@@ -124,6 +147,69 @@ def archive_audit_log_route(
     return {"detail": f"Audit log {id} archived successfully"}
 
 
+@router.post("/archive", status_code=202)
+def archive_audit_log_partitions_route(
+    before: Optional[datetime] = Query(None, description="Archiver les mois entièrement antérieurs à cette date (défaut : il y a 90 jours)"),
+    db: Session = Depends(get_db),
+    current_user: int = Depends(oauth2.get_current_user)
+):
+    """
+    Archiver en bloc les partitions mensuelles anciennes des logs d'audit.
+
+    Chaque partition mensuelle entièrement antérieure à **before** est détachée,
+    copiée dans la table des archives puis supprimée.
+
+    L'archivage dure plus que le statement_timeout des requêtes HTTP : il est
+    exécuté en arrière-plan sur le pool des tâches (BackgroundSessionLocal).
+    Suivi via GET /audit-logs/archive/status/{task_id}.
+
+    Requiert la permission can_manage_settings.
+    """
+    perms = db.query(UserPermissions).filter(
+        UserPermissions.user_id == current_user.id
+    ).first()
+    if not perms or not perms.can_manage_settings:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission 'can_manage_settings' requise"
+        )
+
+    running = sync_tasks.get_running(labels=[ARCHIVE_TASK_LABEL])
+    if running:
+        raise HTTPException(status_code=409, detail=f"Archivage déjà en cours (tâche {running['id']})")
+    if before is None:
+        before = datetime.utcnow() - timedelta(days=90)
+
+    task_id = sync_tasks.create(label=ARCHIVE_TASK_LABEL)
+    log_action(db, current_user.id, "archive_partitions", "audit_logs", 0)
+
+    def _run_archive():
+        session = BackgroundSessionLocal()
+        try:
+            sync_tasks.update(task_id, progress=f"Archivage des partitions antérieures au {before.date()}...", percent=10)
+            sync_tasks.complete(task_id, archive_audit_log_partitions(session, before))
+        except Exception as e:
+            logger.error(f"Erreur archivage des logs d'audit: {e}")
+            sync_tasks.fail(task_id, str(e))
+        finally:
+            session.close()
+
+    threading.Thread(target=_run_archive, daemon=True, name="audit-archive").start()
+    return {"task_id": task_id, "detail": "Archivage lancé en arrière-plan"}
+
+
+@router.get("/archive/status/{task_id}")
+def get_archive_status_route(
+    task_id: str,
+    current_user: int = Depends(oauth2.get_current_user)
+):
+    """Statut d'un archivage lancé par POST /audit-logs/archive."""
+    task = sync_tasks.get(task_id)
+    if not task or task.get("label") != ARCHIVE_TASK_LABEL:
+        raise HTTPException(status_code=404, detail="Tâche introuvable")
+    return task
+
+
 # ===================== LOGS ARCHIVÉS =====================
 
 @router.get("/archived/all", response_model=AuditLogPaginated)
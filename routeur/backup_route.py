@@ -29,7 +29,7 @@ from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 
 from app.config.config import settings
-from app.db.database import SessionLocal, get_db
+from app.db.database import BackgroundSessionLocal, SessionLocal, get_db
 from app.db.crud.crud_audit_logs import log_action
 from app.db.crud.crud_backup import (
     create_backup_history,
@@ -408,7 +408,7 @@ def trigger_backup(
 
     # Lancer le backup en arriere-plan
     def _run_backup():
-        session = SessionLocal()
+        session = BackgroundSessionLocal()
         try:
             sync_tasks.update(task_id, progress="Verification du token Google...", percent=10)
 
@@ -635,7 +635,7 @@ def restore_from_upload(
     task_id = sync_tasks.create(label=f"restore-upload-{safe_name}")
 
     def _run_upload_restore():
-        session = SessionLocal()
+        session = BackgroundSessionLocal()
         try:
             sync_tasks.update(task_id, progress="Nettoyage du schema avant restauration...", percent=10)
 
@@ -755,7 +755,7 @@ def trigger_restore(
     task_id = sync_tasks.create(label=f"restore-{backup.filename}")
 
     def _run_restore():
-        session = SessionLocal()
+        session = BackgroundSessionLocal()
         try:
             logger.info(f"[RESTORE] Demarrage restauration backup_id={backup_id} filename={backup.filename}")
             sync_tasks.update(task_id, progress="Preparation de la restauration...", percent=10)
@@ -1,7 +1,7 @@
 from fastapi import FastAPI, Depends, HTTPException,APIRouter
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.db.crud.crud_dashbord import get_dashboard
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from starlette import status
 from app.models.model_user import User
@@ -14,12 +14,12 @@ router = APIRouter(
 )
 
 @router.get("/")
-def get_dashboard_route(db: Session = Depends(get_db), user_id: User = Depends(oauth2.get_current_user)):
+async def get_dashboard_route(db: AsyncSession = Depends(get_async_db), user_id: User = Depends(oauth2.get_current_user_async)):
     """
     Endpoint pour récupérer les données du tableau de bord.
     
     Args:
-        db (Session): Session de base de données injectée via Depends.
+        db (AsyncSession): Session asyncpg injectée via Depends.
     
     Returns:
         dict: Données formatées pour le tableau de bord.
@@ -28,7 +28,7 @@ def get_dashboard_route(db: Session = Depends(get_db), user_id: User = Depends(o
         HTTPException: Avec un code d'erreur approprié en cas d'échec.
     """
     try:
-        dashboard_data = get_dashboard(db)
+        dashboard_data = await db.run_sync(get_dashboard)
         return dashboard_data
     except ValueError as e:
         raise HTTPException(
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.database import get_db  # Cette fonction obtient une session de base de données
+from app.db.database import get_async_db, get_db  # Cette fonction obtient une session de base de données
 from app.db.crud.crud_emission import create_emission, get_emission_by_id, get_emissions, update_emission, delete_emission, soft_delete_emission
 from app.schemas.schema_emission import EmissionResponse, EmissionCreate, EmissionUpdate
 from core.auth import oauth2
@@ -22,8 +23,8 @@ def create_emission_route(emission: EmissionCreate, db: Session = Depends(get_db
 
 # Lire toutes les émissions
 @router.get("/", response_model=list[EmissionResponse])
-def get_emissions_route(skip: int = 0, limit: int = 10, db: Session = Depends(get_db), current_user: int = Depends(oauth2.get_current_user)):
-    return get_emissions(db, skip, limit)
+async def get_emissions_route(skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_async_db), current_user: int = Depends(oauth2.get_current_user_async)):
+    return await db.run_sync(get_emissions, skip, limit)
 
 # Lire une émission par son ID
 @router.get("/{emission_id}", response_model=EmissionResponse)
@@ -54,7 +54,7 @@ router = APIRouter(prefix="/ga", tags=["ga-analytics"])
 def ga_diagnostic(
     current_user=Depends(oauth2.get_current_user),
 ):
-    """Diagnostic de la configuration GA4 — affiche l'email du Service Account et teste la connexion."""
+    """Diagnostic de la configuration GA4 — affiche l'email du Service Account, teste la connexion et le cache."""
     import json
     from app.config.config import settings
 
@@ -81,6 +81,8 @@ def ga_diagnostic(
         result["client_initialized"] = False
         result["client_error"] = str(e)
 
+    # Cache partage des rapports (compteurs du worker qui repond)
+    result["cache"] = ga_analytics_service.cache_stats()
     return result
 
 
@@ -2,10 +2,11 @@
 
 
 # guest.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.db.crud.crud_guests import get_guest_by_id, get_guests, create_guest, update_guest, delete_guest,search_guest
+from app.db.crud.crud_directory_search import DEFAULT_LIMIT, MAX_LIMIT, TYPEAHEAD_LIMIT, guest_typeahead
 from app.schemas import GuestResponse, GuestCreate, GuestUpdate
 from app.db.database import get_db
 from typing import List
@@ -39,11 +40,22 @@ def create_guest_route(
         raise HTTPException(status_code=400, detail=f"Erreur lors de la création de l'invité: {str(e)}")
 
 @router.get("/search")
-def search_guests(query: str, db: Session = Depends(get_db)):
-    response = GuestService.search_guest_detailed(db, query)
+def search_guests(query: str, skip: int = 0, limit: int = DEFAULT_LIMIT, db: Session = Depends(get_db)):
+    response = GuestService.search_guest_detailed(db, query, skip=skip, limit=limit)
     return response
 
 
+@router.get("/typeahead")
+def guests_typeahead(
+    q: str,
+    limit: int = Query(TYPEAHEAD_LIMIT, ge=1, le=MAX_LIMIT),
+    db: Session = Depends(get_db), current_user: int = Depends(oauth2.get_current_user)):
+    """Suggestions d'invités pour l'autocompletion (id, nom, email, avatar)."""
+    if not q.strip():
+        return []
+    return guest_typeahead(db, q, limit=limit)
+
+
 @router.get("/{guest_id}", response_model=GuestResponse)
 def get_guest_route(
     guest_id: int,
@@ -14,6 +14,7 @@ from app.schemas.schema_inventory_equipment import (
 )
 from core.auth import oauth2
 from app.db.crud.crud_audit_logs import log_action
+from app.utils.serialization import model_response
 
 router = APIRouter(
     prefix="/inventory",
@@ -46,7 +47,7 @@ def get_equipment_list_route(
     db: Session = Depends(get_db),
     current_user=Depends(oauth2.get_current_user),
 ):
-    return get_equipment_list(
+    result = get_equipment_list(
         db,
         page=page,
         page_size=page_size,
@@ -65,6 +66,7 @@ def get_equipment_list_route(
         sort_by=sort_by,
         sort_dir=sort_dir,
     )
+    return model_response(EquipmentListResponse, result)
 
 
 # ════════════════════════════════════════════════════════════════
@@ -0,0 +1,79 @@
+"""
+Routes d'administration du planificateur de taches periodiques.
+
+Prefix : /admin/jobs
+Acces : super_admin
+
+Endpoints :
+- GET /admin/jobs/       — Statut des taches (leader, intervalle, derniere execution)
+- GET /admin/jobs/runs   — Historique des executions (filtrable par tache)
+- GET /admin/jobs/pools  — Pools de connexions PostgreSQL de ce worker (requetes HTTP, taches)
+"""
+
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db, get_pools_status
+from app.db.crud.crud_job_runs import get_job_runs
+from app.models.model_user import User
+from app.services.job_runner import job_runner
+from core.auth.oauth2 import get_current_user
+
+logger = logging.getLogger("hapson-api")
+
+router = APIRouter(prefix="/admin/jobs", tags=["admin-jobs"])
+
+
+def _check_super_admin(user: User):
+    """Reserve au role super_admin."""
+    if any(role.name == "super_admin" for role in (getattr(user, "roles", None) or [])):
+        return
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Acces reserve aux super administrateurs"
+    )
+
+
+@router.get("/")
+def get_jobs_status(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Statut des taches : leader courant (ce worker), intervalles, derniere execution et prochaine echeance."""
+    _check_super_admin(current_user)
+    return job_runner.get_status(db)
+
+
+@router.get("/runs")
+def get_jobs_runs(
+    job_name: Optional[str] = Query(None, description="Filtrer par tache"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Historique des executions, de la plus recente a la plus ancienne."""
+    _check_super_admin(current_user)
+    return [
+        {
+            "id": run.id,
+            "job_name": run.job_name,
+            "status": run.status,
+            "started_at": run.started_at,
+            "finished_at": run.finished_at,
+            "duration_ms": run.duration_ms,
+            "result": run.result,
+            "error_message": run.error_message,
+            "worker": run.worker,
+        }
+        for run in get_job_runs(db, job_name=job_name, limit=limit)
+    ]
+
+
+@router.get("/pools")
+def get_db_pools(current_user: User = Depends(get_current_user)):
+    """Pools de connexions de ce worker : taille, connexions utilisees, debordement."""
+    _check_super_admin(current_user)
+    return get_pools_status()
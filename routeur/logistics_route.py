@@ -11,6 +11,7 @@ from typing import Optional
 
 logger = logging.getLogger("hapson-api")
 from core.auth import oauth2
+from app.utils.serialization import model_response
 from app.db.database import get_db
 from app.db.crud.crud_logistics import (
     get_next_vehicle_reference,
@@ -890,7 +891,7 @@ def list_missions(
         search=search,
         company_id=company_id,
     )
-    return result
+    return model_response(MissionListResponse, result)
 
 
 @router.get("/missions/{mission_id}", response_model=MissionResponse)
@@ -0,0 +1,48 @@
+"""
+Exposition des metriques Prometheus (app/services/metrics.py).
+
+Prefix : /metrics
+Acces : jeton "Authorization: Bearer <METRICS_TOKEN>" (obligatoire en
+production). Sans METRICS_TOKEN, seules les requetes directes depuis le reseau
+interne (loopback, adresses privees, sans X-Forwarded-For) sont acceptees.
+
+Endpoints :
+- GET /metrics — Metriques au format texte Prometheus (tous les workers)
+"""
+
+import hmac
+import ipaddress
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Request, Response, status
+
+from app.config.config import settings
+from app.services import metrics
+
+router = APIRouter(tags=["Version & Health"])
+
+
+def _is_internal(request: Request) -> bool:
+    """Requete directe (sans proxy) depuis le loopback ou une adresse privee."""
+    if request.headers.get("x-forwarded-for") or request.client is None:
+        return False
+    try:
+        address = ipaddress.ip_address(request.client.host)
+    except ValueError:
+        return False
+    return address.is_loopback or address.is_private
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics(request: Request, authorization: Optional[str] = Header(None)):
+    """Metriques HTTP, SQL, pool de connexions et taches planifiees."""
+    if settings.METRICS_TOKEN:
+        if not hmac.compare_digest(authorization or "", f"Bearer {settings.METRICS_TOKEN}"):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Jeton de metriques invalide")
+    elif not _is_internal(request):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="METRICS_TOKEN non defini : metriques reservees au reseau interne",
+        )
+    body, content_type = metrics.render()
+    return Response(content=body, headers={"Content-Type": content_type})
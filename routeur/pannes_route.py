@@ -22,6 +22,7 @@ from datetime import date
 
 from core.auth import oauth2
 from app.db.database import get_db
+from app.utils.serialization import model_response
 from app.db.crud.crud_pannes import (
     get_acteurs,
     get_acteur,
@@ -98,7 +99,7 @@ def list_fiches_pannes_endpoint(
     """Liste des fiches de panne avec filtres."""
     if not current_user.permissions.logistics_pannes_view:
         raise HTTPException(status_code=403, detail="Permission pannes_view requise")
-    return get_fiches_pannes(
+    result = get_fiches_pannes(
         db,
         page=page,
         page_size=page_size,
@@ -109,6 +110,7 @@ def list_fiches_pannes_endpoint(
         date_fin=date_fin,
         category_id=motif_id,   # motif_id (API) → category_id (ORM)
     )
+    return model_response(FichePanneListResponse, result)
 
 
 @router.post("/pannes/", response_model=FichePanneResponse, status_code=201)
@@ -1,8 +1,9 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db
 from app.db.crud.crud_presenters import assign_presenter, create_presenter, get_all_presenters, get_presenter, get_presenter_by_user, update_presenter, delete_presenter, get_deleted_presenters
 from app.schemas.schema_presenters import PresenterCreate, PresenterResponse,PresenterResponsePaged, PresenterUpdate
 from core.auth import oauth2
@@ -33,8 +34,8 @@ def assign_presenter_route(
     """
     return assign_presenter(db, presenter_to_assign)
 @router.get("/all")
-def list_presenters(skip: int = 0, limit: int = 10, db: Session = Depends(get_db), current_user: int = Depends(oauth2.get_current_user)):
-    return get_all_presenters(db, skip, limit)
+async def list_presenters(skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_async_db), current_user: int = Depends(oauth2.get_current_user_async)):
+    return await db.run_sync(get_all_presenters, skip, limit)
 
 
 # Liste des présentateurs soft-deleted
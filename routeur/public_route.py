@@ -3,10 +3,11 @@ from typing import List
 from urllib.parse import parse_qs
 
 from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from starlette import status
 
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db
 from app.config.config import settings
 from core.auth import oauth2
 from app.models.model_user import User
@@ -41,18 +42,20 @@ router = APIRouter(
 # =============================================
 # P1 : Programme en Direct (PUBLIC - sans auth)
 # =============================================
+# Endpoints les plus sollicites (plugin WordPress, RadioDJ) : routes async sur
+# le pool asyncpg, le CRUD synchrone s'execute via AsyncSession.run_sync
 
 @router.get("/now-playing")
-def now_playing_route(db: Session = Depends(get_db)):
+async def now_playing_route(db: AsyncSession = Depends(get_async_db)):
     """
     Retourne l'emission en cours et la prochaine emission.
     Endpoint public - aucune authentification requise.
     Appele par le plugin WordPress pour afficher le programme en direct.
     """
     try:
-        data = get_now_playing(db)
+        data = await db.run_sync(get_now_playing)
         # Enrichir avec la piste RadioDJ en cours
-        data["current_track"] = get_current_track(db)
+        data["current_track"] = await db.run_sync(get_current_track)
         return data
     except Exception as e:
         logger.exception("now-playing error")
@@ -67,7 +70,7 @@ def now_playing_route(db: Session = Depends(get_db)):
 # =============================================
 
 @router.get("/schedule")
-def schedule_route(week: str = "current", db: Session = Depends(get_db)):
+async def schedule_route(week: str = "current", db: AsyncSession = Depends(get_async_db)):
     """
     Retourne la grille des programmes pour une semaine donnee.
     Parametre week: 'current' (defaut), 'next', ou un offset numerique.
@@ -83,7 +86,7 @@ def schedule_route(week: str = "current", db: Session = Depends(get_db)):
             except ValueError:
                 week_offset = 0
 
-        data = get_weekly_schedule(db, week_offset)
+        data = await db.run_sync(get_weekly_schedule, week_offset)
         return data
     except Exception as e:
         logger.exception("schedule error")
@@ -98,14 +101,14 @@ def schedule_route(week: str = "current", db: Session = Depends(get_db)):
 # =============================================
 
 @router.get("/alert")
-def get_alert_route(db: Session = Depends(get_db)):
+async def get_alert_route(db: AsyncSession = Depends(get_async_db)):
     """
     Retourne l'alerte active actuellement.
     Endpoint public - aucune authentification requise.
     Retourne null si aucune alerte n'est active.
     """
     try:
-        alert = get_active_alert(db)
+        alert = await db.run_sync(get_active_alert)
         if not alert:
             return {"active": False}
         return {"active": True, **alert}
@@ -208,13 +211,13 @@ def delete_alert_route(
 # =============================================
 
 @router.get("/presenters")
-def presenters_route(db: Session = Depends(get_db)):
+async def presenters_route(db: AsyncSession = Depends(get_async_db)):
     """
     Retourne la liste des animateurs pour le site public.
     Endpoint public - aucune authentification requise.
     """
     try:
-        presenters = get_public_presenters(db)
+        presenters = await db.run_sync(get_public_presenters)
         return presenters
     except Exception as e:
         logger.exception("presenters error")
@@ -229,10 +232,10 @@ def presenters_route(db: Session = Depends(get_db)):
 # =============================================
 
 @router.post("/analytics/listen-event")
-def listen_event_route(
+async def listen_event_route(
     event: ListenEventCreate,
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Recoit un evenement d'ecoute depuis le plugin WordPress.
@@ -243,8 +246,8 @@ def listen_event_route(
         user_agent = request.headers.get("user-agent")
         referrer = request.headers.get("referer")
 
-        result = create_listen_event(
-            db,
+        result = await db.run_sync(
+            create_listen_event,
             event.model_dump(),
             ip_address=ip_address,
             user_agent=user_agent,
@@ -264,16 +267,16 @@ def listen_event_route(
 # =============================================
 
 @router.get("/analytics/listen-stats", response_model=ListenStatsResponse)
-def listen_stats_route(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(oauth2.get_current_user)
+async def listen_stats_route(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(oauth2.get_current_user_async)
 ):
     """
     Retourne les statistiques d'ecoute pour le dashboard SaaS.
     Endpoint protege - authentification requise.
     """
     try:
-        stats = get_listen_stats(db)
+        stats = await db.run_sync(get_listen_stats)
         return stats
     except Exception as e:
         raise HTTPException(
@@ -289,7 +292,7 @@ def listen_stats_route(
 @router.post("/radiodj/track", status_code=status.HTTP_201_CREATED)
 async def radiodj_track_route(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Recoit les infos de la piste en cours depuis RadioDJ.
@@ -357,7 +360,7 @@ async def radiodj_track_route(
             "duration": dur,
             "track_type": (fields.get("songtype") or fields.get("song_type") or fields.get("type") or "").strip() or None,
         }
-        result = store_now_playing_track(db, track_data)
+        result = await db.run_sync(store_now_playing_track, track_data)
         return {"status": "ok", "track": result}
     except HTTPException:
         raise
@@ -16,6 +16,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
+from app.utils.serialization import model_response
 from core.auth import oauth2
 from app.db.crud import crud_rss
 from app.schemas.schema_rss import (
@@ -132,13 +133,13 @@ def list_articles(
         db, feed_id=feed_id, is_read=is_read, is_bookmarked=is_bookmarked,
         is_used=is_used, search=search, page=page, per_page=per_page,
     )
-    return {
+    return model_response(RssArticleListResponse, {
         "items": items,
         "total": total,
         "page": page,
         "per_page": per_page,
         "total_pages": max(1, math.ceil(total / per_page)),
-    }
+    })
 
 
 @router.get("/articles/{article_id}", response_model=RssArticleResponse)
@@ -6,10 +6,15 @@ Tags: Scaleway Dedibox Services
 Authentification: Bearer token + permissions granulaires
 
 API source : https://api.online.net/api/v1 (Dedibox)
+
+Les listes (compte, serveurs, hebergements, domaines, failover) et le
+dashboard sont servis depuis les instantanes d'inventaire, avec leur age
+(en-tetes X-Snapshot-Generated-At / X-Snapshot-Age, champs du dashboard).
+?refresh=true force un rafraichissement, partage par les demandes simultanees.
 """
 
 import logging
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from typing import Optional
 from sqlalchemy.orm import Session
 
@@ -19,16 +24,13 @@ from app.models import model_user
 from app.models.model_user_permissions import UserPermissions
 from app.db.crud.crud_audit_logs import log_action
 from app.services.scaleway_client import (
-    get_user_info,
-    get_servers,
+    get_inventory,
     get_server_detail,
     get_server_status,
-    get_hostings,
     get_hosting_detail,
-    get_domains,
     get_domain_detail,
-    get_failover_ips,
     get_dashboard,
+    snapshot_age,
 )
 
 logger = logging.getLogger("hapson-api")
@@ -68,19 +70,29 @@ def _check_scw_permission(db: Session, user_id: int, permission_name: str):
         )
 
 
+def _serve_snapshot(response: Response, kind: str, refresh: bool):
+    """Donnees d'un instantane d'inventaire, date et age en en-tetes."""
+    snapshot = get_inventory(kind, refresh=refresh)
+    response.headers["X-Snapshot-Generated-At"] = snapshot["generated_at"]
+    response.headers["X-Snapshot-Age"] = str(snapshot_age(snapshot))
+    return snapshot["data"]
+
+
 # ════════════════════════════════════════════════════════════════
 # ROUTES — COMPTE / UTILISATEUR
 # ════════════════════════════════════════════════════════════════
 
 @router.get("/account")
 def get_scw_account(
+    response: Response,
+    refresh: bool = Query(False, description="Force le rafraichissement depuis l'API Dedibox"),
     db: Session = Depends(get_db),
     current_user: model_user.User = Depends(oauth2.get_current_user)
 ):
     """Recupere les informations du compte utilisateur Dedibox."""
     _check_scw_permission(db, current_user.id, "scw_view_account")
     try:
-        result = get_user_info()
+        result = _serve_snapshot(response, "user", refresh)
         log_action(db, current_user.id, "read", "scaleway_account", 0)
         return result
     except HTTPException:
@@ -96,13 +108,15 @@ def get_scw_account(
 
 @router.get("/servers")
 def list_scw_servers(
+    response: Response,
+    refresh: bool = Query(False, description="Force le rafraichissement depuis l'API Dedibox"),
     db: Session = Depends(get_db),
     current_user: model_user.User = Depends(oauth2.get_current_user)
 ):
     """Liste tous les serveurs dedies Dedibox."""
     _check_scw_permission(db, current_user.id, "scw_view_instances")
     try:
-        result = get_servers()
+        result = _serve_snapshot(response, "servers", refresh)
         log_action(db, current_user.id, "read", "scaleway_servers", 0)
         return result
     except HTTPException:
@@ -156,13 +170,15 @@ def get_scw_server_status(
 
 @router.get("/hosting")
 def list_scw_hosting(
+    response: Response,
+    refresh: bool = Query(False, description="Force le rafraichissement depuis l'API Dedibox"),
     db: Session = Depends(get_db),
     current_user: model_user.User = Depends(oauth2.get_current_user)
 ):
     """Liste tous les hebergements web Dedibox."""
     _check_scw_permission(db, current_user.id, "scw_view_billing")
     try:
-        result = get_hostings()
+        result = _serve_snapshot(response, "hostings", refresh)
         log_action(db, current_user.id, "read", "scaleway_hosting", 0)
         return result
     except HTTPException:
@@ -197,13 +213,15 @@ def get_scw_hosting_detail(
 
 @router.get("/domains")
 def list_scw_domains(
+    response: Response,
+    refresh: bool = Query(False, description="Force le rafraichissement depuis l'API Dedibox"),
     db: Session = Depends(get_db),
     current_user: model_user.User = Depends(oauth2.get_current_user)
 ):
     """Liste tous les domaines geres sur Dedibox."""
     _check_scw_permission(db, current_user.id, "scw_view_domains")
     try:
-        result = get_domains()
+        result = _serve_snapshot(response, "domains", refresh)
         log_action(db, current_user.id, "read", "scaleway_domains", 0)
         return result
     except HTTPException:
@@ -238,13 +256,15 @@ def get_scw_domain(
 
 @router.get("/failover")
 def list_scw_failover(
+    response: Response,
+    refresh: bool = Query(False, description="Force le rafraichissement depuis l'API Dedibox"),
     db: Session = Depends(get_db),
     current_user: model_user.User = Depends(oauth2.get_current_user)
 ):
     """Liste les adresses IP failover."""
     _check_scw_permission(db, current_user.id, "scw_view_instances")
     try:
-        result = get_failover_ips()
+        result = _serve_snapshot(response, "failover", refresh)
         log_action(db, current_user.id, "read", "scaleway_failover", 0)
         return result
     except HTTPException:
@@ -260,13 +280,14 @@ def list_scw_failover(
 
 @router.get("/dashboard")
 def get_scw_dashboard(
+    refresh: bool = Query(False, description="Force le rafraichissement depuis l'API Dedibox"),
     db: Session = Depends(get_db),
     current_user: model_user.User = Depends(oauth2.get_current_user)
 ):
     """Recupere le tableau de bord synthetique Dedibox."""
     _check_scw_permission(db, current_user.id, "scw_view_dashboard")
     try:
-        result = get_dashboard()
+        result = get_dashboard(refresh=refresh)
         log_action(db, current_user.id, "read", "scaleway_dashboard", 0)
         return result
     except HTTPException:
@@ -1,9 +1,10 @@
 
 # routes.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
 from app.schemas import UserRead,UserSrearchResponse
 from app.db.crud.crud_search_user import search_users, search_users_by_keyword_db,get_user_by_id
+from app.db.crud.crud_directory_search import DEFAULT_LIMIT, MAX_LIMIT, TYPEAHEAD_LIMIT, user_typeahead
 from sqlalchemy.orm import Session
 from core.auth import oauth2
 from app.db.database import get_db
@@ -16,15 +17,15 @@ router = APIRouter(
 
 
 @router.get("/", response_model=List[UserSrearchResponse])
-def search_users_by_keyword(keyword: Optional[str] = None, db: Session = Depends(get_db)):
+def search_users_by_keyword(keyword: Optional[str] = None, skip: int = 0, limit: int = DEFAULT_LIMIT, db: Session = Depends(get_db)):
     """
     Rechercher des utilisateurs en utilisant un mot-clé unique.
-    Le mot-clé est recherché dans username, name, family_name et email.
+    Le mot-clé est recherché dans username, name, family_name, email et téléphone.
     """
     if not keyword:
         raise HTTPException(status_code=400, detail="Keyword is required")
 
-    filtered_users = search_users_by_keyword_db(db, keyword)
+    filtered_users = search_users_by_keyword_db(db, keyword, skip=skip, limit=limit)
 
     if not filtered_users:
         raise HTTPException(status_code=404, detail="No users found matching the keyword")
@@ -32,6 +33,19 @@ def search_users_by_keyword(keyword: Optional[str] = None, db: Session = Depends
     return filtered_users
 
 
+@router.get("/typeahead")
+def users_typeahead(
+    q: str,
+    limit: int = Query(TYPEAHEAD_LIMIT, ge=1, le=MAX_LIMIT),
+    db: Session = Depends(get_db),
+    current_user: int = Depends(oauth2.get_current_user),
+):
+    """Suggestions d'utilisateurs pour l'autocompletion (id, username, nom, email, photo)."""
+    if not q.strip():
+        return []
+    return user_typeahead(db, q, limit=limit)
+
+
 # Route pour récupérer un utilisateur par ID
 @router.get("/id/{user_id}", response_model=UserSrearchResponse)
 def get_user_by_id_route(user_id: int, db: Session = Depends(get_db)):
@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.db.database import get_db
-from app.schemas import SegmentCreate, SegmentUpdate, SegmentResponse, SegmentPositionUpdate
+from app.schemas import SegmentCreate, SegmentUpdate, SegmentResponse, SegmentPositionUpdate, SegmentOrderUpdate
 from app.models import Segment
-from app.db.crud.crud_segments import create_segment, get_segments, get_segment_by_id, update_segment, update_segment_position, soft_delete_segment
+from app.db.crud.crud_segments import create_segment, get_segments, get_segment_by_id, update_segment, update_segment_position, soft_delete_segment, apply_segment_order
 from typing import List
 from core.auth import oauth2
 from app.db.crud.crud_audit_logs import log_action
@@ -56,6 +56,13 @@ def update_position_route(segment_id: int, position_update: SegmentPositionUpdat
     log_action(db, current_user.id, "update_position", "segments", segment_id)
     return result
 
+# 5 bis. Appliquer un nouvel ordre complet aux segments d'une émission
+@router.put("/show/{show_id}/order", response_model=list[SegmentResponse])
+def apply_order_route(show_id: int, order: SegmentOrderUpdate, db: Session = Depends(get_db), current_user: int = Depends(oauth2.get_current_user)):
+    result = apply_segment_order(db, show_id, order.segment_ids)
+    log_action(db, current_user.id, "reorder", "segments", show_id)
+    return result
+
 # 6. Soft delete d'un segment
 @router.delete("/{segment_id}", response_model=dict)
 def delete_route(segment_id: int, db: Session = Depends(get_db), current_user: int = Depends(oauth2.get_current_user)):
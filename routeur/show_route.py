@@ -1,9 +1,11 @@
 from fastapi import FastAPI, HTTPException, Depends,APIRouter,status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 from app.schemas import ShowCreate, ShowUpdate,ShowCreateWithDetail,ShowUpdateWithDetails, SegmentUpdateWithDetails, ShowWithdetailResponse, ShowBase_jsonShow, ShowStatuslUpdate
+from app.utils.serialization import json_response
 from app.db.crud.crud_show import create_show, get_shows, get_show_by_id, update_show, delete_show, create_show_with_details,update_show_with_details, get_show_with_details,get_show_details_all,get_show_details_by_id,create_show_with_elements_from_json,update_show_status,get_production_show_details,get_show_details_owned, delete_all_shows, delete_shows_by_user
-from app.db.database import get_db # Assurez-vous d'avoir une fonction SessionLocal pour obtenir la session DB
+from app.db.database import get_async_db, get_db # Assurez-vous d'avoir une fonction SessionLocal pour obtenir la session DB
 from app.schemas import ShowOut  # Modèle Show que vous avez défini précédemment
 from core.auth import oauth2
 from app.models.model_user import User
@@ -51,7 +53,7 @@ async def create_show_new(
 def get_all_show_details(db: Session = Depends(get_db)):
     # print("get_all_show_details")
     shows = get_show_details_all(db)
-    return shows
+    return json_response(shows)
 
 # Route pour récupérer les détails d'une émission par ID
 @router.get("/x/{show_id}", response_model=dict)
@@ -66,7 +68,7 @@ def get_show_details(show_id: int, db: Session = Depends(get_db)):
 def get_all_show_details_for_production(db: Session = Depends(get_db)):
     # print("get_all_show_details")
     shows = get_production_show_details(db)
-    return shows
+    return json_response(shows)
 
 
 # Route pour récupérer tous les détails des émissions pret a etre diffusé
@@ -74,7 +76,7 @@ def get_all_show_details_for_production(db: Session = Depends(get_db)):
 def get_all_show_details_owned_by_user(db: Session = Depends(get_db), user_id: User = Depends(oauth2.get_current_user)):
     # print("get_all_show_details")
     shows = get_show_details_owned(db, user_id.id)
-    return shows
+    return json_response(shows)
 
 
 
@@ -179,7 +181,8 @@ async def update_show_details_route( # Renamed from update_show
     """
     # Note: The original code called update_show_with_details here. 
     # Assuming this is correct based on the function's purpose.
-    updated_show = update_show_with_details(db, show_id, show_data.dict()) 
+    # Champs non envoyes exclus : segments, presentateurs et invites absents restent inchanges
+    updated_show = update_show_with_details(db, show_id, show_data.model_dump(exclude_unset=True))
     if not updated_show:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -203,12 +206,12 @@ def create_new_show_route(show: ShowCreate, db: Session = Depends(get_db)):
 
 # Route pour récupérer tous les shows
 @router.get("/", response_model=List[ShowOut])
-def read_shows_route(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+async def read_shows_route(skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_async_db)):
     """
     Récupère une liste de tous les shows.
     """
     # print(current_user.id)
-    return get_shows(db=db, skip=skip, limit=limit)
+    return await db.run_sync(get_shows, skip=skip, limit=limit)
 
 # Route pour récupérer un show par son ID
 @router.get("/{show_id}", response_model=ShowOut)
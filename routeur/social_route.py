@@ -12,7 +12,7 @@ Endpoints :
 - /social/analytics         — Statistiques d'engagement
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 from typing import Optional
@@ -22,6 +22,7 @@ import logging
 import threading
 
 from app.db.database import get_db
+from app.utils.serialization import model_response
 from core.auth import oauth2
 from app.db.crud.crud_audit_logs import log_action
 from app.db.crud.crud_social import (
@@ -385,7 +386,7 @@ def list_posts(
                 acc = db.query(SocialAccount).filter(SocialAccount.id == result.account_id).first()
                 accounts_cache[result.account_id] = acc.account_name if acc else None
             result.account_name = accounts_cache[result.account_id]
-    return posts
+    return model_response(list[SocialPostResponse], posts)
 
 
 @router.get("/posts/{post_id}", response_model=SocialPostResponse)
@@ -560,7 +561,6 @@ def improve_text_endpoint(
 
 @router.get("/comments", response_model=list[SocialCommentResponse])
 def list_comments(
-    response: Response,
     post_id: Optional[int] = Query(None),
     platform: Optional[str] = Query(None),
     is_read: Optional[bool] = Query(None),
@@ -585,8 +585,7 @@ def list_comments(
             comment.account_name = acc.account_name
         except Exception:
             comment.account_name = None
-    response.headers["X-Total-Count"] = str(total)
-    return comments
+    return model_response(list[SocialCommentResponse], comments, headers={"X-Total-Count": str(total)})
 
 
 @router.post("/comments/{comment_id}/reply", response_model=SocialCommentResponse)
@@ -855,14 +854,15 @@ def reply_to_conversation(
 
 @router.get("/database/stats")
 def database_stats(
+    exact: bool = Query(False, description="Compteurs exacts et orphelins (parcours complets des tables)"),
     db: Session = Depends(get_db),
     current_user: int = Depends(oauth2.get_current_user),
 ):
     """
     Statistiques de la base de données du module social.
 
-    Retourne les compteurs d'enregistrements actifs, soft-deletés
-    et orphelins pour chaque table.
+    Par défaut : estimations PostgreSQL (pg_class.reltuples), sans orphelins.
+    exact=true : compteurs exacts actifs, soft-deletés et orphelins pour chaque table.
     Requiert la permission social_manage_accounts.
     """
     perms = db.query(UserPermissions).filter(
@@ -873,12 +873,13 @@ def database_stats(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Permission 'social_manage_accounts' requise"
         )
-    return get_database_stats(db)
+    return get_database_stats(db, exact=exact)
 
 
 @router.post("/database/optimize")
 def optimize_database(
     hard_delete_days: int = Query(30, ge=-1, le=365, description="Purger les éléments supprimés depuis plus de X jours (0 = tout purger, -1 = orphelins uniquement)"),
+    background: bool = Query(False, description="Lancer en arrière-plan et retourner un task_id"),
     db: Session = Depends(get_db),
     current_user: int = Depends(oauth2.get_current_user),
 ):
@@ -891,6 +892,9 @@ def optimize_database(
        - hard_delete_days=N : purge les éléments supprimés depuis >N jours
        - hard_delete_days=-1 : orphelins uniquement, pas de purge
 
+    Traitement par lots avec VACUUM (ANALYZE) des tables fortement modifiées.
+    background=true : retourne un task_id, progression via GET /social/sync/status/{task_id}.
+
     Requiert la permission social_manage_accounts.
     """
     perms = db.query(UserPermissions).filter(
@@ -902,7 +906,14 @@ def optimize_database(
             detail="Permission 'social_manage_accounts' requise"
         )
 
-    result = cleanup_database(db, hard_delete_days)
+    from app.services.social_maintenance import run_tracked, start_optimize
+
+    if background:
+        launch = start_optimize(hard_delete_days)
+        log_action(db, current_user.id, "optimize", "social_database", 0)
+        return launch
+
+    _, result = run_tracked("optimize", cleanup_database, hard_delete_days)
     log_action(db, current_user.id, "optimize", "social_database", 0)
     return result
 
@@ -989,7 +1000,9 @@ def purge_and_resync(
         )
 
     # 1. Purger les donnees publiees
-    purge_stats = purge_published_data(db)
+    from app.services.social_maintenance import run_tracked
+
+    purge_task_id, purge_stats = run_tracked("purge", purge_published_data)
     log_action(db, current_user.id, "purge_published_data", "social_database", 0)
 
     # 2. Declencher la resynchronisation en arriere-plan
@@ -1002,6 +1015,7 @@ def purge_and_resync(
 
     return {
         "purge_stats": purge_stats,
+        "purge_task_id": purge_task_id,
         "resync_started": True,
         "message": "Donnees purgees. Resynchronisation en cours...",
     }
@@ -15,7 +15,8 @@ Endpoints :
 
 import logging
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, UploadFile, File, status
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
@@ -32,7 +33,7 @@ from app.schemas.schema_subtitle import (
 from app.services.subtitle_service import (
     create_task,
     get_task,
-    extract_subtitles,
+    submit_extraction,
     get_available_langs,
     save_cookies_file,
     get_cookies_status,
@@ -49,15 +50,25 @@ router = APIRouter(
 @router.post("/extract", response_model=SubtitleTaskResponse)
 async def request_extraction(
     req: SubtitleExtractRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user=Depends(oauth2.get_current_user),
 ):
-    """Soumet une extraction de sous-titres en tache de fond."""
-    task_id = create_task()
-    background_tasks.add_task(
-        extract_subtitles, task_id, req.url, req.lang, req.format
-    )
+    """
+    Soumet une extraction de sous-titres au pool d'extraction.
+
+    Si les sous-titres sont deja en cache, la tache est immediatement
+    terminee (status == 'done') et le contenu est disponible via /status.
+    Les fichiers de tache et de cache sont lus / ecrits hors de la boucle d'evenements.
+    """
+    task_id = await run_in_threadpool(create_task)
+    cached = await run_in_threadpool(submit_extraction, task_id, req.url, req.lang, req.format)
+    if cached is not None:
+        logger.info(f"Sous-titres servis depuis le cache (task={task_id}) pour {req.url}")
+        return SubtitleTaskResponse(
+            task_id=task_id,
+            status=cached["status"],
+            message="Sous-titres disponibles (cache)",
+        )
     logger.info(
         f"Extraction sous-titres lancee (task={task_id}) "
         f"par user={current_user.id} pour {req.url}"
@@ -76,7 +87,7 @@ async def get_extraction_status(
     current_user=Depends(oauth2.get_current_user),
 ):
     """Poll le statut d'une tache. Retourne le contenu quand status == 'done'."""
-    task = get_task(task_id)
+    task = await run_in_threadpool(get_task, task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -93,7 +104,7 @@ async def list_available_langs(
 ):
     """Retourne les langues de sous-titres disponibles pour une URL video."""
     try:
-        langs = get_available_langs(url)
+        langs = await run_in_threadpool(get_available_langs, url)
         return AvailableLangsResponse(**langs)
     except Exception as e:
         logger.error(f"Erreur detection langues pour {url}: {e}")
@@ -134,7 +145,7 @@ async def upload_cookies(
             detail="Fichier trop volumineux (max 5 MB)"
         )
 
-    result = save_cookies_file(content, file.filename or "cookies.txt")
+    result = await run_in_threadpool(save_cookies_file, content, file.filename or "cookies.txt")
     logger.info(f"Upload cookies par user={current_user.id} — resultat: {result}")
     return CookiesUploadResponse(**result)
 
@@ -166,7 +177,7 @@ async def paste_cookies(
             detail="Contenu vide"
         )
 
-    result = save_cookies_file(raw.encode('utf-8'), "pasted_cookies.json")
+    result = await run_in_threadpool(save_cookies_file, raw.encode('utf-8'), "pasted_cookies.json")
     logger.info(f"Paste cookies par user={current_user.id} — resultat: {result}")
     return CookiesUploadResponse(**result)
 
@@ -177,5 +188,5 @@ async def cookies_status(
     current_user=Depends(oauth2.get_current_user),
 ):
     """Retourne le statut du fichier cookies (present, nombre, date)."""
-    result = get_cookies_status()
+    result = await run_in_threadpool(get_cookies_status)
     return CookiesStatusResponse(**result)
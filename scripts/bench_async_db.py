@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark de charge : chemin base de donnees synchrone (psycopg2, route `def`
+executee dans le threadpool) contre asynchrone (asyncpg, route `async def`
+sur AsyncSession, app/db/database.py).
+
+Les deux routes executent le meme code que GET /public/now-playing
+(get_now_playing + get_current_track) ; l'option --db-latency-ms ajoute un
+pg_sleep par requete pour simuler une base distante ou chargee. Le chemin
+synchrone est plafonne par le threadpool (40 threads par defaut) en plus du
+pool de connexions ; le chemin async uniquement par le pool.
+
+Necessite une base PostgreSQL accessible (variables DATABASE_* du .env).
+Les requetes passent par httpx (ASGITransport), sans reseau HTTP.
+
+Usage :
+    python scripts/bench_async_db.py
+    python scripts/bench_async_db.py --requests 2000 --concurrency 200 --db-latency-ms 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import anyio
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config.config import settings
+from app.db.crud.crud_public import get_current_track, get_now_playing
+from app.db.database import create_app_async_engine, create_app_engine
+
+
+def _now_playing(db: Session, latency_ms: int) -> dict:
+    if latency_ms:
+        db.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": latency_ms / 1000})
+    data = get_now_playing(db)
+    data["current_track"] = get_current_track(db)
+    return data
+
+
+def _app(pool_size: int, latency_ms: int):
+    """Application minimale : une route par chemin, pools de meme taille."""
+    options = dict(pool_size=pool_size, max_overflow=0,
+                   statement_timeout_ms=settings.DB_STATEMENT_TIMEOUT_MS,
+                   idle_in_transaction_timeout_ms=settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS)
+    sync_engine = create_app_engine("bench-sync", **options)
+    async_engine = create_app_async_engine("bench-async", **options)
+    SyncSession = sessionmaker(autoflush=False, bind=sync_engine)
+    AsyncSessionBench = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def get_sync_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with AsyncSessionBench() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/sync/now-playing")
+    def sync_now_playing(db: Session = Depends(get_sync_db)):
+        return _now_playing(db, latency_ms)
+
+    @app.get("/async/now-playing")
+    async def async_now_playing(db: AsyncSession = Depends(get_async_db)):
+        return await db.run_sync(_now_playing, latency_ms)
+
+    return app, sync_engine, async_engine
+
+
+async def _run(app: FastAPI, path: str, total: int, concurrency: int) -> tuple[float, float, float]:
+    """Debit (req/s), latence p50 et p95 (ms)."""
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(record: bool):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(path)
+                assert response.status_code == 200, response.text
+                if record:
+                    latencies.append((time.perf_counter() - started) * 1000)
+
+        await asyncio.gather(*(one(False) for _ in range(50)))  # Echauffement (connexions du pool)
+        started = time.perf_counter()
+        await asyncio.gather(*(one(True) for _ in range(total)))
+        rate = total / (time.perf_counter() - started)
+    quantiles = statistics.quantiles(latencies, n=20)
+    return rate, statistics.median(latencies), quantiles[18]
+
+
+async def _bench(args) -> None:
+    app, sync_engine, async_engine = _app(args.pool_size, args.db_latency_ms)
+    threads = anyio.to_thread.current_default_thread_limiter().total_tokens
+    print(f"requetes : {args.requests}, concurrence : {args.concurrency}, pool : {args.pool_size}, "
+          f"threadpool : {threads}, latence simulee : {args.db_latency_ms} ms")
+    print(f"{'chemin':<24} | {'req/s':>8} | {'p50 ms':>8} | {'p95 ms':>8}")
+    try:
+        for label, path in [("sync (psycopg2)", "/sync/now-playing"), ("async (asyncpg)", "/async/now-playing")]:
+            rate, p50, p95 = await _run(app, path, args.requests, args.concurrency)
+            print(f"{label:<24} | {rate:>8.0f} | {p50:>8.1f} | {p95:>8.1f}")
+    finally:
+        sync_engine.dispose()
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--pool-size", type=int, default=50)
+    parser.add_argument("--db-latency-ms", type=int, default=10)
+    asyncio.run(_bench(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
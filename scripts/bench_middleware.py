@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark des middlewares de journalisation et de version.
+
+Compare le debit (requetes/s) d'une application minimale avec :
+- avant : LoggerMiddleware et APIVersionMiddleware en BaseHTTPMiddleware,
+  deux lignes INFO par requete ecrites dans un RotatingFileHandler sur la
+  boucle d'evenements (implementation precedente, reproduite ici)
+- apres : middlewares ASGI purs (app/middleware/), une ligne par requete
+  ecrite par le QueueListener (app/config/logging_config.py)
+- apres, echantillonne : idem avec ACCESS_LOG_SAMPLE_RATE=0.1
+
+Les requetes passent par httpx (ASGITransport), sans reseau ; les logs vont
+dans un fichier temporaire.
+
+Usage :
+    python scripts/bench_middleware.py
+    python scripts/bench_middleware.py --requests 5000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import queue
+import sys
+import tempfile
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.__version__ import MIN_VERSION_HEADER, VERSION_HEADER, VERSION_INFO, get_api_version, get_version
+from app.config.logging_config import LOG_FORMAT
+from app.middleware.logger import LoggerMiddleware
+from app.middleware.version_middleware import APIVersionMiddleware
+
+bench_logger = logging.getLogger("hapson-api.access")
+
+
+class LegacyLoggerMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        bench_logger.info(f"Incoming Request: {request.method} {request.url}")
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        bench_logger.info(f"Completed Request: {request.method} {request.url} - Status: {response.status_code} - Time: {process_time:.2f}s")
+        return response
+
+
+class LegacyVersionMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        response.headers[VERSION_HEADER] = get_version()
+        response.headers[MIN_VERSION_HEADER] = VERSION_INFO["min_client_version"]
+        response.headers["X-API-Path-Version"] = get_api_version()
+        return response
+
+
+def _app(logger_middleware, version_middleware, **logger_options) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.add_middleware(logger_middleware, **logger_options)
+    app.add_middleware(version_middleware)
+    return app
+
+
+def _handler(log_file: str, queued: bool):
+    """Handler fichier direct (avant) ou derriere une file (apres)."""
+    file_handler = RotatingFileHandler(log_file, maxBytes=5 * 1024 * 1024, backupCount=3)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    if not queued:
+        return file_handler, None
+    log_queue = queue.SimpleQueue()
+    return QueueHandler(log_queue), QueueListener(log_queue, file_handler)
+
+
+async def _run(app: FastAPI, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                response = await client.get("/ping?source=bench")
+                assert response.status_code == 200
+
+        await asyncio.gather(*(one() for _ in range(50)))  # Echauffement
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        return total / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    bench_logger.setLevel(logging.INFO)
+    bench_logger.propagate = False
+    cases = [
+        ("avant (BaseHTTPMiddleware)", _app(LegacyLoggerMiddleware, LegacyVersionMiddleware), False),
+        ("apres (ASGI + file)", _app(LoggerMiddleware, APIVersionMiddleware, sample_rate=1.0), True),
+        ("apres, echantillon 10%", _app(LoggerMiddleware, APIVersionMiddleware, sample_rate=0.1), True),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"requetes : {args.requests}, concurrence : {args.concurrency}")
+        print(f"{'cas':<28} | {'req/s':>8}")
+        for label, app, queued in cases:
+            handler, listener = _handler(os.path.join(tmp, "bench.log"), queued)
+            bench_logger.handlers = [handler]
+            if listener:
+                listener.start()
+            rate = asyncio.run(_run(app, args.requests, args.concurrency))
+            if listener:
+                listener.stop()
+            handler.close()
+            print(f"{label:<28} | {rate:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
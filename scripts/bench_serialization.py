@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de la serialisation des 10 plus grosses reponses de l'API.
+
+Pour chaque route, compare le temps CPU par requete du chemin par defaut de
+FastAPI (validation par le response_model + json.dumps, ou jsonable_encoder
++ json.dumps sans response_model) et du chemin rapide (app/utils/serialization.py :
+TypeAdapter pre-construit ou orjson direct). Les donnees sont synthetiques,
+aux tailles de page usuelles ; aucune base n'est necessaire.
+
+Usage :
+    python scripts/bench_serialization.py
+    python scripts/bench_serialization.py --repeat 10 --number 20
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import timeit
+import typing
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace, UnionType
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import BaseModel
+
+from app.schemas.schema_audit_logs import AuditLogPaginated
+from app.schemas.schema_inventory_equipment import EquipmentBrief, EquipmentListResponse
+from app.schemas.schema_logistics import MissionListResponse, MissionResponse
+from app.schemas.schema_pannes import FichePanneListItem, FichePanneListResponse
+from app.schemas.schema_rss import RssArticleListResponse
+from app.schemas.schema_social import SocialCommentResponse, SocialPostResponse
+from app.utils.serialization import json_response, model_response
+
+NOW = datetime(2026, 10, 19, 8, 0, tzinfo=timezone.utc)
+
+
+def _fake_value(annotation, i: int, depth: int):
+    origin = typing.get_origin(annotation)
+    args = [a for a in typing.get_args(annotation) if a is not type(None)]
+    if origin in (typing.Union, UnionType):
+        return _fake_value(args[0], i, depth)
+    if origin is typing.Literal:
+        return args[0]
+    if origin in (list, typing.List):
+        item = args[0] if args else str
+        count = 3 if depth < 1 else 0
+        return [_fake_value(item, i + n, depth + 1) for n in range(count)]
+    if origin is dict or annotation is dict:
+        return {"cle": i, "valeur": f"v{i}"}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return fake(annotation, i, depth + 1)
+    if annotation is datetime:
+        return NOW - timedelta(minutes=i)
+    if annotation is date:
+        return (NOW - timedelta(days=i)).date()
+    if annotation is Decimal:
+        return Decimal("1250.50")
+    if annotation is float:
+        return 14.6937 + i
+    if annotation is bool:
+        return bool(i % 2)
+    if annotation is int:
+        return i + 1
+    if annotation is list:
+        return [f"element-{i}.jpg"]
+    return f"Texte {i} — émission spéciale"
+
+
+def fake(model: type[BaseModel], i: int = 0, depth: int = 0) -> SimpleNamespace:
+    """Objet a attributs (comme une ligne ORM) remplissant tous les champs du modele."""
+    return SimpleNamespace(**{
+        name: _fake_value(field.annotation, i, depth) for name, field in model.model_fields.items()
+    })
+
+
+def _show_details(count: int) -> list[dict]:
+    """Meme forme que crud_show.get_show_details_all."""
+    return [{
+        "id": s, "emission": "Matinale", "emission_id": 3, "title": f"Emission {s}", "type": "live",
+        "broadcast_date": NOW.replace(tzinfo=None) - timedelta(days=s), "duration": 120, "frequency": "daily",
+        "description": "Description de l'émission " * 4, "status": "Prêt",
+        "presenters": [
+            {"id": p, "name": f"Présentateur {p}", "contact_info": None, "biography": "Bio " * 10,
+             "isMainPresenter": p == 0}
+            for p in range(2)
+        ],
+        "segments": [{
+            "id": s * 10 + g, "title": f"Segment {g}", "type": "chronique", "duration": 10,
+            "description": "Contenu du segment " * 3, "startTime": "06:30", "position": g,
+            "technical_notes": None,
+            "guests": [
+                {"id": n, "name": f"Invité {n}", "contact_info": "+221 77 000 00 00", "biography": "Bio " * 8,
+                 "role": "expert", "avatar": None}
+                for n in range(2)
+            ],
+        } for g in range(8)],
+    } for s in range(count)]
+
+
+def _fastapi_path(response_type, content):
+    field = create_response_field(name="response", type_=response_type, mode="serialization")
+
+    def run():
+        return JSONResponse(asyncio.run(serialize_response(field=field, response_content=content))).body
+    return run
+
+
+def _cases() -> list[tuple]:
+    """(route, chemin par defaut, chemin rapide)."""
+    missions = [fake(MissionResponse, i) for i in range(100)]
+    equipment = EquipmentListResponse(
+        items=[EquipmentBrief.model_validate(fake(EquipmentBrief, i)) for i in range(100)],
+        total=1000, page=1, page_size=100,
+    )
+    mission_list = MissionListResponse(
+        items=[MissionResponse.model_validate(m) for m in missions], total=1000, page=1, page_size=100,
+    )
+    pannes = {
+        "items": [FichePanneListItem.model_validate(fake(FichePanneListItem, i)) for i in range(100)],
+        "total": 50_000, "page": 1, "page_size": 100,
+    }
+    posts = [fake(SocialPostResponse, i) for i in range(200)]
+    comments = [fake(SocialCommentResponse, i) for i in range(200)]
+    audit = {"total": None, "items": [fake(AuditLogPaginated.model_fields["items"].annotation.__args__[0], i)
+                                      for i in range(200)], "skip": 0, "limit": 200, "next_cursor": "abc"}
+    rss = {"items": [fake(RssArticleListResponse.model_fields["items"].annotation.__args__[0], i)
+                     for i in range(100)], "total": 5000, "page": 1, "per_page": 100, "total_pages": 50}
+
+    cases = []
+    for route, count in (("GET /shows/x", 150), ("GET /shows/production", 60), ("GET /shows/owned", 30)):
+        shows = _show_details(count)
+        cases.append((route,
+                      lambda shows=shows: JSONResponse(jsonable_encoder(shows)).body,
+                      lambda shows=shows: json_response(shows).body))
+    for route, response_type, content in (
+        ("GET /inventory/equipment/", EquipmentListResponse, equipment),
+        ("GET /logistics/missions", MissionListResponse, mission_list),
+        ("GET /pannes/", FichePanneListResponse, pannes),
+        ("GET /social/posts", list[SocialPostResponse], posts),
+        ("GET /social/comments", list[SocialCommentResponse], comments),
+        ("GET /audit-logs/", AuditLogPaginated, audit),
+        ("GET /rss/articles", RssArticleListResponse, rss),
+    ):
+        cases.append((route, _fastapi_path(response_type, content),
+                      lambda t=response_type, c=content: model_response(t, c).body))
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=10)
+    args = parser.parse_args()
+
+    # asyncio.run() du chemin FastAPI : cout fixe deduit des mesures
+    loop_overhead = min(timeit.repeat(lambda: asyncio.run(asyncio.sleep(0)), repeat=args.repeat, number=args.number))
+    loop_overhead /= args.number
+
+    def per_call(func) -> float:
+        return min(timeit.repeat(func, repeat=args.repeat, number=args.number)) / args.number
+
+    print(f"{'route':<28} | {'defaut (ms)':>11} | {'rapide (ms)':>11} | {'gain (ms)':>9} | {'x':>5}")
+    for route, default_path, fast_path in _cases():
+        default_ms = per_call(default_path) * 1000
+        if not route.startswith("GET /shows"):
+            default_ms -= loop_overhead * 1000
+        fast_ms = per_call(fast_path) * 1000
+        print(f"{route:<28} | {default_ms:>11.2f} | {fast_ms:>11.2f} | {default_ms - fast_ms:>9.2f} | "
+              f"{default_ms / fast_ms:>5.1f}")
+
+
+if __name__ == "__main__":
+    main()
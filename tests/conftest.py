@@ -2,7 +2,10 @@ import pytest
 from httpx import AsyncClient
 from maintest import app
 
-from app.db.database import get_db, SessionLocal
+from app.db.database import get_db, SessionLocal, async_engine
+
+# Budgets de requetes SQL : marqueur query_budget et fixture sql_queries
+pytest_plugins = ["tests.sql_budget"]
 
 @pytest.fixture()
 def anyio_backend():
@@ -14,6 +17,8 @@ async def client():
     # Use default dependency (Postgres service in CI)
     async with AsyncClient(app=app, base_url="http://testserver") as client:
         yield client
+    # Les connexions asyncpg sont liees a la boucle d'evenements du test
+    await async_engine.dispose()
 
 # Session DB pour manipulation directe dans les tests
 @pytest.fixture()
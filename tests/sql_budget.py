@@ -0,0 +1,48 @@
+"""
+Plugin pytest : budgets de requetes SQL par test (app/services/sql_profiler.py).
+
+Charge par tests/conftest.py (pytest_plugins). Seules les requetes executees
+pendant le corps du test sont comptees (pas celles des fixtures), tous
+moteurs et tous threads confondus (client de test compris).
+
+Usage :
+    @pytest.mark.query_budget(4)              # au plus 4 requetes
+    @pytest.mark.query_budget(10, repeats=1)  # et aucune forme SQL executee deux fois
+    def test_liste(...):
+        ...
+
+    def test_detail(sql_queries):             # profil du test, budget verifie a la main
+        client.get("/guests/1")
+        sql_queries.assert_budget(3, repeats=1)
+"""
+import pytest
+
+from app.services import sql_profiler
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "query_budget(max_queries, repeats=None): limite le nombre de requetes SQL du test",
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        yield
+        return
+    with sql_profiler.capture() as profile:
+        outcome = yield
+    if outcome.excinfo is None:
+        try:
+            profile.assert_budget(*marker.args, **marker.kwargs)
+        except AssertionError as e:
+            pytest.fail(str(e), pytrace=False)
+
+
+@pytest.fixture()
+def sql_queries():
+    """Profil des requetes SQL executees pendant le test."""
+    with sql_profiler.capture() as profile:
+        yield profile
@@ -0,0 +1,101 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services import ai_service
+
+
+ARTICLE_HTML = (
+    "<html><head><script>var x = 1;</script></head><body>"
+    "<nav>menu</nav><p>{body} Lorem ipsum dolor sit amet, consectetur adipiscing elit, "
+    "sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.</p></body></html>"
+)
+
+
+class _ArticleHandler(BaseHTTPRequestHandler):
+    hits: dict = {}
+    # Les 3 requetes ne repondent qu'une fois toutes arrivees : seul un
+    # telechargement concurrent franchit la barriere
+    barrier = threading.Barrier(3)
+    missed_barrier = 0
+
+    def do_GET(self):
+        _ArticleHandler.hits[self.path] = _ArticleHandler.hits.get(self.path, 0) + 1
+        try:
+            _ArticleHandler.barrier.wait(timeout=2)
+        except threading.BrokenBarrierError:
+            _ArticleHandler.missed_barrier += 1
+        body = ARTICLE_HTML.format(body=f"Article {self.path}").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubLLM:
+    def __init__(self):
+        self.calls = []
+
+    def complete(self, messages, max_tokens, temperature):
+        self.calls.append(messages)
+        if "TITRE:" in messages[0]["content"]:
+            return "TITRE: Titre genere\n<p>Contenu genere</p>"
+        return f"reponse {len(self.calls)}"
+
+
+@pytest.fixture()
+def article_server():
+    _ArticleHandler.hits = {}
+    _ArticleHandler.barrier = threading.Barrier(3)
+    _ArticleHandler.missed_barrier = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ArticleHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    ai_service._source_cache.clear()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.fixture()
+def stub_llm():
+    llm = StubLLM()
+    ai_service.set_llm_client(llm)
+    yield llm
+    ai_service.set_llm_client(None)
+
+
+def test_generate_article_fetches_sources_concurrently_and_caches(article_server, stub_llm):
+    urls = [f"{article_server}/a", f"{article_server}/b", f"{article_server}/c"]
+
+    result = ai_service.generate_article_from_urls(urls, site_key="radioaudace")
+
+    assert result["title"] == "Titre genere"
+    assert result["source_urls"] == urls
+    # Sources telechargees en parallele : les 3 requetes se sont attendues
+    assert _ArticleHandler.missed_barrier == 0
+
+    # URL equivalente (tracking + fragment) : servie depuis le cache
+    ai_service.fetch_content_from_url(f"{article_server}/a/?utm_source=fb#top")
+    assert _ArticleHandler.hits["/a"] == 1
+
+
+def test_improve_text_is_memoized_per_action(stub_llm):
+    text = "Un texte avec des fautes a corriger pour le test."
+
+    first = ai_service.improve_text(text, content_type="post", action="correct")
+    second = ai_service.improve_text(text, content_type="post", action="correct")
+    assert first["result"] == second["result"]
+    assert len(stub_llm.calls) == 1
+
+    ai_service.improve_text(text, content_type="post", action="generate_title")
+    assert len(stub_llm.calls) == 2
+
+
+def test_normalize_url_strips_tracking_and_fragment():
+    assert ai_service.normalize_url("HTTPS://Example.com/Path/?utm_medium=x&b=2&a=1#frag") == \
+        "https://example.com/Path?a=1&b=2"
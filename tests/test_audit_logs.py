@@ -0,0 +1,128 @@
+"""
+Logs d'audit : pagination par curseur (timestamp, id) et filtres exacts
+avec comptage total.
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import MetaData, PrimaryKeyConstraint, create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.crud.crud_audit_logs import create_audit_log, get_all_audit_logs
+from app.models import AuditLog, User, UserPermissions
+from app.services import sync_tasks
+from routeur import audit_log_route
+
+
+def _sqlite_session():
+    engine = create_engine("sqlite://")
+    # users : copie sans les DEFAULT now() propres a PostgreSQL ni les index
+    metadata = MetaData()
+    users = User.__table__.to_metadata(metadata)
+    users.indexes.clear()
+    for column in users.columns:
+        column.server_default = None
+    # audit_logs : id seul en cle primaire (INTEGER PRIMARY KEY) ; SQLite ne genere
+    # pas d'identifiant dans une cle composite, PostgreSQL utilise la sequence
+    audit_logs = AuditLog.__table__.to_metadata(metadata)
+    audit_logs.c.timestamp.primary_key = False
+    audit_logs.append_constraint(PrimaryKeyConstraint(audit_logs.c.id))
+    permissions = UserPermissions.__table__.to_metadata(metadata)
+    metadata.create_all(engine, tables=[users, audit_logs, permissions])
+    return sessionmaker(bind=engine)()
+
+
+@pytest.fixture()
+def sqlite_db():
+    session = _sqlite_session()
+
+    user = User(username="auditeur", name="Nom", family_name="Famille", email="a@example.com", password="x", created_at=datetime.now())
+    session.add(user)
+    session.flush()
+    base = datetime(2026, 1, 1, 12, 0, 0)
+    for i in range(25):
+        session.add(AuditLog(
+            user_id=user.id,
+            action="update" if i % 3 else "update_status",
+            table_name="shows" if i % 2 else "segments",
+            record_id=i,
+            # Horodatages en double : l'id departage les lignes du curseur
+            timestamp=base + timedelta(minutes=i // 2),
+        ))
+    session.commit()
+    yield session
+    session.close()
+
+
+def test_cursor_paging_walks_every_log_once(sqlite_db):
+    expected = [log["id"] for log in get_all_audit_logs(sqlite_db, limit=100)[0]]
+    assert len(expected) == 25
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        logs, total, cursor = get_all_audit_logs(sqlite_db, limit=10, cursor=cursor)
+        if pages:
+            assert total is None  # pas de recomptage en mode curseur
+        seen.extend(log["id"] for log in logs)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert seen == expected  # ordre (timestamp desc, id desc), sans doublon ni trou
+    assert all(log["username"] == "auditeur" for log in logs)
+
+
+def test_exact_filters_and_total(sqlite_db):
+    logs, total, next_cursor = get_all_audit_logs(sqlite_db, limit=5, action="update", exact=True)
+    assert total == 16
+    assert len(logs) == 5 and next_cursor is not None
+    assert {log["action"] for log in logs} == {"update"}
+
+    # Recherche partielle : "update" correspond aussi a "update_status"
+    _, total, _ = get_all_audit_logs(sqlite_db, limit=5, action="update")
+    assert total == 25
+
+    _, total, _ = get_all_audit_logs(sqlite_db, limit=5, table_name="shows", exact=True)
+    assert total == 12
+
+
+def test_invalid_cursor(sqlite_db):
+    with pytest.raises(ValueError):
+        get_all_audit_logs(sqlite_db, cursor="pas-un-curseur")
+
+
+def test_generated_id_is_read_back():
+    # Cle composite (id, timestamp) : id reste la colonne auto-incrementee
+    assert AuditLog.__table__.autoincrement_column is AuditLog.__table__.c.id
+
+    session = _sqlite_session()
+
+    first = create_audit_log(session, "create", None, table_name="shows", record_id=1)
+    second = create_audit_log(session, "update", None, table_name="shows", record_id=1)
+
+    assert first.id is not None and second.id == first.id + 1
+    assert session.query(AuditLog.action).filter(AuditLog.id == second.id).scalar() == "update"
+    session.close()
+
+
+def test_archive_route_requires_manage_settings(sqlite_db, monkeypatch, tmp_path):
+    # Registre des taches isole (fichier partage entre workers sinon)
+    monkeypatch.setattr(sync_tasks, "_TASKS_FILE", str(tmp_path / "tasks.json"))
+    started = []
+    monkeypatch.setattr(audit_log_route, "threading", SimpleNamespace(
+        Thread=lambda **kwargs: SimpleNamespace(start=lambda: started.append(kwargs["name"]))))
+    user = sqlite_db.query(User).one()
+
+    with pytest.raises(HTTPException) as denied:
+        audit_log_route.archive_audit_log_partitions_route(before=None, db=sqlite_db, current_user=user)
+    assert denied.value.status_code == 403 and started == []
+
+    sqlite_db.add(UserPermissions(user_id=user.id, can_manage_settings=True))
+    sqlite_db.commit()
+    response = audit_log_route.archive_audit_log_partitions_route(before=None, db=sqlite_db, current_user=user)
+    assert response["task_id"] and started == ["audit-archive"]
+    logged = sqlite_db.query(AuditLog).filter(AuditLog.action == "archive_partitions").one()
+    assert (logged.user_id, logged.table_name) == (user.id, "audit_logs")
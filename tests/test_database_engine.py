@@ -0,0 +1,115 @@
+"""
+Moteurs PostgreSQL : pools distincts requetes HTTP / taches d'arriere-plan /
+routes async (asyncpg), delais par session, executemany rapide, mode PgBouncer
+et etat des pools.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql.psycopg2 import EXECUTEMANY_VALUES_PLUS_BATCH
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from app.config.config import settings
+from app.db import database
+from app.db.database import (
+    _async_connect_args, _connect_args, create_app_async_engine, create_app_engine, direct_url, pool_status,
+)
+
+
+def test_request_and_background_pools_are_separate():
+    assert database.engine is not database.background_engine
+    assert database.SessionLocal.kw["bind"] is database.engine
+    assert database.BackgroundSessionLocal.kw["bind"] is database.background_engine
+    assert database.AsyncSessionLocal.kw["bind"] is database.async_engine
+    assert database.async_engine.dialect.driver == "asyncpg"
+    assert [pool["role"] for pool in database.get_pools_status()] == ["api", "jobs", "api-async"]
+
+
+def test_engine_factory(monkeypatch):
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", False)
+    engine = create_app_engine("test", pool_size=3, max_overflow=2, statement_timeout_ms=5000,
+                               idle_in_transaction_timeout_ms=0)
+    assert isinstance(engine.pool, QueuePool) and engine.pool.size() == 3
+    assert engine.pool._pre_ping is settings.DB_POOL_PRE_PING
+    assert engine.dialect.executemany_mode == EXECUTEMANY_VALUES_PLUS_BATCH
+    assert _connect_args("jobs", 5000, 60000) == {
+        "application_name": "audace-api:jobs",
+        "options": "-c statement_timeout=5000 -c idle_in_transaction_session_timeout=60000",
+    }
+    assert _connect_args("api", 0, 0) == {"application_name": "audace-api:api"}
+
+    # PgBouncer : pas de pool local, pas de parametre de demarrage "options"
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+    engine = create_app_engine("test", pool_size=3, max_overflow=2, statement_timeout_ms=5000,
+                               idle_in_transaction_timeout_ms=0)
+    assert isinstance(engine.pool, NullPool)
+    assert _connect_args("api", 5000, 0) == {"application_name": "audace-api:api"}
+
+
+def test_async_engine_factory(monkeypatch):
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", False)
+    engine = create_app_async_engine("test", pool_size=3, max_overflow=2, statement_timeout_ms=5000,
+                                     idle_in_transaction_timeout_ms=0)
+    assert isinstance(engine.pool, AsyncAdaptedQueuePool) and engine.pool.size() == 3
+    assert _async_connect_args("api-async", 5000, 60000) == {"server_settings": {
+        "application_name": "audace-api:api-async",
+        "statement_timeout": "5000",
+        "idle_in_transaction_session_timeout": "60000",
+    }}
+
+    # PgBouncer (mode transaction) : pas de pool local ni de cache de requetes preparees
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+    engine = create_app_async_engine("test", pool_size=3, max_overflow=2, statement_timeout_ms=5000,
+                                     idle_in_transaction_timeout_ms=0)
+    assert isinstance(engine.pool, NullPool)
+    assert _async_connect_args("api", 5000, 0) == {
+        "server_settings": {"application_name": "audace-api:api"}, "statement_cache_size": 0,
+    }
+
+
+def test_direct_url_bypasses_pgbouncer(monkeypatch):
+    url = database.SQLALCHEMY_DATABASE_URL
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", False)
+    monkeypatch.setattr(settings, "DB_DIRECT_URL", "")
+    assert direct_url(url) is url
+
+    # PgBouncer (mode transaction) : verrous consultatifs et LISTEN sur une connexion directe
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+    with pytest.raises(RuntimeError):
+        direct_url(url)
+    monkeypatch.setattr(settings, "DB_DIRECT_URL", "postgresql://api:s%40cret@db:5432/audace")
+    direct = direct_url(url)
+    assert (direct.host, direct.port, direct.password) == ("db", 5432, "s@cret")
+
+
+async def test_get_async_db_yields_async_session():
+    # Aucune connexion n'est ouverte tant qu'aucune requete n'est executee
+    dependency = database.get_async_db()
+    session = await dependency.__anext__()
+    assert isinstance(session, AsyncSession) and session.bind is database.async_engine
+    await dependency.aclose()
+
+
+def test_pool_status():
+    engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=2, max_overflow=1)
+    conn = engine.connect()
+    status = pool_status(engine, "test")
+    conn.close()
+
+    assert status == {
+        "role": "test", "pool": "QueuePool", "size": 2, "max_overflow": 1,
+        "checked_out": 1, "checked_in": 0, "overflow": 0, "timeout_seconds": 30.0,
+    }
+    assert pool_status(engine, "test")["checked_in"] == 1
+    assert pool_status(create_engine("sqlite://", poolclass=NullPool))["pool"] == "NullPool"
+
+
+def test_default_pools_fit_connection_budget():
+    # 4 workers (Dockerfile.production) sous max_connections = 100 (PostgreSQL par defaut),
+    # avec une marge pour les connexions dediees (leader, LISTEN, verrous du cache partage)
+    defaults = {name: field.default for name, field in type(settings).model_fields.items()}
+    per_worker = sum(defaults[name] for name in (
+        "DB_POOL_SIZE", "DB_MAX_OVERFLOW", "DB_JOBS_POOL_SIZE", "DB_JOBS_MAX_OVERFLOW",
+        "DB_ASYNC_POOL_SIZE", "DB_ASYNC_MAX_OVERFLOW",
+    ))
+    assert 4 * per_worker <= 90
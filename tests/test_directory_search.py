@@ -0,0 +1,60 @@
+"""
+Recherche annuaire : classement (debut du nom d'abord), pagination bornee,
+echappement des jokers LIKE et forme typeahead.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.db.crud.crud_directory_search import (
+    MAX_LIMIT,
+    guest_typeahead,
+    normalize_search_term,
+    search_guests_directory,
+)
+from app.models import Guest
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Guest.__table__])
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        Guest(name="Paul Martin", email="paul@example.com"),
+        Guest(name="Martine Aubry", email="ma@example.com"),
+        Guest(name="Jean Dupont", email="contact@martin-conseil.fr"),
+        Guest(name="Martin Luther", email="ml@example.com"),
+        Guest(name="Martin Supprime", is_deleted=True),
+        Guest(name="Sans Joker", email="a_b@example.com"),
+        Guest(name="Avec Joker", email="axb@example.com"),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+def test_results_are_ranked_prefix_first(db):
+    guests, total = search_guests_directory(db, "  MARTIN ")
+    assert total == 4
+    assert [g.name for g in guests] == ["Martin Luther", "Martine Aubry", "Paul Martin", "Jean Dupont"]
+
+    page, total = search_guests_directory(db, "martin", limit=2, offset=2)
+    assert total == 4
+    assert [g.name for g in page] == ["Paul Martin", "Jean Dupont"]
+
+    guests, _ = search_guests_directory(db, "e", limit=10_000)
+    assert len(guests) <= MAX_LIMIT
+
+
+def test_like_wildcards_are_escaped_and_typeahead_shape(db):
+    guests, total = search_guests_directory(db, "a_b")
+    assert total == 1 and guests[0].name == "Sans Joker"
+
+    suggestions = guest_typeahead(db, "luth")
+    assert suggestions == [{"id": suggestions[0]["id"], "name": "Martin Luther", "email": "ml@example.com", "avatar": None}]
+
+
+def test_normalize_search_term_strips_accents():
+    assert normalize_search_term("  Hélène   Éloïse ") == "helene eloise"
@@ -0,0 +1,80 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services import http_client
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    calls = 0
+
+    def do_GET(self):
+        _FlakyHandler.calls += 1
+        code = 503 if _FlakyHandler.calls == 1 else 200
+        body = b"ok"
+        self.send_response(code)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_POST = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def flaky_server():
+    _FlakyHandler.calls = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FlakyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def test_get_retries_transient_status_and_reuses_host_client(flaky_server):
+    response = http_client.get(f"{flaky_server}/a")
+    assert response.status_code == 200
+    assert _FlakyHandler.calls == 2
+
+    assert http_client.get_client(f"{flaky_server}/b") is http_client.get_client(f"{flaky_server}/c")
+    metrics = http_client.get_http_metrics()[flaky_server]
+    assert metrics["requests"] == 2
+    assert metrics["retries"] == 1
+
+
+def test_post_is_not_retried_by_default(flaky_server):
+    response = http_client.post(f"{flaky_server}/a", json={})
+    assert response.status_code == 503
+    assert _FlakyHandler.calls == 1
+
+
+async def test_async_request_retries(flaky_server):
+    response = await http_client.arequest("GET", f"{flaky_server}/a")
+    assert response.status_code == 200
+    assert _FlakyHandler.calls == 2
+    await http_client.aclose_http_clients()
+
+
+def test_clients_are_capped_and_lru_host_closed(flaky_server, monkeypatch):
+    monkeypatch.setattr(http_client.settings, "HTTP_MAX_HOSTS", 2)
+    http_client.close_http_clients()
+
+    first = http_client.get_client("https://a.example")
+    evicted = http_client.get_client("https://b.example")
+    http_client.get_client("https://a.example")  # "a" redevient le plus recent
+    http_client.get_client("https://c.example")
+
+    assert list(http_client._sync_pools) == ["https://a.example", "https://c.example"]
+    assert evicted.is_closed and not first.is_closed
+    # Un hote avec une requete en cours n'est jamais evince
+    pool = http_client._sync_pool("https://a.example", acquire=True)
+    http_client.get_client("https://c.example")
+    http_client.get_client("https://d.example")
+    assert "https://a.example" in http_client._sync_pools
+    http_client._release(pool)
+    http_client.close_http_clients()
@@ -0,0 +1,98 @@
+"""
+Planificateur de taches : une tache lente ne bloque pas les autres, pas
+d'execution concurrente d'une meme tache, historique dans job_runs.
+"""
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models import JobRun
+from app.services import job_runner as job_runner_module
+from app.services.job_runner import JobRunner
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture()
+def runner(monkeypatch, tmp_path):
+    # Fichier (et non memoire) : une connexion par thread d'execution
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine, tables=[JobRun.__table__])
+    monkeypatch.setattr(job_runner_module, "TICK_SECONDS", 0.05)
+    runner = JobRunner(session_factory=sessionmaker(bind=engine), engine=engine)
+    yield runner
+    runner.stop()
+
+
+def test_slow_job_does_not_block_fast_job(runner):
+    release = threading.Event()
+    calls = {"slow": 0, "fast": 0}
+
+    def slow():
+        calls["slow"] += 1
+        release.wait(5)
+        return {"done": True}
+
+    def fast():
+        calls["fast"] += 1
+        return {"n": calls["fast"]}
+
+    runner.register("slow", slow, interval=0.01, timeout=60)
+    runner.register("fast", fast, interval=0.01, timeout=60)
+    runner.register("disabled", fast, interval=lambda: None, timeout=60)
+    runner.start()
+
+    assert _wait_until(lambda: calls["fast"] >= 3)
+    assert runner.is_leader
+    assert calls["slow"] == 1          # jamais relancee tant qu'elle tourne
+
+    snapshots = []
+
+    def fast_between_runs():
+        db = runner._db()
+        try:
+            snapshots.append({job["name"]: job for job in runner.get_status(db)["jobs"]})
+        finally:
+            db.close()
+        return snapshots[-1]["fast"]["last_run"]["status"] == "success"
+
+    assert _wait_until(fast_between_runs)
+    status = snapshots[-1]
+    assert status["slow"]["running"] and status["slow"]["last_run"]["status"] == "running"
+    assert not status["disabled"]["enabled"] and status["disabled"]["last_run"] is None
+
+    release.set()
+    runner.get_job("slow").future.result(timeout=2)
+    db = runner._db()
+    slow_runs = db.query(JobRun).filter(JobRun.job_name == "slow").all()
+    assert [r.status for r in slow_runs] == ["success"]
+    assert slow_runs[0].result == {"done": True}
+    db.close()
+
+
+def test_quiet_job_records_only_work_and_errors(runner):
+    outcomes = iter([None, {"published": 2}, {"error": "API indisponible"}])
+    job = runner.register("quiet", lambda: next(outcomes), interval=3600, timeout=60, quiet=True)
+
+    for _ in range(3):
+        runner.submit(job).result(timeout=2)
+
+    db = runner._db()
+    runs = db.query(JobRun).order_by(JobRun.id).all()
+    assert [(r.status, r.result) for r in runs] == [
+        ("success", {"published": 2}),
+        ("error", {"error": "API indisponible"}),
+    ]
+    assert runs[1].error_message == "API indisponible"
+    db.close()
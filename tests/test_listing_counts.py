@@ -0,0 +1,86 @@
+"""
+Les listes invites / presentateurs calculent leurs compteurs en SQL :
+le nombre de requetes ne depend pas de la taille de la page.
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import MetaData, create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.db.crud.crud_guests import get_guests, search_guest
+from app.db.crud.crud_presenters import get_all_presenters
+from app.models import Guest, Presenter, Segment, SegmentGuest, Show, ShowPresenter, User
+
+
+@pytest.fixture()
+def sqlite_db():
+    engine = create_engine("sqlite://")
+    # users : copie sans les DEFAULT now() propres a PostgreSQL ni les index
+    users = User.__table__.to_metadata(MetaData())
+    users.indexes.clear()
+    for column in users.columns:
+        column.server_default = None
+    users.create(engine)
+    tables = [m.__table__ for m in (Show, Segment, Guest, SegmentGuest, Presenter, ShowPresenter)]
+    Base.metadata.create_all(engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+
+    show = Show(title="Matinale", type="live", duration=60, status="draft")
+    session.add(show)
+    session.flush()
+    for i in range(30):
+        user = User(username=f"user{i}", name=f"Nom{i}", family_name=f"Famille{i}", email=f"u{i}@example.com", password="x", created_at=datetime.now())
+        session.add(user)
+        session.flush()
+        presenter = Presenter(name=f"Presentateur {i}", users_id=user.id)
+        guest = Guest(name=f"Invite {i}")
+        session.add_all([presenter, guest])
+        session.flush()
+        for j in range(i % 4):
+            segment = Segment(title=f"S{i}-{j}", type="chronique", duration=5, position=j, show_id=show.id)
+            session.add(segment)
+            session.flush()
+            session.add(SegmentGuest(segment_id=segment.id, guest_id=guest.id))
+        if i % 2:
+            session.add(ShowPresenter(show_id=show.id, presenter_id=presenter.id))
+    session.commit()
+    session.expunge_all()
+    yield session, queries
+    session.close()
+
+
+def _count_queries(queries, call):
+    queries.clear()
+    result = call()
+    return len(queries), result
+
+
+def test_guest_listing_counts_use_constant_queries(sqlite_db):
+    db, queries = sqlite_db
+    small, page = _count_queries(queries, lambda: get_guests(db, skip=0, limit=5))
+    db.expunge_all()
+    large, _ = _count_queries(queries, lambda: get_guests(db, skip=0, limit=30))
+    assert small == large == 1
+    assert {g["name"]: g["showSegment_participation"] for g in page}["Invite 27"] == 3
+
+    db.expunge_all()
+    n, result = _count_queries(queries, lambda: search_guest(db, "Invite", limit=50))
+    assert n == 2  # total + page
+    assert result["total"] == len(result["data"]) == 30
+    assert {g["name"]: g["showSegment_participation"] for g in result["data"]}["Invite 27"] == 3
+
+
+def test_presenter_listing_counts_use_constant_queries(sqlite_db):
+    db, queries = sqlite_db
+    small, _ = _count_queries(queries, lambda: get_all_presenters(db, skip=0, limit=5))
+    db.expunge_all()
+    large, page = _count_queries(queries, lambda: get_all_presenters(db, skip=0, limit=30))
+    assert small == large
+    counts = {p["presenter_name"]: p["shows_presented"] for p in page["presenters"]}
+    assert counts["Presentateur 1"] == 1
+    assert counts["Presentateur 2"] == 0
@@ -0,0 +1,63 @@
+"""
+Maintenance par lots : suppression et mise a jour par plages de cle primaire,
+transactions courtes et progression remontee a chaque lot.
+"""
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.config.config import settings
+from app.db.crud.crud_maintenance import (
+    delete_in_batches,
+    estimate_row_counts,
+    tables_to_vacuum,
+    update_in_batches,
+)
+from app.db.database import Base
+from app.models import JobRun
+
+
+@pytest.fixture()
+def db(monkeypatch):
+    monkeypatch.setattr(settings, "MAINTENANCE_BATCH_SIZE", 4)
+    monkeypatch.setattr(settings, "MAINTENANCE_PAUSE_MS", 0)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[JobRun.__table__])
+    session = sessionmaker(bind=engine)()
+    now = datetime.now(timezone.utc)
+    session.add_all(
+        JobRun(job_name=f"job-{i}", status="error" if i % 3 == 0 else "success", started_at=now)
+        for i in range(30)
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+def test_delete_in_batches_commits_each_pk_range(db):
+    commits = []
+    event.listen(db, "after_commit", lambda session: commits.append(1))
+    progress = []
+
+    deleted = delete_in_batches(db, JobRun, [JobRun.status == "error"], lambda table, done: progress.append(done))
+
+    assert deleted == 10
+    assert db.query(JobRun).filter(JobRun.status == "error").count() == 0
+    assert db.query(JobRun).count() == 20
+    # 10 lignes par lots de 4 : 3 lots, chacun dans sa transaction
+    assert progress == [4, 8, 10]
+    assert len(commits) == 3
+
+
+def test_update_in_batches_and_selective_vacuum(db, monkeypatch):
+    updated = update_in_batches(db, JobRun, [JobRun.status == "success"], {"status": "archived"})
+
+    assert updated == 20
+    assert db.query(JobRun).filter(JobRun.status == "archived").count() == 20
+
+    monkeypatch.setattr(settings, "MAINTENANCE_VACUUM_MIN_ROWS", 15)
+    assert tables_to_vacuum({"job_runs": updated, "social_messages": 3}) == ["job_runs"]
+    # Hors PostgreSQL : pas d'estimation (les statistiques retombent sur des COUNT exacts)
+    assert estimate_row_counts(db, ["job_runs"]) == {}
@@ -0,0 +1,84 @@
+"""
+Metriques Prometheus : latence et statut par modele de route, requetes SQL
+par requete HTTP (evenements du moteur), pool de connexions, exposition /metrics.
+"""
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from app.middleware.metrics_middleware import MetricsMiddleware
+from app.services import metrics
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def _app(engine) -> FastAPI:
+    app = FastAPI()
+
+    def get_conn():
+        with engine.connect() as conn:
+            yield conn
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int, conn=Depends(get_conn)):
+        total = sum(conn.execute(text("SELECT :n"), {"n": n}).scalar() for n in range(item_id))
+        return {"total": total}
+
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+def test_route_latency_and_sql_per_request():
+    engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=2, connect_args={"check_same_thread": False})
+    metrics.instrument_engine(engine, "test")
+    metrics.instrument_engine(engine, "test")  # Idempotent
+    client = TestClient(_app(engine))
+    route = "/items/{item_id}"
+    before = _sample("http_requests_total", method="GET", route=route, status="200")
+    queries_before = _sample("http_request_db_queries_sum", route=route)
+
+    assert client.get("/items/3").json() == {"total": 3}
+    assert client.get("/items/2").status_code == 200
+    client.get("/nothing")
+
+    # Une serie par modele de route, pas par URL
+    assert _sample("http_requests_total", method="GET", route=route, status="200") == before + 2
+    assert _sample("http_request_db_queries_sum", route=route) == queries_before + 5
+    assert _sample("http_request_db_queries_bucket", route=route, le="3.0") >= 2
+    assert _sample("http_requests_total", method="GET", route="<unmatched>", status="404") >= 1
+    assert _sample("db_pool_size", pool="test") == 2
+    assert _sample("db_pool_checked_out", pool="test") == 0
+
+
+def _client_from(app, host: str) -> TestClient:
+    """Client de test dont les requetes proviennent de l'adresse `host`."""
+    async def asgi(scope, receive, send):
+        scope["client"] = (host, 50000)
+        await app(scope, receive, send)
+    return TestClient(asgi)
+
+
+def test_metrics_endpoint_exposes_jobs(monkeypatch):
+    from app.config.config import settings
+    from routeur import metrics_route
+
+    metrics.observe_job("backup_check", "success", 0.2)
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+    app = FastAPI()
+    app.include_router(metrics_route.router)
+
+    # Sans jeton : reseau interne uniquement, jamais via un proxy
+    body = _client_from(app, "10.0.0.5").get("/metrics").text
+    assert 'job_duration_seconds_count{job="backup_check",status="success"}' in body
+    assert _client_from(app, "127.0.0.1").get("/metrics").status_code == 200
+    assert _client_from(app, "93.184.216.34").get("/metrics").status_code == 403
+    assert _client_from(app, "10.0.0.5").get("/metrics", headers={"X-Forwarded-For": "93.184.216.34"}).status_code == 403
+
+    client = _client_from(app, "93.184.216.34")
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "secret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer secret"}).status_code == 200
@@ -0,0 +1,81 @@
+"""
+Middlewares ASGI purs : headers de version sans toucher au corps (reponses
+en streaming comprises), journal des acces echantillonne, texte ou JSON.
+"""
+import json
+import logging
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.__version__ import MIN_VERSION_HEADER, VERSION_HEADER, VERSION_INFO, get_version
+from app.middleware.logger import LoggerMiddleware
+from app.middleware.version_middleware import APIVersionMiddleware
+
+
+def _access_records(caplog) -> list[logging.LogRecord]:
+    return [record for record in caplog.records if record.name == "hapson-api.access"]
+
+
+def _app(**logger_options) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ok")
+    def ok():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a" * 10, b"b" * 10]), media_type="text/plain")
+
+    @app.get("/boom")
+    def boom():
+        raise RuntimeError("boom")
+
+    app.add_middleware(LoggerMiddleware, **logger_options)
+    app.add_middleware(APIVersionMiddleware)
+    return app
+
+
+def test_version_headers_and_deprecated_versions(monkeypatch):
+    client = TestClient(_app())
+
+    response = client.get("/stream")
+    assert response.text == "a" * 10 + "b" * 10
+    assert response.headers[VERSION_HEADER] == get_version()
+    assert response.headers[MIN_VERSION_HEADER] == VERSION_INFO["min_client_version"]
+    assert "Warning" not in response.headers
+
+    assert "Warning" in client.get("/api/v0/ok").headers
+
+    monkeypatch.setitem(VERSION_INFO, "deprecated_versions", ["v0"])
+    response = client.get("/api/v0/ok")
+    assert response.status_code == 410
+    assert response.headers["X-Deprecated-Version"] == "v0"
+
+
+def test_access_log_sampling_and_formats(caplog):
+    caplog.set_level(logging.INFO, logger="hapson-api.access")
+
+    client = TestClient(_app(sample_rate=0.0, slow_ms=10_000), raise_server_exceptions=False)
+    client.get("/ok")
+    client.get("/missing?q=1")
+    client.get("/boom")
+    # Succes non echantillonnes ; erreurs toujours journalisees, y compris les exceptions
+    messages = [record.getMessage() for record in _access_records(caplog)]
+    assert len(messages) == 2
+    assert messages[0].startswith("Completed Request: GET /missing?q=1 - Status: 404")
+    assert "GET /boom - Status: 500" in messages[1]
+
+    caplog.clear()
+    TestClient(_app(sample_rate=1.0, log_format="json")).get("/ok")
+    entry = json.loads(_access_records(caplog)[0].getMessage())
+    assert (entry["method"], entry["path"], entry["status"]) == ("GET", "/ok", 200)
+    assert entry["duration_ms"] >= 0
+
+
+def test_slow_requests_always_logged(caplog):
+    caplog.set_level(logging.INFO, logger="hapson-api.access")
+    TestClient(_app(sample_rate=0.0, slow_ms=0)).get("/ok")
+    assert len(_access_records(caplog)) == 1
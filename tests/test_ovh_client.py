@@ -0,0 +1,142 @@
+"""
+Inventaire OVH : appels paralleles par niveaux (un client par thread), caches
+par endpoint et instantanes partages rafraichis par la tache ovh_inventory.
+L'API OVH est simulee (ovh.Client remplace).
+"""
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config.config import settings
+from app.db.database import Base
+from app.models import SharedCacheEntry
+from app.services import ovh_client
+from app.services.shared_cache import SharedCache
+from app.utils.ttl_cache import TTLCache
+
+API = {
+    "/dedicated/server": ["srv1"],
+    "/vps": ["vps1", "vps2"],
+    "/domain": ["exemple.fr"],
+    "/email/pro": ["pro1"],
+    "/email/domain": ["d1", "d2"],
+    "/email/pro/pro1/account": ["a@exemple.fr", "b@exemple.fr"],
+    "/email/pro/pro1/account/a@exemple.fr": {"state": "ok", "displayName": "A"},
+    "/email/pro/pro1/account/b@exemple.fr": {"state": "suspended"},
+    "/email/domain/d1/account": ["c@d1.fr"],
+    "/email/domain/d2/account": [],
+    "/me/bill": ["B1", "B2"],
+    "/me/bill/B1": {"billId": "B1", "date": "2026-01-01"},
+    "/me/bill/B2": {"billId": "B2", "date": "2026-02-01"},
+    "/me/balance": {"value": 0},
+    "/me/debtAccount": {"active": False},
+    "/me/payment/method": [1],
+    "/me/payment/method/1": {"paymentMethodId": 1},
+    "/vps/vps1/tasks": [10],
+    "/vps/vps1/tasks/10": {"state": "doing", "startDate": "2026-03-01"},
+}
+EMPTY_LISTINGS = {"/hosting/web", "/cloud/project", "/ip", "/allDom", "/email/exchange", "/email/mxplan"}
+
+
+class FakeOvh:
+    """Remplace ovh.Client : chaque instance note le thread qui l'utilise."""
+
+    def __init__(self):
+        self.calls = []
+        self.threads_by_client = {}
+        self._lock = threading.Lock()
+
+    def client(self, **credentials):
+        fake = self
+
+        class _Client:
+            def get(self, path, **params):
+                with fake._lock:
+                    fake.calls.append(path)
+                    fake.threads_by_client.setdefault(id(self), set()).add(threading.get_ident())
+                time.sleep(0.005)
+                if path in API:
+                    return API[path]
+                if path in EMPTY_LISTINGS or path.endswith(("/tasks", "/task")):
+                    return []
+                if path.endswith("/serviceInfos"):
+                    return {"status": "ok", "expiration": "2030-01-01"}
+                # Detail d'un service (displayName)
+                return {"displayName": f"detail-{path.rsplit('/', 1)[-1]}"}
+
+        return _Client()
+
+
+@pytest.fixture()
+def fake_ovh(monkeypatch, tmp_path):
+    fake = FakeOvh()
+    monkeypatch.setattr(ovh_client.ovh, "Client", fake.client)
+    for name in ("OVH_APPLICATION_KEY", "OVH_APPLICATION_SECRET", "OVH_CONSUMER_KEY"):
+        monkeypatch.setattr(settings, name, "test")
+    monkeypatch.setattr(ovh_client, "_thread_local", threading.local())
+    monkeypatch.setattr(ovh_client, "_list_cache", TTLCache(ttl=3600))
+    monkeypatch.setattr(ovh_client, "_detail_cache", TTLCache(ttl=900))
+    monkeypatch.setattr(ovh_client, "_bill_cache", TTLCache(ttl=None))
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    Base.metadata.create_all(engine, tables=[SharedCacheEntry.__table__])
+    monkeypatch.setattr(
+        ovh_client, "_inventory",
+        SharedCache("ovh-test", ttl=1200, stale_ttl=3600, session_factory=sessionmaker(bind=engine)),
+    )
+    yield fake
+    engine.dispose()
+
+
+def test_services_fetched_by_level_with_one_client_per_thread(fake_ovh):
+    services = ovh_client.get_all_services()
+
+    names = [(s["serviceType"], s["serviceName"]) for s in services]
+    assert ("email_domain", "d1") in names and ("email_domain", "d2") not in names  # sans compte : ignore
+    accounts = {s["serviceName"]: s for s in services if s["serviceType"] == "email_pro_account"}
+    assert accounts["a@exemple.fr"]["status"] == "ok" and accounts["b@exemple.fr"]["status"] == "suspended"
+    assert len(services) == 8
+
+    # Chaque chemin n'est appele qu'une fois, en parallele, un client par thread
+    assert len(fake_ovh.calls) == len(set(fake_ovh.calls))
+    assert len(fake_ovh.threads_by_client) > 1
+    assert all(len(threads) == 1 for threads in fake_ovh.threads_by_client.values())
+
+
+def test_snapshots_shared_and_endpoint_caches(fake_ovh):
+    first = ovh_client.get_all_services()
+    calls = len(fake_ovh.calls)
+    assert ovh_client.get_all_services() == first
+    assert len(fake_ovh.calls) == calls  # instantane partage : aucun appel OVH
+
+    # Rafraichissement force : listes et details encore frais dans les caches par endpoint
+    assert ovh_client.get_inventory("services", refresh=True) == first
+    assert len(fake_ovh.calls) == calls
+
+    bills = ovh_client.get_bills(count=20)
+    assert [bill["billId"] for bill in bills] == ["B2", "B1"]
+    # Details expires : les factures (immuables) restent en cache, seule la liste est relue
+    ovh_client._detail_cache.clear()
+    calls = len(fake_ovh.calls)
+    ovh_client.get_inventory("bills:20", refresh=True)
+    assert fake_ovh.calls[calls:] == ["/me/bill"]
+
+
+def test_refresh_inventory_and_volatile_ttls(fake_ovh):
+    assert ovh_client.refresh_inventory() == {"services": 8, "bills:20": 2, "balance": 1, "tasks": 1}
+
+    tasks = ovh_client._inventory._read("tasks")
+    assert tasks.value[0]["resourceName"] == "vps1"
+    assert tasks.expires_at - tasks.stored_at == timedelta(seconds=ovh_client.TASKS_CACHE_TTL)
+    balance = ovh_client._inventory._read("balance")
+    assert balance.expires_at - balance.stored_at == timedelta(seconds=ovh_client.BALANCE_CACHE_TTL)
+    assert balance.value["paymentMethods"] == [{"paymentMethodId": 1}]
+
+
+def test_refresh_inventory_disabled_without_credentials(fake_ovh, monkeypatch):
+    monkeypatch.setattr(settings, "OVH_CONSUMER_KEY", "")
+    assert ovh_client.refresh_inventory() is None
+    assert fake_ovh.calls == []
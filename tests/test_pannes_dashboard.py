@@ -0,0 +1,131 @@
+"""
+Module Pannes : liste en projection allegee (nombre de requetes constant) et
+dashboard en un seul parcours GROUPING SETS de fiches_pannes.
+
+Le dashboard necessite PostgreSQL (GROUPING SETS), ignore sinon ; ses donnees
+sont inserees dans une transaction annulee a la fin du test.
+"""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.crud.crud_pannes import get_fiches_pannes, get_pannes_dashboard
+from app.db.database import Base
+from app.models.model_logistics_settings import LogisticsConfigOption
+from app.models.model_pannes import Acteur, FicheActeur, FichePanne
+
+STATUTS = ["en_attente", "en_cours", "cloture"]
+SOCIETES = ["TRAFRIC SARL", "BAJ SERVICES SA"]
+
+
+def _seed(session) -> None:
+    """12 fiches : 4 par statut, 8/4 par societe, 6 par motif, 3 immatriculations."""
+    freins = LogisticsConfigOption(list_type="panne_category", name="Freinage", color="#f00")
+    moteur = LogisticsConfigOption(list_type="panne_category", name="Moteur", color="#00f")
+    mecaniciens = [Acteur(nom="Diallo", prenom="Moussa", role="mecanicien"), Acteur(nom="Sarr", role="mecanicien")]
+    chauffeur = Acteur(nom="Ndiaye", prenom="Fatou", role="chauffeur")
+    session.add_all([freins, moteur, *mecaniciens, chauffeur])
+    session.flush()
+    for i in range(12):
+        fiche = FichePanne(
+            numero_fiche=90_000 + i,
+            date_panne=date(2026, 10, 1) + timedelta(days=i),
+            immatriculation=f"DK-{i % 3}",
+            societe=SOCIETES[0 if i % 3 else 1],
+            statut=STATUTS[i % 3],
+            category_id=(freins if i % 2 else moteur).id,
+            breakdown_types_json=["Pneus & Roues"],
+        )
+        session.add(fiche)
+        session.flush()
+        session.add(FicheActeur(fiche_id=fiche.id, acteur_id=mecaniciens[i % 4 == 0].id, role_sur_fiche="mecanicien"))
+        session.add(FicheActeur(fiche_id=fiche.id, acteur_id=chauffeur.id, role_sur_fiche="chauffeur"))
+    session.flush()
+
+
+@pytest.fixture()
+def sqlite_session():
+    engine = create_engine("sqlite://")
+    tables = [m.__table__ for m in (LogisticsConfigOption, Acteur, FichePanne, FicheActeur)]
+    Base.metadata.create_all(engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+    _seed(session)
+    session.commit()
+    session.expunge_all()
+
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    yield session, queries
+    session.close()
+
+
+def test_list_is_lean_and_query_count_constant(sqlite_session):
+    session, queries = sqlite_session
+
+    page = get_fiches_pannes(session, page=1, page_size=5)
+    first_page_queries = len(queries)
+    queries.clear()
+    get_fiches_pannes(session, page=1, page_size=12)
+
+    # Comptage, page de fiches, fiche_acteur puis acteurs : quelle que soit la taille de page
+    assert first_page_queries == len(queries) == 4
+    assert "count(fiches_pannes.id)" in queries[0] and "JOIN" not in queries[0]
+    assert "numero_moteur" not in queries[1] and "pieces_commandees" not in queries[1]
+
+    assert page["total"] == 12 and len(page["items"]) == 5
+    latest = page["items"][0]
+    assert latest.numero_fiche == 90_011 and latest.motif_name == "Freinage"
+    assert latest.mecaniciens == ["Moussa Diallo"]
+
+    filtered = get_fiches_pannes(session, statut="cloture", societe="TRAFRIC SARL")
+    assert filtered["total"] == 4 and {item.statut for item in filtered["items"]} == {"cloture"}
+
+
+@pytest.fixture()
+def pg_session():
+    from app.db.database import engine
+
+    if engine.dialect.name != "postgresql":
+        pytest.skip("Dashboard Pannes : PostgreSQL requis")
+    try:
+        conn = engine.connect()
+    except OperationalError:
+        pytest.skip("Dashboard Pannes : PostgreSQL injoignable")
+
+    trans = conn.begin()
+    try:
+        conn.execute(text("DELETE FROM fiche_acteur"))
+        conn.execute(text("DELETE FROM fiches_pannes"))
+        session = Session(bind=conn)
+        _seed(session)
+        yield session
+    finally:
+        trans.rollback()
+        conn.close()
+
+
+def test_dashboard_single_scan(pg_session):
+    queries = []
+    event.listen(pg_session.get_bind(), "before_cursor_execute", lambda *args: queries.append(args[2]))
+
+    dashboard = get_pannes_dashboard(pg_session)
+
+    # Un GROUPING SETS pour les fiches, une requete pour les mecaniciens
+    assert len(queries) == 2 and "GROUPING SETS" in queries[0]
+    assert dashboard.total_fiches == 12
+    assert (dashboard.fiches_en_attente, dashboard.fiches_en_cours, dashboard.fiches_cloturees) == (4, 4, 4)
+    assert [(r.societe, r.nombre_fiches, r.pourcentage) for r in dashboard.repartition_societe] == [
+        ("TRAFRIC SARL", 8, 66.7), ("BAJ SERVICES SA", 4, 33.3),
+    ]
+    assert sorted((r.motif_name, r.nombre_fiches) for r in dashboard.repartition_motif) == [
+        ("Freinage", 6), ("Moteur", 6),
+    ]
+    assert sorted((v.immatriculation, v.nombre_fiches) for v in dashboard.vehicules_recurrents) == [
+        ("DK-0", 4), ("DK-1", 4), ("DK-2", 4),
+    ]
+    assert [(m.nom_complet, m.nombre_interventions) for m in dashboard.mecaniciens_actifs] == [
+        ("Moussa Diallo", 9), ("Sarr", 3),
+    ]
@@ -0,0 +1,374 @@
+"""
+Non-regression des plans d'execution : les requetes les plus frequentes
+doivent passer par un index (jamais de Seq Scan sur la table visee) une fois
+la base peuplee a des volumes realistes.
+
+Necessite PostgreSQL avec les migrations appliquees (CI : alembic upgrade head),
+ignore sinon. Les donnees sont inserees par generate_series dans une transaction
+annulee a la fin du module ; ANALYZE est lance sur chaque table peuplee.
+"""
+import json
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import desc, inspect
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.db.crud.crud_directory_search import _normalized
+from app.models import Guest, JobRun, Show, User
+from app.models.model_listen_event import ListenEvent
+from app.models.model_inventory_equipment import InventoryEquipment
+from app.models.model_logistics_operations import LogisticsFuelLog
+from app.models.model_social import (
+    SocialComment, SocialConversation, SocialMessage, SocialPageInsight,
+    SocialPost, SocialPostResult,
+)
+from app.utils.time_window import day_window, last_days_window, week_window
+
+# Colonne cle etrangere : identifiant d'une ligne existante de la table parente
+FK = "{ids}[1 + (g % cardinality({ids}))]"
+# Lignes creees dans une table parente vide (non listee dans SEED)
+PARENT_ROWS = 5
+
+# (table, lignes, expressions SQL par colonne ; g = numero de ligne)
+# Ordre : parents avant enfants
+SEED = [
+    ("users", 20_000, {"is_deleted": "false"}),
+    ("social_accounts", 20, {"platform": "'facebook'", "is_deleted": "false"}),
+    ("social_posts", 20_000, {
+        "status": "CASE WHEN g % 50 = 0 THEN 'scheduled' WHEN g % 25 = 0 THEN 'draft' ELSE 'published' END",
+        "scheduled_at": "CASE WHEN g % 50 = 0 THEN now() + g * interval '1 minute' END",
+        "platforms": "ARRAY['facebook']",
+        "is_deleted": "g % 10 = 0",
+        "created_at": "now() - g * interval '10 minutes'",
+    }),
+    ("social_post_results", 40_000, {
+        "post_id": FK,
+        "platform": "'facebook'",
+        "status": "'published'",
+        "platform_post_id": "'qp_fb_' || g",
+        "is_deleted": "g % 20 = 0",
+    }),
+    ("social_comments", 100_000, {
+        "platform_comment_id": "'qp_c_' || g",
+        "post_id": FK,
+        "platform": "'facebook'",
+        "is_deleted": "g % 20 = 0",
+        "created_at": "now() - g * interval '1 minute'",
+    }),
+    ("social_conversations", 5_000, {
+        "platform": "'facebook'",
+        "is_deleted": "false",
+        "last_message_at": "now() - g * interval '1 hour'",
+    }),
+    ("social_messages", 50_000, {
+        "platform_message_id": "'qp_m_' || g",
+        "platform": "'facebook'",
+        "direction": "'inbound'",
+        "is_deleted": "false",
+        "created_at": "now() - g * interval '1 minute'",
+    }),
+    # Unicite (account_id, date) : une date par compte et par tranche de g
+    ("social_page_insights", 7_300, {
+        "account_id": FK,
+        "date": "current_date - (g / cardinality({ids:account_id}))",
+    }),
+    ("shows", 30_000, {
+        "broadcast_date": "now() - g * interval '1 hour'",
+        "status": "CASE g % 3 WHEN 0 THEN 'En préparation' WHEN 1 THEN 'Prêt' ELSE 'Diffusé' END",
+        "created_by": FK,
+    }),
+    ("inventory_equipment", 20_000, {
+        "reference": "'QP-' || g",
+        "serial_number": "'QP-SN-' || g",
+        "barcode": "'QP-BC-' || g",
+        "is_archived": "g % 10 = 0",
+        "is_deleted": "g % 20 = 0",
+        "created_at": "now() - g * interval '10 minutes'",
+    }),
+    ("logistics_vehicles", 200, {"registration_number": "left('QP' || g, 20)"}),
+    ("logistics_fuel_logs", 50_000, {
+        "date": "now() - g * interval '30 minutes'",
+        "is_deleted": "g % 20 = 0",
+    }),
+    ("job_runs", 50_000, {
+        "job_name": "'qp_job_' || (g % 8)",
+        "status": "'success'",
+        "started_at": "now() - g * interval '1 minute'",
+    }),
+    ("guests", 50_000, {
+        "name": "'Invite ' || md5(g::text)",
+        "email": "md5(g::text) || '@example.com'",
+        "is_deleted": "false",
+    }),
+    ("listen_events", 100_000, {
+        "session_id": "'qp_s_' || (g % 5000)",
+        "event_type": "CASE g % 4 WHEN 0 THEN 'heartbeat' ELSE 'play' END",
+        "created_at": "localtimestamp - g * interval '5 minutes'",
+    }),
+]
+
+
+def _default_expr(column: dict) -> str:
+    """Valeur generee pour une colonne NOT NULL sans defaut, selon son type."""
+    col_type = column["type"]
+    if isinstance(col_type, sa.Enum):
+        return f"'{col_type.enums[0]}'"
+    if isinstance(col_type, sa.Boolean):
+        return "false"
+    if isinstance(col_type, sa.ARRAY):
+        return "'{}'"
+    if isinstance(col_type, sa.JSON):
+        return "'{}'"
+    if isinstance(col_type, sa.DateTime):
+        return "now() - (g % 1000) * interval '1 hour'"
+    if isinstance(col_type, sa.Date):
+        return "current_date - (g % 1000)"
+    if isinstance(col_type, sa.Time):
+        return "time '08:00'"
+    if isinstance(col_type, (sa.Integer, sa.Numeric)):
+        return "(g % 100)"
+    if isinstance(col_type, sa.String):
+        return f"left('qp' || g, {col_type.length})" if col_type.length else "('qp' || g)"
+    raise TypeError(f"Type non gere pour {column['name']}: {col_type!r}")
+
+
+def _seed(conn, table: str, rows: int, overrides: dict) -> None:
+    """INSERT ... SELECT generate_series : colonnes requises + colonnes surchargees."""
+    insp = inspect(conn)
+    foreign_keys = {
+        fk["constrained_columns"][0]: (fk["referred_table"], fk["referred_columns"][0])
+        for fk in insp.get_foreign_keys(table)
+        if len(fk["constrained_columns"]) == 1 and fk["referred_table"] != table
+    }
+    columns, aliases = {}, {}
+    for column in insp.get_columns(table):
+        name = column["name"]
+        if name in overrides:
+            columns[name] = overrides[name]
+        elif column["nullable"] or column.get("default") is not None or column.get("identity"):
+            continue
+        elif name in foreign_keys:
+            columns[name] = FK
+        else:
+            columns[name] = _default_expr(column)
+
+        if name in foreign_keys:
+            parent, parent_column = foreign_keys[name]
+            _ensure_rows(conn, parent)
+            alias = f"qp_ids_{parent}"
+            conn.execute(sa.text(f"DROP TABLE IF EXISTS {alias}"))
+            conn.execute(sa.text(
+                f"CREATE TEMP TABLE {alias} AS "
+                f"SELECT array_agg({parent_column} ORDER BY {parent_column}) AS ids FROM {parent}"
+            ))
+            aliases[name] = alias
+
+    # {ids} : identifiants de la table parente de la colonne, {ids:col} : ceux de la colonne col
+    names, exprs = [], []
+    for name, expr in columns.items():
+        for fk_column, alias in aliases.items():
+            expr = expr.replace(f"{{ids:{fk_column}}}", f"{alias}.ids")
+        if name in aliases:
+            expr = expr.replace("{ids}", f"{aliases[name]}.ids")
+        names.append(f'"{name}"')
+        exprs.append(expr)
+    joins = [f"CROSS JOIN {alias}" for alias in sorted(set(aliases.values()))]
+
+    conn.execute(sa.text(
+        f"INSERT INTO {table} ({', '.join(names)}) "
+        f"SELECT {', '.join(exprs)} FROM generate_series(1, {rows}) AS g {' '.join(joins)}"
+    ))
+    conn.execute(sa.text(f"ANALYZE {table}"))
+
+
+def _ensure_rows(conn, table: str) -> None:
+    if conn.execute(sa.text(f"SELECT EXISTS (SELECT 1 FROM {table})")).scalar():
+        return
+    _seed(conn, table, PARENT_ROWS, {})
+
+
+@pytest.fixture(scope="module")
+def plan_db():
+    from app.db.database import engine
+
+    if engine.dialect.name != "postgresql":
+        pytest.skip("Plans d'execution : PostgreSQL requis")
+    try:
+        conn = engine.connect()
+    except OperationalError:
+        pytest.skip("Plans d'execution : PostgreSQL injoignable")
+
+    trans = conn.begin()
+    try:
+        for table, rows, overrides in SEED:
+            _seed(conn, table, rows, overrides)
+        sample = {
+            name: conn.execute(sa.text(f"SELECT max(id) FROM {name}")).scalar()
+            for name, _, _ in SEED
+        }
+        yield conn, Session(bind=conn), sample
+    finally:
+        trans.rollback()
+        conn.close()
+
+
+def _walk(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def _explain(conn, query) -> dict:
+    statement = query.statement if hasattr(query, "statement") else query
+    compiled = statement.compile(dialect=conn.dialect)
+    plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+# (identifiant, table interrogee, index attendu, construction de la requete)
+CASES = [
+    # ── Social : publications ──
+    ("posts_scheduled_due", "social_posts", "ix_social_posts_scheduled_due",
+     lambda db, s: db.query(SocialPost.id, SocialPost.scheduled_at).filter(
+         SocialPost.status == "scheduled", SocialPost.scheduled_at != None, SocialPost.is_deleted == False,
+     ).order_by(SocialPost.scheduled_at).limit(200)),
+    ("posts_listing", "social_posts", "ix_social_posts_active_created",
+     lambda db, s: db.query(SocialPost).filter(SocialPost.is_deleted == False)
+     .order_by(desc(SocialPost.created_at)).limit(50)),
+    ("post_by_id", "social_posts", "social_posts_pkey",
+     lambda db, s: db.query(SocialPost).filter(SocialPost.id == s["social_posts"], SocialPost.is_deleted == False)),
+    ("result_by_account_platform_post", "social_post_results", "ix_social_post_results_account_platform_post",
+     lambda db, s: db.query(SocialPostResult).filter(
+         SocialPostResult.platform_post_id == "qp_fb_1234", SocialPostResult.account_id == s["social_accounts"],
+     ).limit(1)),
+    ("results_by_post", "social_post_results", "ix_social_post_results_post_id",
+     lambda db, s: db.query(SocialPostResult).filter(SocialPostResult.post_id == s["social_posts"])),
+    # ── Social : commentaires et messages ──
+    ("comment_by_platform_id", "social_comments", "social_comments_platform_comment_id_key",
+     lambda db, s: db.query(SocialComment).filter(SocialComment.platform_comment_id == "qp_c_4321").limit(1)),
+    ("comments_inbox", "social_comments", "ix_social_comments_root_created",
+     lambda db, s: db.query(SocialComment).filter(
+         SocialComment.is_deleted == False, SocialComment.parent_comment_id == None,
+     ).order_by(desc(SocialComment.created_at)).offset(0).limit(50)),
+    ("comments_of_post", "social_comments", "ix_social_comments_post_id",
+     lambda db, s: db.query(SocialComment).filter(
+         SocialComment.is_deleted == False, SocialComment.parent_comment_id == None,
+         SocialComment.post_id == s["social_posts"],
+     ).order_by(desc(SocialComment.created_at)).limit(50)),
+    ("comment_replies", "social_comments", "ix_social_comments_parent_comment_id",
+     lambda db, s: db.query(SocialComment).filter(SocialComment.parent_comment_id == s["social_comments"])),
+    ("comment_by_id", "social_comments", "social_comments_pkey",
+     lambda db, s: db.query(SocialComment).filter(
+         SocialComment.id == s["social_comments"], SocialComment.is_deleted == False,
+     )),
+    ("conversation_by_id", "social_conversations", "social_conversations_pkey",
+     lambda db, s: db.query(SocialConversation).filter(
+         SocialConversation.id == s["social_conversations"], SocialConversation.is_deleted == False,
+     )),
+    ("conversation_thread", "social_messages", "ix_social_messages_conversation_created",
+     lambda db, s: db.query(SocialMessage).filter(SocialMessage.conversation_id == s["social_conversations"])
+     .order_by(SocialMessage.created_at)),
+    ("message_by_platform_id", "social_messages", "social_messages_platform_message_id_key",
+     lambda db, s: db.query(SocialMessage).filter(SocialMessage.platform_message_id == "qp_m_777").limit(1)),
+    ("page_insights_window", "social_page_insights", None,
+     lambda db, s: db.query(SocialPageInsight).filter(
+         SocialPageInsight.account_id == s["social_accounts"],
+         SocialPageInsight.date >= (_now() - timedelta(days=30)).date(),
+     )),
+    # ── Conducteurs ──
+    ("shows_of_day", "shows", "ix_shows_broadcast_date",
+     lambda db, s: db.query(Show).filter(
+         day_window(date.today() - timedelta(days=3)).filter(Show.broadcast_date),
+     )),
+    ("shows_of_week", "shows", "ix_shows_broadcast_date",
+     lambda db, s: db.query(Show).filter(week_window(week_offset=-1).filter(Show.broadcast_date))
+     .order_by(Show.broadcast_date)),
+    ("shows_of_creator", "shows", "ix_created_by_status_broadcast_date",
+     lambda db, s: db.query(Show).filter(Show.created_by == s["users"], Show.status == "Prêt")
+     .order_by(desc(Show.broadcast_date)).limit(20)),
+    ("show_by_id", "shows", "shows_pkey",
+     lambda db, s: db.query(Show).filter(Show.id == s["shows"])),
+    # ── Inventaire ──
+    ("equipment_listing", "inventory_equipment", "ix_equipment_active_created",
+     lambda db, s: db.query(InventoryEquipment).filter(
+         InventoryEquipment.is_deleted == False, InventoryEquipment.is_archived == False,
+     ).order_by(desc(InventoryEquipment.created_at)).offset(0).limit(50)),
+    ("equipment_archived_listing", "inventory_equipment", "ix_equipment_active_created",
+     lambda db, s: db.query(InventoryEquipment).filter(
+         InventoryEquipment.is_deleted == False, InventoryEquipment.is_archived == True,
+     ).order_by(desc(InventoryEquipment.created_at)).offset(0).limit(50)),
+    ("equipment_by_reference", "inventory_equipment", "ix_inventory_equipment_reference",
+     lambda db, s: db.query(InventoryEquipment).filter(InventoryEquipment.reference == "QP-1234")),
+    ("equipment_by_barcode", "inventory_equipment", "ix_inventory_equipment_barcode",
+     lambda db, s: db.query(InventoryEquipment).filter(
+         InventoryEquipment.barcode == "QP-BC-1234", InventoryEquipment.is_deleted == False,
+     )),
+    ("equipment_by_serial", "inventory_equipment", "ix_inventory_equipment_serial_number",
+     lambda db, s: db.query(InventoryEquipment).filter(
+         InventoryEquipment.serial_number == "QP-SN-1234", InventoryEquipment.is_deleted == False,
+     )),
+    # ── Logistique ──
+    ("fuel_logs_of_vehicle", "logistics_fuel_logs", "ix_fuel_vehicle_date",
+     lambda db, s: db.query(LogisticsFuelLog).filter(
+         LogisticsFuelLog.is_deleted == False, LogisticsFuelLog.vehicle_id == s["logistics_vehicles"],
+     ).order_by(LogisticsFuelLog.date.desc()).offset(0).limit(20)),
+    ("fuel_logs_listing", "logistics_fuel_logs", "ix_logistics_fuel_logs_date",
+     lambda db, s: db.query(LogisticsFuelLog).filter(LogisticsFuelLog.is_deleted == False)
+     .order_by(LogisticsFuelLog.date.desc()).offset(0).limit(20)),
+    # ── Planificateur ──
+    ("job_runs_of_job", "job_runs", "ix_job_runs_job_name_started_at",
+     lambda db, s: db.query(JobRun).filter(JobRun.job_name == "qp_job_3")
+     .order_by(JobRun.started_at.desc()).limit(50)),
+    ("job_runs_history", "job_runs", "job_runs_pkey",
+     lambda db, s: db.query(JobRun).order_by(JobRun.id.desc()).limit(50)),
+    # ── Annuaire ──
+    ("guest_search", "guests", "ix_guests_search_trgm",
+     lambda db, s: db.query(Guest).filter(
+         Guest.is_deleted == False,
+         _normalized(db, Guest.name, Guest.email, Guest.phone).like("%c4ca4238%", escape="\\"),
+     )),
+    ("user_search", "users", "ix_users_search_trgm",
+     lambda db, s: db.query(User).filter(
+         User.is_deleted == False,
+         _normalized(db, User.username, User.name, User.family_name, User.email, User.phone_number)
+         .like("%qp1234%", escape="\\"),
+     )),
+    ("guest_by_id", "guests", "guests_pkey",
+     lambda db, s: db.query(Guest).filter(Guest.id == s["guests"], Guest.is_deleted == False)),
+    ("user_by_id", "users", "users_pkey",
+     lambda db, s: db.query(User).filter(User.id == s["users"])),
+    # ── Statistiques d'ecoute ──
+    ("listen_plays_today", "listen_events", "ix_listen_events_type_created",
+     lambda db, s: db.query(sa.func.count(sa.distinct(ListenEvent.session_id))).filter(
+         day_window().filter(ListenEvent.created_at), ListenEvent.event_type == "play",
+     )),
+    ("listen_daily_breakdown", "listen_events", "ix_listen_events_type_created",
+     lambda db, s: db.query(sa.cast(ListenEvent.created_at, sa.Date), sa.func.count(ListenEvent.id)).filter(
+         last_days_window(7).filter(ListenEvent.created_at), ListenEvent.event_type == "play",
+     ).group_by(sa.cast(ListenEvent.created_at, sa.Date))),
+]
+
+
+@pytest.mark.parametrize("name, table, expected_index, build", CASES, ids=[case[0] for case in CASES])
+def test_hot_query_uses_index(plan_db, name, table, expected_index, build):
+    conn, db, sample = plan_db
+    plan = _explain(conn, build(db, sample))
+
+    scans = [node for node in _walk(plan) if node.get("Relation Name") == table]
+    indexes = sorted({node["Index Name"] for node in _walk(plan) if "Index Name" in node})
+    summary = [f"{node['Node Type']} {node.get('Index Name', '')}".strip() for node in scans]
+
+    assert scans, f"{name}: {table} absente du plan"
+    assert not any(node["Node Type"] == "Seq Scan" for node in scans), (
+        f"{name}: Seq Scan sur {table} (index attendu : {expected_index}, plan : {summary})"
+    )
+    assert indexes, f"{name}: aucun index utilise (attendu : {expected_index}, plan : {summary})"
@@ -0,0 +1,112 @@
+"""
+Inventaire Dedibox : details recuperes en parallele, listes servies depuis
+des instantanes partages, rafraichissement force regroupe.
+L'API Online.net est simulee (http_client.get remplace).
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config.config import settings
+from app.db.database import Base
+from app.models import SharedCacheEntry
+from app.services import http_client, scaleway_client
+from app.services.shared_cache import SharedCache
+
+DETAIL_DELAY = 0.2
+
+
+class FakeDedibox:
+    def __init__(self):
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        path = urlsplit(url).path.removeprefix("/api/v1")
+        with self._lock:
+            self.calls.append(path)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if path in ("/server", "/domain", "/hosting"):
+                return httpx.Response(200, json=[1, 2, 3, 4])
+            if path == "/server/failover":
+                return httpx.Response(200, json=[{"ip": "62.210.0.1"}])
+            if path == "/user":
+                return httpx.Response(200, json={"login": "audace"})
+            time.sleep(DETAIL_DELAY)
+            kind, item_id = path.strip("/").split("/")
+            return httpx.Response(200, json={"id": int(item_id), "hostname": f"{kind}-{item_id}", "offer": "Start"})
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def list_calls(self, path):
+        return [call for call in self.calls if call == path]
+
+
+@pytest.fixture()
+def dedibox(monkeypatch, tmp_path):
+    fake = FakeDedibox()
+    monkeypatch.setattr(http_client, "get", fake.get)
+    monkeypatch.setattr(settings, "SCW_SECRET_KEY", "token-test")
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    Base.metadata.create_all(engine, tables=[SharedCacheEntry.__table__])
+    monkeypatch.setattr(
+        scaleway_client, "_inventory",
+        SharedCache("scaleway-test", ttl=600, stale_ttl=3600, session_factory=sessionmaker(bind=engine)),
+    )
+    yield fake
+    engine.dispose()
+
+
+def test_details_fetched_concurrently(dedibox):
+    started = time.monotonic()
+    servers = scaleway_client.get_servers()
+    elapsed = time.monotonic() - started
+
+    assert [server["hostname"] for server in servers] == ["server-1", "server-2", "server-3", "server-4"]
+    assert dedibox.max_in_flight > 1
+    assert elapsed < 4 * DETAIL_DELAY
+
+
+def test_lists_served_from_snapshot(dedibox):
+    first = scaleway_client.get_inventory("domains")
+    calls = len(dedibox.calls)
+    second = scaleway_client.get_inventory("domains")
+
+    assert second == first
+    assert len(dedibox.calls) == calls
+    assert [domain["hostname"] for domain in first["data"]][:2] == ["domain-1", "domain-2"]
+    assert scaleway_client.snapshot_age(second) <= 1
+
+    dashboard = scaleway_client.get_dashboard()
+    assert dashboard["total_domains"] == 4 and dashboard["total_servers"] == 4
+    assert dashboard["failover_ips_count"] == 1 and dashboard["user"] == {"login": "audace"}
+    assert dashboard["generated_at"] == first["generated_at"]
+    # Le dashboard n'a relu aucune liste deja en instantane
+    assert len(dedibox.list_calls("/domain")) == 1
+
+
+def test_concurrent_refreshes_are_coalesced(dedibox):
+    before = scaleway_client.get_inventory("servers")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: scaleway_client.get_inventory("servers", refresh=True), range(4)))
+
+    assert all(result == results[0] for result in results)
+    assert results[0]["generated_at"] > before["generated_at"]
+    # Un seul appel de liste pour les quatre demandes de rafraichissement
+    assert len(dedibox.list_calls("/server")) == 2
+
+    assert scaleway_client.refresh_inventory() == {
+        "servers": 4, "hostings": 4, "domains": 4, "failover": 1, "user": 1,
+    }
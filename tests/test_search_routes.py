@@ -1,6 +1,7 @@
 import pytest
 import uuid
 from httpx import AsyncClient
+from maintest import app
 
 # Tests for /search/shows and /search/users using async client
 @pytest.mark.asyncio
@@ -63,4 +64,14 @@ async def test_search_users_no_results(client: AsyncClient):
 async def test_search_users_unauthorized(client: AsyncClient):
     # Missing keyword → 400 Bad Request
     resp = await client.get("/search_users/")
-    assert resp.status_code == 400
\ No newline at end of file
+    assert resp.status_code == 400
+
+@pytest.mark.asyncio
+async def test_typeahead_requires_auth_and_bounded_limit(client: AsyncClient):
+    # Autocompletion : annuaire invites/utilisateurs reserve aux utilisateurs connectes
+    paths = app.openapi()["paths"]
+    for path in ("/guests/typeahead", "/search_users/typeahead"):
+        resp = await client.get(f"{path}?q=ab&limit=1000")
+        assert resp.status_code == 401
+        limit = next(p for p in paths[path]["get"]["parameters"] if p["name"] == "limit")
+        assert (limit["schema"]["minimum"], limit["schema"]["maximum"]) == (1, 100)
@@ -71,3 +71,43 @@ async def test_segment_crud_and_soft_delete(client: AsyncClient):
     # Verify not found
     nf = await client.get(f"/segments/{sid}", headers=headers)
     assert nf.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_segment_reorder_is_scoped_to_show(client: AsyncClient):
+    email = f"user_{uuid.uuid4().hex}@example.com"
+    password = "Pass1234!"
+    r = await client.post("/auth/signup", json={"email": email, "password": password})
+    assert r.status_code == 201
+    login = await client.post("/auth/login", data={"username": email, "password": password})
+    headers = {"Authorization": f"Bearer {login.json().get('access_token')}"}
+
+    show_ids = []
+    for title in ("OrderShowA", "OrderShowB"):
+        show_resp = await client.post("/shows/", json={"title": title, "type": "TypeA", "duration": 30, "status": "active"}, headers=headers)
+        assert show_resp.status_code == 201
+        show_ids.append(show_resp.json().get("id"))
+
+    seg_ids = []
+    for i in range(3):
+        seg = {"title": f"Seg{i}", "type": "Interview", "duration": 5, "position": 0, "show_id": show_ids[0]}
+        resp = await client.post("/segments/", json=seg, headers=headers)
+        assert resp.status_code == 201
+        seg_ids.append(resp.json().get("id"))
+    other = await client.post("/segments/", json={"title": "Other", "type": "Interview", "duration": 5, "position": 0, "show_id": show_ids[1]}, headers=headers)
+    assert other.json().get("position") == 1
+
+    # Déplacer le dernier segment en tête : les autres sont décalés, l'autre émission intacte
+    pos_resp = await client.patch(f"/segments/{seg_ids[2]}/position", json={"position": 1}, headers=headers)
+    assert pos_resp.status_code == 200
+    order_resp = await client.put(f"/segments/show/{show_ids[0]}/order", json={"segment_ids": [seg_ids[0], seg_ids[1], seg_ids[2]]}, headers=headers)
+    assert order_resp.status_code == 200
+    assert [s["id"] for s in order_resp.json()] == seg_ids
+    assert [s["position"] for s in order_resp.json()] == [1, 2, 3]
+
+    other_get = await client.get(f"/segments/{other.json().get('id')}", headers=headers)
+    assert other_get.json().get("position") == 1
+
+    # Liste incomplète refusée
+    bad = await client.put(f"/segments/show/{show_ids[0]}/order", json={"segment_ids": seg_ids[:2]}, headers=headers)
+    assert bad.status_code == 400
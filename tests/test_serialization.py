@@ -0,0 +1,93 @@
+"""
+Serialisation des reponses : orjson par defaut, dicts serialises sans
+jsonable_encoder, listes typees serialisees par un TypeAdapter pre-construit.
+Les sorties doivent etre identiques au chemin par defaut de FastAPI.
+"""
+import asyncio
+import json
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import ValidationError
+
+from app.schemas.schema_logistics import MissionListResponse, MissionResponse
+from app.utils.serialization import FastJSONResponse, json_response, model_response
+
+
+def _mission(i: int) -> SimpleNamespace:
+    """Objet a attributs, comme une ligne ORM Mission."""
+    values = {}
+    for name, field in MissionResponse.model_fields.items():
+        annotation = str(field.annotation)
+        if "datetime" in annotation:
+            values[name] = datetime(2026, 10, 19, 8, i, tzinfo=timezone.utc)
+        elif "Decimal" in annotation:
+            values[name] = Decimal("1250.50")
+        elif "float" in annotation:
+            values[name] = 14.6937
+        elif "bool" in annotation:
+            values[name] = bool(i % 2)
+        elif "int" in annotation:
+            values[name] = i
+        elif "list" in annotation:
+            values[name] = [f"photo-{i}.jpg"]
+        else:
+            values[name] = f"Dakar → Thiès {i}"
+    values["cargo_loss_reason"] = None
+    return SimpleNamespace(**values)
+
+
+def test_json_response_matches_jsonable_encoder():
+    content = [{
+        "id": 7,
+        "broadcast_date": datetime(2026, 10, 19, 6, 30, 15, 120000),
+        "published_at": datetime(2026, 10, 19, 6, 30, tzinfo=timezone.utc),
+        "day": date(2026, 10, 19),
+        "startTime": time(6, 45),
+        "price": Decimal("12.50"),
+        "count": Decimal("3"),
+        "by_hour": {6: 12, 7: 3},
+        "title": "Matinale — édition spéciale",
+        "guests": [{"id": 1, "role": None}],
+    }]
+
+    fast = json_response(content)
+    default = JSONResponse(jsonable_encoder(content))
+
+    assert isinstance(fast, FastJSONResponse)
+    assert json.loads(fast.body) == json.loads(default.body)
+    assert "édition".encode() in fast.body
+
+
+def test_model_response_matches_fastapi_path():
+    missions = [_mission(i) for i in range(5)]
+    content = {"items": missions, "total": 42, "page": 1, "page_size": 5}
+    field = create_response_field(name="response", type_=MissionListResponse, mode="serialization")
+    expected = JSONResponse(asyncio.run(serialize_response(field=field, response_content=content)))
+
+    response = model_response(MissionListResponse, content, headers={"X-Total-Count": "42"})
+
+    assert json.loads(response.body) == json.loads(expected.body)
+    assert response.media_type == "application/json"
+    assert response.headers["X-Total-Count"] == "42"
+    # Instances deja typees : meme sortie, sans reconstruction
+    typed = MissionListResponse(items=[MissionResponse.model_validate(m) for m in missions], total=42, page=1, page_size=5)
+    assert model_response(MissionListResponse, typed).body == response.body
+
+    missions[0].driver_id = None
+    with pytest.raises(ValidationError):
+        model_response(list[MissionResponse], missions)
+
+
+def test_app_routes_default_to_fast_json():
+    from maintest import app
+
+    routes = {(route.path, method): route for route in app.routes for method in getattr(route, "methods", ())}
+    assert routes[("/shows/", "GET")].response_class is FastJSONResponse
+    assert routes[("/logistics/missions", "GET")].response_class is FastJSONResponse
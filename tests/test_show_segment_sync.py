@@ -0,0 +1,92 @@
+"""
+Mise a jour d'une emission avec details : les segments sont synchronises par
+difference et les liens invites d'un segment ne changent que si guest_ids est envoye.
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import MetaData, create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.crud.crud_show import update_show_with_details
+from app.db.database import Base
+from app.models import Guest, Presenter, Segment, SegmentGuest, Show, ShowPresenter, User
+from app.schemas.schema_show import ShowUpdateWithDetails
+
+
+@pytest.fixture()
+def sqlite_db():
+    engine = create_engine("sqlite://")
+    # users : copie sans les DEFAULT now() propres a PostgreSQL ni les index
+    users = User.__table__.to_metadata(MetaData())
+    users.indexes.clear()
+    for column in users.columns:
+        column.server_default = None
+    users.create(engine)
+    tables = [m.__table__ for m in (Show, Segment, Guest, SegmentGuest, Presenter, ShowPresenter)]
+    Base.metadata.create_all(engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+
+    show = Show(title="Matinale", type="live", duration=60, status="draft")
+    guests = [Guest(name=f"Invite {i}") for i in range(3)]
+    session.add_all([show, *guests])
+    session.flush()
+    user = User(username="animateur", name="Nom", family_name="Famille", email="a@example.com", password="x", created_at=datetime.now())
+    session.add(user)
+    session.flush()
+    presenter = Presenter(name="Presentateur", users_id=user.id)
+    session.add(presenter)
+    session.flush()
+    session.add(ShowPresenter(show_id=show.id, presenter_id=presenter.id))
+    for position in range(3):
+        segment = Segment(title=f"S{position}", type="chronique", duration=5, position=position, show_id=show.id)
+        session.add(segment)
+        session.flush()
+        session.add(SegmentGuest(segment_id=segment.id, guest_id=guests[position].id))
+    session.commit()
+    yield session, show.id, [g.id for g in guests]
+    session.close()
+
+
+def _links(db, show_id):
+    rows = (
+        db.query(Segment.title, SegmentGuest.guest_id)
+        .join(SegmentGuest, SegmentGuest.segment_id == Segment.id)
+        .filter(Segment.show_id == show_id)
+    )
+    links = {}
+    for title, guest_id in rows:
+        links.setdefault(title, set()).add(guest_id)
+    return links
+
+
+def _payload(**fields):
+    """Corps de PATCH /shows/detail/{id} tel que la route le transmet au CRUD."""
+    return ShowUpdateWithDetails(**fields).model_dump(exclude_unset=True)
+
+
+def test_omitted_guest_ids_keep_links(sqlite_db):
+    db, show_id, guest_ids = sqlite_db
+    s0, s1, _ = db.query(Segment).filter(Segment.show_id == show_id).order_by(Segment.position)
+
+    update_show_with_details(db, show_id, _payload(segments=[
+        {"id": s0.id, "title": "S0 renomme", "type": "chronique", "position": 0, "duration": 5},
+        {"id": s1.id, "title": "S1", "type": "chronique", "position": 1, "duration": 5, "guest_ids": []},
+        {"title": "Nouveau", "type": "jingle", "position": 2, "duration": 1, "guest_ids": [guest_ids[2]]},
+    ]))
+
+    segments = {seg.title: seg for seg in db.query(Segment).filter(Segment.show_id == show_id)}
+    assert set(segments) == {"S0 renomme", "S1", "Nouveau"}  # S2 non envoye : supprime
+    # guest_ids absent : liens conserves ; liste vide : liens retires
+    assert _links(db, show_id) == {"S0 renomme": {guest_ids[0]}, "Nouveau": {guest_ids[2]}}
+
+
+def test_partial_update_leaves_segments_and_presenters(sqlite_db):
+    db, show_id, guest_ids = sqlite_db
+
+    show = update_show_with_details(db, show_id, _payload(title="Matinale du samedi"))
+
+    assert show.title == "Matinale du samedi" and show.type == "live"
+    assert len(show.presenters) == 1
+    assert db.query(Segment).filter(Segment.show_id == show_id).count() == 3
+    assert _links(db, show_id) == {f"S{i}": {guest_ids[i]} for i in range(3)}
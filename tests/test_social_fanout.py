@@ -0,0 +1,100 @@
+"""
+Publication multi-comptes : comptes publies en parallele, resultats rendus au
+fil de l'eau, nouvelles tentatives independantes sur erreur passagere.
+"""
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.config.config import settings
+from app.services import social_facebook
+from app.services.social_publish_fanout import fan_out_publish
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "SOCIAL_PUBLISH_RETRY_BASE_SECONDS", 0.0)
+    monkeypatch.setattr(settings, "SOCIAL_PUBLISH_MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(settings, "SOCIAL_FANOUT_CONCURRENCY", 8)
+
+
+def _target(account_id, page_id):
+    return {"account_id": account_id, "platform": "facebook", "access_token": "tok", "page_id": page_id}
+
+
+def test_targets_published_concurrently_with_independent_retries(monkeypatch):
+    calls = {}
+
+    def fake_publish_to_page(page_access_token, page_id, message, link=None, media_urls=None,
+                             uploaded_photos=None, retryable_errors=False):
+        assert retryable_errors
+        calls[page_id] = calls.get(page_id, 0) + 1
+        time.sleep(0.3)  # appel reseau simule
+        if page_id == "flaky" and calls[page_id] == 1:
+            raise HTTPException(status_code=503, detail="Facebook API error: temporairement indisponible")
+        if page_id == "broken":
+            raise HTTPException(status_code=502, detail="Facebook API error: token invalide")
+        return {"id": f"{page_id}_1", "permalink_url": f"https://www.facebook.com/{page_id}_1"}
+
+    monkeypatch.setattr(social_facebook, "publish_to_page", fake_publish_to_page)
+    targets = [_target(1, "p1"), _target(2, "p2"), _target(3, "flaky"), _target(4, "broken"), _target(5, None)]
+
+    started = time.perf_counter()
+    outcomes = list(fan_out_publish(targets, "Bonjour"))
+    elapsed = time.perf_counter() - started
+
+    by_account = {o["account_id"]: o for o in outcomes}
+    assert len(outcomes) == 5
+    assert by_account[1]["status"] == "published" and by_account[1]["platform_post_id"] == "p1_1"
+    assert by_account[3]["status"] == "published" and by_account[3]["attempts"] == 2
+    assert by_account[4]["status"] == "error" and by_account[4]["attempts"] == 1
+    assert by_account[5]["error_message"] == "Aucun Page ID disponible pour ce compte"
+    # Le compte lent (2 tentatives) ne retarde pas les autres : pas de somme des latences
+    assert elapsed < 1.0
+    assert outcomes[-1]["account_id"] == 3
+
+
+def test_retry_reuses_uploaded_photos(monkeypatch):
+    uploads = []
+    feed_calls = []
+
+    def fake_upload(page_access_token, page_id, image_url, published=True, caption=None, retryable_errors=False):
+        uploads.append(image_url)
+        return {"id": f"photo-{len(uploads)}"}
+
+    def fake_graph_post(url, data, access_token, description="", as_form=False, retryable_errors=False):
+        feed_calls.append(data)
+        if len(feed_calls) == 1:
+            raise HTTPException(status_code=503, detail="Facebook API error: surcharge")
+        return {"id": "page_42"}
+
+    monkeypatch.setattr(social_facebook, "_upload_photo_from_url", fake_upload)
+    monkeypatch.setattr(social_facebook, "_graph_post", fake_graph_post)
+
+    media = ["https://cdn.example.com/a.jpg", "https://cdn.example.com/b.png"]
+    [outcome] = list(fan_out_publish([_target(7, "page")], "Album", media_urls=media))
+
+    assert outcome["status"] == "published" and outcome["attempts"] == 2
+    assert uploads == media
+    assert feed_calls[1]["attached_media[1]"] == '{"media_fbid":"photo-2"}'
+
+
+@pytest.mark.parametrize("outcome, retryable, expected", [
+    (429, True, 503),
+    (500, True, 502),      # le post a pu etre cree : jamais retente
+    (429, False, 502),     # hors publication multi-comptes : comportement inchange
+    ("connect", True, 503),
+    ("connect", False, 502),
+])
+def test_graph_post_retryable_errors(monkeypatch, outcome, retryable, expected):
+    def fake_post(url, **kwargs):
+        if outcome == "connect":
+            raise httpx.ConnectError("connexion refusee")
+        return httpx.Response(outcome, json={"error": {"message": "indisponible"}})
+
+    monkeypatch.setattr(social_facebook.http_client, "post", fake_post)
+    with pytest.raises(HTTPException) as exc:
+        social_facebook._graph_post("https://graph.facebook.com/v21.0/1/feed", {}, "tok", retryable_errors=retryable)
+    assert exc.value.status_code == expected
@@ -0,0 +1,101 @@
+"""
+File de publication planifiee : publication a l'echeance (pas de sondage),
+reveil sur changement de planification, publications en parallele.
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.services.social_publish_queue import RESYNC_SECONDS, ScheduledPublisher
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class FakeSchedule:
+    def __init__(self):
+        self.posts = {}
+        self.published = {}
+        self.loads = 0
+        self.lock = threading.Lock()
+        # Rendez-vous des publications simultanees (1 : aucune attente)
+        self.barrier = threading.Barrier(1)
+
+    def load(self, db):
+        self.loads += 1
+        with self.lock:
+            return sorted(((pid, at) for pid, at in self.posts.items()), key=lambda e: e[1])
+
+    def publish(self, db, post_id):
+        started = datetime.now(timezone.utc)
+        self.barrier.wait(timeout=5)  # appel reseau simule
+        with self.lock:
+            self.posts.pop(post_id, None)
+            self.published[post_id] = started
+        return "published"
+
+
+@pytest.fixture()
+def queue():
+    schedule = FakeSchedule()
+    engine = create_engine("sqlite://")
+    publisher = ScheduledPublisher(
+        session_factory=sessionmaker(bind=engine), engine=engine,
+        loader=schedule.load, publish_func=schedule.publish,
+    )
+    yield publisher, schedule
+    publisher.stop()
+
+
+def test_posts_are_published_at_their_due_time_concurrently(queue):
+    publisher, schedule = queue
+    # En parallele : chaque publication attend que les trois aient demarre
+    schedule.barrier = threading.Barrier(3)
+    publisher.start()
+    due = datetime.now(timezone.utc) + timedelta(seconds=0.3)
+    for post_id in (1, 2, 3):
+        schedule.posts[post_id] = due
+    schedule.posts[4] = due + timedelta(hours=1)
+    publisher.wake()
+
+    assert _wait_until(lambda: publisher.get_metrics()["published"] == 3)
+    assert set(schedule.published) == {1, 2, 3}
+    # Jamais avant l'echeance
+    assert min(schedule.published.values()) >= due
+    metrics = publisher.get_metrics()
+    assert metrics["errors"] == 0 and metrics["lag_seconds"]["max"] >= 0
+    assert metrics["queued"] == 1
+
+
+def test_idle_queue_sleeps_until_woken(queue):
+    publisher, schedule = queue
+    timeouts = []
+    idle = threading.Event()
+    wait = publisher._wait
+
+    def recording_wait(timeout):
+        timeouts.append(timeout)
+        idle.set()
+        return wait(timeout)
+
+    publisher._wait = recording_wait
+    publisher.start()
+    assert idle.wait(5)
+    # File vide : un seul chargement, puis attente jusqu'a la resynchro de securite
+    assert schedule.loads == 1
+    assert timeouts[0] > RESYNC_SECONDS - 5
+
+    schedule.posts[7] = datetime.now(timezone.utc) - timedelta(seconds=1)
+    publisher.wake()
+    assert _wait_until(lambda: 7 in schedule.published)
+    assert schedule.loads == 2
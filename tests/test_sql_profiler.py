@@ -0,0 +1,106 @@
+"""
+Profilage SQL : formes de requetes, detection des N+1 par requete HTTP
+(en-tetes X-DB-Queries / Server-Timing, journal avec origine) et budgets de
+requetes dans les tests (plugin tests/sql_budget.py).
+"""
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.middleware.sql_profiler_middleware import SQLProfilerMiddleware
+from app.services.sql_profiler import fingerprint
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE guests (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text("CREATE TABLE segments (id INTEGER PRIMARY KEY, guest_id INTEGER, title TEXT)"))
+        for i in range(1, 7):
+            conn.execute(text("INSERT INTO guests VALUES (:i, :name)"), {"i": i, "name": f"Invite {i}"})
+            conn.execute(text("INSERT INTO segments VALUES (:i, :i, 'Chronique')"), {"i": i})
+    return engine
+
+
+def test_fingerprint_ignores_values():
+    assert fingerprint("SELECT * FROM guests WHERE id = %(id_1)s AND name = 'Awa'") == \
+        fingerprint("SELECT *\n  FROM guests WHERE id = %(id_1)s AND name = 'Moussa'")
+    assert fingerprint("SELECT * FROM t WHERE id IN (?, ?, ?) LIMIT 10") == "SELECT * FROM t WHERE id IN (?) LIMIT ?"
+    assert fingerprint("SELECT * FROM t WHERE id IN (%(id_1_1)s, %(id_1_2)s)") == "SELECT * FROM t WHERE id IN (?)"
+
+
+def test_middleware_flags_n_plus_one(engine, caplog):
+    app = FastAPI()
+
+    @app.get("/guests")
+    def list_guests():
+        with engine.connect() as conn:
+            guests = conn.execute(text("SELECT id, name FROM guests")).all()
+            return [
+                {"name": name, "segments": conn.execute(
+                    text("SELECT title FROM segments WHERE guest_id = :id"), {"id": guest_id}
+                ).scalars().all()}
+                for guest_id, name in guests
+            ]
+
+    app.add_middleware(SQLProfilerMiddleware)
+    caplog.set_level(logging.WARNING, logger="hapson-api.sql")
+
+    response = TestClient(app).get("/guests")
+
+    assert response.headers["X-DB-Queries"] == "7"
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    warning = next(r.getMessage() for r in caplog.records if r.name == "hapson-api.sql")
+    assert "GET /guests - 7 requetes SQL" in warning
+    assert "x6 SELECT title FROM segments WHERE guest_id = ?" in warning
+    assert "[tests/test_sql_profiler.py:" in warning and "in <listcomp>" in warning
+
+
+@pytest.mark.query_budget(2, repeats=1)
+def test_query_budget_marker(engine):
+    with engine.connect() as conn:
+        conn.execute(text("SELECT count(*) FROM guests")).scalar()
+        conn.execute(text("SELECT title FROM segments WHERE guest_id IN (1, 2, 3)")).all()
+
+
+def test_sql_queries_fixture(engine, sql_queries):
+    with engine.connect() as conn:
+        for guest_id in (1, 2, 3):
+            conn.execute(text("SELECT name FROM guests WHERE id = :id"), {"id": guest_id}).scalar()
+
+    assert sql_queries.count == 3
+    sql_queries.assert_budget(3)
+    with pytest.raises(AssertionError, match="repetee plus de 1 fois"):
+        sql_queries.assert_budget(3, repeats=1)
+    with pytest.raises(AssertionError, match="Budget SQL depasse : 3 > 2"):
+        sql_queries.assert_budget(2)
+
+
+@pytest.mark.parametrize("profiler_outside", [True, False])
+def test_profiler_shares_metrics_request_stats(engine, profiler_outside):
+    from prometheus_client import REGISTRY
+
+    from app.middleware.metrics_middleware import MetricsMiddleware
+
+    app = FastAPI()
+
+    @app.get("/count")
+    def count():
+        with engine.connect() as conn:
+            return [conn.execute(text("SELECT count(*) FROM guests")).scalar() for _ in range(3)]
+
+    # Ordre des middlewares indifferent : un seul jeu de compteurs par requete
+    for middleware in ([MetricsMiddleware, SQLProfilerMiddleware] if profiler_outside
+                       else [SQLProfilerMiddleware, MetricsMiddleware]):
+        app.add_middleware(middleware)
+    before = REGISTRY.get_sample_value("http_request_db_queries_sum", {"route": "/count"}) or 0.0
+
+    response = TestClient(app).get("/count")
+
+    assert response.headers["X-DB-Queries"] == "3"
+    assert REGISTRY.get_sample_value("http_request_db_queries_sum", {"route": "/count"}) == before + 3
@@ -0,0 +1,85 @@
+"""
+Extraction de sous-titres : une seule extraction pour des demandes identiques
+simultanees, cache disque partage et eviction LRU bornee par SUBTITLE_CACHE_MAX_MB.
+"""
+import os
+import threading
+
+import pytest
+
+from app.config.config import settings
+from app.services import subtitle_service
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+@pytest.fixture()
+def cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "SUBTITLE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "SUBTITLE_WORKERS", 2)
+    subtitle_service.shutdown_extraction_pool()
+    yield tmp_path
+    subtitle_service.shutdown_extraction_pool()
+
+
+def test_concurrent_requests_share_one_extraction(cache_dir, monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fake_extract(url, lang, fmt, task_id):
+        calls.append(url)
+        started.set()
+        assert release.wait(5)
+        return {"status": "done", "content": "bonjour", "format": fmt}
+
+    monkeypatch.setattr(subtitle_service, "_extract_with_fallback", fake_extract)
+
+    first = subtitle_service._submit(URL, "fr", "txt")
+    assert started.wait(5)
+    # Meme video via une autre forme d'URL : meme cle, meme Future
+    second = subtitle_service._submit("https://youtu.be/dQw4w9WgXcQ", "fr", "txt")
+    assert second is first
+
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(subtitle_service.extract_subtitles_sync(URL)))
+    waiter.start()
+    release.set()
+    waiter.join(5)
+
+    assert first.result(timeout=5)["content"] == "bonjour"
+    assert results == ["bonjour"]
+    assert calls == [URL]
+
+    # Resultat en cache : Future deja resolu, pas de nouvelle extraction
+    cached = subtitle_service._submit(URL, "fr", "txt")
+    assert cached.done() and cached.result()["content"] == "bonjour"
+    assert calls == [URL]
+    assert subtitle_service._inflight == {}
+
+
+def test_failed_extraction_is_not_cached(cache_dir, monkeypatch):
+    monkeypatch.setattr(subtitle_service, "_extract_with_fallback",
+                        lambda *args: {"status": "error", "message": "indisponible"})
+
+    with pytest.raises(RuntimeError):
+        subtitle_service.extract_subtitles_sync(URL)
+    assert subtitle_service.get_cached_subtitles(URL, "fr", "txt") is None
+
+
+def test_cache_eviction_stays_within_size_cap(cache_dir, monkeypatch):
+    monkeypatch.setattr(settings, "SUBTITLE_CACHE_MAX_MB", 1)
+    content = "x" * 300 * 1024  # ~300 Ko par entree, 3 entrees tiennent dans 1 Mo
+
+    for i, key in enumerate(["a", "b", "c"]):
+        subtitle_service._cache_put(key, {"status": "done", "content": content})
+        os.utime(subtitle_service._cache_path(key), (1000 + i, 1000 + i))
+    # Lecture de "a" : devient la plus recemment utilisee
+    assert subtitle_service._cache_get("a") is not None
+
+    subtitle_service._cache_put("d", {"status": "done", "content": content})
+
+    remaining = sorted(f[:-5] for f in os.listdir(cache_dir) if f.endswith(".json"))
+    assert remaining == ["a", "c", "d"]  # "b", la moins recemment utilisee, est evincee
+    total = sum(os.path.getsize(os.path.join(cache_dir, f)) for f in os.listdir(cache_dir))
+    assert total <= settings.SUBTITLE_CACHE_MAX_MB * 1024 * 1024
@@ -0,0 +1,57 @@
+"""
+Fenetres temporelles [start, end) : bornes des jours, semaines, mois et
+periodes 7d/30d/90d/12m, et filtres SQL sargables (pas de date() sur la colonne).
+"""
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy.dialects import postgresql
+
+from app.models import Show
+from app.utils.time_window import (
+    day_window,
+    last_days_window,
+    month_window,
+    period_window,
+    week_window,
+)
+
+
+def test_calendar_windows_are_half_open():
+    wednesday = date(2026, 10, 14)
+
+    day = day_window(wednesday)
+    assert (day.start, day.end) == (datetime(2026, 10, 14), datetime(2026, 10, 15))
+    assert datetime(2026, 10, 14, 23, 59, 59) in day
+    assert datetime(2026, 10, 15) not in day
+
+    week = week_window(wednesday, week_offset=1)
+    assert (week.start, week.end) == (datetime(2026, 10, 19), datetime(2026, 10, 26))
+    assert len(week.days()) == 7
+
+    december = month_window(date(2026, 12, 31))
+    assert (december.start, december.end) == (datetime(2026, 12, 1), datetime(2027, 1, 1))
+    assert month_window(date(2026, 1, 15), month_offset=-1).start == datetime(2025, 12, 1)
+
+    last_week = last_days_window(7, wednesday, tz=timezone.utc)
+    assert last_week.start == datetime(2026, 10, 7, tzinfo=timezone.utc)
+    assert last_week.end == datetime(2026, 10, 15, tzinfo=timezone.utc)
+
+
+def test_period_window_and_previous():
+    now = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+    window = period_window("7d", now=now)
+    assert (window.start, window.end) == (now - timedelta(days=7), now)
+    assert window.previous().end == window.start
+    assert window.previous().start == now - timedelta(days=14)
+    assert period_window("12m", now=now).start == now - timedelta(days=365)
+    # Periode inconnue : 30 jours
+    assert period_window("3y", now=now).start == now - timedelta(days=30)
+
+
+def test_filter_keeps_column_sargable():
+    clause = day_window(date(2026, 10, 14)).filter(Show.broadcast_date)
+    sql = str(clause.compile(dialect=postgresql.dialect()))
+
+    assert sql == "shows.broadcast_date >= %(broadcast_date_1)s AND shows.broadcast_date < %(broadcast_date_2)s"
+    assert "date(" not in sql.lower()
@@ -0,0 +1,132 @@
+"""
+Agregation WordPress multi-sites : pagination globale par fusion k-way,
+termes et auteurs resolus depuis un cache, statistiques servies depuis un
+instantane. Les sites sont simules (http_client.get remplace).
+"""
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models import SharedCacheEntry
+from app.services import http_client, wp_article_service
+from app.services.shared_cache import SharedCache
+
+SITES = {"www.audacemagazine.com": ("audacemagazine", 25, 0), "www.radioaudace.com": ("radioaudace", 10, 1)}
+START = datetime(2026, 10, 1)
+
+
+def _posts(count: int, shift: int) -> list[dict]:
+    """Articles du plus recent au plus ancien, toutes les 2 h (decales d'1 h entre sites)."""
+    return [
+        {
+            "id": i + 1,
+            "title": {"rendered": f"Article {i + 1}"},
+            "date_gmt": (START - timedelta(hours=2 * i + shift)).isoformat(),
+            "categories": [7],
+            "tags": [70 + i % 2],
+            "author": 3,
+        }
+        for i in range(count)
+    ]
+
+
+class FakeWordPress:
+    def __init__(self):
+        self.calls = []
+        self.down = False
+
+    def get(self, url, params=None, **kwargs):
+        if self.down:
+            raise httpx.ConnectError("site injoignable")
+        parts = urlsplit(url)
+        endpoint = parts.path.rsplit("/wp/v2/", 1)[1]
+        self.calls.append((parts.netloc, endpoint, dict(params or {})))
+        site, count, shift = SITES[parts.netloc]
+        if endpoint != "posts":
+            ids = [int(i) for i in params["include"].split(",")]
+            return httpx.Response(200, json=[{"id": i, "name": f"{endpoint}-{i}", "slug": f"s{i}"} for i in ids])
+        posts = _posts(count, shift)
+        if params.get("after"):
+            posts = posts[:3]
+        page, per_page = params.get("page", 1), params["per_page"]
+        chunk = posts[(page - 1) * per_page:page * per_page]
+        return httpx.Response(200, json=chunk, headers={"X-WP-Total": str(len(posts))})
+
+    def posts_calls(self):
+        return [c for c in self.calls if c[1] == "posts"]
+
+
+@pytest.fixture()
+def wordpress(monkeypatch):
+    fake = FakeWordPress()
+    monkeypatch.setattr(http_client, "get", fake.get)
+    wp_article_service._cursor_cache.clear()
+    wp_article_service._lookup_cache.clear()
+    return fake
+
+
+def test_merged_pages_follow_global_date_order(wordpress):
+    expected = sorted(
+        [("audacemagazine", p["date_gmt"]) for p in _posts(25, 0)]
+        + [("radioaudace", p["date_gmt"]) for p in _posts(10, 1)],
+        key=lambda item: item[1], reverse=True,
+    )
+
+    pages = [wp_article_service.list_articles(page=n, per_page=6) for n in range(1, 7)]
+
+    assert pages[0]["total"] == 35 and pages[0]["total_pages"] == 6
+    merged = [(item["site"], item["created_at"]) for page in pages for item in page["items"]]
+    assert merged == expected
+    # Chaque lot d'un site n'est lu qu'une fois : 5 lots de 6 + 2 lots de 6
+    assert len(wordpress.posts_calls()) == 7
+    assert all(call[2]["_embed"] == "wp:featuredmedia" for call in wordpress.posts_calls())
+
+
+def test_unreachable_site_is_retried_on_next_request(wordpress):
+    wordpress.down = True
+    failed = wp_article_service.list_articles(page=1, per_page=6)
+    assert failed["total"] == 0 and failed["items"] == []
+    # Erreur passagere : aucun curseur "epuise" ne reste en cache
+    assert wp_article_service._cursor_cache.stats()["size"] == 0
+
+    wordpress.down = False
+    page = wp_article_service.list_articles(page=1, per_page=6)
+    assert page["total"] == 35 and len(page["items"]) == 6
+
+
+def test_terms_and_authors_resolved_from_cache(wordpress):
+    first = wp_article_service.list_articles(site_key="radioaudace", per_page=5)
+    lookups = [c for c in wordpress.calls if c[1] != "posts"]
+    wp_article_service.list_articles(site_key="radioaudace", page=2, per_page=5)
+
+    article = first["items"][0]
+    assert article["categories"] == [{"id": 7, "name": "categories-7", "slug": "s7", "count": 0}]
+    assert article["tags"] == [{"id": 70, "name": "tags-70", "slug": "s70"}]
+    assert article["author_name"] == "users-3"
+    # Une requete ?include= par type a la premiere page, aucune ensuite
+    assert sorted(c[1] for c in lookups) == ["categories", "tags", "users"]
+    assert [c for c in wordpress.calls if c[1] != "posts"] == lookups
+
+
+def test_stats_served_from_snapshot(wordpress, monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    Base.metadata.create_all(engine, tables=[SharedCacheEntry.__table__])
+    monkeypatch.setattr(
+        wp_article_service, "_stats_cache",
+        SharedCache("wp-test", ttl=900, stale_ttl=3600, session_factory=sessionmaker(bind=engine)),
+    )
+
+    assert wp_article_service.refresh_article_stats() == {"total_articles": 35, "sites": 2}
+    wordpress.down = True
+    stats = wp_article_service.get_article_stats()
+
+    assert stats["total_articles"] == 35
+    assert stats["articles_this_month"] == 6
+    assert len(stats["top_articles"]) == 10
+    assert stats["by_category"] == [{"category": "categories-7", "count": 10}]
+    engine.dispose()